@@ -34,6 +34,18 @@ PAAS_APP_BATCH_SIZE = 20
 
 SYSTEM_SYNC_BATCH_SIZE = 20
 
+# 全局配置缓存: 进程内 LRU -> 共享缓存，保存配置后通过版本号失效
+GLOBAL_META_CONFIG_CACHE_NAMESPACE = "global_meta_config"
+GLOBAL_META_CONFIG_LOCAL_CACHE_SIZE = int(os.getenv("BKAPP_GLOBAL_META_CONFIG_LOCAL_CACHE_SIZE", 1024))
+GLOBAL_META_CONFIG_LOCAL_CACHE_TTL = int(os.getenv("BKAPP_GLOBAL_META_CONFIG_LOCAL_CACHE_TTL", 10))  # s
+GLOBAL_META_CONFIG_SHARED_CACHE_TTL = int(os.getenv("BKAPP_GLOBAL_META_CONFIG_SHARED_CACHE_TTL", 60))  # s
+
+# 系统展示信息缓存: 进程内 LRU -> 共享缓存，同步系统后通过版本号失效
+SYSTEM_INFO_CACHE_NAMESPACE = "meta:system_info"
+SYSTEM_INFO_LOCAL_CACHE_SIZE = int(os.getenv("BKAPP_SYSTEM_INFO_LOCAL_CACHE_SIZE", 2048))
+SYSTEM_INFO_LOCAL_CACHE_TTL = int(os.getenv("BKAPP_SYSTEM_INFO_LOCAL_CACHE_TTL", 30))  # s
+SYSTEM_INFO_SHARED_CACHE_TTL = int(os.getenv("BKAPP_SYSTEM_INFO_SHARED_CACHE_TTL", 60 * 10))  # s
+
 FETCH_INSTANCE_SCHEMA_METHOD = "fetch_resource_type_schema"
 FETCH_INSTANCE_SCHEMA_CACHE_TIMEOUT = 300
 
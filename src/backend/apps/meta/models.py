@@ -27,6 +27,8 @@ from django.db import IntegrityError, models, transaction
 from django.db.models import IntegerField, OuterRef, Q, QuerySet, Subquery, Value
 from django.db.models.aggregates import Count
 from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy
 from django.utils.translation import gettext_lazy as _
@@ -36,8 +38,16 @@ from treebeard.ns_tree import NS_Node
 from apps.exceptions import MetaConfigNotExistException
 from apps.meta.constants import (
     GLOBAL_CONFIG_LEVEL_INSTANCE,
+    GLOBAL_META_CONFIG_CACHE_NAMESPACE,
+    GLOBAL_META_CONFIG_LOCAL_CACHE_SIZE,
+    GLOBAL_META_CONFIG_LOCAL_CACHE_TTL,
+    GLOBAL_META_CONFIG_SHARED_CACHE_TTL,
     IAM_MANAGER_ROLE,
     SYSTEM_AUTH_TOKEN_LENGTH,
+    SYSTEM_INFO_CACHE_NAMESPACE,
+    SYSTEM_INFO_LOCAL_CACHE_SIZE,
+    SYSTEM_INFO_LOCAL_CACHE_TTL,
+    SYSTEM_INFO_SHARED_CACHE_TTL,
     SYSTEM_INSTANCE_SEPARATOR,
     ConfigLevelChoices,
     SystemAuditStatusEnum,
@@ -53,8 +63,24 @@ from core.models import (
     SoftDeleteModel,
     SoftDeleteModelManager,
 )
+from core.utils.cache import VersionedCache
 from core.utils.data import generate_random_string
 
+global_meta_config_cache = VersionedCache(
+    namespace=GLOBAL_META_CONFIG_CACHE_NAMESPACE,
+    local_maxsize=GLOBAL_META_CONFIG_LOCAL_CACHE_SIZE,
+    local_ttl=GLOBAL_META_CONFIG_LOCAL_CACHE_TTL,
+    shared_ttl=GLOBAL_META_CONFIG_SHARED_CACHE_TTL,
+)
+
+# 系统展示信息缓存，见 apps.meta.utils.system.fetch_system_infos
+system_info_cache = VersionedCache(
+    namespace=SYSTEM_INFO_CACHE_NAMESPACE,
+    local_maxsize=SYSTEM_INFO_LOCAL_CACHE_SIZE,
+    local_ttl=SYSTEM_INFO_LOCAL_CACHE_TTL,
+    shared_ttl=SYSTEM_INFO_SHARED_CACHE_TTL,
+)
+
 
 class GlobalMetaConfig(OperateRecordModel):
     """
@@ -82,9 +108,12 @@ class GlobalMetaConfig(OperateRecordModel):
         default=Unset,
     ):
         try:
-            return cls.objects.get(
-                config_key=config_key, instance_key=instance_key, config_level=config_level
-            ).config_value
+            return global_meta_config_cache.get_or_load(
+                f"{config_level}:{instance_key}:{config_key}",
+                lambda: cls.objects.get(
+                    config_key=config_key, instance_key=instance_key, config_level=config_level
+                ).config_value,
+            )
         except cls.DoesNotExist:
             if default != Unset:
                 return default
@@ -109,6 +138,33 @@ class GlobalMetaConfig(OperateRecordModel):
         config.save()
         return config
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """
+        使所有进程的配置缓存失效
+        """
+
+        global_meta_config_cache.invalidate()
+
+    @classmethod
+    def cache_stats(cls) -> dict:
+        """
+        本进程配置缓存命中统计
+        """
+
+        return global_meta_config_cache.stats
+
+
+@receiver(post_save, sender=GlobalMetaConfig)
+@receiver(post_delete, sender=GlobalMetaConfig)
+def invalidate_global_meta_config_cache(sender, instance: GlobalMetaConfig, **kwargs):
+    """
+    配置变更后立即失效缓存，并在事务提交后再次失效，避免其他进程在提交前回填旧值
+    """
+
+    GlobalMetaConfig.clear_cache()
+    transaction.on_commit(GlobalMetaConfig.clear_cache)
+
 
 class Namespace(SoftDeleteModel):
     """
@@ -363,6 +419,24 @@ class System(OperateRecordModel):
 
         return generate_random_string(length=SYSTEM_AUTH_TOKEN_LENGTH)
 
+    @classmethod
+    def clear_info_cache(cls) -> None:
+        """
+        使所有进程的系统展示信息缓存失效
+        """
+
+        system_info_cache.invalidate()
+
+
+@receiver(post_save, sender=System)
+@receiver(post_delete, sender=System)
+def invalidate_system_info_cache(sender, instance: System, **kwargs):
+    """
+    系统变更后在事务提交后失效展示信息缓存
+    """
+
+    transaction.on_commit(System.clear_info_cache)
+
 
 class SystemDiagnosisConfig(OperateRecordModel):
     """
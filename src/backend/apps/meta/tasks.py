@@ -41,6 +41,7 @@ from apps.meta.handlers.system_sync import (
 from apps.meta.models import System, SystemDiagnosisConfig
 from core.lock import lock
 from core.utils.data import group_by
+from services.web.databus.tasks import refresh_system_status_records
 
 
 @periodic_task(run_every=crontab(minute="*/10"), time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
@@ -127,6 +128,7 @@ def sync_system_paas_info():
             fields=["logo_url", "system_url"],
             batch_size=PAAS_APP_BATCH_SIZE,
         )
+        transaction.on_commit(System.clear_info_cache)
 
     logger.info("[sync_system_paas_info] finished")
 
@@ -159,6 +161,12 @@ def sync_iam_systems():
         except Exception as e:  # NOCC:broad-except(需要处理所有错误)
             logger.error(f"[sync_iam_systems] sync {syncer.__name__} error: {e}")
 
+    # 系统信息同步后失效展示信息缓存
+    System.clear_info_cache()
+
+    # 权限模型变化后刷新系统状态快照
+    refresh_system_status_records.delay()
+
 
 @periodic_task(run_every=crontab(minute=0, hour=17), time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
 @transaction.atomic
@@ -17,7 +17,7 @@ to the current version of the project delivered to anyone in the future.
 """
 import abc
 from collections import defaultdict
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, Iterable, List, Tuple
 
 from bk_resource import resource
 from blueapps.utils.logger import logger
@@ -27,7 +27,7 @@ from apps.meta.constants import (
     SystemAuditStatusEnum,
     SystemSortFieldEnum,
 )
-from apps.meta.models import System
+from apps.meta.models import System, SystemRole, system_info_cache
 from services.web.databus.constants import SystemStatusDict
 
 
@@ -61,6 +61,41 @@ def wrapper_system_status(namespace: str, systems: List[dict]) -> List[dict]:
     return systems
 
 
+def fetch_system_infos(namespace: str, system_ids: Iterable[str]) -> Dict[str, dict]:
+    """
+    获取系统展示信息，仅加载传入的系统，不存在的系统不返回
+    不包含权限、系统状态等需要额外计算的字段
+    """
+
+    from apps.meta.serializers import SystemSerializer
+
+    cache_keys = {f"{namespace}:{system_id}": system_id for system_id in set(system_ids) if system_id}
+    if not cache_keys:
+        return {}
+    system_infos = system_info_cache.get_many(list(cache_keys))
+
+    missing_ids = [system_id for cache_key, system_id in cache_keys.items() if cache_key not in system_infos]
+    if missing_ids:
+        systems = SystemSerializer(
+            System.objects.filter(namespace=namespace, system_id__in=missing_ids), many=True
+        ).data
+        system_map = {system["system_id"]: dict(system) for system in systems}
+        # 兼容 IAM V4 管理员
+        manager_map = defaultdict(list)
+        for role in SystemRole.objects.filter(system_id__in=system_map.keys(), role=IAM_MANAGER_ROLE):
+            manager_map[role.system_id].append(role.username)
+        for system in system_map.values():
+            system["managers"] = system["managers"] or manager_map[system["system_id"]]
+        # 不存在的系统同样缓存，避免重复查询
+        loaded = {f"{namespace}:{system_id}": system_map.get(system_id) for system_id in missing_ids}
+        system_info_cache.set_many(loaded)
+        system_infos.update(loaded)
+
+    return {
+        cache_keys[cache_key]: system_info for cache_key, system_info in system_infos.items() if system_info is not None
+    }
+
+
 def is_system_manager_func(system_ids: List[str], username: str) -> Callable[[str], bool]:
     """
     判断是否是系统管理员
@@ -40,6 +40,9 @@ DEFAULT_NOTICE_AGG_MAX_NOTICE = 0  # 默认不聚合
 
 NOTICE_LAST_AGG_TIME_KEY = "notice:last_agg_time:{relate_type}:{agg_key}"
 
+# 未实际发送(如已被聚合)的通知记录批量回写条数，已发送的记录发送后立即回写
+NOTICE_LOG_UPDATE_BATCH_SIZE = 100
+
 
 class MsgType(TextChoices):
     """
@@ -18,7 +18,7 @@ to the current version of the project delivered to anyone in the future.
 
 import json
 import traceback
-from typing import List, Optional, Type
+from typing import Dict, List, Optional, Type
 
 from blueapps.utils.logger import logger
 from django.utils import timezone
@@ -28,6 +28,7 @@ from apps.notice.aggregators import AGGREGATORS
 from apps.notice.aggregators.base import Aggregator
 from apps.notice.builders import BUILDERS
 from apps.notice.builders.base import Builder
+from apps.notice.constants import NOTICE_LOG_UPDATE_BATCH_SIZE
 from apps.notice.models import NoticeLogV2
 from apps.notice.senders import SENDERS
 from apps.notice.senders.base import Sender
@@ -53,6 +54,8 @@ class NoticeHandler:
         self.relate_type = relate_type
         self.agg_key = agg_key
         self.notice_logs = notice_logs
+        # 已处理待回写的通知记录
+        self.finished_logs: Dict[int, NoticeLogV2] = {}
 
     def send(self) -> None:
         """
@@ -87,22 +90,26 @@ class NoticeHandler:
         agg_notice_log = None
 
         # 逐个处理
-        for notice_log in self.notice_logs:
-            # 已有聚合通知记录不再发送
-            if agg_notice_log is not None:
-                self.done(
-                    notice_log=notice_log,
-                    debug_info=json.dumps({"AggNoticeLogID": agg_notice_log.id}, ensure_ascii=False),
-                )
-                continue
-            # 无聚合周期或未达到最大发送次数时直接发送
-            if duration <= 0 or send_times < max_send_times:
-                self._send(notice_log=notice_log, need_agg=False)
-                send_times += 1
-                continue
-            # 达到最大聚合次数时，再发送一次，并更新聚合记录
-            agg_notice_log = notice_log
-            self._send(notice_log=notice_log, need_agg=True, agg_count=len(self.notice_logs) - max_send_times)
+        try:
+            for notice_log in self.notice_logs:
+                # 已有聚合通知记录不再发送
+                if agg_notice_log is not None:
+                    self.done(
+                        notice_log=notice_log,
+                        debug_info=json.dumps({"AggNoticeLogID": agg_notice_log.id}, ensure_ascii=False),
+                    )
+                    continue
+                # 无聚合周期或未达到最大发送次数时直接发送
+                if duration <= 0 or send_times < max_send_times:
+                    self._send(notice_log=notice_log, need_agg=False)
+                    send_times += 1
+                    continue
+                # 达到最大聚合次数时，再发送一次，并更新聚合记录
+                agg_notice_log = notice_log
+                self._send(notice_log=notice_log, need_agg=True, agg_count=len(self.notice_logs) - max_send_times)
+        finally:
+            # 回写剩余的发送状态，避免已发送的消息被重复发送
+            self.flush()
 
         # 更新调度时间
         aggregator.update_agg_time()
@@ -146,7 +153,7 @@ class NoticeHandler:
                 errors.append(err)
                 debug_info.append({"Error": str(err), "Traceback": str(traceback.format_exc())})
 
-        # 存储记录
+        # 存储记录，已发送的消息立即回写，避免进程异常退出后被重复发送
         self.done(
             notice_log=notice_log,
             errors=errors,
@@ -154,10 +161,10 @@ class NoticeHandler:
             title=title,
             content=content,
         )
+        self.flush()
 
-    @classmethod
     def done(
-        cls, notice_log: NoticeLogV2, errors: list = None, debug_info: str = "", title: str = "", content: str = ""
+        self, notice_log: NoticeLogV2, errors: list = None, debug_info: str = "", title: str = "", content: str = ""
     ) -> None:
         """
         将消息标记为完成
@@ -172,10 +179,9 @@ class NoticeHandler:
             any([len(notice_log.msg_type) <= 0, len(notice_log.msg_type) > len(errors)])  # 没有通知渠道  # 错误数小于通知渠道数
         )
         notice_log.debug_info = debug_info
-        notice_log.save(update_fields=["title", "content", "schedule_at", "schedule_result", "debug_info"])
+        self.finish(notice_log)
 
-    @classmethod
-    def fail(cls, notice_log: NoticeLogV2, debug_info: str = "") -> None:
+    def fail(self, notice_log: NoticeLogV2, debug_info: str = "") -> None:
         """
         将消息标记为失败
         """
@@ -183,4 +189,28 @@ class NoticeHandler:
         notice_log.schedule_at = timezone.now()
         notice_log.schedule_result = False
         notice_log.debug_info = debug_info
-        notice_log.save(update_fields=["schedule_at", "schedule_result", "debug_info"])
+        self.finish(notice_log)
+
+    def finish(self, notice_log: NoticeLogV2) -> None:
+        """
+        记录已处理的消息，达到批量大小时回写
+        仅未实际发送的消息(如已被聚合)会在此累积，已发送的消息在发送后立即回写
+        """
+
+        self.finished_logs[notice_log.id] = notice_log
+        if len(self.finished_logs) >= NOTICE_LOG_UPDATE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        批量回写消息发送状态
+        """
+
+        if not self.finished_logs:
+            return
+        NoticeLogV2.objects.bulk_update(
+            self.finished_logs.values(),
+            fields=["title", "content", "schedule_at", "schedule_result", "debug_info"],
+            batch_size=NOTICE_LOG_UPDATE_BATCH_SIZE,
+        )
+        self.finished_logs = {}
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.26 on 2026-10-18 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notice", "0009_remove_scene_id"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="noticelogv2",
+            index=models.Index(fields=["schedule_at", "create_at"], name="notice_log_pending_idx"),
+        ),
+    ]
@@ -198,3 +198,7 @@ class NoticeLogV2(models.Model):
         index_together = [
             ["relate_type", "agg_key", "schedule_at", "create_at"],
         ]
+        indexes = [
+            # 调度任务只扫描待发送记录: schedule_at IS NULL 等值 + create_at 有序
+            models.Index(fields=["schedule_at", "create_at"], name="notice_log_pending_idx"),
+        ]
@@ -16,6 +16,8 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
 
 from blueapps.contrib.celery_tools.periodic import periodic_task
 from celery.schedules import crontab
@@ -35,20 +37,16 @@ def send_notice_from_db():
     # 初始化调度时间
     schedule_time = time.time()
 
-    # 获取聚合键
-    schedule_configs = (
-        NoticeLogV2.objects.values("relate_type", "agg_key").order_by("relate_type", "agg_key").distinct()
-    )
+    # 只读取待发送记录，并在内存中按聚合键分组
+    pending_logs: Dict[Tuple[str, str], List[NoticeLogV2]] = defaultdict(list)
+    for notice_log in NoticeLogV2.objects.filter(schedule_at__isnull=True).order_by("create_at", "id").iterator():
+        pending_logs[(notice_log.relate_type, notice_log.agg_key)].append(notice_log)
 
     # 逐个执行
-    for schedule_config in schedule_configs:
+    for (relate_type, agg_key), notice_logs in pending_logs.items():
         NoticeHandler(
             schedule_time=schedule_time,
-            relate_type=schedule_config["relate_type"],
-            agg_key=schedule_config["agg_key"],
-            notice_logs=NoticeLogV2.objects.filter(
-                relate_type=schedule_config["relate_type"],
-                agg_key=schedule_config["agg_key"],
-                schedule_at__isnull=True,
-            ).order_by("create_at"),
+            relate_type=relate_type,
+            agg_key=agg_key,
+            notice_logs=notice_logs,
         ).send()
@@ -403,6 +403,15 @@ BK_SOPS_APP_CODE = os.getenv("BKAPP_BK_SOPS_APP_CODE", "bk_sops")
 ENABLE_PROCESS_RISK_TASK = strtobool(os.getenv("BKAPP_ENABLE_PROCESS_RISK_TASK", "True"))
 PROCESS_RISK_MAX_RETRY = int(os.getenv("BKAPP_PROCESS_RISK_MAX_RETRY", 3))
 ENABLE_MULTI_PROCESS_RISK = strtobool(os.getenv("BKAPP_ENABLE_MULTI_PROCESS_RISK", "True"))
+# 自动流转风险: 每个任务处理的风险数，<=1 时按单个风险投递
+PROCESS_RISK_CHUNK_SIZE = int(os.getenv("BKAPP_PROCESS_RISK_CHUNK_SIZE", 50))
+# 自动流转风险: 上次处理后流转状态未变化的风险跳过时长(秒)，跳过期间不检查审批单据/套餐任务状态
+# 默认 0 不跳过；开启时应小于自动流转任务的调度周期，避免状态同步延迟
+PROCESS_RISK_UNCHANGED_SKIP_TIMEOUT = int(os.getenv("BKAPP_PROCESS_RISK_UNCHANGED_SKIP_TIMEOUT", 0))
+# 按时间片批量生成风险(预加载候选风险，合并更新后批量写入)
+ENABLE_BULK_GENERATE_RISK = strtobool(os.getenv("BKAPP_ENABLE_BULK_GENERATE_RISK", "True"))
+# 追赶同步窗口时将时间片分发为并行子任务
+ENABLE_PARALLEL_GENERATE_RISK = strtobool(os.getenv("BKAPP_ENABLE_PARALLEL_GENERATE_RISK", "False"))
 
 # cache lock
 DEFAULT_CACHE_LOCK_TIMEOUT = int(os.getenv("BKAPP_DEFAULT_CACHE_LOCK_TIMEOUT", 60 * 60))
@@ -516,6 +525,15 @@ LOG_EXPORT_TASK_MAX_PERIODIC_TIME = int(os.getenv("BKAPP_LOG_EXPORT_TASK_MAX_PER
 # 日志导出任务分页大小
 LOG_EXPORT_TASK_PAGE_SIZE = int(os.getenv("BKAPP_LOG_EXPORT_TASK_PAGE_SIZE", 100))
 
+# 日志导出是否使用游标分页(避免深分页 OFFSET 扫描)
+ENABLE_LOG_EXPORT_KEYSET_PAGINATION = strtobool(os.getenv("BKAPP_ENABLE_LOG_EXPORT_KEYSET_PAGINATION", "True"))
+
+# 日志导出预取页数(检索与写文件流水线的队列长度)
+LOG_EXPORT_PREFETCH_PAGES = int(os.getenv("BKAPP_LOG_EXPORT_PREFETCH_PAGES", 2))
+
+# 日志导出进度更新间隔(秒)
+LOG_EXPORT_PROGRESS_UPDATE_INTERVAL = int(os.getenv("BKAPP_LOG_EXPORT_PROGRESS_UPDATE_INTERVAL", 5))
+
 # 风险导出同步阈值
 RISK_EXPORT_SYNC_MAX_COUNT = int(os.getenv("BKAPP_RISK_EXPORT_SYNC_MAX_COUNT", 300))
 
@@ -613,12 +631,66 @@ EVENT_DORIS_EXPIRES = os.getenv("BKAPP_EVENT_DORIS_EXPIRES", "1080d")
 
 # 日志订阅查询最大时间范围（毫秒），默认 30 天
 LOG_SUBSCRIPTION_MAX_TIME_RANGE = int(os.getenv("BKAPP_LOG_SUBSCRIPTION_MAX_TIME_RANGE", 30 * 24 * 60 * 60 * 1000))
+# 日志订阅流式(NDJSON)查询单次请求最大返回条数，超出后通过 next_cursor 续拉
+LOG_SUBSCRIPTION_STREAM_MAX_ROWS = int(os.getenv("BKAPP_LOG_SUBSCRIPTION_STREAM_MAX_ROWS", 100000))
 
 # API 工具执行默认超时时间
 API_TOOL_EXECUTE_DEFAULT_TIMEOUT = int(os.getenv("BKAPP_API_TOOL_EXECUTE_DEFAULT_TIMEOUT", 120))
 # API 工具非 JSON 数据默认最大返回字符数
 API_TOOL_EXECUTE_DEFAULT_MAX_RETURN_CHAR = int(os.getenv("BKAPP_API_TOOL_EXECUTE_DEFAULT_MAX_RETURN_CHAR", 1000))
 
+# 外部 HTTP 请求连接池: 每个 host 的最大连接数
+HTTP_SESSION_POOL_MAXSIZE = int(os.getenv("BKAPP_HTTP_SESSION_POOL_MAXSIZE", 10))
+# 外部 HTTP 请求连接池: 最多保留的 host 数
+HTTP_SESSION_POOL_MAX_HOSTS = int(os.getenv("BKAPP_HTTP_SESSION_POOL_MAX_HOSTS", 64))
+# 外部 HTTP 请求连接池: 每个 host 的最大并发请求数
+HTTP_SESSION_HOST_CONCURRENCY = int(os.getenv("BKAPP_HTTP_SESSION_HOST_CONCURRENCY", 20))
+
+# 策略状态巡检: 并发请求 BKBase 的线程数
+STRATEGY_STATUS_CHECK_CONCURRENCY = int(os.getenv("BKAPP_STRATEGY_STATUS_CHECK_CONCURRENCY", 10))
+# 策略状态巡检: 单次 BKBase 请求的超时时间(秒)
+STRATEGY_STATUS_CHECK_CALL_TIMEOUT = int(os.getenv("BKAPP_STRATEGY_STATUS_CHECK_CALL_TIMEOUT", 30))
+
+# 关联数据一致性检查: 全局并发检查的快照数
+JOIN_DATA_CHECK_CONCURRENCY = int(os.getenv("BKAPP_JOIN_DATA_CHECK_CONCURRENCY", 10))
+# 关联数据一致性检查: 同一系统同时检查的快照数，避免压垮单个源系统
+JOIN_DATA_CHECK_SYSTEM_CONCURRENCY = int(os.getenv("BKAPP_JOIN_DATA_CHECK_SYSTEM_CONCURRENCY", 2))
+# 关联数据一致性检查: 按 thedate 增量计数的存储类型；Doris 主键表会跨分区覆盖更新，历史分区计数不稳定，默认仅 HDFS
+JOIN_DATA_CHECK_INCREMENTAL_STORAGES = [
+    storage for storage in os.getenv("BKAPP_JOIN_DATA_CHECK_INCREMENTAL_STORAGES", "hdfs").split(",") if storage
+]
+# 关联数据一致性检查: 每次重新计数的最近分区天数
+JOIN_DATA_CHECK_RECENT_PARTITION_DAYS = int(os.getenv("BKAPP_JOIN_DATA_CHECK_RECENT_PARTITION_DAYS", 2))
+# 关联数据一致性检查: 历史分区计数缓存时间(秒)，过期后全量重算一次
+JOIN_DATA_CHECK_PARTITION_CACHE_TIMEOUT = int(
+    os.getenv("BKAPP_JOIN_DATA_CHECK_PARTITION_CACHE_TIMEOUT", 60 * 60 * 24 * 7)
+)
+
+# 采集项最近日志同步: 并发请求日志平台/计算平台的线程数
+TAIL_LOG_SYNC_CONCURRENCY = int(os.getenv("BKAPP_TAIL_LOG_SYNC_CONCURRENCY", 10))
+# 采集项最近日志同步: 单轮同步的时间预算(秒)，超出后剩余采集项留到下一轮，<=0 时不限制
+TAIL_LOG_SYNC_TIME_BUDGET = int(os.getenv("BKAPP_TAIL_LOG_SYNC_TIME_BUDGET", 60 * 8))
+# 采集项最近日志同步: 该时间(秒)内变更过的采集项优先同步
+TAIL_LOG_SYNC_RECENT_CHANGE_WINDOW = int(os.getenv("BKAPP_TAIL_LOG_SYNC_RECENT_CHANGE_WINDOW", 60 * 30))
+
+# 资源反向拉取: 游标分页未指定 limit 时的默认页大小
+PULLER_FETCH_DEFAULT_LIMIT = int(os.getenv("BKAPP_PULLER_FETCH_DEFAULT_LIMIT", 1000))
+# 资源反向拉取: 总数缓存时间(秒)，首页重新计数，后续分页复用缓存
+PULLER_FETCH_COUNT_CACHE_TIMEOUT = int(os.getenv("BKAPP_PULLER_FETCH_COUNT_CACHE_TIMEOUT", 60 * 10))
+# 资源反向拉取: 完整请求/响应日志的采样率(0~1)，其余请求仅记录摘要
+PULLER_FETCH_LOG_SAMPLE_RATE = float(os.getenv("BKAPP_PULLER_FETCH_LOG_SAMPLE_RATE", 0.01))
+
+# Scope 权限: 用户授权场景/系统集合的跨请求缓存时间(秒)，<=0 时不缓存
+SCOPE_PERMISSION_CACHE_TTL = int(os.getenv("BKAPP_SCOPE_PERMISSION_CACHE_TTL", 60))
+# Scope 权限: 缓存过期后先返回旧值并在后台刷新
+SCOPE_PERMISSION_CACHE_STALE_WHILE_REVALIDATE = strtobool(
+    os.getenv("BKAPP_SCOPE_PERMISSION_CACHE_STALE_WHILE_REVALIDATE", "False")
+)
+# Scope 权限: 过期后仍可返回旧值的时间(秒)
+SCOPE_PERMISSION_CACHE_STALE_TTL = int(os.getenv("BKAPP_SCOPE_PERMISSION_CACHE_STALE_TTL", 300))
+# Scope 权限: 后台刷新线程数
+SCOPE_PERMISSION_CACHE_REFRESH_WORKERS = int(os.getenv("BKAPP_SCOPE_PERMISSION_CACHE_REFRESH_WORKERS", 2))
+
 # SDK 配置
 BKAPP_GO_SDK_CONFIG = os.getenv("BKAPP_GO_SDK_CONFIG", "")
 BKAPP_JAVA_SDK_CONFIG = os.getenv("BKAPP_JAVA_SDK_CONFIG", "")
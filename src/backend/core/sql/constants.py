@@ -15,6 +15,7 @@ specific language governing permissions and limitations under the License.
 We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
+import os
 from functools import cached_property
 
 from django.utils.translation import gettext_lazy
@@ -152,3 +153,8 @@ class Operator(TextChoices):
     MATCH_ANY = "match_any", gettext_lazy("match any")
     JSON_CONTAINS = "json_contains", gettext_lazy("json contains")
     BETWEEN = "between", gettext_lazy("between")
+
+
+# SQL 模板解析结果缓存（进程内 LRU）
+SQL_TEMPLATE_CACHE_SIZE = int(os.getenv("BKAPP_SQL_TEMPLATE_CACHE_SIZE", 512))
+SQL_TEMPLATE_CACHE_TTL = int(os.getenv("BKAPP_SQL_TEMPLATE_CACHE_TTL", 60 * 60))  # s
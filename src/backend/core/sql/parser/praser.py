@@ -1,14 +1,77 @@
 from itertools import chain
-from typing import List, Optional, Set
+from typing import FrozenSet, List, Optional, Set, Tuple
 
 import sqlglot
 from sqlglot import exp
 
+from core.sql.constants import SQL_TEMPLATE_CACHE_SIZE, SQL_TEMPLATE_CACHE_TTL
 from core.sql.exceptions import SQLParseError
 from core.sql.model import Table
 from core.sql.parser.common import _create_sqlglot_literal
 from core.sql.parser.functions import function_visitors, get_skip_null_var_names
 from core.sql.parser.model import ParsedSQLInfo, SelectField, SqlVariable
+from core.utils.cache import LocalTTLCache
+
+# 节点在语法树中的位置: 从根节点出发的 (arg_key, index) 序列
+NodePath = Tuple[Tuple[str, Optional[int]], ...]
+
+
+def _node_path(node: exp.Expression) -> NodePath:
+    path = []
+    while node.parent is not None:
+        path.append((node.arg_key, node.index))
+        node = node.parent
+    return tuple(reversed(path))
+
+
+def _resolve_node(root: exp.Expression, path: NodePath) -> exp.Expression:
+    node = root
+    for arg_key, index in path:
+        value = node.args[arg_key]
+        node = value[index] if index is not None else value
+    return node
+
+
+class ParsedSQLTemplate:
+    """
+    解析后的 SQL 模板
+    语法树只读共享，渲染时复制一次并按预先记录的位置替换变量与自定义函数
+    """
+
+    def __init__(self, expression: exp.Expression):
+        self.expression = expression
+        self.skip_null_var_names: FrozenSet[str] = frozenset(get_skip_null_var_names(expression))
+        self.variable_paths: List[NodePath] = [
+            _node_path(node) for node in expression.find_all(exp.Var, exp.Placeholder, bfs=False)
+        ]
+        # 与 transform 一致: 外层自定义函数被替换后不再处理其内部节点
+        self.function_paths: List[NodePath] = []
+        for node in expression.find_all(exp.Func, bfs=False):
+            if node.__class__ not in function_visitors:
+                continue
+            path = _node_path(node)
+            if any(path[: len(parent)] == parent for parent in self.function_paths):
+                continue
+            self.function_paths.append(path)
+
+    def copy_tree(self) -> exp.Expression:
+        return self.expression.copy()
+
+
+sql_template_cache = LocalTTLCache(maxsize=SQL_TEMPLATE_CACHE_SIZE, ttl=SQL_TEMPLATE_CACHE_TTL)
+
+
+def get_parsed_template(sql: str, dialect: Optional[str]) -> ParsedSQLTemplate:
+    """
+    获取解析后的 SQL 模板，按 (sql, dialect) 进程内缓存；解析失败抛出 sqlglot.errors.ParseError
+    """
+
+    cache_key = (sql, dialect)
+    template = sql_template_cache.get(cache_key)
+    if template is None:
+        template = ParsedSQLTemplate(sqlglot.parse_one(sql, read=dialect))
+        sql_template_cache.set(cache_key, template)
+    return template
 
 
 class SqlQueryAnalysis:
@@ -54,7 +117,7 @@ class SqlQueryAnalysis:
             return
 
         try:
-            self._parsed_expression = sqlglot.parse_one(self.original_sql, read=self.dialect)
+            self._parsed_expression = get_parsed_template(self.original_sql, self.dialect).expression
         except sqlglot.errors.ParseError as e:
             raise SQLParseError(f"SQL解析失败: {e}") from e
 
@@ -159,33 +222,50 @@ class SqlQueryAnalysis:
         target_dialect = template_dialect if template_dialect is not None else self.dialect
 
         try:
-            parsed_tree = sqlglot.parse_one(target_sql, read=target_dialect)
+            template = get_parsed_template(target_sql, target_dialect)
         except sqlglot.errors.ParseError as e:
             raise SQLParseError(f"SQL 模板解析失败 (SQL template parsing failed): {target_sql} - {e}") from e
 
-        skip_null_var_names = get_skip_null_var_names(parsed_tree)
-
-        transformed_tree = parsed_tree.transform(
-            self._parameter_replacer_visitor, params, target_dialect, skip_null_var_names, copy=True
-        )
-        transformed_tree = transformed_tree.transform(self._custom_function_visitor, params, target_dialect, copy=True)
+        transformed_tree = self._render_template(template, params, target_dialect)
 
         count_sql = None
         if with_count:
+            # 统计 SQL 先于分页生成，子查询直接引用渲染结果，无需再复制
             count_expr = exp.select(exp.func("COUNT", exp.Star()).as_("count")).from_(
-                transformed_tree.copy().subquery("_sub")
+                transformed_tree.subquery("_sub", copy=False), copy=False
             )
             count_sql = count_expr.sql(dialect=target_dialect)
 
         if limit is not None:
-            transformed_tree = transformed_tree.limit(limit)
+            transformed_tree = transformed_tree.limit(limit, copy=False)
         if offset:
-            transformed_tree = transformed_tree.offset(offset)
+            transformed_tree = transformed_tree.offset(offset, copy=False)
 
         data_sql = transformed_tree.sql(dialect=target_dialect)
 
         return {"data": data_sql, "count": count_sql}
 
+    def _render_template(self, template: ParsedSQLTemplate, params: dict, dialect_str: Optional[str]) -> exp.Expression:
+        """
+        复制一次模板语法树，按预先记录的位置替换变量，再替换自定义函数
+        """
+
+        tree = template.copy_tree()
+        for paths, visitor, args in (
+            (template.variable_paths, self._parameter_replacer_visitor, (template.skip_null_var_names,)),
+            (template.function_paths, self._custom_function_visitor, ()),
+        ):
+            for path in paths:
+                node = _resolve_node(tree, path)
+                new_node = visitor(node, params, dialect_str, *args)
+                if new_node is node:
+                    continue
+                if path:
+                    node.replace(new_node)
+                else:
+                    tree = new_node
+        return tree
+
     def get_parsed_def(self) -> ParsedSQLInfo:
         """
         返回一个包含解析结果摘要的 Pydantic 模型实例，方便查看。
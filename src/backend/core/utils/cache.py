@@ -17,8 +17,14 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import abc
+import copy
 import functools
 import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List
 
 from blueapps.utils.base import md5_sum
 from blueapps.utils.logger import logger
@@ -90,3 +96,180 @@ class CacheMixin(abc.ABC):
     def set_cache(self, key_params: dict, data: any, ex: int = None, *args, **kwargs) -> None:
         cache_key = self.generate_cache_key(**key_params)
         return self.cache.set(cache_key, data, ex, *args, **kwargs)
+
+
+_MISSING = object()
+
+
+class LocalTTLCache:
+    """
+    进程内 LRU 缓存
+    超出容量时淘汰最久未使用的条目，条目超过 ttl 秒后失效；ttl<=0 时不缓存
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING or item[0] < time.monotonic():
+                if item is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+class VersionedCache:
+    """
+    两级读穿缓存: 进程内 LRU(短 TTL) -> Django 缓存
+    共享缓存的 key 带版本号，invalidate 时更换版本号使所有进程的共享缓存失效；
+    其他进程的本地缓存最迟在 local_ttl 后失效
+    """
+
+    def __init__(self, namespace: str, local_maxsize: int = 1024, local_ttl: float = 10, shared_ttl: int = 60):
+        self.namespace = namespace
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self.local = LocalTTLCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self._version = None
+        self._version_expired_at = 0
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    def get_version(self) -> str:
+        """
+        获取共享缓存版本号，本地同样缓存 local_ttl 秒
+        """
+
+        if self._version is not None and self._version_expired_at > time.monotonic():
+            return self._version
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(self.version_key)
+        self._version = version
+        self._version_expired_at = time.monotonic() + self.local_ttl
+        return version
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        依次读取本地缓存、共享缓存，均未命中时返回 default
+        """
+
+        value = self.local.get(key, _MISSING)
+        if value is not _MISSING:
+            return copy.deepcopy(value)
+
+        # 共享缓存中以元组包装，以区分缓存值为 None 与未命中
+        wrapped = cache.get(self._shared_key(key)) if self.shared_ttl > 0 else None
+        if wrapped is None:
+            self.shared_misses += 1
+            return default
+        self.shared_hits += 1
+        self.local.set(key, wrapped[0])
+        return copy.deepcopy(wrapped[0])
+
+    def set(self, key: str, value: Any) -> None:
+        if self.shared_ttl > 0:
+            cache.set(self._shared_key(key), (value,), timeout=self.shared_ttl)
+        self.local.set(key, value)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        批量读取，仅返回命中的 key；本地未命中的 key 通过一次请求读取共享缓存
+        """
+
+        result, missing = {}, []
+        for key in keys:
+            value = self.local.get(key, _MISSING)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                result[key] = copy.deepcopy(value)
+        if not missing:
+            return result
+
+        shared_keys = {self._shared_key(key): key for key in missing} if self.shared_ttl > 0 else {}
+        wrapped_map = cache.get_many(list(shared_keys)) if shared_keys else {}
+        for shared_key, wrapped in wrapped_map.items():
+            key = shared_keys[shared_key]
+            self.local.set(key, wrapped[0])
+            result[key] = copy.deepcopy(wrapped[0])
+        self.shared_hits += len(wrapped_map)
+        self.shared_misses += len(missing) - len(wrapped_map)
+        return result
+
+    def set_many(self, data: Dict[str, Any]) -> None:
+        if self.shared_ttl > 0:
+            cache.set_many({self._shared_key(key): (value,) for key, value in data.items()}, timeout=self.shared_ttl)
+        for key, value in data.items():
+            self.local.set(key, value)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        缓存未命中时调用 loader 加载并回填
+        loader 抛出的异常不会被缓存；返回值为可变对象时返回副本，避免调用方修改缓存
+        """
+
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = loader()
+        self.set(key, value)
+        return copy.deepcopy(value)
+
+    def _shared_key(self, key: str) -> str:
+        return f"{self.namespace}:{self.get_version()}:{key}"
+
+    def invalidate(self) -> None:
+        """
+        更换版本号并清空本进程缓存
+        """
+
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+        self._version = None
+        self.local.clear()
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "local_hits": self.local.hits,
+            "local_misses": self.local.misses,
+            "shared_hits": self.shared_hits,
+            "shared_misses": self.shared_misses,
+            "local_size": self.local.stats["size"],
+        }
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+import threading
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+
+class HostSession:
+    """
+    单个 host 的连接池会话
+    """
+
+    def __init__(self, pool_maxsize: int, concurrency: int):
+        self.session = requests.Session()
+        # 与 requests.request 一致，不在请求之间保留 Cookie
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.semaphore = threading.BoundedSemaphore(max(concurrency, 1))
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        统计底层连接: connections 为新建连接数，requests 为发出的请求数，差值即复用的连接数
+        """
+
+        connections = requests_count = 0
+        for key in self.adapter.poolmanager.pools.keys():
+            pool = self.adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            requests_count += pool.num_requests
+        return {
+            "connections": connections,
+            "requests": requests_count,
+            "reused": max(requests_count - connections, 0),
+        }
+
+    def close(self):
+        self.session.close()
+
+
+class HostSessionPool:
+    """
+    按 host 复用 requests.Session，保持长连接
+    每个 host 的连接数与并发请求数均有上限，超出 host 数量上限时淘汰最久未使用的会话
+    """
+
+    def __init__(self, pool_maxsize: int, max_hosts: int, host_concurrency: int):
+        self.pool_maxsize = pool_maxsize
+        self.max_hosts = max_hosts
+        self.host_concurrency = host_concurrency
+        self._sessions: "OrderedDict[str, HostSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def get_host_key(cls, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def get_session(self, url: str) -> HostSession:
+        host_key = self.get_host_key(url)
+        with self._lock:
+            host_session = self._sessions.get(host_key)
+            if host_session is not None:
+                self._sessions.move_to_end(host_key)
+                self.hits += 1
+                return host_session
+            self.misses += 1
+            host_session = HostSession(pool_maxsize=self.pool_maxsize, concurrency=self.host_concurrency)
+            self._sessions[host_key] = host_session
+            while len(self._sessions) > max(self.max_hosts, 1):
+                _, expired = self._sessions.popitem(last=False)
+                expired.close()
+            return host_session
+
+    @classmethod
+    def _get_wait_timeout(cls, timeout: Union[None, float, Tuple[float, float]]) -> Optional[float]:
+        if isinstance(timeout, (tuple, list)):
+            return timeout[0]
+        return timeout
+
+    def request(
+        self, method: str, url: str, timeout: Union[None, float, Tuple[float, float]] = None, **kwargs
+    ) -> requests.Response:
+        """
+        发送请求，参数与 requests.request 一致
+        等待 host 并发名额的时间计入连接超时，超时抛出 requests.Timeout
+        """
+
+        host_session = self.get_session(url)
+        wait_timeout = self._get_wait_timeout(timeout)
+        if not host_session.semaphore.acquire(timeout=wait_timeout):
+            raise requests.Timeout(f"wait for connection slot of {self.get_host_key(url)} timeout")
+        try:
+            return host_session.session.request(method=method, url=url, timeout=timeout, **kwargs)
+        finally:
+            host_session.semaphore.release()
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("post", url, **kwargs)
+
+    def stats(self) -> dict:
+        """
+        连接池统计: 会话命中、新建连接与复用连接数
+        """
+
+        with self._lock:
+            sessions = list(self._sessions.items())
+        hosts = {host_key: host_session.connection_stats() for host_key, host_session in sessions}
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hosts": hosts,
+            "connections": sum(item["connections"] for item in hosts.values()),
+            "requests": sum(item["requests"] for item in hosts.values()),
+            "reused": sum(item["reused"] for item in hosts.values()),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for host_session in sessions:
+            host_session.close()
+
+
+http_session_pool = HostSessionPool(
+    pool_maxsize=settings.HTTP_SESSION_POOL_MAXSIZE,
+    max_hosts=settings.HTTP_SESSION_POOL_MAX_HOSTS,
+    host_concurrency=settings.HTTP_SESSION_HOST_CONCURRENCY,
+)
@@ -93,6 +93,21 @@ def service_lock(key_instance, **kwargs):
             lock.release()
 
 
+@contextmanager
+def wait_lock(name, ttl=None, wait_timeout=60):
+    """
+    阻塞等待获取锁，超时抛出 LockError
+    释放时校验 token，持有超过 ttl 后不会误删其他持有者的锁
+    """
+    lock = RedisLock(name, ttl)
+    if not lock.acquire(wait_timeout):
+        raise LockError(msg="{} is already locked".format(name))
+    try:
+        yield lock
+    finally:
+        lock.release()
+
+
 def share_lock(ttl=600, identify=None):
     """
     装饰定时任务时需要放在periodic_task下面
@@ -20,6 +20,9 @@ from rest_framework import fields
 
 DEFAULT_REDIS_KEY_FORMAT = "{system_id}:{object_type}:{object_id}"
 
+# 反向拉取总数缓存
+FETCH_COUNT_CACHE_KEY = "puller:fetch_count:{handler}:{start_time}:{end_time}"
+
 
 FIELD_TYPE_MAP = {
     fields.IntegerField: "number",
@@ -16,6 +16,7 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+from django.utils.translation import gettext_lazy
 from rest_framework import serializers
 
 from apps.meta.models import Action, ResourceType
@@ -52,6 +53,9 @@ class ResourceViewFilterSerializer(serializers.Serializer):
 class ResourceViewPageSerializer(serializers.Serializer):
     offset = serializers.IntegerField(required=False)
     limit = serializers.IntegerField(required=False)
+    cursor = serializers.CharField(
+        required=False, allow_blank=True, help_text=gettext_lazy("游标分页，首页传空字符串，后续传上页返回的 next_cursor")
+    )
 
 
 class ResourceViewRequestSerializer(serializers.Serializer):
@@ -74,3 +78,4 @@ class ResourceViewResponseItemSerializer(serializers.Serializer):
 class ResourceViewResponseSerializer(serializers.Serializer):
     count = serializers.IntegerField()
     results = ResourceViewResponseItemSerializer(many=True)
+    next_cursor = serializers.CharField(required=False, allow_null=True)
@@ -17,14 +17,19 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import abc
+import base64
 import datetime
-from typing import List
+import json
+from typing import List, Optional, Tuple
 
-from django.db.models import QuerySet
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model, Q, QuerySet
+from django.utils.translation import gettext
 from rest_framework import serializers
 
 from apps.meta.models import Action, ResourceType
-from services.puller.puller.constants import FIELD_TYPE_MAP
+from services.puller.puller.constants import FETCH_COUNT_CACHE_KEY, FIELD_TYPE_MAP
 from services.puller.puller.serializers import (
     FetchActionSerializer,
     FetchResourceTypeSerializer,
@@ -63,30 +68,101 @@ class FetchInstanceMixin:
 
 
 class BaseFetchHandler(FetchInstanceMixin, abc.ABC):
+    """
+    反向拉取处理器
+    page 中携带 cursor 时使用 (updated_at, pk) 游标分页，否则沿用 offset/limit 分页
+    """
+
     def __init__(self, start_time: int = None, end_time: int = None, page: dict = None):
+        self.raw_start_time = start_time
+        self.raw_end_time = end_time
         self.start_time = datetime.datetime.fromtimestamp(start_time / 1000) if start_time else None
         self.end_time = datetime.datetime.fromtimestamp(end_time / 1000) if end_time else None
         page = page or dict()
         self.offset = page.get("offset")
         self.limit = page.get("limit")
+        self.cursor = page.get("cursor")
 
-    def fetch_instance_list(self):
+    @property
+    def use_cursor(self) -> bool:
+        return self.cursor is not None
+
+    def get_filtered_queryset(self) -> QuerySet:
         if self.start_time and self.end_time:
-            queryset = self.get_queryset().filter(updated_at__gte=self.start_time, updated_at__lte=self.end_time)
-        elif self.start_time:
-            queryset = self.get_queryset().filter(updated_at__gte=self.start_time)
-        else:
-            queryset = self.get_queryset()
-        count = queryset.count()
+            return self.get_queryset().filter(updated_at__gte=self.start_time, updated_at__lte=self.end_time)
+        if self.start_time:
+            return self.get_queryset().filter(updated_at__gte=self.start_time)
+        return self.get_queryset()
+
+    def fetch_instance_list(self):
+        queryset = self.get_filtered_queryset()
+        if self.use_cursor:
+            instances, next_cursor = self.cursor_pagination(queryset)
+            data = self.serialize(instances)
+            return {
+                "count": self.get_count(queryset, refresh=not self.cursor),
+                "results": self.parse_data(data),
+                "next_cursor": next_cursor,
+            }
         page = self.pagination(queryset)
         data = self.serialize(page)
-        return {"count": count, "results": self.parse_data(data)}
+        # offset 分页调用方依赖精确总数，不使用缓存
+        return {"count": queryset.count(), "results": self.parse_data(data)}
+
+    def get_count(self, queryset: QuerySet, refresh: bool) -> int:
+        """
+        获取游标分页总数
+        首页重新计数并缓存，后续分页复用缓存，避免每页都对全表 count
+        """
+
+        cache_key = FETCH_COUNT_CACHE_KEY.format(
+            handler=self.__class__.__name__, start_time=self.raw_start_time, end_time=self.raw_end_time
+        )
+        if not refresh:
+            count = cache.get(cache_key)
+            if count is not None:
+                return count
+        count = queryset.count()
+        cache.set(cache_key, count, settings.PULLER_FETCH_COUNT_CACHE_TIMEOUT)
+        return count
 
     def pagination(self, queryset: QuerySet) -> QuerySet:
         if self.offset is not None and self.limit is not None:
             return queryset[self.offset : self.offset + self.limit]
         return queryset
 
+    def cursor_pagination(self, queryset: QuerySet) -> Tuple[List[Model], Optional[str]]:
+        """
+        按 (updated_at, pk) 游标分页，每页代价与偏移量无关
+        updated_at 为空的数据在升序中排在最前(MySQL)，游标中以 None 表示
+        """
+
+        limit = self.limit if self.limit and self.limit > 0 else settings.PULLER_FETCH_DEFAULT_LIMIT
+        if self.cursor:
+            updated_at, pk = self.decode_cursor(self.cursor)
+            if updated_at is None:
+                queryset = queryset.filter(Q(updated_at__isnull=True, pk__gt=pk) | Q(updated_at__isnull=False))
+            else:
+                queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, pk__gt=pk))
+        instances = list(queryset.order_by(self.updated_at_field, "pk")[: limit + 1])
+        if len(instances) <= limit:
+            return instances, None
+        instances = instances[:limit]
+        return instances, self.encode_cursor(instances[-1])
+
+    def encode_cursor(self, instance: Model) -> str:
+        updated_at = getattr(instance, self.updated_at_field)
+        value = [updated_at.isoformat() if updated_at else None, instance.pk]
+        return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+    @classmethod
+    def decode_cursor(cls, cursor: str) -> Tuple[Optional[datetime.datetime], int]:
+        try:
+            updated_at, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return (datetime.datetime.fromisoformat(updated_at) if updated_at else None), int(pk)
+        except (ValueError, TypeError) as e:
+            raise serializers.ValidationError({"cursor": gettext("游标无效")}) from e
+
     def serialize(self, queryset: QuerySet) -> list:
         serializer = self.serializer(queryset, many=True)
         return serializer.data
@@ -17,9 +17,12 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import json
+import random
+import time
 
 from bk_resource.settings import bk_resource_settings
 from blueapps.utils.logger import logger
+from django.conf import settings
 from django.utils.translation import gettext
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.response import Response
@@ -59,12 +62,9 @@ class ResourcesView(APIView):
         method = request.data.get("method")
         try:
             handler = getattr(self, method)
+            start = time.perf_counter()
             data = handler(request, *args, **kwargs)
-            logger.info(
-                f"[{self.__class__.__module__}.{self.__class__.__name__}] "
-                f"RequestData => {json.dumps(request.data)}; "
-                f"ResponseData => {json.dumps(data)}"
-            )
+            self.log_request(request, data, time.perf_counter() - start)
             return Response(data)
         except AttributeError:
             logger.info(
@@ -74,6 +74,29 @@ class ResourcesView(APIView):
             )
             raise NotImplementedError(f"{gettext('未实现方法')} => {method}")
 
+    def log_request(self, request, data: dict, duration: float) -> None:
+        """
+        记录请求日志
+        全量同步时每页响应都很大，默认仅记录摘要，按采样率记录完整请求与响应
+        """
+
+        prefix = f"[{self.__class__.__module__}.{self.__class__.__name__}]"
+        if random.random() < settings.PULLER_FETCH_LOG_SAMPLE_RATE:
+            logger.info(f"{prefix} RequestData => {json.dumps(request.data)}; ResponseData => {json.dumps(data)}")
+            return
+        results = data.get("results") if isinstance(data, dict) else None
+        logger.info(
+            "%s Method => %s; Type => %s; Filter => %s; Page => %s; Count => %s; Results => %s; Duration => %.3fs",
+            prefix,
+            request.data.get("method"),
+            request.data.get("type"),
+            request.data.get("filter"),
+            request.data.get("page"),
+            data.get("count") if isinstance(data, dict) else None,
+            len(results) if results is not None else None,
+            duration,
+        )
+
     def fetch_instance_list(self, request, *args, **kwargs):
         type_name = request.data.get("type")
         if type_name == "resource_type":
@@ -19,6 +19,10 @@ class ScopeType(models.TextChoices):
     SYSTEM = "system", gettext_lazy("单系统")
 
 
+# 用户授权场景/系统集合的跨请求缓存命名空间
+SCOPE_PERMISSION_CACHE_NAMESPACE = "scope_permission:authorized"
+
+
 class ScopeQueryField(models.TextChoices):
     """scope 请求协议中的 query / body 参数名"""
 
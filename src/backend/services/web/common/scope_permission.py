@@ -11,8 +11,19 @@ Scope 权限组件
 
 from __future__ import annotations
 
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from blueapps.utils.logger import logger
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
 
 from apps.meta.models import System
 from apps.permission.handlers.actions import ActionMeta
@@ -22,13 +33,21 @@ from apps.permission.handlers.resource_types import ResourceEnum
 from apps.permission.handlers.service import PermissionService as Permission
 from core.exceptions import PermissionException, ValidationError
 from core.models import get_request_username
+from core.observability import submit_with_observation_context
 from services.web.common.constants import (
+    SCOPE_PERMISSION_CACHE_NAMESPACE,
     BindingResourceType,
     ScopeQueryField,
     ScopeType,
 )
 from services.web.scene.constants import BindingType, SceneStatus, VisibilityScope
-from services.web.scene.models import ResourceBinding, Scene, SceneSystem
+from services.web.scene.models import (
+    ResourceBinding,
+    ResourceBindingScene,
+    ResourceBindingSystem,
+    Scene,
+    SceneSystem,
+)
 
 # IAM 资源类型 ID 常量（用于判断 action 关联的 resource_type）
 _SCENE_RESOURCE_TYPE_ID = ResourceEnum.SCENE.id  # "scene"
@@ -120,6 +139,142 @@ class ScopeContext:
         return cls(scope_type=scope_type, scope_id=scope_id)
 
 
+# ---------------------------------------------------------------------------
+# AuthorizedScopeCache — 跨请求的授权实例集合缓存
+# ---------------------------------------------------------------------------
+
+
+class AuthorizedScopeCache:
+    """用户授权实例集合的跨请求缓存
+
+    按 (用户, 资源类型, action) 缓存 IAM 授权且本地存在的场景/系统 ID，存放在共享缓存中，有效期 ttl 秒。
+
+    失效方式：key 中带全局版本号与用户版本号
+    - invalidate_user：单个用户授权变更（如 grant_scene_role）
+    - invalidate_all：场景成员同步、场景启停等影响多个用户的变更
+
+    stale_while_revalidate 开启时，条目过期后 stale_ttl 秒内仍返回旧值，同时在后台线程刷新，
+    IAM 响应变慢时列表页不会被阻塞。
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: int,
+        stale_while_revalidate: bool = False,
+        stale_ttl: int = 0,
+        refresh_workers: int = 1,
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_ttl = stale_ttl
+        self.refresh_workers = refresh_workers
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refresh_failures = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.namespace}:version"
+
+    def user_version_key(self, username: str) -> str:
+        return f"{self.namespace}:user_version:{username}"
+
+    def _get_versions(self, username: str) -> Tuple[str, str]:
+        keys = [self.version_key, self.user_version_key(username)]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if versions.get(key) is None:
+                cache.add(key, uuid.uuid4().hex, timeout=None)
+                versions[key] = cache.get(key)
+        return versions[keys[0]], versions[keys[1]]
+
+    def make_key(self, username: str, resource_type: str, action_id: str) -> str:
+        global_version, user_version = self._get_versions(username)
+        return f"{self.namespace}:{global_version}:{user_version}:{username}:{resource_type}:{action_id}"
+
+    def get_or_load(self, username: str, resource_type: str, action_id: str, loader: Callable[[], list]) -> list:
+        """读取缓存，未命中时调用 loader 加载并回填；loader 抛出的异常不会被缓存"""
+        if self.ttl <= 0:
+            return list(loader())
+
+        key = self.make_key(username, resource_type, action_id)
+        entry = cache.get(key)
+        if entry is not None:
+            if entry["expired_at"] > time.time():
+                self.hits += 1
+                return list(entry["value"])
+            if self.stale_while_revalidate:
+                self.stale_hits += 1
+                self._revalidate(key, loader)
+                return list(entry["value"])
+
+        self.misses += 1
+        value = list(loader())
+        self._set(key, value)
+        return value
+
+    def _set(self, key: str, value: list) -> None:
+        timeout = self.ttl + (self.stale_ttl if self.stale_while_revalidate else 0)
+        cache.set(key, {"value": value, "expired_at": time.time() + self.ttl}, timeout=timeout)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=max(self.refresh_workers, 1), thread_name_prefix="scope_permission_refresh"
+                )
+            return self._executor
+
+    def _revalidate(self, key: str, loader: Callable[[], list]) -> None:
+        # 同一个 key 同时只有一个刷新任务
+        refresh_key = f"{key}:refreshing"
+        if not cache.add(refresh_key, 1, timeout=self.ttl):
+            return
+        submit_with_observation_context(self.executor, self._refresh, key, refresh_key, loader)
+
+    def _refresh(self, key: str, refresh_key: str, loader: Callable[[], list]) -> None:
+        try:
+            self._set(key, list(loader()))
+        except Exception as err:  # NOCC:broad-except(刷新失败时保留旧值)
+            self.refresh_failures += 1
+            logger.exception("[AuthorizedScopeCache] Refresh Failed; Key => %s; Err => %s", key, err)
+        finally:
+            cache.delete(refresh_key)
+            connections.close_all()
+
+    def invalidate_user(self, username: str) -> None:
+        cache.set(self.user_version_key(username), uuid.uuid4().hex, timeout=None)
+
+    def invalidate_all(self) -> None:
+        cache.set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+    @property
+    def stats(self) -> dict:
+        total = self.hits + self.stale_hits + self.misses
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refresh_failures": self.refresh_failures,
+            "hit_rate": (self.hits + self.stale_hits) / total if total else 0,
+        }
+
+
+authorized_scope_cache = AuthorizedScopeCache(
+    namespace=SCOPE_PERMISSION_CACHE_NAMESPACE,
+    ttl=settings.SCOPE_PERMISSION_CACHE_TTL,
+    stale_while_revalidate=settings.SCOPE_PERMISSION_CACHE_STALE_WHILE_REVALIDATE,
+    stale_ttl=settings.SCOPE_PERMISSION_CACHE_STALE_TTL,
+    refresh_workers=settings.SCOPE_PERMISSION_CACHE_REFRESH_WORKERS,
+)
+
+
 # ---------------------------------------------------------------------------
 # ScopePermission — 通用 scope 服务类
 # ---------------------------------------------------------------------------
@@ -131,9 +286,10 @@ class ScopePermission:
     职责：
     1. scope 合法性校验（check_scope_entry）
     2. scope 下可访问场景/系统实例集合回收（get_scene_ids / get_system_ids）
-    3. 通用资源可见范围交集判断（check_resource_permission）
+    3. 通用资源可见范围交集判断（check_resource_permission / check_resources_visibility）
 
-    实例挂载在 request.scope_permission 上，生命周期为单次请求。
+    实例挂载在 request.scope_permission 上，生命周期为单次请求；
+    跨场景/跨系统的 IAM 授权集合另外通过 authorized_scope_cache 跨请求缓存。
 
     业务侧常见使用场景：
     - 入口鉴权：场景页进入"策略列表""规则管理"，系统页进入"系统检索""系统诊断"
@@ -254,9 +410,9 @@ class ScopePermission:
         - 用户点开某个处理套餐、面板、工具详情前，先判断该资源是否在自己的可见范围内
         - 用户对某个资源执行启停、编辑、删除等实例操作前，先做一次资源消费权限校验
         """
-        all_scene_ids = self._get_all_scene_ids()
-        all_system_ids = self._get_all_system_ids()
-        result = self._check_visibility_intersection(resource_type, resource_id, all_scene_ids, all_system_ids)
+        result = self._check_visibility_intersection(
+            resource_type, resource_id, self._get_all_scene_ids(), self._get_all_system_ids()
+        )
 
         if not result and raise_exception:
             raise PermissionException(
@@ -267,6 +423,24 @@ class ScopePermission:
 
         return result
 
+    def check_resources_visibility(
+        self,
+        resources: Iterable[Tuple[str, str]],
+    ) -> Dict[Tuple[str, str], bool]:
+        """批量校验用户能否消费一组资源。
+
+        与 check_resource_permission 规则一致，返回 {(resource_type, resource_id): 是否可见}，
+        key 中的 resource_type / resource_id 均为字符串。
+        绑定关系、绑定场景、绑定系统各用一次查询批量获取，查询数与资源数量无关。
+
+        业务侧常见使用场景：
+        - 工具、报表等列表按当前用户的可消费范围批量过滤，避免逐行鉴权
+        """
+        keys = list(dict.fromkeys((str(resource_type), str(resource_id)) for resource_type, resource_id in resources))
+        if not keys:
+            return {}
+        return self._resolve_visibility_map(keys, self._get_all_scene_ids(), self._get_all_system_ids())
+
     def _get_all_scene_ids(self) -> List[int]:
         """获取用户有 VIEW_SCENE 权限的所有场景 ID（内部复用缓存）"""
         return self.get_scene_ids(ScopeContext(ScopeType.CROSS_SCENE), ActionEnum.VIEW_SCENE)
@@ -283,18 +457,85 @@ class ScopePermission:
         system_ids: List[str],
     ) -> bool:
         """校验资源的授权范围与用户可消费范围是否有交集。"""
+        key = (str(resource_type), str(resource_id))
+        return self._resolve_visibility_map([key], scene_ids, system_ids)[key]
+
+    @staticmethod
+    def _resolve_visibility_map(
+        keys: List[Tuple[str, str]],
+        scene_ids: List[int],
+        system_ids: List[str],
+    ) -> Dict[Tuple[str, str], bool]:
+        """批量校验资源的授权范围与用户可消费范围是否有交集。"""
+        visibility = {key: False for key in keys}
         if not system_ids and not scene_ids:
             # 没有任一 scope 权限时，任何资源都不可见
-            return False
+            return visibility
+
+        resource_ids_by_type: Dict[str, List[str]] = defaultdict(list)
+        for resource_type, resource_id in keys:
+            resource_ids_by_type[resource_type].append(resource_id)
+        condition = Q()
+        for resource_type, resource_ids in resource_ids_by_type.items():
+            condition |= Q(resource_type=resource_type, resource_id__in=resource_ids)
+
+        bindings = list(
+            ResourceBinding.objects.filter(condition).only(
+                "id", "resource_type", "resource_id", "binding_type", "visibility_type"
+            )
+        )
 
-        binding = ResourceBinding.objects.filter(
-            resource_type=resource_type,
-            resource_id=str(resource_id),
-        ).first()
-        if not binding:
-            # 不存在绑定关系，直接返回 False
-            return False
+        # 仅为需要比对绑定范围的资源批量查询绑定场景/系统
+        scene_binding_ids = [binding.id for binding in bindings if ScopePermission._needs_bound_scenes(binding)]
+        system_binding_ids = [binding.id for binding in bindings if ScopePermission._needs_bound_systems(binding)]
+        bound_scene_ids: Dict[int, Set[int]] = defaultdict(set)
+        bound_system_ids: Dict[int, Set[str]] = defaultdict(set)
+        if scene_binding_ids:
+            for binding_id, scene_id in ResourceBindingScene.objects.filter(
+                binding_id__in=scene_binding_ids, scene__is_deleted=False
+            ).values_list("binding_id", "scene_id"):
+                bound_scene_ids[binding_id].add(scene_id)
+        if system_binding_ids:
+            for binding_id, system_id in ResourceBindingSystem.objects.filter(
+                binding_id__in=system_binding_ids
+            ).values_list("binding_id", "system_id"):
+                bound_system_ids[binding_id].add(system_id)
+
+        scene_id_set, system_id_set = set(scene_ids), set(system_ids)
+        # 不存在绑定关系的资源保持 False
+        for binding in bindings:
+            visibility[(binding.resource_type, binding.resource_id)] = ScopePermission._is_binding_visible(
+                binding,
+                scene_id_set,
+                system_id_set,
+                bound_scene_ids.get(binding.id, set()),
+                bound_system_ids.get(binding.id, set()),
+            )
+        return visibility
+
+    @staticmethod
+    def _needs_bound_scenes(binding: ResourceBinding) -> bool:
+        return binding.binding_type == BindingType.SCENE_BINDING or binding.visibility_type in {
+            VisibilityScope.SPECIFIC_SCENES,
+            VisibilityScope.SCENES_AND_SYSTEMS,
+        }
+
+    @staticmethod
+    def _needs_bound_systems(binding: ResourceBinding) -> bool:
+        return binding.binding_type == BindingType.PLATFORM_BINDING and binding.visibility_type in {
+            VisibilityScope.SPECIFIC_SYSTEMS,
+            VisibilityScope.SCENES_AND_SYSTEMS,
+        }
 
+    @staticmethod
+    def _is_binding_visible(
+        binding: ResourceBinding,
+        scene_ids: Set[int],
+        system_ids: Set[str],
+        bound_scene_ids: Set[int],
+        bound_system_ids: Set[str],
+    ) -> bool:
+        """按绑定类型与可见范围判断单个资源是否可见。"""
         # 平台级 all_visible：在已获得任一 scene/system scope 的前提下可见
         if (
             binding.binding_type == BindingType.PLATFORM_BINDING
@@ -304,10 +545,7 @@ class ScopePermission:
 
         # 场景级绑定：检查 ResourceBindingScene
         if binding.binding_type == BindingType.SCENE_BINDING:
-            bound_scene_ids = set(
-                binding.binding_scenes.filter(scene__is_deleted=False).values_list("scene_id", flat=True)
-            )
-            return bool(set(scene_ids) & bound_scene_ids)
+            return bool(scene_ids & bound_scene_ids)
 
         # 平台级绑定：按 visibility_type 分支
         if binding.visibility_type == VisibilityScope.ALL_SCENES:
@@ -317,23 +555,14 @@ class ScopePermission:
             return bool(system_ids)
 
         if binding.visibility_type == VisibilityScope.SPECIFIC_SCENES:
-            bound_scene_ids = set(
-                binding.binding_scenes.filter(scene__is_deleted=False).values_list("scene_id", flat=True)
-            )
-            return bool(set(scene_ids) & bound_scene_ids)
+            return bool(scene_ids & bound_scene_ids)
 
         if binding.visibility_type == VisibilityScope.SPECIFIC_SYSTEMS:
-            bound_system_ids = set(binding.binding_systems.values_list("system_id", flat=True))
-            return bool(set(system_ids) & bound_system_ids)
+            return bool(system_ids & bound_system_ids)
 
         if binding.visibility_type == VisibilityScope.SCENES_AND_SYSTEMS:
-            bound_scene_ids = set(
-                binding.binding_scenes.filter(scene__is_deleted=False).values_list("scene_id", flat=True)
-            )
-            bound_system_ids = set(binding.binding_systems.values_list("system_id", flat=True))
-
-            scene_matched = bool(scene_ids) and bool(set(scene_ids) & bound_scene_ids)
-            system_matched = bool(system_ids) and bool(set(system_ids) & bound_system_ids)
+            scene_matched = bool(scene_ids) and bool(scene_ids & bound_scene_ids)
+            system_matched = bool(system_ids) and bool(system_ids & bound_system_ids)
 
             return scene_matched or system_matched
 
@@ -358,7 +587,7 @@ class ScopePermission:
         - 策略列表、规则列表、处理套餐列表按当前用户可见场景做过滤
         - 某个接口传 `scope_type=scene&scope_id=123` 时，先确认用户是否能访问场景 123，再继续查询
 
-        结果缓存在请求级 _scene_ids_cache 中。
+        结果缓存在请求级 _scene_ids_cache 中；cross_scene 的授权集合另有跨请求缓存。
 
         无权限时返回空列表；需要抛出权限申请异常的入口应调用 check_scope_entry。
         """
@@ -373,15 +602,12 @@ class ScopePermission:
         result: List[int] = []
 
         if scope.scope_type == ScopeType.CROSS_SCENE:
-            resource_ids = self.permission.get_authorized_resource_ids(action, ResourceEnum.SCENE.id)
-            if resource_ids:
-                scene_qs = Scene.objects.filter(scene_id__in=resource_ids, status=SceneStatus.ENABLED)
-            else:
-                scene_qs = None
-            if scene_qs is not None:
-                result = list(scene_qs.values_list("scene_id", flat=True))
-            else:
-                result = []
+            result = authorized_scope_cache.get_or_load(
+                self.username,
+                ResourceEnum.SCENE.id,
+                action.id,
+                lambda: self._load_authorized_scene_ids(action),
+            )
 
         elif scope.scope_type == ScopeType.SCENE:
             # 实例级校验
@@ -409,7 +635,7 @@ class ScopePermission:
         - 系统检索、系统列表、系统诊断面板按当前用户可见系统做过滤
         - 某个接口传 `scope_type=system&scope_id=bk_monitor` 时，确认用户能访问该系统后再放行后续查询
 
-        结果缓存在请求级 _system_ids_cache 中。
+        结果缓存在请求级 _system_ids_cache 中；cross_system 的 IAM 授权集合另有跨请求缓存，本地 managers 通道不缓存。
 
         无权限时返回空列表；需要抛出权限申请异常的入口应调用 check_scope_entry。
         """
@@ -425,9 +651,14 @@ class ScopePermission:
 
         if scope.scope_type == ScopeType.CROSS_SYSTEM:
             # IAM 通道
-            resource_ids = self.permission.get_authorized_resource_ids(action, ResourceEnum.SYSTEM.id)
-            if resource_ids:
-                result_set |= set(System.objects.filter(system_id__in=resource_ids).values_list("system_id", flat=True))
+            result_set |= set(
+                authorized_scope_cache.get_or_load(
+                    self.username,
+                    ResourceEnum.SYSTEM.id,
+                    action.id,
+                    lambda: self._load_authorized_system_ids(action),
+                )
+            )
 
             # 本地 managers 通道（使用 Model 便捷方法，单条 SQL）
             local_ids = set(System.get_managed_system_ids(self.username))
@@ -446,6 +677,24 @@ class ScopePermission:
         self._system_ids_cache[cache_key] = result
         return result
 
+    def _load_authorized_scene_ids(self, action: ActionMeta) -> List[int]:
+        """IAM 授权且已启用的场景 ID"""
+        resource_ids = self.permission.get_authorized_resource_ids(action, ResourceEnum.SCENE.id)
+        if not resource_ids:
+            return []
+        return list(
+            Scene.objects.filter(scene_id__in=resource_ids, status=SceneStatus.ENABLED).values_list(
+                "scene_id", flat=True
+            )
+        )
+
+    def _load_authorized_system_ids(self, action: ActionMeta) -> List[str]:
+        """IAM 授权且本地存在的系统 ID"""
+        resource_ids = self.permission.get_authorized_resource_ids(action, ResourceEnum.SYSTEM.id)
+        if not resource_ids:
+            return []
+        return list(System.objects.filter(system_id__in=resource_ids).values_list("system_id", flat=True))
+
     def get_system_ids_for_scope(
         self,
         scope: ScopeContext,
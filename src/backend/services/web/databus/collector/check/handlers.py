@@ -18,26 +18,44 @@ to the current version of the project delivered to anyone in the future.
 
 import datetime
 import os
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import chain, zip_longest
+from typing import Dict, List, Optional, Tuple
 
 from bk_resource import api, resource
 from bk_resource.exceptions import APIRequestError
 from blueapps.utils.logger import logger
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 from rest_framework.settings import api_settings
 
-from apps.meta.models import GlobalMetaConfig
+from api.bk_base.constants import StorageType
+from apps.meta.models import GlobalMetaConfig, ResourceType, System
 from apps.meta.utils.fields import REPORT_TIME
+from core.observability import submit_with_observation_context
+from services.web.databus.collector.snapshot.join.http_pull import HttpPullHandler
 from services.web.databus.constants import (
     COLLECTOR_CHECK_AGG_SIZE,
     COLLECTOR_CHECK_DECIMALS,
     COLLECTOR_CHECK_EXTRA_CONFIG_KEY,
     COLLECTOR_CHECK_TIME_PERIOD,
     COLLECTOR_CHECK_TIME_RANGE,
+    JOIN_DATA_CHECK_MISSING_COLUMN_KEYWORDS,
+    JOIN_DATA_CHECK_PARTITION_COUNT_KEY,
+    JOIN_DATA_CHECK_PARTITION_FIELD,
+    PULL_HANDLER_PRE_CHECK_TIMEOUT,
+    CheckErrorType,
+)
+from services.web.databus.models import (
+    CollectorConfig,
+    Snapshot,
+    SnapshotCheckStatistic,
 )
-from services.web.databus.models import CollectorConfig
 
 
 class ReportCheckHandler:
@@ -231,3 +249,254 @@ class ReportCheckHandler:
             api.bk_monitor.report_metric(params)
         except (APIRequestError, ValidationError):
             pass
+
+
+@dataclass
+class SnapshotCheckResult:
+    """单个快照的一致性检查结果"""
+
+    snapshot: Snapshot
+    http_pull_count: int = 0
+    storage_counts: Dict[str, int] = field(default_factory=dict)
+    result: bool = True
+    error_type: Optional[str] = None
+    # 各阶段耗时（秒）
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return round(sum(self.timings.values()), 3)
+
+
+class SnapshotCountChecker:
+    """
+    关联数据一致性检查
+    1. 并发检查运行中的快照，同一系统同时检查的快照数受限，避免压垮单个源系统
+    2. 增量存储按 thedate 分区计数：历史分区计数缓存复用，仅重算最近的分区
+    3. 数据库读写只在调用线程执行，工作线程只负责远程请求
+    """
+
+    STORAGE_TYPES = (StorageType.DORIS.value, StorageType.HDFS.value)
+
+    def __init__(self, concurrency: int = None, system_concurrency: int = None, today: datetime.date = None):
+        self.concurrency = max(concurrency or settings.JOIN_DATA_CHECK_CONCURRENCY, 1)
+        self.system_concurrency = max(system_concurrency or settings.JOIN_DATA_CHECK_SYSTEM_CONCURRENCY, 1)
+        self.today = today or datetime.date.today()
+        self._system_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    def check(self, snapshots: List[Snapshot]) -> List[SnapshotCheckResult]:
+        """
+        检查入口
+        """
+        system_ids = {snapshot.system_id for snapshot in snapshots}
+        systems = {system.system_id: system for system in System.objects.filter(system_id__in=system_ids)}
+        resource_types = {
+            (resource_type.system_id, resource_type.resource_type_id): resource_type
+            for resource_type in ResourceType.objects.filter(system_id__in=system_ids)
+        }
+
+        tasks = []
+        for snapshot in self.interleave_by_system(snapshots):
+            system = systems.get(snapshot.system_id)
+            resource_type = resource_types.get((snapshot.system_id, snapshot.resource_type_id))
+            if not system or not resource_type:
+                logger.error(
+                    "[JoinDataCheckFailed] System %s ResourceType Not Found => %s",
+                    snapshot.system_id,
+                    snapshot.resource_type_id,
+                )
+                continue
+            tasks.append((snapshot, system, resource_type))
+        if not tasks:
+            return []
+
+        self._system_semaphores = {
+            system_id: threading.BoundedSemaphore(self.system_concurrency) for system_id in system_ids
+        }
+        results = []
+        with ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(tasks)), thread_name_prefix="join_data_check"
+        ) as executor:
+            futures = [
+                submit_with_observation_context(executor, self.check_snapshot, snapshot, system, resource_type)
+                for snapshot, system, resource_type in tasks
+            ]
+            for future, (snapshot, _, _) in zip(futures, tasks):
+                try:
+                    results.append(future.result())
+                except Exception as e:  # NOCC:broad-except(单个快照失败不影响其他快照)
+                    logger.exception(
+                        "[JoinDataCheckFailed] System => %s; ResourceType => %s; Error => %s",
+                        snapshot.system_id,
+                        snapshot.resource_type_id,
+                        e,
+                    )
+
+        for check_result in results:
+            self.save(check_result)
+        return results
+
+    @staticmethod
+    def interleave_by_system(snapshots: List[Snapshot]) -> List[Snapshot]:
+        """
+        按系统轮转排列快照，减少工作线程因同一系统限流而空等
+        """
+        grouped: Dict[str, List[Snapshot]] = {}
+        for snapshot in snapshots:
+            grouped.setdefault(snapshot.system_id, []).append(snapshot)
+        return [snapshot for snapshot in chain.from_iterable(zip_longest(*grouped.values())) if snapshot]
+
+    def check_snapshot(self, snapshot: Snapshot, system: System, resource_type: ResourceType) -> SnapshotCheckResult:
+        """
+        检查单个快照：源端拉取预检 + 存储计数
+        """
+        check_result = SnapshotCheckResult(snapshot=snapshot)
+        with self._system_semaphores[snapshot.system_id]:
+            start = time.monotonic()
+            self.check_source(check_result, system, resource_type)
+            check_result.timings["source"] = round(time.monotonic() - start, 3)
+
+            start = time.monotonic()
+            self.check_storage(check_result)
+            check_result.timings["storage"] = round(time.monotonic() - start, 3)
+
+        logger.info(
+            "[JoinDataCheckFinished] System => %s; ResourceType => %s; Result => %s; Timings => %s",
+            snapshot.system_id,
+            snapshot.resource_type_id,
+            check_result.result,
+            check_result.timings,
+        )
+        return check_result
+
+    def check_source(self, check_result: SnapshotCheckResult, system: System, resource_type: ResourceType) -> None:
+        """
+        请求源系统拉取接口，获取实例总数
+        """
+        snapshot = check_result.snapshot
+        body = {
+            "type": snapshot.resource_type_id,
+            "method": "fetch_instance_list",
+            "filter": {"start_time": 0, "end_time": int(datetime.datetime.now().timestamp()) * 1000},
+            "page": {"offset": 0, "limit": 1},
+        }
+        try:
+            pull_handler = HttpPullHandler(system, resource_type, Snapshot(), snapshot.join_data_type)
+            resp = pull_handler.request(body, timeout=PULL_HANDLER_PRE_CHECK_TIMEOUT)
+            resp.raise_for_status()
+            content = resp.json()
+            check_result.http_pull_count = content.get("data", {}).get("count", 0)
+            if not content.get("result", True):
+                check_result.result = False
+                check_result.error_type = CheckErrorType.SOURCE.value
+        except Exception as e:  # NOCC:broad-except(需要处理所有错误)
+            logger.exception("[JoinDataCheckFailed] Error while querying source: %s", e)
+            check_result.http_pull_count = 0
+            check_result.result = False
+            check_result.error_type = CheckErrorType.SOURCE.value
+
+    def check_storage(self, check_result: SnapshotCheckResult) -> None:
+        """
+        获取各存储中的数据总数
+        """
+        table_id = check_result.snapshot.bkbase_table_id
+        try:
+            for storage in self.STORAGE_TYPES:
+                if storage in settings.JOIN_DATA_CHECK_INCREMENTAL_STORAGES:
+                    check_result.storage_counts[storage] = self.count_incremental(table_id, storage)
+                else:
+                    check_result.storage_counts[storage] = self.count_full(table_id, storage)
+        except Exception as e:  # NOCC:broad-except(需要处理所有错误)
+            logger.exception("[JoinDataCheckFailed] Error while querying storage: %s", e)
+            check_result.storage_counts = {}
+            check_result.result = False
+            # 仅当源端未失败时才标记为存储失败，避免覆盖先发生的源端故障
+            if not check_result.error_type:
+                check_result.error_type = CheckErrorType.STORAGE.value
+
+    @staticmethod
+    def count_full(table_id: str, storage: str) -> int:
+        """
+        全表计数
+        """
+        resp = api.bk_base.query_sync(sql=f"select count(*) as count from {table_id} limit 1", prefer_storage=storage)
+        return (resp.get("list") or [{}])[0].get("count", 0)
+
+    def count_incremental(self, table_id: str, storage: str) -> int:
+        """
+        按 thedate 分区计数
+        缓存中已有历史分区时只重算最近的分区；缓存不存在或过期时全量分组计数一次，
+        过期的全量重算同时修正被存储过期清理的历史分区
+        表没有 thedate 字段时回退为全表计数，并在缓存有效期内不再尝试分区计数；
+        其他查询异常仅本次回退为全表计数，下次仍尝试分区计数
+        """
+        cache_key = JOIN_DATA_CHECK_PARTITION_COUNT_KEY.format(table_id=table_id, storage=storage)
+        cached = cache.get(cache_key)
+        if cached and not cached["partitioned"]:
+            return self.count_full(table_id, storage)
+
+        recent_days = max(settings.JOIN_DATA_CHECK_RECENT_PARTITION_DAYS, 1)
+        recent_start = int((self.today - datetime.timedelta(days=recent_days - 1)).strftime("%Y%m%d"))
+        if cached:
+            history = {thedate: count for thedate, count in cached["counts"].items() if int(thedate) < recent_start}
+            sql = f"select thedate, count(*) as count from {table_id} where thedate >= {recent_start} group by thedate"
+            expired_at = cached["expired_at"]
+        else:
+            history = {}
+            sql = f"select thedate, count(*) as count from {table_id} group by thedate"
+            expired_at = time.time() + settings.JOIN_DATA_CHECK_PARTITION_CACHE_TIMEOUT
+
+        try:
+            resp = api.bk_base.query_sync(sql=sql, prefer_storage=storage)
+        except APIRequestError as e:
+            if cached:
+                raise
+            logger.warning("[JoinDataCheck] Partition count unavailable, fallback to full count; %s %s", table_id, e)
+            count = self.count_full(table_id, storage)
+            if self.is_partition_missing(e):
+                self._set_partition_cache(cache_key, {"partitioned": False, "expired_at": expired_at})
+            return count
+
+        recent = {str(row["thedate"]): row.get("count", 0) for row in resp.get("list") or [] if row.get("thedate")}
+        counts = {**history, **recent}
+        self._set_partition_cache(cache_key, {"partitioned": True, "counts": counts, "expired_at": expired_at})
+        return sum(counts.values())
+
+    @staticmethod
+    def is_partition_missing(error: APIRequestError) -> bool:
+        """
+        查询异常是否因表缺少分区字段，超时等临时异常不视为无分区
+        """
+        # BKBase 返回的错误信息在 data 中（message/errors 等）
+        message = str(error.data).lower()
+        return JOIN_DATA_CHECK_PARTITION_FIELD in message and any(
+            keyword in message for keyword in JOIN_DATA_CHECK_MISSING_COLUMN_KEYWORDS
+        )
+
+    @staticmethod
+    def _set_partition_cache(cache_key: str, value: dict) -> None:
+        """写入分区计数缓存，增量更新不延长首次全量计数时确定的过期时间"""
+        timeout = int(value["expired_at"] - time.time())
+        if timeout > 0:
+            cache.set(cache_key, value, timeout=timeout)
+
+    @staticmethod
+    def save(check_result: SnapshotCheckResult) -> Tuple[SnapshotCheckStatistic, bool]:
+        """
+        保存检查结果
+        """
+        snapshot = check_result.snapshot
+        return SnapshotCheckStatistic.objects.update_or_create(
+            system_id=snapshot.system_id,
+            resource_type_id=snapshot.resource_type_id,
+            join_data_type=snapshot.join_data_type,
+            defaults={
+                "http_pull_count": check_result.http_pull_count,
+                "doris_storage_count": check_result.storage_counts.get(StorageType.DORIS.value, 0),
+                "hdfs_storage_count": check_result.storage_counts.get(StorageType.HDFS.value, 0),
+                "result": check_result.result,
+                "error_type": check_result.error_type,
+                "check_duration": check_result.duration,
+                "checked_at": timezone.now(),
+            },
+        )
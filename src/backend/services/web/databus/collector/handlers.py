@@ -18,15 +18,26 @@ to the current version of the project delivered to anyone in the future.
 
 import datetime
 import json
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
 
 from bk_resource import api
 from bk_resource.exceptions import APIRequestError
 from blueapps.utils.logger import logger
+from django.conf import settings
 from django.utils import timezone
 from django.utils.timezone import get_default_timezone
 from rest_framework.settings import api_settings
 
-from services.web.databus.constants import SourcePlatformChoices
+from core.monitor import Metric
+from core.observability import submit_with_observation_context
+from services.web.databus.constants import (
+    TAIL_LOG_SYNC_BATCH_SIZE,
+    SourcePlatformChoices,
+)
 from services.web.databus.models import CollectorConfig
 
 
@@ -51,6 +62,7 @@ class TailLogHandler:
         self.collector = collector
         self.tail_logs = []
         self.tail_log_time: datetime = None
+        self.error_type = ""
 
     def load_tail_log(self):
         raise NotImplementedError
@@ -58,10 +70,15 @@ class TailLogHandler:
     def parse_log_time(self):
         raise NotImplementedError
 
-    def sync(self):
+    def fetch(self) -> Optional[datetime.datetime]:
+        """
+        获取最近日志时间，不写库；获取或解析失败时返回 None 并记录 error_type
+        """
+
         try:
             self.load_tail_log()
         except APIRequestError as err:
+            self.error_type = err.__class__.__name__
             logger.warning(
                 "[GetCollectorTailLogError] CollectorConfigID => %s; Err => %s", self.collector.collector_config_id, err
             )
@@ -69,13 +86,17 @@ class TailLogHandler:
             try:
                 self.parse_log_time()
             except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+                self.error_type = err.__class__.__name__
                 logger.warning(
                     "[ParseLogFailed] Collector => %s; Log => %s; Err => %s",
                     self.collector.collector_config_id,
                     self.tail_logs,
                     err,
                 )
-        self.collector.tail_log_time = self.tail_log_time
+        return self.tail_log_time
+
+    def sync(self):
+        self.collector.tail_log_time = self.fetch()
         self.collector.save(update_fields=["tail_log_time"])
 
 
@@ -106,3 +127,152 @@ class BkBaseTailLogHandler(TailLogHandler):
         self.tail_log_time = datetime.datetime.fromtimestamp(start_time / 1000).astimezone(
             timezone.get_default_timezone()
         )
+
+
+@dataclass
+class TailLogSyncResult:
+    collector: CollectorConfig
+    tail_log_time: Optional[datetime.datetime] = None
+    duration: float = 0
+    error_type: str = ""
+
+
+class TailLogSyncer:
+    """
+    采集项最近日志时间并发同步
+    1. 近期变更过、最近日志时间最旧的采集项优先同步，超出时间预算的采集项留到下一轮
+    2. 各线程只调用平台接口，结果在主线程中通过 bulk_update 一次写回
+    3. 按来源平台汇总耗时与失败数并上报指标
+    """
+
+    def __init__(self, concurrency: int = None, time_budget: int = None, recent_change_window: int = None):
+        self.concurrency = max(concurrency or settings.TAIL_LOG_SYNC_CONCURRENCY, 1)
+        self.time_budget = settings.TAIL_LOG_SYNC_TIME_BUDGET if time_budget is None else time_budget
+        self.recent_change_window = (
+            settings.TAIL_LOG_SYNC_RECENT_CHANGE_WINDOW if recent_change_window is None else recent_change_window
+        )
+        self.deadline = 0
+
+    def load_collectors(self) -> List[CollectorConfig]:
+        """
+        加载需要同步的采集项，已删除的采集项不同步
+        """
+
+        return list(
+            CollectorConfig.objects.filter(is_deleted=False).only(
+                "id",
+                "system_id",
+                "collector_config_id",
+                "bk_data_id",
+                "source_platform",
+                "tail_log_time",
+                "updated_at",
+            )
+        )
+
+    def prioritize(self, collectors: List[CollectorConfig]) -> List[CollectorConfig]:
+        """
+        近期变更的采集项优先，其余按最近日志时间升序，无数据的采集项最先
+        """
+
+        recent_changed_at = timezone.now() - datetime.timedelta(seconds=self.recent_change_window)
+        min_time = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+
+        def sort_key(collector: CollectorConfig):
+            recently_changed = bool(collector.updated_at and collector.updated_at >= recent_changed_at)
+            return not recently_changed, collector.tail_log_time or min_time
+
+        return sorted(collectors, key=sort_key)
+
+    def fetch(self, collector: CollectorConfig) -> Optional[TailLogSyncResult]:
+        # 计算平台采集项缺少 bk_data_id 时无法获取最近日志，无需请求直接置空
+        if collector.source_platform == SourcePlatformChoices.BKBASE.value and not collector.bk_data_id:
+            return TailLogSyncResult(collector=collector)
+        # 超出时间预算后不再请求，未同步的采集项保持原值
+        if self.time_budget > 0 and time.monotonic() > self.deadline:
+            return None
+        start = time.perf_counter()
+        handler = TailLogHandler.get_instance(collector)
+        tail_log_time = handler.fetch()
+        return TailLogSyncResult(
+            collector=collector,
+            tail_log_time=tail_log_time,
+            duration=time.perf_counter() - start,
+            error_type=handler.error_type,
+        )
+
+    def sync(self, collectors: List[CollectorConfig] = None) -> List[CollectorConfig]:
+        """
+        同步入口，返回最近日志时间发生变化的采集项
+        """
+
+        collectors = self.prioritize(self.load_collectors() if collectors is None else collectors)
+        if not collectors:
+            return []
+
+        self.deadline = time.monotonic() + self.time_budget
+        results: List[TailLogSyncResult] = []
+        with ThreadPoolExecutor(
+            max_workers=min(self.concurrency, len(collectors)), thread_name_prefix="sync_tail_log_time"
+        ) as executor:
+            futures = [submit_with_observation_context(executor, self.fetch, collector) for collector in collectors]
+            for future, collector in zip(futures, collectors):
+                try:
+                    result = future.result()
+                except Exception as err:  # NOCC:broad-except(单个采集项失败不影响其他采集项)
+                    logger.exception(
+                        "[SyncTailLogFailed] Collector => %s; Err => %s", collector.collector_config_id, err
+                    )
+                    result = TailLogSyncResult(collector=collector, error_type=err.__class__.__name__)
+                if result:
+                    results.append(result)
+
+        changed = []
+        for result in results:
+            if result.collector.tail_log_time != result.tail_log_time:
+                result.collector.tail_log_time = result.tail_log_time
+                changed.append(result.collector)
+        if changed:
+            CollectorConfig.objects.bulk_update(changed, fields=["tail_log_time"], batch_size=TAIL_LOG_SYNC_BATCH_SIZE)
+
+        logger.info(
+            "[SyncTailLogTime] Total => %d; Synced => %d; Changed => %d", len(collectors), len(results), len(changed)
+        )
+        self.report_metrics(collectors, results)
+        return changed
+
+    def report_metrics(self, collectors: List[CollectorConfig], results: List[TailLogSyncResult]) -> None:
+        """
+        按来源平台汇总上报同步耗时、失败数与超出时间预算未同步的数量
+        """
+
+        platform_collectors: Dict[str, int] = defaultdict(int)
+        for collector in collectors:
+            platform_collectors[collector.source_platform] += 1
+        platform_results: Dict[str, List[TailLogSyncResult]] = defaultdict(list)
+        for result in results:
+            platform_results[result.collector.source_platform].append(result)
+
+        records = []
+        for platform, total in platform_collectors.items():
+            items = platform_results[platform]
+            durations = [item.duration for item in items] or [0]
+            metrics = {
+                "sync_count": len(items),
+                "failed_count": len([item for item in items if item.error_type]),
+                "skipped_count": total - len(items),
+                "avg_duration_ms": int(sum(durations) / len(durations) * 1000),
+                "max_duration_ms": int(max(durations) * 1000),
+            }
+            logger.info("[SyncTailLogTime] SourcePlatform => %s; Metrics => %s", platform, metrics)
+            records.append(
+                {
+                    "target": f"sync_tail_log_time_{platform}",
+                    "metrics": metrics,
+                    "dimension": {"source_platform": platform},
+                }
+            )
+
+        metric = Metric(records=records)
+        if metric.is_configured:
+            metric.report()
@@ -24,7 +24,6 @@ from collections import defaultdict
 from typing import List
 
 import arrow
-import requests
 from bk_resource import api, resource
 from bk_resource.contrib.model import ModelResource
 from bk_resource.settings import bk_resource_settings
@@ -524,14 +523,8 @@ class ToggleJoinDataResource(CollectorMeta):
         pull_handler = HttpPullHandler(system, resource_type, Snapshot(), join_data_type)
         # 触发url校验
         _ = pull_handler.url
-        web = requests.session()
         try:
-            resp = web.post(
-                pull_handler.url,
-                json=body,
-                headers={"Authorization": pull_handler.authorization},
-                timeout=PULL_HANDLER_PRE_CHECK_TIMEOUT,
-            )
+            resp = pull_handler.request(body, timeout=PULL_HANDLER_PRE_CHECK_TIMEOUT)
             content = resp.json()
             status = resp.status_code
             result = content.get("result", True)
@@ -23,6 +23,7 @@ from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 
 from apps.meta.models import ResourceType, System
+from core.utils.http import http_session_pool
 from services.web.databus.constants import (
     ASSET_RT_FORMAT,
     JOIN_DATA_RT_FORMAT,
@@ -81,6 +82,15 @@ class HttpPullHandler:
         if parsed.port and parsed.port in settings.HIGH_RISK_PORTS:
             raise SecurityForbiddenError(message=_("URL包含高危端口: {}").format(parsed.port))
 
+    def request(self, body: dict, timeout: int):
+        """
+        请求系统的实例拉取接口，复用进程内的 host 连接池
+        """
+
+        return http_session_pool.post(
+            self.url, json=body, headers={"Authorization": self.authorization}, timeout=timeout
+        )
+
     @property
     def raw_url(self):
         return self.resource_type.resource_request_url(system=self.system)
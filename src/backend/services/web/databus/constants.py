@@ -113,6 +113,8 @@ COLLECTOR_CHECK_PRECISION_THRESHOLD = 40000
 COLLECTOR_CHECK_DECIMALS = 10
 COLLECTOR_CHECK_EXTRA_CONFIG_KEY = "collector_check_extra_config"
 
+TAIL_LOG_SYNC_BATCH_SIZE = 500
+
 BKBASE_API_MAX_PAGESIZE = 100
 
 ContainerCollectorType = _ContainerCollectorType
@@ -121,6 +123,13 @@ CollectorParamConditionTypeEnum = _CollectorParamConditionTypeEnum
 CollectorParamConditionMatchType = _CollectorParamConditionMatchType
 
 PULL_HANDLER_PRE_CHECK_TIMEOUT = int(os.getenv("BKAPP_PULL_HANDLER_PRE_CHECK_TIMEOUT", 5))  # ss
+# 关联数据一致性检查: 存储按 thedate 分区计数的缓存
+JOIN_DATA_CHECK_PARTITION_COUNT_KEY = "join_data_check:partition_count:{table_id}:{storage}"
+# 关联数据一致性检查: 分区字段及表缺少该字段时的查询报错关键字(小写)
+JOIN_DATA_CHECK_PARTITION_FIELD = "thedate"
+JOIN_DATA_CHECK_MISSING_COLUMN_KEYWORDS = ["unknown column", "cannot be resolved", "not found", "not exist"]
+# 系统状态快照: 采集项/快照更新这些字段时刷新
+SYSTEM_STATUS_RECORD_TRIGGER_FIELDS = {"status", "is_deleted", "system_id"}
 
 # Doris 事件存储配置
 DORIS_EVENT_STORAGE_CONFIG_KEY = "doris_event_storage_config"
@@ -15,21 +15,25 @@ specific language governing permissions and limitations under the License.
 We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
-from typing import Dict, List, Union
+import datetime
+from typing import Dict, Iterable, List, Union
 
-from bk_resource import resource
-from django.db.models import QuerySet
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from rest_framework.settings import api_settings
 
 from apps.meta.constants import SystemAuditStatusEnum, SystemStageEnum, SystemStatusEnum
 from apps.meta.models import System
 from services.web.databus.constants import (
+    DEFAULT_LAST_TIME_TIMESTAMP,
     LogReportStatus,
     SnapshotReportStatus,
-    SnapshotStatusDict,
+    SnapshotRunningStatus,
     SystemStatusDetailEnum,
     SystemStatusDict,
     TailLogStatusDict,
 )
+from services.web.databus.models import CollectorConfig, Snapshot, SystemStatusRecord
 
 
 def fetch_system_status(namespace: str, system_ids: List[str]) -> Dict[str, SystemStatusDict]:
@@ -40,74 +44,198 @@ def fetch_system_status(namespace: str, system_ids: List[str]) -> Dict[str, Syst
         1. 没有权限模型 or 没有日志上报 or 没有配置资产上报: 待完善
         2. 资产上报异常 or 日志上报无数据: 数据异常
         3. 否则：系统接入 & 有权限模型 & 日志上报正常 & 资产上报： 数据正常
+    状态由 SystemStatusRecordHandler 预先计算，缺失时实时补齐
     """
 
     if not system_ids:
         return {}
 
-    # 排序复用缓存
-    system_ids = sorted(system_ids)
-
-    # 1. 获取系统审计状态
-    systems: QuerySet = (
-        System.objects.with_action_resource_type_count()
-        .filter(
-            namespace=namespace,
-            system_id__in=system_ids,
+    records: Dict[str, SystemStatusRecord] = {
+        record.system_id: record for record in SystemStatusRecord.objects.filter(system_id__in=system_ids)
+    }
+    missing_system_ids = set(system_ids) - set(records)
+    if missing_system_ids:
+        records.update(
+            {record.system_id: record for record in SystemStatusRecordHandler.refresh(system_ids=missing_system_ids)}
         )
-        .values("system_id", "audit_status", "action_count", "resource_type_count")
-    )
-
-    # 2. 获取日志上报信息
-    tail_log_time_map = resource.databus.collector.bulk_system_collectors_status(
-        namespace=namespace,
-        system_ids=system_ids,
-    )
-    # 3. 获取资产上报信息
-    snapshot_status_map = resource.databus.collector.bulk_system_snapshots_status(system_ids=system_ids)
-
-    result = {}
-    for system in systems:
-        tail_log_item: TailLogStatusDict = tail_log_time_map.get(system["system_id"], {})
-        snapshot_status_item: SnapshotStatusDict = snapshot_status_map.get(system["system_id"], {})
-        tail_log_status: LogReportStatus = tail_log_item.get("status")
-        has_permission_model = bool(system["action_count"] or system["resource_type_count"])
-        snapshot_status: SnapshotReportStatus = snapshot_status_item.get("status")
-
-        # 系统审计状态为未接入: 未接入
-        if system["audit_status"] == SystemAuditStatusEnum.PENDING:
-            status_detail = SystemStatusDetailEnum.PENDING
-        # 没有权限模型 or 没有日志上报 or 没有配置资产上报: 待完善
-        elif not has_permission_model:
-            status_detail = SystemStatusDetailEnum.NO_PERMISSION_MODEL
-        elif tail_log_status in (LogReportStatus.UNSET, None):
-            status_detail = SystemStatusDetailEnum.NO_LOG_REPORT
-        elif snapshot_status == SnapshotReportStatus.UNSET:
-            status_detail = SystemStatusDetailEnum.NO_ASSET_REPORT
-        # 资产上报异常 or 日志上报无数据: 数据异常
-        elif tail_log_status == LogReportStatus.NODATA:
-            status_detail = SystemStatusDetailEnum.LOG_NO_DATA
-        elif snapshot_status == SnapshotReportStatus.ABNORMAL:
-            status_detail = SystemStatusDetailEnum.ASSET_ABNORMAL
-        # 系统接入 & 有权限模型 & 日志上报正常 & 资产上报： 数据正常
+
+    return {
+        system_id: SystemStatusRecordHandler.build_status_dict(record)
+        for system_id, record in records.items()
+        if record.namespace == namespace
+    }
+
+
+def fetch_status_detail(
+    audit_status: str, has_permission_model: bool, log_status: str, snapshot_status: str
+) -> SystemStatusDetailEnum:
+    """
+    获取系统状态详情
+    """
+
+    # 系统审计状态为未接入: 未接入
+    if audit_status == SystemAuditStatusEnum.PENDING:
+        return SystemStatusDetailEnum.PENDING
+    # 没有权限模型 or 没有日志上报 or 没有配置资产上报: 待完善
+    if not has_permission_model:
+        return SystemStatusDetailEnum.NO_PERMISSION_MODEL
+    if log_status in (LogReportStatus.UNSET, None):
+        return SystemStatusDetailEnum.NO_LOG_REPORT
+    if snapshot_status == SnapshotReportStatus.UNSET:
+        return SystemStatusDetailEnum.NO_ASSET_REPORT
+    # 资产上报异常 or 日志上报无数据: 数据异常
+    if log_status == LogReportStatus.NODATA:
+        return SystemStatusDetailEnum.LOG_NO_DATA
+    if snapshot_status == SnapshotReportStatus.ABNORMAL:
+        return SystemStatusDetailEnum.ASSET_ABNORMAL
+    # 系统接入 & 有权限模型 & 日志上报正常 & 资产上报： 数据正常
+    return SystemStatusDetailEnum.NORMAL
+
+
+class SystemStatusRecordHandler:
+    """
+    系统状态快照
+    由采集项/快照/系统变更、sync_tail_log_time 与 IAM 同步增量刷新，系统列表仅按系统ID读取
+    """
+
+    update_fields = [
+        "namespace",
+        "audit_status",
+        "action_count",
+        "resource_type_count",
+        "collector_count",
+        "tail_log_time",
+        "log_status",
+        "snapshot_status",
+        "system_status_detail",
+        "system_status",
+        "system_stage",
+        "updated_at",
+    ]
+
+    @classmethod
+    def refresh(cls, system_ids: Iterable[str] = None) -> List[SystemStatusRecord]:
+        """
+        重新计算系统状态快照，system_ids 为空时刷新全部系统
+        """
+
+        system_ids = set(system_ids) if system_ids is not None else None
+        if system_ids is not None and not system_ids:
+            return []
+
+        systems = System.objects.with_action_resource_type_count()
+        collectors = CollectorConfig.objects.filter(is_deleted=False)
+        snapshots = Snapshot.objects.all()
+        records = SystemStatusRecord.objects.all()
+        if system_ids is not None:
+            systems = systems.filter(system_id__in=system_ids)
+            collectors = collectors.filter(system_id__in=system_ids)
+            snapshots = snapshots.filter(system_id__in=system_ids)
+            records = records.filter(system_id__in=system_ids)
+
+        # 采集项数量与最近日志时间
+        collector_map = {
+            item["system_id"]: item
+            for item in collectors.values("system_id").annotate(
+                collector_count=Count("id"), tail_log_time=Max("tail_log_time")
+            )
+        }
+        # 快照数量与失败数量
+        snapshot_map = {
+            item["system_id"]: item
+            for item in snapshots.values("system_id").annotate(
+                snapshot_count=Count("id"),
+                failed_count=Count("id", filter=Q(status=SnapshotRunningStatus.FAILED.value)),
+            )
+        }
+        existing_records = {record.system_id: record for record in records}
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        for system in systems.values("system_id", "namespace", "audit_status", "action_count", "resource_type_count"):
+            record = existing_records.pop(system["system_id"], None) or SystemStatusRecord(
+                system_id=system["system_id"]
+            )
+            cls.fill_record(
+                record,
+                system=system,
+                collector=collector_map.get(system["system_id"], {}),
+                snapshot=snapshot_map.get(system["system_id"], {}),
+            )
+            record.updated_at = now
+            (to_update if record.pk else to_create).append(record)
+
+        if to_create:
+            SystemStatusRecord.objects.bulk_create(to_create, ignore_conflicts=True)
+        if to_update:
+            SystemStatusRecord.objects.bulk_update(to_update, fields=cls.update_fields)
+        # 系统已删除
+        if existing_records:
+            SystemStatusRecord.objects.filter(system_id__in=list(existing_records)).delete()
+        return to_create + to_update
+
+    @classmethod
+    def fill_record(cls, record: SystemStatusRecord, system: dict, collector: dict, snapshot: dict) -> None:
+        record.namespace = system["namespace"]
+        record.audit_status = system["audit_status"]
+        record.action_count = system["action_count"]
+        record.resource_type_count = system["resource_type_count"]
+
+        # 日志上报: 无采集项 => 未配置；任一采集项有日志 => 正常；否则 => 无数据
+        record.collector_count = collector.get("collector_count", 0)
+        record.tail_log_time = collector.get("tail_log_time")
+        last_log_time = datetime.datetime.fromtimestamp(DEFAULT_LAST_TIME_TIMESTAMP).replace(tzinfo=None)
+        if not record.collector_count:
+            record.log_status = LogReportStatus.UNSET.value
+        elif record.tail_log_time and record.tail_log_time.replace(tzinfo=None) > last_log_time:
+            record.log_status = LogReportStatus.NORMAL.value
+        else:
+            record.log_status = LogReportStatus.NODATA.value
+
+        # 资产上报: 无快照 => 未配置；有失败快照 => 异常；否则 => 正常
+        if not snapshot.get("snapshot_count"):
+            record.snapshot_status = SnapshotReportStatus.UNSET.value
+        elif snapshot.get("failed_count"):
+            record.snapshot_status = SnapshotReportStatus.ABNORMAL.value
         else:
-            status_detail = SystemStatusDetailEnum.NORMAL
-        system_status = str(status_detail.system_status().value)
-        system_status_msg = str(status_detail.label)
-        system_stage = fetch_system_stage(
-            system_status=system_status,
+            record.snapshot_status = SnapshotReportStatus.NORMAL.value
+
+        has_permission_model = bool(record.action_count or record.resource_type_count)
+        status_detail = fetch_status_detail(
+            audit_status=record.audit_status,
             has_permission_model=has_permission_model,
-            has_collector=bool(tail_log_item.get("collector_count", 0)),
+            log_status=record.log_status,
+            snapshot_status=record.snapshot_status,
         )
-        result[system["system_id"]] = SystemStatusDict(
-            system_status=system_status,
-            system_status_msg=system_status_msg,
-            tail_log_item=tail_log_item,
-            snapshot_status_item=snapshot_status_item,
+        record.system_status_detail = status_detail.value
+        record.system_status = str(status_detail.system_status().value)
+        record.system_stage = fetch_system_stage(
+            system_status=record.system_status,
             has_permission_model=has_permission_model,
-            system_stage=system_stage,
+            has_collector=bool(record.collector_count),
+        )
+
+    @classmethod
+    def build_status_dict(cls, record: SystemStatusRecord) -> SystemStatusDict:
+        tail_log_item = TailLogStatusDict(
+            system_id=record.system_id,
+            status=record.log_status,
+            status_msg=str(LogReportStatus(record.log_status).label),
+            last_time=(
+                record.tail_log_time.astimezone(timezone.get_default_timezone()).strftime(api_settings.DATETIME_FORMAT)
+                if record.log_status == LogReportStatus.NORMAL
+                else str()
+            ),
+            collector_count=record.collector_count,
+        )
+        return SystemStatusDict(
+            system_status=record.system_status,
+            system_status_msg=str(SystemStatusDetailEnum(record.system_status_detail).label),
+            tail_log_item=tail_log_item,
+            snapshot_status_item={"status": record.snapshot_status},
+            has_permission_model=bool(record.action_count or record.resource_type_count),
+            system_stage=record.system_stage,
         )
-    return result
 
 
 def fetch_system_stage(
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("databus", "0023_snapshotcheckstatistic_error_type"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="snapshotcheckstatistic",
+            name="check_duration",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="snapshotcheckstatistic",
+            name="checked_at",
+            field=models.DateTimeField(blank=True, default=None, null=True),
+        ),
+    ]
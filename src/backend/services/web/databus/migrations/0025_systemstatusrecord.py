@@ -0,0 +1,36 @@
+# Generated by Django 4.2.26 on 2026-10-18 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('databus', '0024_snapshotcheckstatistic_check_duration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SystemStatusRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('system_id', models.CharField(max_length=64, unique=True, verbose_name='系统ID')),
+                ('namespace', models.CharField(db_index=True, max_length=32, verbose_name='namespace')),
+                ('audit_status', models.CharField(max_length=32, verbose_name='系统审计状态')),
+                ('action_count', models.IntegerField(default=0, verbose_name='操作数量')),
+                ('resource_type_count', models.IntegerField(default=0, verbose_name='资源类型数量')),
+                ('collector_count', models.IntegerField(default=0, verbose_name='采集项数量')),
+                ('tail_log_time', models.DateTimeField(blank=True, null=True, verbose_name='最近日志时间')),
+                ('log_status', models.CharField(max_length=32, verbose_name='日志上报状态')),
+                ('snapshot_status', models.CharField(max_length=32, verbose_name='资产上报状态')),
+                ('system_status_detail', models.IntegerField(verbose_name='系统状态详情')),
+                ('system_status', models.CharField(max_length=32, verbose_name='系统状态')),
+                ('system_stage', models.CharField(max_length=32, verbose_name='系统阶段')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '系统状态快照',
+                'verbose_name_plural': '系统状态快照',
+            },
+        ),
+    ]
@@ -18,10 +18,12 @@ to the current version of the project delivered to anyone in the future.
 
 from blueapps.utils.request_provider import get_local_request_id, get_request_username
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy
 
 from apps.meta.constants import ConfigLevelChoices
-from apps.meta.models import GlobalMetaConfig
+from apps.meta.models import GlobalMetaConfig, System
 from core.models import OperateRecordModel, SoftDeleteModel
 from services.web.databus.constants import (
     COLLECTOR_PLUGIN_ID,
@@ -30,6 +32,7 @@ from services.web.databus.constants import (
     DEFAULT_STORAGE_REPLIES,
     DEFAULT_STORAGE_SHARD_SIZE,
     DEFAULT_STORAGE_SHARDS,
+    SYSTEM_STATUS_RECORD_TRIGGER_FIELDS,
     CustomTypeEnum,
     JoinDataPullType,
     JoinDataType,
@@ -310,6 +313,73 @@ class SnapshotCheckStatistic(models.Model):
     result = models.BooleanField(default=False)
     # 失败类型：None=成功，source=源系统拉取失败，storage=存储查询失败
     error_type = models.CharField(max_length=16, null=True, blank=True, default=None)
+    # 单个快照检查耗时（秒）及检查时间
+    check_duration = models.FloatField(default=0)
+    checked_at = models.DateTimeField(null=True, blank=True, default=None)
 
     class Meta:
         unique_together = [["system_id", "resource_type_id", "join_data_type"]]
+
+
+class SystemStatusRecord(models.Model):
+    """
+    系统状态快照
+    按系统预先计算日志上报、资产上报与权限模型状态，系统列表直接读取，避免每次请求逐个系统统计
+    """
+
+    system_id = models.CharField(gettext_lazy("系统ID"), max_length=64, unique=True)
+    namespace = models.CharField(gettext_lazy("namespace"), max_length=32, db_index=True)
+    audit_status = models.CharField(gettext_lazy("系统审计状态"), max_length=32)
+    action_count = models.IntegerField(gettext_lazy("操作数量"), default=0)
+    resource_type_count = models.IntegerField(gettext_lazy("资源类型数量"), default=0)
+    collector_count = models.IntegerField(gettext_lazy("采集项数量"), default=0)
+    tail_log_time = models.DateTimeField(gettext_lazy("最近日志时间"), null=True, blank=True)
+    log_status = models.CharField(gettext_lazy("日志上报状态"), max_length=32)
+    snapshot_status = models.CharField(gettext_lazy("资产上报状态"), max_length=32)
+    system_status_detail = models.IntegerField(gettext_lazy("系统状态详情"))
+    system_status = models.CharField(gettext_lazy("系统状态"), max_length=32)
+    system_stage = models.CharField(gettext_lazy("系统阶段"), max_length=32)
+    updated_at = models.DateTimeField(gettext_lazy("更新时间"), auto_now=True)
+
+    class Meta:
+        verbose_name = gettext_lazy("系统状态快照")
+        verbose_name_plural = verbose_name
+
+
+@receiver(post_save, sender=CollectorConfig)
+@receiver(post_delete, sender=CollectorConfig)
+@receiver(post_save, sender=Snapshot)
+@receiver(post_delete, sender=Snapshot)
+def refresh_system_status_record(sender, instance, **kwargs):
+    """
+    采集项或快照变化时刷新系统状态快照
+    采集项最近日志时间由 sync_tail_log_time 批量刷新，此处跳过
+    """
+
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not set(update_fields) & SYSTEM_STATUS_RECORD_TRIGGER_FIELDS:
+        return
+
+    from services.web.databus.handler.system_status import SystemStatusRecordHandler
+
+    SystemStatusRecordHandler.refresh(system_ids=[instance.system_id])
+
+
+@receiver(post_save, sender=System)
+def refresh_system_status_record_by_system(sender, instance: System, **kwargs):
+    """
+    系统审计状态或空间变化时刷新系统状态快照
+    """
+
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not set(update_fields) & {"audit_status", "namespace"}:
+        return
+
+    from services.web.databus.handler.system_status import SystemStatusRecordHandler
+
+    SystemStatusRecordHandler.refresh(system_ids=[instance.system_id])
+
+
+@receiver(post_delete, sender=System)
+def delete_system_status_record(sender, instance: System, **kwargs):
+    SystemStatusRecord.objects.filter(system_id=instance.system_id).delete()
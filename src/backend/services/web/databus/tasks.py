@@ -20,10 +20,9 @@ import datetime
 import os
 import time
 import traceback
-from typing import Dict, Optional, Type
+from typing import Dict, List, Optional, Type
 
-import requests
-from bk_resource import api, resource
+from bk_resource import resource
 from bk_resource.exceptions import APIRequestError
 from blueapps.contrib.celery_tools.periodic import periodic_task
 from blueapps.core.celery import celery_app
@@ -45,14 +44,16 @@ from services.web.common.monitor import (
     AssetSyncAnomalyEvent,
     AssetSyncCheckAnomalyEvent,
 )
-from services.web.databus.collector.check.handlers import ReportCheckHandler
+from services.web.databus.collector.check.handlers import (
+    ReportCheckHandler,
+    SnapshotCountChecker,
+)
 from services.web.databus.collector.etl.base import EtlClean
-from services.web.databus.collector.handlers import TailLogHandler
+from services.web.databus.collector.handlers import TailLogSyncer
 from services.web.databus.collector.snapshot.join.base import (
     AssetHandler,
     BasicJoinHandler,
 )
-from services.web.databus.collector.snapshot.join.http_pull import HttpPullHandler
 from services.web.databus.collector_plugin.handlers import (
     EventCollectorEtlHandler,
     PluginEtlHandler,
@@ -66,7 +67,6 @@ from services.web.databus.constants import (
     ASSET_TICKET_NODE_BKBASE_RT_ID_KEY,
     ASSET_TICKET_PERMISSION_BKBASE_RT_ID_KEY,
     COLLECTOR_PLUGIN_ID,
-    PULL_HANDLER_PRE_CHECK_TIMEOUT,
     AssetSyncAnomalyReason,
     CheckErrorType,
     EtlConfigEnum,
@@ -74,6 +74,7 @@ from services.web.databus.constants import (
     PluginSceneChoices,
     SnapshotRunningStatus,
 )
+from services.web.databus.handler.system_status import SystemStatusRecordHandler
 from services.web.databus.models import (
     CollectorConfig,
     CollectorPlugin,
@@ -131,9 +132,22 @@ def start_snapshot():
 @periodic_task(run_every=crontab(minute="*/10"), time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
 @lock(lock_name="celery:sync_tail_log_time")
 def sync_tail_log_time():
-    collectors = CollectorConfig.objects.all()
-    for collector in collectors:
-        TailLogHandler.get_instance(collector).sync()
+    changed_collectors = TailLogSyncer().sync()
+    # 批量写回不触发信号，仅刷新最近日志时间变化的系统状态快照
+    if changed_collectors:
+        SystemStatusRecordHandler.refresh(system_ids={collector.system_id for collector in changed_collectors})
+
+
+@periodic_task(run_every=crontab(minute=30), time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
+@lock(lock_name="celery:refresh_system_status_records")
+def refresh_system_status_records(system_ids: List[str] = None):
+    """
+    刷新系统状态快照
+    定期全量对账，兜底批量更新(queryset.update)等未触发增量刷新的变更
+    """
+
+    records = SystemStatusRecordHandler.refresh(system_ids=system_ids)
+    logger.info("[RefreshSystemStatusRecords] Total %d", len(records))
 
 
 @periodic_task(run_every=crontab(minute="*/1"), time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
@@ -326,97 +340,20 @@ def create_or_update_plugin_etl(collector_plugin_id: int = None):
 @periodic_task(run_every=crontab(minute="0", hour="5"), time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
 @lock(lock_name="celery:check_join_data")
 def check_join_data():
-    # 获取所有状态为 'running' 的快照记录
-    snapshots = Snapshot.objects.filter(status=SnapshotRunningStatus.RUNNING)
-
-    # 遍历每个快照记录并执行检查
-    for snapshot in snapshots:
-        system_id = snapshot.system_id
-        resource_type_id = snapshot.resource_type_id
-        join_data_type = snapshot.join_data_type
-
-        # 获取系统和资源类型信息
-        system = System.objects.get(system_id=system_id)
-        try:
-            resource_type = ResourceType.objects.get(system_id=system_id, resource_type_id=resource_type_id)
-        except ResourceType.DoesNotExist:
-            logger.error("[JoinDataCheckFailed] System %s ResourceType Not Found => %s", system_id, resource_type_id)
-            continue
-
-        # 构建请求体
-        body = {
-            "type": resource_type_id,
-            "method": "fetch_instance_list",
-            "filter": {"start_time": 0, "end_time": int(datetime.datetime.now().timestamp()) * 1000},
-            "page": {"offset": 0, "limit": 1},
-        }
-
-        error_type = None
-        try:
-            # 设置 HttpPullHandler
-            pull_handler = HttpPullHandler(system, resource_type, Snapshot(), join_data_type)
-            # 执行 HTTP 请求
-            web = requests.session()
-            resp = web.post(
-                pull_handler.url,
-                json=body,
-                headers={"Authorization": pull_handler.authorization},
-                timeout=PULL_HANDLER_PRE_CHECK_TIMEOUT,
-            )
-            resp.raise_for_status()  # 检查请求是否成功
-            content = resp.json()
-            result = content.get("result", True)
-            http_pull_count = content.get("data", {}).get("count", 0)
-            if not result:
-                error_type = CheckErrorType.SOURCE.value
-        except Exception as e:  # NOCC:broad-except(需要处理所有错误)
-            # 如果发生异常，将 storage_count 设置为 0，并且 result 设置为 False
-            logger.exception("[JoinDataCheckFailed] Error while querying source: %s", e)
-            http_pull_count = 0
-            result = False
-            error_type = CheckErrorType.SOURCE.value
-        # 请求存储中的数据总数
-        count_sql = f"select count(*) as count from {snapshot.bkbase_table_id} limit 1"
-        bulk_req_params = [
-            {
-                "sql": count_sql,
-                "prefer_storage": StorageType.DORIS.value,
-            },
-            {
-                "sql": count_sql,
-                "prefer_storage": StorageType.HDFS.value,
-            },
-        ]
+    """
+    检查运行中快照的源端与存储数据量是否一致
+    """
 
-        try:
-            # 尝试发送请求获取存储中的 count 数据
-            bulk_resp = api.bk_base.query_sync.bulk_request(bulk_req_params)
-            doris_count_resp, hdfs_count_resp = bulk_resp
-            doris_storage_count = doris_count_resp.get("list", [{}])[0].get("count", 0)
-            hdfs_storage_count = hdfs_count_resp.get("list", [{}])[0].get("count", 0)
-        except Exception as e:  # NOCC:broad-except(需要处理所有错误)
-            # 如果发生异常，将 storage_count 设置为 0，并且 result 设置为 False
-            logger.exception("[JoinDataCheckFailed] Error while querying storage: %s", e)
-            doris_storage_count = 0
-            hdfs_storage_count = 0
-            result = False
-            # 仅当源端未失败时才标记为存储失败，避免覆盖先发生的源端故障
-            if not error_type:
-                error_type = CheckErrorType.STORAGE.value
-
-        # 将结果保存到 JoinDataCheckStatistic 表
-        SnapshotCheckStatistic.objects.update_or_create(
-            system_id=system_id,
-            resource_type_id=resource_type_id,
-            join_data_type=join_data_type,
-            defaults={
-                "http_pull_count": http_pull_count,
-                "doris_storage_count": doris_storage_count,
-                "hdfs_storage_count": hdfs_storage_count,
-                "result": result,
-                "error_type": error_type,
-            },
-        )
+    snapshots = list(Snapshot.objects.filter(status=SnapshotRunningStatus.RUNNING))
+    start = time.monotonic()
+    results = SnapshotCountChecker().check(snapshots)
+    logger.info(
+        "[JoinDataCheck] Finished; Snapshots => %s; Checked => %s; Failed => %s; Cost => %.3fs",
+        len(snapshots),
+        len(results),
+        len([result for result in results if not result.result]),
+        time.monotonic() - start,
+    )
 
 
 @celery_app.task(soft_time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
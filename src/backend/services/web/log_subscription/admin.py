@@ -88,11 +88,12 @@ class LogDataSourceAdmin(admin.ModelAdmin):
         (
             _("表配置"),
             {
-                "fields": ("bkbase_table_id", "storage_type", "time_field"),
+                "fields": ("bkbase_table_id", "storage_type", "time_field", "cursor_field"),
                 "description": _(
                     "bkbase_table_id: BKBase 结果表 ID，如 591_bkaudit_event<br>"
                     "storage_type: 存储类型，默认 doris<br>"
-                    "time_field: 用于时间范围筛选的字段名"
+                    "time_field: 用于时间范围筛选的字段名<br>"
+                    "cursor_field: 游标模式下与时间字段共同排序的决胜字段"
                 ),
             },
         ),
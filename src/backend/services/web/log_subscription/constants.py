@@ -16,8 +16,24 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import os
+
 # 日志订阅字段黑名单配置键
 LOG_SUBSCRIPTION_FIELD_BLACKLIST_KEY = "log_subscription_field_blacklist"
 
 # 全局字段黑名单数据源标识（适用于所有数据源）
 GLOBAL_FIELD_BLACKLIST_SOURCE_ID = "__ALL__"
+
+# 游标模式默认的排序决胜字段，与时间字段共同确定唯一顺序
+LOG_SUBSCRIPTION_DEFAULT_CURSOR_FIELD = "event_id"
+
+# 流式查询 NDJSON 响应
+LOG_SUBSCRIPTION_NDJSON_CONTENT_TYPE = "application/x-ndjson"
+# 流式查询末行的元信息键，如 {"__meta__": {"count": 10, "next_cursor": "..."}}
+LOG_SUBSCRIPTION_STREAM_META_KEY = "__meta__"
+
+# 订阅查询计划缓存（token + 数据源 -> 表、字段与订阅条件）: 进程内 LRU -> 共享缓存，配置变更后通过版本号失效
+LOG_SUBSCRIPTION_PLAN_CACHE_NAMESPACE = "log_subscription:query_plan"
+LOG_SUBSCRIPTION_PLAN_LOCAL_CACHE_SIZE = int(os.getenv("BKAPP_LOG_SUBSCRIPTION_PLAN_LOCAL_CACHE_SIZE", 1024))
+LOG_SUBSCRIPTION_PLAN_LOCAL_CACHE_TTL = int(os.getenv("BKAPP_LOG_SUBSCRIPTION_PLAN_LOCAL_CACHE_TTL", 30))  # s
+LOG_SUBSCRIPTION_PLAN_SHARED_CACHE_TTL = int(os.getenv("BKAPP_LOG_SUBSCRIPTION_PLAN_SHARED_CACHE_TTL", 60 * 10))  # s
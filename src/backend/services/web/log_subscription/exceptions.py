@@ -78,3 +78,17 @@ class FieldNotAllowed(LogSubscriptionException):
             allowed_fields=", ".join(allowed_fields),
         )
         super().__init__(message=message, *args, **kwargs)
+
+
+class CursorFieldNotFound(LogSubscriptionException):
+    """查询结果缺少游标所需字段"""
+
+    MESSAGE = gettext_lazy("数据源 {source_id} 的查询结果缺少游标字段 {fields}，请检查数据源的时间字段与游标字段配置")
+    STATUS_CODE = 500
+    ERROR_CODE = "005"
+
+    def __init__(self, source_id: str, fields: list, *args, **kwargs):
+        self.source_id = source_id
+        self.fields = fields
+        message = self.MESSAGE.format(source_id=source_id, fields=", ".join(fields))
+        super().__init__(message=message, *args, **kwargs)
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.26 on 2026-10-18 05:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('log_subscription', '0004_alter_logdatasource_required_filter_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logdatasource',
+            name='cursor_field',
+            field=models.CharField(
+                default='event_id',
+                help_text='游标模式下与时间字段共同排序的决胜字段，需在同一时间内唯一，如 event_id',
+                max_length=64,
+                verbose_name='游标字段',
+            ),
+        ),
+    ]
@@ -18,15 +18,39 @@ to the current version of the project delivered to anyone in the future.
 
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import gettext_lazy
 from pydantic import ValidationError as PydanticValidationError
 
 from api.bk_base.constants import StorageType
-from core.models import OperateRecordModel, SoftDeleteModel, UUIDField
+from core.models import (
+    OperateRecordModel,
+    SoftDeleteModel,
+    SoftDeleteModelManager,
+    SoftDeleteQuerySet,
+    UUIDField,
+)
 from core.sql.model import WhereCondition
+from core.utils.cache import VersionedCache
+from services.web.log_subscription.constants import (
+    LOG_SUBSCRIPTION_DEFAULT_CURSOR_FIELD,
+    LOG_SUBSCRIPTION_PLAN_CACHE_NAMESPACE,
+    LOG_SUBSCRIPTION_PLAN_LOCAL_CACHE_SIZE,
+    LOG_SUBSCRIPTION_PLAN_LOCAL_CACHE_TTL,
+    LOG_SUBSCRIPTION_PLAN_SHARED_CACHE_TTL,
+)
 from services.web.query.constants import TIMESTAMP_PARTITION_FIELD
 
+# 订阅查询计划缓存，见 QueryLogSubscription._get_query_plan
+query_plan_cache = VersionedCache(
+    namespace=LOG_SUBSCRIPTION_PLAN_CACHE_NAMESPACE,
+    local_maxsize=LOG_SUBSCRIPTION_PLAN_LOCAL_CACHE_SIZE,
+    local_ttl=LOG_SUBSCRIPTION_PLAN_LOCAL_CACHE_TTL,
+    shared_ttl=LOG_SUBSCRIPTION_PLAN_SHARED_CACHE_TTL,
+)
+
 
 class LogDataSource(OperateRecordModel):
     """
@@ -92,6 +116,14 @@ class LogDataSource(OperateRecordModel):
         help_text=gettext_lazy("用于时间范围筛选的字段名"),
     )
 
+    # 游标字段
+    cursor_field = models.CharField(
+        gettext_lazy("游标字段"),
+        max_length=64,
+        default=LOG_SUBSCRIPTION_DEFAULT_CURSOR_FIELD,
+        help_text=gettext_lazy("游标模式下与时间字段共同排序的决胜字段，需在同一时间内唯一，如 event_id"),
+    )
+
     # 允许返回的字段列表（可选，为空则返回所有字段）
     fields = models.JSONField(
         gettext_lazy("允许返回的字段"),
@@ -180,6 +212,21 @@ class LogDataSource(OperateRecordModel):
         return fields
 
 
+class LogSubscriptionQuerySet(SoftDeleteQuerySet):
+    """订阅配置 QuerySet：批量更新(含批量软删除)不触发模型信号，需在事务提交后失效查询计划缓存"""
+
+    def update(self, *args, **kwargs):
+        rows = super().update(*args, **kwargs)
+        transaction.on_commit(LogSubscription.clear_query_plan_cache)
+        return rows
+
+
+class LogSubscriptionManager(SoftDeleteModelManager):
+    def get_queryset(self):
+        """获取批量更新后失效查询计划缓存的 queryset"""
+        return LogSubscriptionQuerySet(self.model, using=self._db)
+
+
 class LogSubscription(SoftDeleteModel):
     """
     日志订阅配置
@@ -188,6 +235,8 @@ class LogSubscription(SoftDeleteModel):
     一个订阅配置包含多个配置项，每个配置项对应一个或多个数据源。
     """
 
+    objects = LogSubscriptionManager()
+
     # 配置名称
     name = models.CharField(gettext_lazy("配置名称"), max_length=128)
 
@@ -212,6 +261,11 @@ class LogSubscription(SoftDeleteModel):
         """获取该订阅配置关联的所有数据源"""
         return LogDataSource.objects.filter(subscription_items__subscription=self).distinct()
 
+    @classmethod
+    def clear_query_plan_cache(cls) -> None:
+        """使所有进程的订阅查询计划缓存失效"""
+        query_plan_cache.invalidate()
+
 
 class LogSubscriptionItem(OperateRecordModel):
     """
@@ -303,3 +357,15 @@ class LogSubscriptionItem(OperateRecordModel):
                 WhereCondition.model_validate(self.condition)
             except Exception as exc:
                 raise DjangoValidationError({"condition": str(exc)})
+
+
+@receiver(post_save, sender=LogDataSource)
+@receiver(post_delete, sender=LogDataSource)
+@receiver(post_save, sender=LogSubscription)
+@receiver(post_delete, sender=LogSubscription)
+@receiver(post_save, sender=LogSubscriptionItem)
+@receiver(post_delete, sender=LogSubscriptionItem)
+@receiver(m2m_changed, sender=LogSubscriptionItem.data_sources.through)
+def invalidate_query_plan_cache(sender, **kwargs):
+    """订阅配置、配置项或数据源变更后，在事务提交后失效查询计划缓存"""
+    transaction.on_commit(LogSubscription.clear_query_plan_cache)
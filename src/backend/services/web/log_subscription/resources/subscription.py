@@ -3,11 +3,14 @@
 Log subscription resources.
 """
 import abc
+import json
 import uuid
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Tuple, Union
 
 from bk_resource import api
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
 from django.utils.translation import gettext_lazy
 from pydantic import ValidationError as PydanticValidationError
 from pypika.enums import Order as PypikaOrder
@@ -29,17 +32,28 @@ from core.sql.model import (
 from services.web.log_subscription.constants import (
     GLOBAL_FIELD_BLACKLIST_SOURCE_ID,
     LOG_SUBSCRIPTION_FIELD_BLACKLIST_KEY,
+    LOG_SUBSCRIPTION_NDJSON_CONTENT_TYPE,
+    LOG_SUBSCRIPTION_STREAM_META_KEY,
 )
 from services.web.log_subscription.exceptions import (
+    CursorFieldNotFound,
     DataSourceNotFound,
     DataSourceNotInSubscription,
     FieldNotAllowed,
     LogSubscriptionNotFound,
 )
-from services.web.log_subscription.models import LogDataSource, LogSubscription
+from services.web.log_subscription.models import (
+    LogDataSource,
+    LogSubscription,
+    query_plan_cache,
+)
 from services.web.log_subscription.serializers import (
     LogSubscriptionQueryResponseSerializer,
     LogSubscriptionQuerySerializer,
+    LogSubscriptionStreamSerializer,
+    decode_cursor,
+    encode_cursor,
+    is_cursor_value,
 )
 
 
@@ -62,61 +76,57 @@ class QueryLogSubscription(LogSubscriptionMeta):
     RequestSerializer = LogSubscriptionQuerySerializer
     ResponseSerializer = LogSubscriptionQueryResponseSerializer
 
+    # 查询计划中缓存的数据源字段
+    plan_data_source_fields = ["source_id", "bkbase_table_id", "storage_type", "time_field", "cursor_field", "fields"]
+
     def perform_request(self, validated_request_data):
         """
         执行查询请求
 
         流程:
-        1. 验证 token，获取订阅配置
-        2. 验证 source_id，获取数据源
-        3. 组装完整的查询条件（时间 + 订阅条件 + 自定义条件）
-        4. 使用 BkBaseComputeSqlGenerator 构建 SQL
-        5. 执行查询并返回分页结果
-        """
-        # 1. 获取订阅配置
-        subscription = self._get_subscription(validated_request_data["token"])
+        1. 获取查询计划（验证 token 与数据源、订阅条件），按 token + 数据源缓存
+        2. 组装完整的查询条件（时间 + 订阅条件 + 自定义条件 + 游标位置）
+        3. 使用 BkBaseComputeSqlGenerator 构建 SQL
+        4. 执行查询并返回分页结果
 
-        # 2. 获取数据源
+        传入 cursor 时使用游标模式：按 (时间字段, 游标字段) 倒序增量拉取，不使用 OFFSET，
+        默认不统计总数，返回 next_cursor 供下次请求使用
+        """
         source_id = validated_request_data["source_id"]
-        data_source = self._get_data_source(subscription, source_id)
+        page = validated_request_data["page"]
+        page_size = validated_request_data["page_size"]
+        cursor = validated_request_data.get("cursor")
+        cursor_mode = cursor is not None
+        need_count = validated_request_data.get("need_count")
+        if need_count is None:
+            need_count = not cursor_mode
 
-        # 3. 组装完整的查询条件
+        # 1. 获取查询计划
+        data_source, subscription_condition = self._get_query_plan(validated_request_data["token"], source_id)
+
+        # 2. 组装完整的查询条件
         where_condition = self._build_where_condition(
             data_source=data_source,
-            subscription=subscription,
-            source_id=source_id,
+            subscription_condition=subscription_condition,
             start_time=validated_request_data["start_time"],
             end_time=validated_request_data["end_time"],
             custom_filters=validated_request_data.get("filters"),
+            cursor=cursor,
         )
-
-        # 4. 构建 SqlConfig
-        page = validated_request_data["page"]
-        page_size = validated_request_data["page_size"]
         select_fields = self._build_select_fields(
             data_source=data_source,
             custom_fields=validated_request_data.get("fields"),
         )
 
-        sql_config = SqlConfig(
-            from_table=Table(table_name=data_source.get_table_name()),
-            select_fields=select_fields,  # 为空时使用 SELECT *
-            where=where_condition,
-            order_by=[
-                Order(
-                    field=Field(
-                        table=data_source.get_table_name(),
-                        raw_name=data_source.time_field,
-                        display_name=data_source.time_field,
-                        field_type=FieldType.LONG,
-                    ),
-                    order=PypikaOrder.desc,
-                )
-            ],
-            pagination=Pagination(limit=page_size, offset=page_size * (page - 1)),
+        # 3. 构建 SqlConfig 并生成 SQL
+        sql_config = self._build_sql_config(
+            data_source=data_source,
+            where_condition=where_condition,
+            select_fields=select_fields,
+            page=page,
+            page_size=page_size,
+            cursor_mode=cursor_mode,
         )
-
-        # 5. 生成 SQL
         generator = BkBaseComputeSqlGenerator(BKBaseQueryBuilder())
         query_sql = str(generator.generate(sql_config))
         count_sql = str(generator.generate_count(sql_config))
@@ -125,30 +135,63 @@ class QueryLogSubscription(LogSubscriptionMeta):
         response = {
             "page": page,
             "page_size": page_size,
-            "total": 0,
+            "total": 0 if need_count else None,
             "results": [],
             "query_sql": query_sql,
             "count_sql": count_sql,
         }
+        if cursor_mode:
+            response["next_cursor"] = None
 
         # 如果只需要 SQL，直接返回
         if validated_request_data.get("raw"):
             return response
 
-        # 6. 执行查询
-        data_resp, count_resp = api.bk_base.query_sync.bulk_request([{"sql": query_sql}, {"sql": count_sql}])
+        # 4. 执行查询，无需统计总数时不执行 COUNT
+        if need_count:
+            data_resp, count_resp = api.bk_base.query_sync.bulk_request([{"sql": query_sql}, {"sql": count_sql}])
+            count_list = count_resp.get("list", [])
+            response["total"] = count_list[0].get("count", 0) if count_list else 0
+        else:
+            data_resp = api.bk_base.query_sync(sql=query_sql)
 
         results = data_resp.get("list", [])
-        count_list = count_resp.get("list", [])
+        if cursor_mode:
+            results, response["next_cursor"] = self._paginate_by_cursor(data_source, results, page_size)
+            results = self._strip_cursor_fields(results, data_source, select_fields)
 
         # 过滤黑名单字段
-        results = self._filter_blacklist_fields(results, source_id)
-
-        response["results"] = results
-        response["total"] = count_list[0].get("count", 0) if count_list else 0
+        response["results"] = self._filter_blacklist_fields(results, source_id)
 
         return response
 
+    def _get_query_plan(
+        self, token: Union[str, uuid.UUID], source_id: str
+    ) -> Tuple[LogDataSource, Optional[WhereCondition]]:
+        """
+        获取查询计划：数据源配置与订阅配置中针对该数据源的筛选条件
+
+        按 token + 数据源缓存，订阅配置、配置项或数据源变更后失效；校验失败时抛出的异常不缓存
+
+        Returns:
+            (未保存的数据源对象, 订阅筛选条件)
+        """
+        if isinstance(token, uuid.UUID):
+            token = token.hex
+
+        def load_plan() -> dict:
+            subscription = self._get_subscription(token)
+            data_source = self._get_data_source(subscription, source_id)
+            condition = self._get_subscription_condition(subscription, source_id)
+            return {
+                "data_source": {field: getattr(data_source, field) for field in self.plan_data_source_fields},
+                "condition": condition.model_dump(mode="json") if condition else None,
+            }
+
+        plan = query_plan_cache.get_or_load(f"{token}:{source_id}", load_plan)
+        condition = WhereCondition.model_validate(plan["condition"]) if plan["condition"] else None
+        return LogDataSource(**plan["data_source"]), condition
+
     def _get_subscription(self, token: Union[str, uuid.UUID]) -> LogSubscription:
         """
         获取启用的订阅配置
@@ -284,24 +327,24 @@ class QueryLogSubscription(LogSubscriptionMeta):
     def _build_where_condition(
         self,
         data_source: LogDataSource,
-        subscription: LogSubscription,
-        source_id: str,
+        subscription_condition: Optional[WhereCondition],
         start_time: int,
         end_time: int,
         custom_filters: Optional[dict] = None,
+        cursor: Optional[str] = None,
     ) -> WhereCondition:
         """
         组装完整的 WHERE 条件
 
-        将时间范围、订阅条件、自定义条件组合成一个 WhereCondition 对象。
+        将时间范围、订阅条件、自定义条件、游标位置组合成一个 WhereCondition 对象。
 
         Args:
             data_source: 数据源对象
-            subscription: 订阅配置
-            source_id: 数据源标识
+            subscription_condition: 订阅配置中针对该数据源的筛选条件
             start_time: 开始时间（毫秒）
             end_time: 结束时间（毫秒）
             custom_filters: 自定义筛选条件
+            cursor: 游标，为空时从最新的数据开始
 
         Returns:
             完整的查询条件对象
@@ -325,7 +368,6 @@ class QueryLogSubscription(LogSubscriptionMeta):
         conditions.append(time_condition)
 
         # 2. 添加订阅配置的筛选条件
-        subscription_condition = self._get_subscription_condition(subscription, source_id)
         if subscription_condition:
             conditions.append(subscription_condition)
 
@@ -334,17 +376,147 @@ class QueryLogSubscription(LogSubscriptionMeta):
         if custom_condition:
             conditions.append(custom_condition)
 
-        # 4. 组合所有条件（使用 AND 连接）
+        # 4. 添加游标位置条件
+        if cursor:
+            conditions.append(self._build_cursor_condition(data_source, cursor))
+
+        # 5. 组合所有条件（使用 AND 连接）
         if len(conditions) == 1:
             final_condition = conditions[0]
         else:
             final_condition = WhereCondition(connector=FilterConnector.AND, conditions=conditions)
 
-        # 5. 统一替换所有条件中的表名占位符 't' 为实际表名
+        # 6. 统一替换所有条件中的表名占位符 't' 为实际表名
         self._replace_table_name(final_condition, table_name)
 
         return final_condition
 
+    def _build_cursor_condition(self, data_source: LogDataSource, cursor: str) -> WhereCondition:
+        """
+        构建游标位置条件，按 (时间字段, 游标字段) 倒序取游标之后的数据:
+        time < t OR (time = t AND cursor_field < v)
+        """
+        time_value, cursor_value = decode_cursor(cursor)
+        table_name = data_source.get_table_name()
+        time_field = Field(
+            table=table_name,
+            raw_name=data_source.time_field,
+            display_name=data_source.time_field,
+            field_type=FieldType.DOUBLE if isinstance(time_value, float) else FieldType.LONG,
+        )
+        cursor_field = Field(
+            table=table_name,
+            raw_name=data_source.cursor_field,
+            display_name=data_source.cursor_field,
+            field_type=self._get_cursor_field_type(cursor_value),
+        )
+        return WhereCondition(
+            connector=FilterConnector.OR,
+            conditions=[
+                WhereCondition(condition=Condition(field=time_field, operator=Operator.LT, filter=time_value)),
+                WhereCondition(
+                    connector=FilterConnector.AND,
+                    conditions=[
+                        WhereCondition(condition=Condition(field=time_field, operator=Operator.EQ, filter=time_value)),
+                        WhereCondition(
+                            condition=Condition(field=cursor_field, operator=Operator.LT, filter=cursor_value)
+                        ),
+                    ],
+                ),
+            ],
+        )
+
+    @staticmethod
+    def _get_cursor_field_type(value) -> FieldType:
+        """按游标值类型确定比较时的字段类型"""
+        if isinstance(value, float):
+            return FieldType.DOUBLE
+        if isinstance(value, int):
+            return FieldType.LONG
+        return FieldType.STRING
+
+    def _build_sql_config(
+        self,
+        data_source: LogDataSource,
+        where_condition: WhereCondition,
+        select_fields: List[Field],
+        page: int,
+        page_size: int,
+        cursor_mode: bool = False,
+    ) -> SqlConfig:
+        """
+        构建 SqlConfig
+
+        分页模式按时间字段倒序并使用 OFFSET 分页；
+        游标模式按 (时间字段, 游标字段) 倒序，多取一条用于判断是否还有下一页
+        """
+        table_name = data_source.get_table_name()
+        order_fields = [data_source.time_field]
+        if cursor_mode:
+            order_fields.append(data_source.cursor_field)
+            # 指定了返回字段时，补充生成游标所需的字段
+            selected = {field.raw_name for field in select_fields}
+            select_fields = select_fields + [
+                Field(table=table_name, raw_name=name, display_name=name, field_type=FieldType.STRING)
+                for name in order_fields
+                if select_fields and name not in selected
+            ]
+            pagination = Pagination(limit=page_size + 1, offset=0)
+        else:
+            pagination = Pagination(limit=page_size, offset=page_size * (page - 1))
+
+        return SqlConfig(
+            from_table=Table(table_name=table_name),
+            select_fields=select_fields,  # 为空时使用 SELECT *
+            where=where_condition,
+            order_by=[
+                Order(
+                    field=Field(
+                        table=table_name,
+                        raw_name=name,
+                        display_name=name,
+                        field_type=FieldType.LONG if name == data_source.time_field else FieldType.STRING,
+                    ),
+                    order=PypikaOrder.desc,
+                )
+                for name in order_fields
+            ],
+            pagination=pagination,
+        )
+
+    def _paginate_by_cursor(
+        self, data_source: LogDataSource, results: List[dict], page_size: int
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        截取游标模式的本页数据并生成下一页游标
+
+        Returns:
+            (本页数据, 下一页游标)，已无更多数据时游标为 None
+        """
+        if len(results) <= page_size:
+            return results, None
+        results = results[:page_size]
+        last = results[-1]
+        # 缺失或类型不支持的字段无法生成可解析的游标
+        missing_fields = [
+            name for name in [data_source.time_field, data_source.cursor_field] if not is_cursor_value(last.get(name))
+        ]
+        if missing_fields:
+            raise CursorFieldNotFound(source_id=data_source.source_id, fields=missing_fields)
+        return results, encode_cursor(last[data_source.time_field], last[data_source.cursor_field])
+
+    def _strip_cursor_fields(
+        self, results: List[dict], data_source: LogDataSource, select_fields: List[Field]
+    ) -> List[dict]:
+        """移除为生成游标而补充查询、但用户未请求的字段"""
+        if not select_fields:
+            return results
+        selected = {field.raw_name for field in select_fields}
+        extra_fields = {data_source.time_field, data_source.cursor_field} - selected
+        if not extra_fields:
+            return results
+        return [{k: v for k, v in item.items() if k not in extra_fields} for item in results]
+
     def _build_select_fields(
         self, data_source: LogDataSource, custom_fields: Optional[List[str]] = None
     ) -> List[Field]:
@@ -434,3 +606,74 @@ class QueryLogSubscription(LogSubscriptionMeta):
             filtered_results.append(filtered_item)
 
         return filtered_results
+
+
+class StreamLogSubscription(QueryLogSubscription):
+    """
+    日志订阅流式查询接口
+
+    以游标模式分批拉取，按 NDJSON 逐行返回数据，适用于大批量同步。
+    末行为元信息 {"__meta__": {"count": 返回条数, "next_cursor": 续拉游标}}，next_cursor 为 null 表示已拉取完毕；
+    单次请求最多返回 LOG_SUBSCRIPTION_STREAM_MAX_ROWS 条，缺少末行表示拉取中断，可使用上次的游标重试。
+    """
+
+    name = gettext_lazy("日志订阅流式查询")
+    RequestSerializer = LogSubscriptionStreamSerializer
+    ResponseSerializer = None
+
+    def perform_request(self, validated_request_data):
+        # 开始输出前完成校验，校验失败时按普通接口返回错误
+        source_id = validated_request_data["source_id"]
+        data_source, subscription_condition = self._get_query_plan(validated_request_data["token"], source_id)
+        select_fields = self._build_select_fields(
+            data_source=data_source,
+            custom_fields=validated_request_data.get("fields"),
+        )
+        self._parse_custom_condition(validated_request_data.get("filters"))
+
+        lines = self._iter_lines(data_source, subscription_condition, select_fields, validated_request_data)
+        return StreamingHttpResponse(lines, content_type=LOG_SUBSCRIPTION_NDJSON_CONTENT_TYPE)
+
+    def _iter_lines(
+        self,
+        data_source: LogDataSource,
+        subscription_condition: Optional[WhereCondition],
+        select_fields: List[Field],
+        validated_request_data: dict,
+    ) -> Iterator[str]:
+        """按游标逐批查询，逐行输出数据，最后输出元信息"""
+        source_id = validated_request_data["source_id"]
+        page_size = validated_request_data["page_size"]
+        max_rows = settings.LOG_SUBSCRIPTION_STREAM_MAX_ROWS
+        generator = BkBaseComputeSqlGenerator(BKBaseQueryBuilder())
+        cursor = validated_request_data.get("cursor") or ""
+        count = 0
+
+        while True:
+            batch_size = min(page_size, max_rows - count)
+            where_condition = self._build_where_condition(
+                data_source=data_source,
+                subscription_condition=subscription_condition,
+                start_time=validated_request_data["start_time"],
+                end_time=validated_request_data["end_time"],
+                custom_filters=validated_request_data.get("filters"),
+                cursor=cursor,
+            )
+            sql_config = self._build_sql_config(
+                data_source=data_source,
+                where_condition=where_condition,
+                select_fields=select_fields,
+                page=1,
+                page_size=batch_size,
+                cursor_mode=True,
+            )
+            data_resp = api.bk_base.query_sync(sql=str(generator.generate(sql_config)))
+            results, cursor = self._paginate_by_cursor(data_source, data_resp.get("list", []), batch_size)
+            results = self._strip_cursor_fields(results, data_source, select_fields)
+            for item in self._filter_blacklist_fields(results, source_id):
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+            count += len(results)
+            if not cursor or count >= max_rows:
+                break
+
+        yield json.dumps({LOG_SUBSCRIPTION_STREAM_META_KEY: {"count": count, "next_cursor": cursor}}) + "\n"
@@ -16,10 +16,37 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import base64
+import json
+from typing import Tuple, Union
+
 from django.conf import settings
 from django.utils.translation import gettext_lazy
 from rest_framework import serializers
 
+CursorValue = Union[int, float, str]
+
+
+def is_cursor_value(value) -> bool:
+    """游标字段值仅支持数值与字符串，保证编码后可被 decode_cursor 解析"""
+    return isinstance(value, (int, float, str)) and not isinstance(value, bool)
+
+
+def encode_cursor(time_value: CursorValue, cursor_value: CursorValue) -> str:
+    """将最后一条数据的 (时间字段, 游标字段) 编码为不透明游标"""
+    return base64.urlsafe_b64encode(json.dumps([time_value, cursor_value]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[CursorValue, CursorValue]:
+    """解析游标，格式错误时抛出 ValidationError"""
+    try:
+        time_value, cursor_value = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise serializers.ValidationError(gettext_lazy("游标无效")) from e
+    if not all(is_cursor_value(value) for value in [time_value, cursor_value]):
+        raise serializers.ValidationError(gettext_lazy("游标无效"))
+    return time_value, cursor_value
+
 
 class LogSubscriptionQuerySerializer(serializers.Serializer):
     """日志订阅查询请求序列化器"""
@@ -58,6 +85,23 @@ class LogSubscriptionQuerySerializer(serializers.Serializer):
         help_text=gettext_lazy("设置为 true 时仅返回 SQL 不执行查询"),
     )
 
+    cursor = serializers.CharField(
+        label=gettext_lazy("游标"),
+        required=False,
+        allow_null=True,
+        allow_blank=True,
+        default=None,
+        help_text=gettext_lazy("传入时使用游标模式（忽略 page）：首次传空字符串，后续传上次返回的 next_cursor"),
+    )
+
+    need_count = serializers.BooleanField(
+        label=gettext_lazy("是否统计总数"),
+        required=False,
+        allow_null=True,
+        default=None,
+        help_text=gettext_lazy("不传时分页模式统计总数，游标模式不统计"),
+    )
+
     def validate_filters(self, value):
         """
         验证自定义筛选条件，检查是否包含 keys 字段（暂不支持），并为 field 对象补充默认值
@@ -116,6 +160,11 @@ class LogSubscriptionQuerySerializer(serializers.Serializer):
 
         return value
 
+    def validate_cursor(self, value):
+        if value:
+            decode_cursor(value)
+        return value
+
     def validate(self, attrs):
         attrs = super().validate(attrs)
 
@@ -141,7 +190,7 @@ class LogSubscriptionQueryResponseSerializer(serializers.Serializer):
 
     page_size = serializers.IntegerField(label=gettext_lazy("单页数量"))
 
-    total = serializers.IntegerField(label=gettext_lazy("总数"))
+    total = serializers.IntegerField(label=gettext_lazy("总数"), allow_null=True, help_text=gettext_lazy("未统计时为 null"))
 
     results = serializers.ListField(
         label=gettext_lazy("数据"),
@@ -153,3 +202,26 @@ class LogSubscriptionQueryResponseSerializer(serializers.Serializer):
     query_sql = serializers.CharField(label=gettext_lazy("查询 SQL"), help_text=gettext_lazy("实际执行的查询 SQL"))
 
     count_sql = serializers.CharField(label=gettext_lazy("统计 SQL"), help_text=gettext_lazy("实际执行的统计 SQL"))
+
+    next_cursor = serializers.CharField(
+        label=gettext_lazy("下一页游标"),
+        allow_null=True,
+        required=False,
+        help_text=gettext_lazy("游标模式下返回，为 null 表示已无更多数据"),
+    )
+
+
+class LogSubscriptionStreamSerializer(LogSubscriptionQuerySerializer):
+    """日志订阅流式查询请求序列化器"""
+
+    page = None
+    need_count = None
+    raw = None
+
+    page_size = serializers.IntegerField(
+        label=gettext_lazy("单批数量"),
+        min_value=1,
+        max_value=1000,
+        default=1000,
+        help_text=gettext_lazy("每批从 BKBase 拉取的数量"),
+    )
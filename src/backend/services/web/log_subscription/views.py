@@ -18,7 +18,10 @@ to the current version of the project delivered to anyone in the future.
 from bk_resource.viewsets import ResourceRoute, ResourceViewSet
 
 from core.view_sets import APIGWViewSet
-from services.web.log_subscription.resources import QueryLogSubscription
+from services.web.log_subscription.resources import (
+    QueryLogSubscription,
+    StreamLogSubscription,
+)
 
 
 class LogSubscriptionApigwViewSet(APIGWViewSet):
@@ -30,6 +33,7 @@ class LogSubscriptionApigwViewSet(APIGWViewSet):
 
     resource_routes = [
         ResourceRoute("POST", QueryLogSubscription, endpoint="query"),
+        ResourceRoute("POST", StreamLogSubscription, endpoint="stream"),
     ]
 
 
@@ -42,4 +46,5 @@ class LogSubscriptionViewSet(ResourceViewSet):
 
     resource_routes = [
         ResourceRoute("POST", QueryLogSubscription, endpoint="query"),
+        ResourceRoute("POST", StreamLogSubscription, endpoint="stream"),
     ]
@@ -16,11 +16,16 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 import math
-from typing import Generator, List
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generator, Iterator, List, Optional
 
 from bk_resource import resource
 from django.conf import settings
+from django.db import connections
 
+from core.observability import submit_with_observation_context
 from core.utils.retry import FuncRunner
 from services.web.query.export.model import ExportConfig
 
@@ -49,6 +54,16 @@ class DataFetcher:
         ).run()
         return resp
 
+    @classmethod
+    def fetch_keyset_logs(cls, query_params: dict, page_size: int, search_after: Optional[dict], page: int = 1):
+        """
+        游标分页检索日志，返回本页日志及下一页游标；无游标时按 page 使用 OFFSET
+        """
+
+        query_params = {**query_params, "keyset_pagination": True, "search_after": search_after}
+        resp = cls._fetch_data(query_params, page, page_size)
+        return resp["results"], resp.get("search_after")
+
     @classmethod
     def get_total(cls, query_params: dict) -> int:
         """
@@ -67,15 +82,96 @@ class DataFetcher:
         resp = cls._fetch_data(query_params, page, page_size)
         return resp["results"]
 
-    def fetch_logs(self) -> Generator[List[dict], None, None]:
+    def sync_total(self) -> int:
         """
-        检索日志
+        获取并更新任务总条数
         """
 
         total = self.get_total(self.config.task.query_params)
-        # 更新总条数
         if total != self.config.task.total:
             self.config.task.total = total
             self.config.task.save(update_fields=["total"])
+        return total
+
+    def fetch_logs(self) -> Generator[List[dict], None, None]:
+        """
+        检索日志
+        """
+
+        yield from self.iter_logs(self.sync_total())
+
+    def iter_logs(self, total: int) -> Generator[List[dict], None, None]:
+        """
+        按总条数分页检索日志
+        """
+
+        if settings.ENABLE_LOG_EXPORT_KEYSET_PAGINATION:
+            yield from self.iter_keyset_logs(total)
+            return
         for i in range(0, math.ceil(total / self.page_size)):
             yield self.fetch_patch_logs(self.config.task.query_params, i + 1, self.page_size)
+
+    def iter_keyset_logs(self, total: int) -> Generator[List[dict], None, None]:
+        """
+        按游标逐页检索日志，每页查询代价与页码无关
+        末行排序值为空无法生成游标时，下一页按 OFFSET 检索，排序与游标分页一致，不会提前结束
+        """
+
+        search_after = None
+        page = 1
+        fetched = 0
+        while fetched < total:
+            logs, search_after = self.fetch_keyset_logs(
+                self.config.task.query_params, self.page_size, search_after, page
+            )
+            if not logs:
+                return
+            fetched += len(logs)
+            yield logs
+            if len(logs) < self.page_size:
+                return
+            page = 1 if search_after else fetched // self.page_size + 1
+
+    def prefetch_logs(self, max_pages: int = settings.LOG_EXPORT_PREFETCH_PAGES) -> Generator[List[dict], None, None]:
+        """
+        后台线程预取日志
+        检索下一页的同时由调用方处理当前页，队列满时检索线程阻塞，避免内存无限增长
+        总条数在当前线程更新；检索线程调用检索接口时仍会访问数据库，结束时关闭该线程的数据库连接
+        """
+
+        pages = queue.Queue(maxsize=max(max_pages, 1))
+        stopped = threading.Event()
+        finished = object()
+
+        def put(item) -> bool:
+            while not stopped.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce(logs: Iterator[List[dict]]):
+            try:
+                for page in logs:
+                    if not put(page):
+                        return
+            finally:
+                put(finished)
+                # 数据库连接按线程隔离，检索线程结束前需主动关闭，避免连接泄漏
+                connections.close_all()
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = submit_with_observation_context(executor, produce, self.iter_logs(self.sync_total()))
+        try:
+            while True:
+                page = pages.get()
+                if page is finished:
+                    # 检索异常在此抛出
+                    future.result()
+                    return
+                yield page
+        finally:
+            stopped.set()
+            executor.shutdown(wait=True)
@@ -17,49 +17,140 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import json
-from typing import Any, List
+from functools import cached_property
+from json import JSONDecodeError
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from bk_resource.base import Empty
 
 from core.utils.data import extract_nested_value
+from services.web.query.constants import LogExportField
 from services.web.query.export.model import ExportConfig
 
+EMPTY = Empty()
+
+
+def decode_nested_source(value: Any) -> Any:
+    """
+    预解析下钻字段的原始值，字符串按 JSON 解析，与 extract_nested_value 首层处理一致
+    """
+
+    if not value or type(value) is not str:
+        return value
+    try:
+        value = json.loads(value)
+    except JSONDecodeError:
+        return EMPTY
+    return value if isinstance(value, dict) else EMPTY
+
 
 class DataProcessor:
     """
     数据处理模块
+    导出字段只编译一次，按列批量处理：同一原始字段的 JSON 每行只解析一次，供其下所有下钻字段共用
     """
 
     def __init__(self, config: ExportConfig):
         self.config = config
 
+    @cached_property
+    def value_formatter(self) -> Callable[[Any], str]:
+        """
+        编译值格式化函数，字符串直接返回
+        """
+
+        empty_value = self.config.empty_value
+        # 与 json.dumps(value, ensure_ascii=False) 输出一致，避免每次调用重新构造 encoder
+        encode = json.JSONEncoder(ensure_ascii=False).encode
+
+        def formatter(value: Any) -> str:
+            value_type = type(value)
+            if value_type is str:
+                return value
+            if value_type is dict or value_type is list:
+                return encode(value)
+            if isinstance(value, Empty):
+                return empty_value
+            if isinstance(value, (dict, list)):
+                return encode(value)
+            return str(value)
+
+        return formatter
+
+    @classmethod
+    def compile_field(cls, field: LogExportField) -> Optional[Callable[[Any], Any]]:
+        """
+        编译下钻字段的取值函数，入参为预解析后的原始字段值；非下钻字段返回 None
+        """
+
+        keys = list(field.keys)
+        if not keys:
+            return None
+        if len(keys) == 1:
+            key = keys[0]
+            return lambda value: (
+                value.get(key, EMPTY) if type(value) is dict and value else extract_nested_value(value, keys)
+            )
+        return lambda value: extract_nested_value(value, keys)
+
+    @cached_property
+    def field_extractors(self) -> List[Tuple[str, Optional[Callable[[Any], Any]]]]:
+        """
+        按导出字段顺序编译的 (原始字段, 取值函数)
+        """
+
+        return [(field.raw_name, self.compile_field(field)) for field in self.config.export_fields]
+
     def format_value(self, value: Any) -> str:
         """
         格式化值
         """
 
-        if isinstance(value, Empty):
-            formatted_value = self.config.empty_value
-        elif isinstance(value, (dict, list)):
-            formatted_value = json.dumps(value, ensure_ascii=False)
-        else:
-            formatted_value = str(value)
-        return formatted_value
+        return self.value_formatter(value)
+
+    def batch_format_columns(self, batch_data: List[dict]) -> List[List[str]]:
+        """
+        按列批量格式化数据，每个导出字段对应一列
+        """
+
+        formatter = self.value_formatter
+        sources: Dict[Tuple[str, bool], list] = {}
+        columns = []
+        for raw_name, extractor in self.field_extractors:
+            nested = extractor is not None
+            source = sources.get((raw_name, nested))
+            if source is None:
+                source = [log.get(raw_name) for log in batch_data]
+                if nested:
+                    source = [decode_nested_source(value) for value in source]
+                sources[(raw_name, nested)] = source
+            if nested:
+                columns.append([formatter(extractor(value)) for value in source])
+            else:
+                columns.append([formatter(value) for value in source])
+        return columns
+
+    def batch_format_rows(self, batch_data: List[dict]) -> List[Sequence[str]]:
+        """
+        批量格式化数据，返回按导出字段顺序排列的行
+        """
+
+        columns = self.batch_format_columns(batch_data)
+        if not columns:
+            return [() for _ in batch_data]
+        return list(zip(*columns))
 
     def format_data(self, data: dict) -> dict:
         """
         格式化数据
         """
 
-        formatted = {}
-        for field in self.config.export_fields:
-            value = extract_nested_value(data.get(field.raw_name), field.keys)
-            formatted[field.full_key] = self.format_value(value)
-        return formatted
+        return self.batch_format_data([data])[0]
 
     def batch_format_data(self, batch_data: List[dict]) -> List[dict]:
         """
         批量格式化数据
         """
 
-        return [self.format_data(log) for log in batch_data]
+        full_keys = [field.full_key for field in self.config.export_fields]
+        return [dict(zip(full_keys, row)) for row in self.batch_format_rows(batch_data)]
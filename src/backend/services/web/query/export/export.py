@@ -15,10 +15,12 @@ specific language governing permissions and limitations under the License.
 We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
+import time
 import traceback
 from datetime import datetime
 
 from blueapps.utils.logger import logger_celery
+from django.conf import settings
 from django.core.files import File
 
 from services.web.query.export.data_fetcher import DataFetcher
@@ -48,6 +50,7 @@ class CollectorLogExporter:
         self.file_exporter = file_exporter
         self.file_uploader = file_uploader
         self.current_records = 0
+        self.progress_updated_at = time.monotonic()
 
     def _finally_export(self):
         """
@@ -56,22 +59,33 @@ class CollectorLogExporter:
 
         self.file_exporter.close()
 
+    def update_progress(self):
+        """
+        按时间间隔更新导出进度，避免每页都写一次数据库
+        """
+
+        now = time.monotonic()
+        if now - self.progress_updated_at < settings.LOG_EXPORT_PROGRESS_UPDATE_INTERVAL:
+            return
+        self.progress_updated_at = now
+        self.task.update_current_records(current_records=self.current_records)
+
     def search_and_write_file(self) -> File:
         """
         分页检索日志，处理并写入文件
-        1. 分页检索日志
+        1. 分页检索日志(后台线程预取下一页)
         2. 格式化数据
         3. 导出日志
         4. 上传文件
         """
 
         # 1. 分页检索日志
-        for log_data in self.data_fetcher.fetch_logs():
+        for log_data in self.data_fetcher.prefetch_logs():
             logger_celery.info(
                 f"[{self.__class__.__name__}] fetch logs done; task {self.task.id}; data_count: {len(log_data)}"
             )
             # 2. 数据处理
-            formatted_logs = self.data_processor.batch_format_data(log_data)
+            formatted_logs = self.data_processor.batch_format_rows(log_data)
             logger_celery.info(
                 f"[{self.__class__.__name__}] format logs done; task {self.task.id}; "
                 f"formatted_logs_count: {len(formatted_logs)}"
@@ -84,7 +98,7 @@ class CollectorLogExporter:
             )
             # 4. 更新记录日志条数
             self.current_records += len(formatted_logs)
-            self.task.update_current_records(current_records=self.current_records)
+            self.update_progress()
             logger_celery.info(
                 f"[{self.__class__.__name__}] record logs done; task {self.task.id}; "
                 f"current_logs_count: {self.current_records}"
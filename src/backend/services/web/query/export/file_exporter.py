@@ -20,7 +20,7 @@ import gc
 import tempfile
 from datetime import datetime
 from functools import cached_property
-from typing import List
+from typing import List, Sequence
 
 import xlsxwriter
 from blueapps.utils.logger import logger_celery
@@ -61,9 +61,9 @@ class FileExporter(abc.ABC):
         return f"审计检索日志-{date_str}-{unique_id()}{self.suffix}"
 
     @abc.abstractmethod
-    def write(self, data: List[dict]):
+    def write(self, rows: List[Sequence[str]]):
         """
-        将数据写入文件
+        将数据写入文件，每行按导出字段顺序排列
         """
 
         raise NotImplementedError()
@@ -130,7 +130,7 @@ class XLSXExporter(FileExporter):
         self._write_category_header()
         self._write_title_header()
 
-    def _write_row(self, row: list, *args, **kwargs):
+    def _write_row(self, row: Sequence, *args, **kwargs):
         """
         写入数据
         """
@@ -177,9 +177,8 @@ class XLSXExporter(FileExporter):
         # 设置列宽
         self.worksheet.set_column(0, len(titles) - 1, 20)
 
-    def write(self, formatted_logs: List[dict]):
-        for log in formatted_logs:
-            row_data = [log.get(field.full_key, self.config.empty_value) for field in self.config.export_fields]
+    def write(self, rows: List[Sequence[str]]):
+        for row_data in rows:
             self._write_row(row_data, self.data_fmt)
             # 如果超出最大行数，则新建一个工作表
             if self.row >= self.max_row:
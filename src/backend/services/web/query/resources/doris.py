@@ -19,7 +19,7 @@ from abc import ABCMeta, abstractmethod
 from datetime import timedelta
 from typing import Dict, Type
 
-from bk_resource import api, resource
+from bk_resource import api
 from bkstorages.backends.bkrepo import BKRepoFile
 from blueapps.utils.logger import logger
 from django.conf import settings
@@ -32,6 +32,7 @@ from api.bk_base.constants import StorageType
 from apps.meta.constants import ConfigLevelChoices
 from apps.meta.models import GlobalMetaConfig
 from apps.meta.utils.fields import BKDATA_ES_TYPE_MAP, STANDARD_FIELDS
+from apps.meta.utils.system import fetch_system_infos
 from apps.meta.utils.tools import is_system_admin
 from apps.permission.handlers.actions import ActionEnum
 from core.sql.constants import FieldType
@@ -104,6 +105,7 @@ class CollectorSearchBaseResource(QueryBaseResource, SearchDataParser, metaclass
             sort_list=validated_request_data["sort_list"],
             page=page,
             page_size=page_size,
+            search_after=validated_request_data.get("search_after"),
         )
         return sql_builder
 
@@ -124,10 +126,46 @@ class CollectorSearchAllResource(CollectorSearchBaseResource):
         logger.info(f"[{self.__class__.__name__}] search data_sql: {data_sql};count_sql:{count_sql}")
         return {"data": data_sql, "count": count_sql}
 
+    def search_by_keyset(self, validated_request_data) -> dict:
+        """
+        游标分页: 只执行数据查询，不统计总数，并返回下一页游标
+        """
+
+        sql_builder = super().get_sql_builder(validated_request_data)
+        data_sql = sql_builder.build_keyset_data_sql()
+        logger.info(f"[{self.__class__.__name__}] search keyset data_sql: {data_sql}")
+        data_resp = api.bk_base.query_sync(sql=data_sql, prefer_storage=StorageType.DORIS.value)
+        rows = data_resp.get("list", [])
+        # 先取游标，parse_data 会原地格式化数据
+        search_after = sql_builder.build_next_search_after(rows)
+        data = self.bind_system_info(validated_request_data, self.parse_data(rows))
+        return {
+            "page": validated_request_data["page"],
+            "num_pages": validated_request_data["page_size"],
+            "total": None,
+            "results": data,
+            "query_sql": data_sql,
+            "count_sql": "",
+            "search_after": search_after,
+        }
+
+    def bind_system_info(self, validated_request_data, data: list) -> list:
+        """
+        补充系统信息
+        """
+
+        if not validated_request_data["bind_system_info"]:
+            return data
+        system_map = fetch_system_infos(validated_request_data["namespace"], [value.get("system_id") for value in data])
+        for value in data:
+            value["system_info"] = system_map.get(value.get("system_id"), dict())
+        return data
+
     def perform_request(self, validated_request_data):
+        if validated_request_data["keyset_pagination"]:
+            return self.search_by_keyset(validated_request_data)
         page = validated_request_data["page"]
         page_size = validated_request_data["page_size"]
-        bind_system_info = validated_request_data["bind_system_info"]
         sqls = self.build_sql(validated_request_data)
         bulk_req_params = [
             {
@@ -142,13 +180,7 @@ class CollectorSearchAllResource(CollectorSearchBaseResource):
         # 请求BKBASE数据
         bulk_resp = api.bk_base.query_sync.bulk_request(bulk_req_params)
         data_resp, count_resp = bulk_resp
-        data = self.parse_data(data_resp.get("list", []))
-        # 补充系统信息
-        if bind_system_info:
-            systems = resource.meta.system_list(namespace=validated_request_data["namespace"])
-            system_map = {system["system_id"]: system for system in systems}
-            for value in data:
-                value["system_info"] = system_map.get(value.get("system_id"), dict())
+        data = self.bind_system_info(validated_request_data, self.parse_data(data_resp.get("list", [])))
         # 请求总数
         total = count_resp.get("list", [{}])[0].get("count", 0)
         # 响应
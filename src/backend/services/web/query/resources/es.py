@@ -23,6 +23,7 @@ from api.bk_log.constants import INDEX_SET_ID
 from apps.meta.constants import ConfigLevelChoices
 from apps.meta.models import GlobalMetaConfig
 from apps.meta.permissions import SearchLogPermission
+from apps.meta.utils.system import fetch_system_infos
 from apps.permission.handlers.actions import ActionEnum
 from services.web.databus.constants import DEFAULT_STORAGE_CONFIG_KEY
 from services.web.query.serializers import (
@@ -81,8 +82,7 @@ class SearchAllResource(QueryBaseResource, SearchDataParser):
         hits = self.parse_data([hit["_source"] for hit in resp.get("hits", {}).get("hits", [])])
         # 补充系统信息
         if validated_request_data["bind_system_info"]:
-            systems = resource.meta.system_list(namespace=validated_request_data["namespace"])
-            system_map = {system["system_id"]: system for system in systems}
+            system_map = fetch_system_infos(validated_request_data["namespace"], [hit.get("system_id") for hit in hits])
             for hit in hits:
                 hit["system_info"] = system_map.get(hit.get("system_id"), dict())
         # 响应
@@ -63,6 +63,7 @@ from services.web.query.constants import (
     ResultCodeChoices,
 )
 from services.web.query.models import LogExportTask
+from services.web.query.utils.doris import build_keyset_sort_list
 from services.web.query.utils.field import LOG_SEARCH_ALL_FIELDS
 from services.web.query.utils.search_config import QueryConditionOperator
 from services.web.risk.constants import (
@@ -339,11 +340,29 @@ class CollectorSearchReqBaseSerializer(serializers.Serializer):
         return attrs
 
 
+class CollectorSearchAfterSerializer(serializers.Serializer):
+    """
+    日志查询游标
+    """
+
+    values = serializers.ListField(label=gettext_lazy("排序字段值"), child=serializers.JSONField(), allow_empty=False)
+
+    def validate_values(self, value: list) -> list:
+        # 游标值会直接拼入 WHERE 条件，仅允许数值或字符串
+        for item in value:
+            if isinstance(item, bool) or not isinstance(item, (int, float, str)):
+                raise serializers.ValidationError(gettext("游标值仅支持数值或字符串: %s") % item)
+        return value
+
+
 class CollectorSearchAllReqSerializer(CollectorSearchReqBaseSerializer):
     """
     日志查询(All)请求序列化器
     """
 
+    keyset_pagination = serializers.BooleanField(label=gettext_lazy("游标分页"), default=False)
+    search_after = CollectorSearchAfterSerializer(label=gettext_lazy("游标"), required=False, allow_null=True)
+
     @classmethod
     def _build_time_conditions(cls, validated_request_data: dict) -> List[dict]:
         """
@@ -381,6 +400,9 @@ class CollectorSearchAllReqSerializer(CollectorSearchReqBaseSerializer):
         attrs = super().validate(attrs)
         time_conditions = self._build_time_conditions(attrs)
         attrs["conditions"] = time_conditions + attrs["conditions"]
+        search_after = attrs.get("search_after")
+        if search_after and len(search_after["values"]) != len(build_keyset_sort_list(attrs["sort_list"])):
+            raise ValidationError(message=gettext("游标与排序字段数量不一致"))
         return attrs
 
 
@@ -464,6 +486,7 @@ class CollectorSearchResponseSerializer(QuerySearchResponseSerializer):
 
     query_sql = serializers.CharField(required=False, allow_blank=True)
     count_sql = serializers.CharField(required=False, allow_blank=True)
+    search_after = serializers.DictField(required=False, allow_null=True)
 
 
 class StatisticSQLSerializer(serializers.Serializer):
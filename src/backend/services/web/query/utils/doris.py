@@ -15,14 +15,14 @@ specific language governing permissions and limitations under the License.
 We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
-from typing import List, Union
+from typing import List, Optional, Union
 
 from pypika.enums import Order
 from pypika.functions import Avg, Count, Max, Min
 from pypika.queries import QueryBuilder
 from pypika.terms import BasicCriterion, Criterion, EmptyCriterion, Function
 
-from apps.meta.utils.fields import STANDARD_FIELDS
+from apps.meta.utils.fields import EVENT_ID, STANDARD_FIELDS
 from core.constants import OrderTypeChoices
 from core.sql.builder.builder import BKBaseQueryBuilder, BkBaseTable
 from core.sql.builder.functions import DateTrunc, FromUnixTime, PercentileApprox
@@ -36,6 +36,19 @@ from core.sql.builder.utils import operate
 from core.sql.constants import FieldType
 from services.web.query.utils.search_config import QueryConditionOperator
 
+# 游标分页的决胜字段，保证排序唯一
+KEYSET_TIEBREAKER_FIELD = EVENT_ID.field_name
+
+
+def build_keyset_sort_list(sort_list: List[dict]) -> List[dict]:
+    """
+    游标分页的排序字段: 末尾追加唯一的决胜字段，使排序值元组唯一
+    """
+
+    if any(item["order_field"] == KEYSET_TIEBREAKER_FIELD for item in sort_list):
+        return list(sort_list)
+    return [*sort_list, {"order_field": KEYSET_TIEBREAKER_FIELD, "order_type": OrderTypeChoices.ASC.value}]
+
 
 class BaseDorisSQLBuilder:
     """日志查询SQL构建器"""
@@ -50,11 +63,13 @@ class BaseDorisSQLBuilder:
         sort_list: List[dict],
         page: int,
         page_size: int,
+        search_after: Optional[dict] = None,
     ):
         self.conditions = conditions
         self.sort_list = sort_list
         self.page = page
         self.page_size = page_size
+        self.search_after = search_after
         self.table = self._build_base_table(table)
         self.query = BKBaseQueryBuilder().from_(self.table)
 
@@ -105,18 +120,21 @@ class BaseDorisSQLBuilder:
 
         return query.where(self._build_filter_condition())
 
-    def _build_order_by(self, query: QueryBuilder) -> QueryBuilder:
+    def _build_order_by(self, query: QueryBuilder, sort_list: List[dict] = None) -> QueryBuilder:
         """
         构建排序逻辑
         """
 
-        for sort_item in self.sort_list:
+        for sort_item in self.sort_list if sort_list is None else sort_list:
             order_field = sort_item["order_field"]
-            order_type = sort_item["order_type"]
-            order = Order.desc if order_type == OrderTypeChoices.DESC else Order.asc
+            order = Order.desc if self._is_desc(sort_item) else Order.asc
             query = query.orderby(self.get_pypika_field(name=order_field), order=order)
         return query
 
+    @classmethod
+    def _is_desc(cls, sort_item: dict) -> bool:
+        return sort_item["order_type"] == OrderTypeChoices.DESC
+
 
 class DorisQuerySQLBuilder(BaseDorisSQLBuilder):
     def build_data_sql(self) -> str:
@@ -128,6 +146,59 @@ class DorisQuerySQLBuilder(BaseDorisSQLBuilder):
         query = self._build_order_by(query)
         return str(query.limit(self.page_size).offset(self.page_size * (self.page - 1)))
 
+    @property
+    def keyset_sort_list(self) -> List[dict]:
+        return build_keyset_sort_list(self.sort_list)
+
+    def build_keyset_data_sql(self) -> str:
+        """
+        生成游标分页数据查询
+        以排序字段的值作为游标，避免深分页时 OFFSET 扫描越来越多的数据；
+        无游标时（首页，或上一页末行排序值为空无法生成游标）按 page 使用 OFFSET，排序与游标分页一致
+        """
+
+        query = self.query.select("*")
+        query = self._build_where(query)
+        if self.search_after:
+            query = query.where(self._build_keyset_condition(self.search_after["values"]))
+            offset = 0
+        else:
+            offset = self.page_size * (self.page - 1)
+        query = self._build_order_by(query, self.keyset_sort_list)
+        return str(query.limit(self.page_size).offset(offset))
+
+    def _build_keyset_condition(self, values: list) -> Criterion:
+        """
+        按排序方向展开游标条件: (a < x) OR (a = x AND b < y) OR (a = x AND b = y AND c > z)
+        排序末尾为唯一的决胜字段，所有比较均为严格比较；
+        降序时空值排在最后，因此降序字段的比较包含 IS NULL
+        """
+
+        sort_list = self.keyset_sort_list
+        fields = [self.get_pypika_field(name=item["order_field"]) for item in sort_list]
+        conditions = []
+        for index, (field, value, sort_item) in enumerate(zip(fields, values, sort_list)):
+            if self._is_desc(sort_item):
+                compare = field.lt(value) | field.isnull()
+            else:
+                compare = field.gt(value)
+            equals = [prev_field.eq(prev_value) for prev_field, prev_value in zip(fields[:index], values[:index])]
+            conditions.append(Criterion.all([*equals, compare]))
+        return Criterion.any(conditions)
+
+    def build_next_search_after(self, rows: List[dict]) -> Optional[dict]:
+        """
+        根据本页数据生成下一页游标，values 为最后一行的排序字段值（含决胜字段）
+        最后一行存在空的排序值时无法生成游标，返回 None，由调用方按 OFFSET 继续分页
+        """
+
+        if not rows:
+            return None
+        values = [rows[-1].get(item["order_field"]) for item in self.keyset_sort_list]
+        if any(value is None for value in values):
+            return None
+        return {"values": values}
+
     def build_count_sql(self) -> str:
         """
         生成统计查询
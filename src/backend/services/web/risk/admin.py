@@ -39,6 +39,7 @@ from services.web.risk.models import (
     Risk,
     RiskEventSubscription,
     RiskExperience,
+    RiskParticipant,
     RiskReport,
     RiskRule,
     TicketNode,
@@ -207,6 +208,13 @@ class TicketPermissionAdmin(admin.ModelAdmin):
     list_filter = ["action"]
 
 
+@admin.register(RiskParticipant)
+class RiskParticipantAdmin(admin.ModelAdmin):
+    list_display = ["id", "risk_id", "username", "role", "event_time", "status"]
+    search_fields = ["risk_id", "username"]
+    list_filter = ["role", "status"]
+
+
 class RiskEventSubscriptionAdminForm(forms.ModelForm):
     condition = forms.JSONField(required=False, help_text=_("可使用结构化模式或 JSON 模式编辑筛选条件。"))
 
@@ -58,10 +58,20 @@ EVENT_ESQUERY_DELAY_TIME = int(os.getenv("BKAPP_EVENT_ESQUERY_DELAY_TIME", str(1
 # 需要考虑数据传输的限制 <5MB 避免网关报错
 RISK_SYNC_BATCH_SIZE = int(os.getenv("BKAPP_RISK_SYNC_BATCH_SIZE", 1000))
 RISK_SYNC_SCROLL = os.getenv("BKAPP_RISK_SYNC_SCROLL", "5m")
+# 清理滚动上下文的 ES 客户端按集群在进程内复用
+RISK_SYNC_SCROLL_CLIENT_CACHE_TTL = int(os.getenv("BKAPP_RISK_SYNC_SCROLL_CLIENT_CACHE_TTL", 60 * 10))  # s
 RISK_SYNC_START_TIME_KEY = "RISK_SYNC_START_TIME"
 RISK_ESQUERY_DELAY_TIME = int(os.getenv("BKAPP_RISK_ESQUERY_DELAY_TIME", str(10 * 60)))  # s
 RISK_ESQUERY_SLICE_DURATION = int(os.getenv("BKAPP_RISK_ESQUERY_SLICE_DURATION", str(60 * 60)))  # s
 RISK_EVENTS_SYNC_TIME = int(os.getenv("BKAPP_RISK_EVENTS_SYNC_TIME", "2"))  # day
+# 批量生成风险时单次写入的风险数量
+RISK_GENERATE_BULK_SIZE = int(os.getenv("BKAPP_RISK_GENERATE_BULK_SIZE", 500))
+# 并行生成风险时按 (strategy_id, raw_event_id) 分区加锁
+RISK_GENERATE_LOCK_PARTITIONS = int(os.getenv("BKAPP_RISK_GENERATE_LOCK_PARTITIONS", 64))
+RISK_GENERATE_LOCK_TIMEOUT = int(os.getenv("BKAPP_RISK_GENERATE_LOCK_TIMEOUT", 60 * 5))  # s
+RISK_GENERATE_PARTITION_LOCK_KEY = "risk:generate:partition:{partition}"
+# 并行时间片完成标记
+RISK_SYNC_SLICE_FINISHED_KEY = "risk:sync:slice:finished:{start_time}"
 
 SECURITY_PERSON_KEY = "SECURITY_PERSON"
 
@@ -71,6 +81,13 @@ DEFAULT_RISK_OPERATE_NOTICE_CONFIG = [{"msg_type": "mail"}]
 # 风险列表有些字段长度过长来给它一个限制长度
 LIST_RISK_FIELD_MAX_LENGTH = int(os.getenv("BKAPP_LIST_RISK_FIELD_MAX_LENGTH", 1024))
 
+# 风险列表 BKBase count 结果缓存，同一筛选条件下翻页时复用；设置为 0 时关闭
+LIST_RISK_COUNT_CACHE_NAMESPACE = "risk:list:bkbase_count"
+LIST_RISK_COUNT_CACHE_TIMEOUT = int(os.getenv("BKAPP_LIST_RISK_COUNT_CACHE_TIMEOUT", 60))  # s
+# 风险列表 BKBase 查询表达式模板缓存（进程内 LRU）
+BKBASE_PLAN_CACHE_SIZE = int(os.getenv("BKAPP_BKBASE_PLAN_CACHE_SIZE", 256))
+BKBASE_PLAN_CACHE_TTL = int(os.getenv("BKAPP_BKBASE_PLAN_CACHE_TTL", 60 * 60))  # s
+
 RISK_SHOW_FIELDS = [
     "risk_id",
     "event_content",
@@ -88,6 +105,8 @@ RISK_SHOW_FIELDS = [
 RISK_RENDER_LOCK_KEY = "risk:render:lock:{risk_id}"
 # 风险事件最新时间
 RISK_EVENT_LATEST_TIME_KEY = "risk:event:latest:{risk_id}"
+# 自动流转风险: 上次处理后未变化的流转状态版本
+PROCESS_RISK_STATUS_VERSION_KEY = "risk:process:status_version:{risk_id}"
 
 
 @dataclass
@@ -5,13 +5,27 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from datetime import timezone as dt_timezone
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import sqlglot
 from django.core.exceptions import EmptyResultSet
@@ -21,14 +35,30 @@ from django.utils.dateparse import parse_datetime
 from sqlglot import exp
 from sqlglot.errors import ParseError
 
+from core.observability import submit_with_observation_context
+from core.utils.cache import LocalTTLCache, VersionedCache
 from services.web.risk.constants import (
+    BKBASE_PLAN_CACHE_SIZE,
+    BKBASE_PLAN_CACHE_TTL,
     EVENT_BASIC_COLUMN_MAP,
+    LIST_RISK_COUNT_CACHE_NAMESPACE,
+    LIST_RISK_COUNT_CACHE_TIMEOUT,
     RISK_LEVEL_ORDER_FIELD,
     EventBasicField,
 )
 
 logger = logging.getLogger(__name__)
 
+# 风险列表基础查询的表达式模板缓存，见 BkBaseQueryExpressionBuilder.compile_queryset_expression
+bkbase_plan_cache = LocalTTLCache(maxsize=BKBASE_PLAN_CACHE_SIZE, ttl=BKBASE_PLAN_CACHE_TTL)
+
+# 风险列表 count 结果缓存，见 BkBaseQueryPlanner
+list_risk_count_cache = VersionedCache(
+    namespace=LIST_RISK_COUNT_CACHE_NAMESPACE,
+    local_ttl=min(LIST_RISK_COUNT_CACHE_TIMEOUT, 10),
+    shared_ttl=LIST_RISK_COUNT_CACHE_TIMEOUT,
+)
+
 
 def _convert_to_float(value: Any) -> Optional[float]:
     if value is None or isinstance(value, bool):
@@ -134,6 +164,48 @@ class SQLHelper:
         return exp.Add(this=expression.copy(), expression=interval)
 
 
+class BkBaseExpressionTemplate:
+    """以占位符代替 QuerySet 参数编译出的表达式模板。"""
+
+    PLACEHOLDER_PREFIX = "__bkbase_param_"
+    PLACEHOLDER_PATTERN = re.compile(r"^__bkbase_param_(\d+)__$")
+
+    def __init__(self, expression: exp.Expression, localize_params: FrozenSet[int]) -> None:
+        self.expression = expression
+        self.localize_params = localize_params
+
+    @classmethod
+    def placeholder(cls, index: int) -> str:
+        return f"'{cls.PLACEHOLDER_PREFIX}{index}__'"
+
+    @classmethod
+    def placeholder_index(cls, node: Optional[exp.Expression]) -> Optional[int]:
+        if not isinstance(node, exp.Literal) or not node.is_string:
+            return None
+        match = cls.PLACEHOLDER_PATTERN.match(node.this)
+        return int(match.group(1)) if match else None
+
+    def bind(
+        self,
+        params: Sequence[Any],
+        literal_func: Callable[[Any], exp.Expression],
+        localize_func: Callable[[str], Optional[str]],
+    ) -> exp.Expression:
+        def transform(node: exp.Expression) -> exp.Expression:
+            index = self.placeholder_index(node)
+            if index is None or index >= len(params):
+                return node
+            literal = literal_func(params[index])
+            if index in self.localize_params and isinstance(literal, exp.Literal) and literal.is_string:
+                localized = localize_func(literal.this)
+                if localized is not None:
+                    literal = exp.Literal.string(localized)
+            return literal
+
+        # transform 默认在副本上执行，缓存中的模板不会被修改
+        return self.expression.transform(transform)
+
+
 class BkBaseQueryExpressionBuilder:
     """负责将 QuerySet 编译为 BKBase 可用的 SQL 与表达式。"""
 
@@ -144,6 +216,64 @@ class BkBaseQueryExpressionBuilder:
         self.storage_suffix = (storage_suffix or "").strip()
         self._storage_suffix_lower = self.storage_suffix.lower()
 
+    def compile_queryset_expression(self, queryset: QuerySet) -> Optional[exp.Expression]:
+        """
+        将 QuerySet 编译为 BKBase 表达式，等价于 compile_queryset_sql + convert_to_expression。
+
+        去掉参数后的 SQL 相同时，sqlglot 解析、规范化与表名替换的结果只与结构有关，
+        因此以占位符编译出表达式模板并缓存，每次请求只需把参数绑定回模板。
+        """
+
+        compiler = queryset.query.get_compiler(using=queryset.db)
+        try:
+            sql, params = compiler.as_sql()
+        except EmptyResultSet:
+            return None
+        sql_text = (sql or "").strip()
+        cache_key = (
+            sql_text,
+            tuple(sorted(self.table_map.items())),
+            self.storage_suffix,
+            timezone.get_current_timezone_name(),
+        )
+        template = bkbase_plan_cache.get(cache_key)
+        if template is None:
+            template = self._build_expression_template(sql_text, len(params or []))
+            if template is None:
+                return None
+            bkbase_plan_cache.set(cache_key, template)
+        expression = template.bind(params or [], self._literal, self._localize_datetime_string)
+        logger.info("BKBase transformed base SQL: %s", expression.sql(dialect="mysql"))
+        return expression
+
+    def _build_expression_template(self, sql: str, param_count: int) -> Optional["BkBaseExpressionTemplate"]:
+        if param_count:
+            placeholders = iter(BkBaseExpressionTemplate.placeholder(index) for index in range(param_count))
+            sql = re.sub(r"%s", lambda match: next(placeholders, match.group(0)), sql)
+        cleaned_sql = (sql or "").strip().rstrip(";")
+        if not cleaned_sql:
+            return None
+        cleaned_sql = self._normalize_query_expressions(cleaned_sql)
+        expression = self.convert_to_expression(cleaned_sql, log=False)
+        return BkBaseExpressionTemplate(
+            expression=expression,
+            localize_params=frozenset(self._collect_event_time_params(expression)),
+        )
+
+    def _collect_event_time_params(self, expression: exp.Expression) -> Iterator[int]:
+        """找出与 event_time 比较的占位符，绑定参数时需与未缓存路径一样做时区转换。"""
+
+        for node in expression.find_all(exp.GT, exp.GTE, exp.LT, exp.LTE, exp.EQ):
+            left, right = node.args.get("this"), node.args.get("expression")
+            for column, value in ((left, right), (right, left)):
+                if not self._is_event_time_column(column):
+                    continue
+                while isinstance(value, exp.Paren):
+                    value = value.args.get("this")
+                index = BkBaseExpressionTemplate.placeholder_index(value)
+                if index is not None:
+                    yield index
+
     def compile_queryset_sql(self, queryset: QuerySet) -> Optional[str]:
         compiler = queryset.query.get_compiler(using=queryset.db)
         try:
@@ -158,7 +288,7 @@ class BkBaseQueryExpressionBuilder:
             logger.info("BKBase base queryset SQL: %s", cleaned_sql)
         return cleaned_sql
 
-    def convert_to_expression(self, sql: str) -> exp.Expression:
+    def convert_to_expression(self, sql: str, log: bool = True) -> exp.Expression:
         if not sql:
             return sqlglot.parse_one("SELECT 1")
         if not self.table_map:
@@ -193,6 +323,8 @@ class BkBaseQueryExpressionBuilder:
             return node
 
         transformed = expression.transform(transform_table)
+        if not log:
+            return transformed
         try:
             logger.info("BKBase transformed base SQL: %s", transformed.sql(dialect="mysql"))
         except Exception:  # noqa: BLE001
@@ -1046,6 +1178,27 @@ class BkBasePaginationPlanner:
             limit = total
         return page, limit, offset
 
+    def predict(self, request) -> Optional[Tuple[int, int]]:
+        """
+        在未知总数时根据请求参数预测 limit/offset
+        无法预测（未分页、last 页等）时返回 None，需要等 count 完成后再分页
+        """
+
+        page = self.pagination_class()
+        page_size = page.get_page_size(request)
+        if not page_size:
+            return None
+        page_number = request.query_params.get(page.page_query_param) or 1
+        if page_number in page.last_page_strings:
+            return None
+        try:
+            page_number = int(page_number)
+        except (TypeError, ValueError):
+            return None
+        if page_number < 1:
+            return None
+        return page_size, (page_number - 1) * page_size
+
 
 class BkBaseSQLRunner:
     """执行 SQL 并记录日志。"""
@@ -1054,10 +1207,13 @@ class BkBaseSQLRunner:
         self.api_client = api_client
         self.sql_statements: List[str] = []
 
-    def run_count(self, query: exp.Select) -> int:
-        count_sql = query.sql(dialect="mysql")
-        logger.info("BKBase count SQL: %s", count_sql)
-        self.sql_statements.append(count_sql)
+    def record(self, query: exp.Select, kind: str) -> str:
+        sql = query.sql(dialect="mysql")
+        logger.info("BKBase %s SQL: %s", kind, sql)
+        self.sql_statements.append(sql)
+        return sql
+
+    def fetch_count(self, count_sql: str) -> int:
         count_resp = self.api_client(sql=count_sql) or {}
         results = count_resp.get("list") or []
         try:
@@ -1065,13 +1221,16 @@ class BkBaseSQLRunner:
         except (TypeError, ValueError):
             return 0
 
-    def run_data(self, query: exp.Select) -> List[Dict[str, Any]]:
-        data_sql = query.sql(dialect="mysql")
-        logger.info("BKBase data SQL: %s", data_sql)
-        self.sql_statements.append(data_sql)
+    def fetch_data(self, data_sql: str) -> List[Dict[str, Any]]:
         data_resp = self.api_client(sql=data_sql) or {}
         return data_resp.get("list") or []
 
+    def run_count(self, query: exp.Select) -> int:
+        return self.fetch_count(self.record(query, "count"))
+
+    def run_data(self, query: exp.Select) -> List[Dict[str, Any]]:
+        return self.fetch_data(self.record(query, "data"))
+
 
 class BkBaseCountExecutor:
     """负责执行 count 查询。"""
@@ -1081,18 +1240,41 @@ class BkBaseCountExecutor:
         components_builder: BkBaseQueryComponentsBuilder,
         count_query_builder: BkBaseCountQueryBuilder,
         sql_runner: BkBaseSQLRunner,
+        count_cache: Optional[VersionedCache] = None,
     ) -> None:
         self.components_builder = components_builder
         self.count_query_builder = count_query_builder
         self.sql_runner = sql_runner
+        self.count_cache = count_cache
 
-    def execute(self, base_expression: exp.Expression) -> Tuple[int, BkBaseQueryComponents]:
+    def prepare(self, base_expression: exp.Expression) -> Tuple[BkBaseQueryComponents, exp.Select]:
         components = self.components_builder.build(base_expression)
-        count_query = self.count_query_builder.build(components)
-        total = self.sql_runner.run_count(count_query)
+        return components, self.count_query_builder.build(components)
+
+    def get_cached(self, count_query: exp.Select) -> Optional[int]:
+        if self.count_cache is None:
+            return None
+        return self.count_cache.get(self._cache_key(count_query))
+
+    def fetch(self, count_query: exp.Select, count_sql: str) -> int:
+        total = self.sql_runner.fetch_count(count_sql)
+        if self.count_cache is not None:
+            self.count_cache.set(self._cache_key(count_query), total)
+        return total
+
+    def execute(self, base_expression: exp.Expression) -> Tuple[int, BkBaseQueryComponents]:
+        components, count_query = self.prepare(base_expression)
+        total = self.get_cached(count_query)
+        if total is None:
+            total = self.fetch(count_query, self.sql_runner.record(count_query, "count"))
         # 返回组件以便数据查询沿用同一份 matched_event 子查询。
         return total, components
 
+    @staticmethod
+    def _cache_key(count_query: exp.Select) -> str:
+        # count SQL 由权限、筛选条件编译而来，规范化后即可作为筛选条件的唯一标识
+        return hashlib.md5(count_query.sql(dialect="mysql", normalize=True).encode()).hexdigest()
+
 
 class BkBaseDataExecutor:
     """负责执行数据查询。"""
@@ -1107,7 +1289,7 @@ class BkBaseDataExecutor:
         self.data_query_builder = data_query_builder
         self.sql_runner = sql_runner
 
-    def execute(
+    def prepare(
         self,
         base_expression: exp.Expression,
         *,
@@ -1115,14 +1297,31 @@ class BkBaseDataExecutor:
         limit: int,
         offset: int,
         components: Optional[BkBaseQueryComponents] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> exp.Select:
         base_components = components or self.components_builder.build(base_expression)
-        data_query = self.data_query_builder.build(
+        return self.data_query_builder.build(
             base_components,
             order_fields=order_fields,
             limit=limit,
             offset=offset,
         )
+
+    def execute(
+        self,
+        base_expression: exp.Expression,
+        *,
+        order_fields: List[str],
+        limit: int,
+        offset: int,
+        components: Optional[BkBaseQueryComponents] = None,
+    ) -> List[Dict[str, Any]]:
+        data_query = self.prepare(
+            base_expression,
+            order_fields=order_fields,
+            limit=limit,
+            offset=offset,
+            components=components,
+        )
         return self.sql_runner.run_data(data_query)
 
 
@@ -1188,8 +1387,22 @@ class BkBaseResponseAssembler:
         return response
 
 
+@dataclass
+class BkBaseQueryPlan:
+    """风险列表一页的查询结果。"""
+
+    page: Any
+    manual_ids: List[str]
+    risk_rows: List[Dict[str, Any]]
+
+
 class BkBaseQueryPlanner:
-    """调度 count/data 执行与分页处理。"""
+    """
+    调度 count/data 执行与分页处理。
+
+    count 结果按规范化后的 count SQL 缓存，同一筛选条件翻页时直接复用；
+    count 未命中且请求中的页码可直接推算 offset 时，count 与 data 并发执行。
+    """
 
     def __init__(
         self,
@@ -1199,34 +1412,77 @@ class BkBaseQueryPlanner:
         data_executor: BkBaseDataExecutor,
         pagination_planner: BkBasePaginationPlanner,
         sql_runner: BkBaseSQLRunner,
+        manual_helper: Optional[ManualUnsyncedRiskPrepender] = None,
     ):
         self.queryset_expression = queryset_expression
         self.count_executor = count_executor
         self.data_executor = data_executor
         self.pagination_planner = pagination_planner
         self.sql_runner = sql_runner
+        self.manual_helper = manual_helper
 
     def plan(
         self,
         request,
         *,
         order_fields: List[str],
-    ) -> Tuple[List[Dict[str, Any]], Any]:
-        total, components = self.count_executor.execute(self.queryset_expression)
-        page, limit, offset = self.pagination_planner.paginate(total, request)
-
-        data_rows: List[Dict[str, Any]] = []
-        if total:
+    ) -> BkBaseQueryPlan:
+        manual_count = self.manual_helper.count() if self.manual_helper else 0
+        components, count_query = self.count_executor.prepare(self.queryset_expression)
+        bkbase_total = self.count_executor.get_cached(count_query)
+
+        prefetched: Optional[Tuple[Tuple[int, int], List[Dict[str, Any]]]] = None
+        predicted = self.pagination_planner.predict(request) if bkbase_total is None else None
+        data_window = self._split_window(manual_count, *predicted) if predicted else (0, 0)
+        if bkbase_total is None and data_window[0]:
             # 复用 count 阶段生成的组件，避免重复构造冗长的 sqlglot AST。
-            data_rows = self.data_executor.execute(
+            data_query = self.data_executor.prepare(
                 self.queryset_expression,
                 order_fields=order_fields,
-                limit=limit,
-                offset=offset,
+                limit=data_window[0],
+                offset=data_window[1],
                 components=components,
             )
+            # 主线程中按 count/data 顺序记录 SQL，保证返回的 sql 列表顺序稳定
+            count_sql = self.sql_runner.record(count_query, "count")
+            data_sql = self.sql_runner.record(data_query, "data")
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                count_future = submit_with_observation_context(
+                    executor, self.count_executor.fetch, count_query, count_sql
+                )
+                data_future = submit_with_observation_context(executor, self.sql_runner.fetch_data, data_sql)
+                bkbase_total = count_future.result()
+                prefetched = (data_window, data_future.result())
+        elif bkbase_total is None:
+            bkbase_total = self.count_executor.fetch(count_query, self.sql_runner.record(count_query, "count"))
+
+        page, limit, offset = self.pagination_planner.paginate(bkbase_total + manual_count, request)
+        manual_ids = self.manual_helper.slice_ids(offset, limit) if self.manual_helper else []
+        bkbase_limit, bkbase_offset = self._split_window(manual_count, limit, offset)
+
+        risk_rows: List[Dict[str, Any]] = []
+        if not (bkbase_limit and bkbase_total):
+            return BkBaseQueryPlan(page=page, manual_ids=manual_ids, risk_rows=risk_rows)
+        if prefetched and prefetched[0] == (bkbase_limit, bkbase_offset):
+            risk_rows = prefetched[1]
+        else:
+            # 实际分页结果与预测不一致时重新查询
+            risk_rows = self.data_executor.execute(
+                self.queryset_expression,
+                order_fields=order_fields,
+                limit=bkbase_limit,
+                offset=bkbase_offset,
+                components=components,
+            )
+
+        return BkBaseQueryPlan(page=page, manual_ids=manual_ids, risk_rows=risk_rows)
+
+    @staticmethod
+    def _split_window(manual_count: int, limit: int, offset: int) -> Tuple[int, int]:
+        """未同步的手工风险排在最前，换算出 BKBase 部分需要查询的 limit/offset。"""
 
-        return data_rows, page
+        manual_filled = min(max(manual_count - offset, 0), limit)
+        return max(limit - manual_filled, 0), max(offset - manual_count, 0)
 
     @property
     def sql_statements(self) -> List[str]:
@@ -18,6 +18,7 @@ to the current version of the project delivered to anyone in the future.
 
 import datetime
 import os
+from typing import Iterator, List
 
 from bk_resource import api, resource
 from bk_resource.utils.common_utils import uniqid
@@ -26,10 +27,12 @@ from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext
+from elasticsearch import Elasticsearch
 
 from apps.exceptions import MetaConfigNotExistException
 from apps.meta.constants import ConfigLevelChoices, EtlConfigEnum
 from apps.meta.models import GlobalMetaConfig
+from core.utils.cache import LocalTTLCache
 from core.utils.retry import FuncRunner
 from services.web.databus.constants import (
     DEFAULT_CATEGORY_ID,
@@ -52,10 +55,14 @@ from services.web.risk.constants import (
     EVENT_ES_CLUSTER_ID_KEY,
     INDEX_TIME_FORMAT,
     RISK_SYNC_SCROLL,
+    RISK_SYNC_SCROLL_CLIENT_CACHE_TTL,
     WRITE_INDEX_FORMAT,
     EventMappingFields,
 )
 
+# 清理滚动上下文的 ES 客户端，按集群 ID 缓存
+scroll_clients = LocalTTLCache(maxsize=8, ttl=RISK_SYNC_SCROLL_CLIENT_CACHE_TTL)
+
 
 class EventHandler(ElasticHandler):
     """
@@ -233,6 +240,22 @@ class EventHandler(ElasticHandler):
 
     @classmethod
     def search_all_event(cls, namespace: str, start_time: str, end_time: str, page: int, page_size: int, **kwargs):
+        data = []
+        for hits in cls.iter_all_event(
+            namespace=namespace, start_time=start_time, end_time=end_time, page=page, page_size=page_size, **kwargs
+        ):
+            data.extend(hits)
+        return data
+
+    @classmethod
+    def iter_all_event(
+        cls, namespace: str, start_time: str, end_time: str, page: int, page_size: int, **kwargs
+    ) -> Iterator[List[dict]]:
+        """
+        按页流式返回事件，内存中只保留当前页
+        迭代结束或异常时清理滚动上下文
+        """
+
         # 获取单次结果
         resp = cls.search_event(
             namespace=namespace,
@@ -243,29 +266,63 @@ class EventHandler(ElasticHandler):
             scroll=RISK_SYNC_SCROLL,
             **kwargs,
         )
-        data: list = resp["results"]
-        # 判断是否需要滚动查询
-        if resp["total"] <= page_size:
-            return data
-        # 滚动查询
-        scroll_id = resp["scroll_id"]
-        while True:
-            resp = FuncRunner(
-                func=api.bk_log.es_query_scroll,
-                kwargs={
-                    "indices": cls.get_table_id().replace(".", "_"),
-                    "scenario_id": "log",
-                    "storage_cluster_id": GlobalMetaConfig.get(EVENT_ES_CLUSTER_ID_KEY),
-                    "scroll": RISK_SYNC_SCROLL,
-                    "scroll_id": scroll_id,
-                },
-            ).run()
-            hits = [HitsFormatter(hit["_source"], []).value for hit in resp.get("hits", {}).get("hits", [])]
-            if not hits:
-                break
-            data.extend(hits)
-            scroll_id = resp["_scroll_id"]
-        return data
+        scroll_id = resp.get("scroll_id")
+        storage_cluster_id = None
+        try:
+            if resp["results"]:
+                yield resp["results"]
+            # 判断是否需要滚动查询
+            if resp["total"] <= page_size:
+                return
+            # 滚动查询
+            indices = cls.get_table_id().replace(".", "_")
+            storage_cluster_id = GlobalMetaConfig.get(EVENT_ES_CLUSTER_ID_KEY)
+            while True:
+                resp = FuncRunner(
+                    func=api.bk_log.es_query_scroll,
+                    kwargs={
+                        "indices": indices,
+                        "scenario_id": "log",
+                        "storage_cluster_id": storage_cluster_id,
+                        "scroll": RISK_SYNC_SCROLL,
+                        "scroll_id": scroll_id,
+                    },
+                ).run()
+                hits = [HitsFormatter(hit["_source"], []).value for hit in resp.get("hits", {}).get("hits", [])]
+                if not hits:
+                    break
+                scroll_id = resp.get("_scroll_id") or scroll_id
+                yield hits
+        finally:
+            cls.clear_scroll(scroll_id, storage_cluster_id)
+
+    @classmethod
+    def clear_scroll(cls, scroll_id: str, storage_cluster_id: int = None) -> None:
+        """
+        在滚动查询所在集群上清理滚动上下文，失败时仅记录日志，等待其自然过期
+        未返回 scroll_id 时不做任何请求
+        """
+
+        if not scroll_id:
+            return
+        try:
+            if storage_cluster_id is None:
+                storage_cluster_id = GlobalMetaConfig.get(EVENT_ES_CLUSTER_ID_KEY)
+            cls.get_scroll_client(storage_cluster_id).clear_scroll(scroll_id=scroll_id)
+        except Exception as err:  # NOCC:broad-except(清理失败不影响主流程)
+            logger.warning("[ClearScrollFailed] ScrollID => %s; Error => %s", scroll_id, err)
+
+    @classmethod
+    def get_scroll_client(cls, storage_cluster_id: int) -> Elasticsearch:
+        """
+        获取集群的 ES 客户端，进程内复用，避免每次清理都查询集群信息并新建连接
+        """
+
+        client = scroll_clients.get(storage_cluster_id)
+        if client is None:
+            client = cls.get_client(**cls.get_es_config(storage_cluster_id))
+            scroll_clients.set(storage_cluster_id, client)
+        return client
 
     @classmethod
     def search_event(cls, namespace: str, start_time: str, end_time: str, page: int, page_size: int, **kwargs):
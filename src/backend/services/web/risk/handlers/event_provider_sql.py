@@ -18,19 +18,23 @@ to the current version of the project delivered to anyone in the future.
 EventProvider SQL 生成器
 
 纯 SQL 生成，不负责执行查询。
-使用 BkbaseDorisSqlGenerator 生成聚合、Latest、First 三种 SQL。
+使用 BkbaseDorisSqlGenerator 生成聚合、Latest、First 三种 SQL；
+批量导出场景使用窗口函数按风险分组拉取最近事件。
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from django.conf import settings
 from django.utils import timezone
+from pypika import Criterion
 from pypika import Order as PypikaOrder
+from pypika import analytics
+from pypika.terms import ValueWrapper
 
 from apps.meta.constants import ConfigLevelChoices
 from apps.meta.models import GlobalMetaConfig
-from core.sql.builder.builder import BKBaseQueryBuilder
+from core.sql.builder.builder import BKBaseQueryBuilder, BkBaseTable
 from core.sql.builder.generator import BkbaseDorisSqlGenerator
 from core.sql.constants import AggregateType, FieldType, Operator
 from core.sql.model import (
@@ -282,6 +286,13 @@ class RiskEventAggregateSqlBuilder(EventAggregateSqlBuilder):
             rt_id = f"{rt_id}.{cls.STORAGE_SUFFIX}"
         return rt_id
 
+    @classmethod
+    def get_time_range(cls, risk: "Risk") -> Tuple[int, int]:
+        """获取风险事件时间范围（毫秒时间戳），未结束的风险以当前时间为终点"""
+
+        end_time = ceil_to_second(risk.event_end_time) if risk.event_end_time else timezone.now()
+        return int(risk.event_time.timestamp() * 1000), int(end_time.timestamp() * 1000)
+
     def __init__(self, risk: "Risk"):
         """
         初始化
@@ -290,12 +301,122 @@ class RiskEventAggregateSqlBuilder(EventAggregateSqlBuilder):
             risk: Risk 对象
         """
         self.risk = risk
-        end_time = ceil_to_second(risk.event_end_time) if risk.event_end_time else timezone.now()
+        start_time, end_time = self.get_time_range(risk)
 
         super().__init__(
             table_name=self.get_rt_id(),
             strategy_id=risk.strategy_id,
             raw_event_id=risk.raw_event_id,
-            start_time=int(risk.event_time.timestamp() * 1000),
-            end_time=int(end_time.timestamp() * 1000),
+            start_time=start_time,
+            end_time=end_time,
+        )
+
+
+class RiskEventWindowSqlBuilder:
+    """
+    批量风险事件查询 SQL Builder
+
+    事件表没有 risk_id 列，先将每个风险的 (risk_id, strategy_id, raw_event_id, 起止时间) 以 UNION ALL 构造为派生表，
+    与事件表关联标记所属风险，时间范围重叠的多个风险各自得到一行事件；
+    再使用 ROW_NUMBER() OVER (PARTITION BY risk_id ORDER BY dtEventTimeStamp DESC) 为每个风险保留最近 N 条事件，
+    一条 SQL 即可取回一批风险的事件。
+    """
+
+    TABLE_ALIAS: str = "t"
+    RISK_WINDOW_ALIAS: str = "risk_window"
+    TAGGED_ALIAS: str = "tagged"
+    RANKED_ALIAS: str = "ranked"
+    RISK_ID_FIELD: str = "risk_id"
+    ROW_NUMBER_FIELD: str = "_row_number"
+    START_TIME_FIELD: str = "start_time"
+    END_TIME_FIELD: str = "end_time"
+
+    def __init__(self, table_name: str, limit_per_risk: int):
+        """
+        初始化
+
+        Args:
+            table_name: BKBase 表名，如 "591_xxx_1.doris"
+            limit_per_risk: 每个风险最多保留的事件数
+        """
+        self.table_name = table_name
+        self.limit_per_risk = limit_per_risk
+
+    def build_sql(self, risks: List["Risk"]) -> Optional[str]:
+        """
+        构建批量查询 SQL
+
+        Args:
+            risks: Risk 对象列表
+
+        Returns:
+            SQL 字符串，或 None（风险为空时）
+        """
+        if not risks:
+            return None
+
+        table = BkBaseTable(self.table_name).as_(self.TABLE_ALIAS)
+        risk_windows = []
+        conditions = []
+        for risk in risks:
+            start_time, end_time = RiskEventAggregateSqlBuilder.get_time_range(risk)
+            risk_windows.append(
+                BKBaseQueryBuilder().select(
+                    ValueWrapper(risk.risk_id).as_(self.RISK_ID_FIELD),
+                    ValueWrapper(risk.strategy_id).as_("strategy_id"),
+                    ValueWrapper(risk.raw_event_id).as_("raw_event_id"),
+                    ValueWrapper(start_time).as_(self.START_TIME_FIELD),
+                    ValueWrapper(end_time).as_(self.END_TIME_FIELD),
+                )
+            )
+            # 事件表扫描条件，关联前先过滤
+            conditions.append(
+                (table.strategy_id == risk.strategy_id)
+                & (table.raw_event_id == risk.raw_event_id)
+                & table.dtEventTimeStamp[start_time:end_time]
+            )
+
+        risk_window = risk_windows[0]
+        for window in risk_windows[1:]:
+            risk_window = risk_window * window
+        risk_window = risk_window.as_(self.RISK_WINDOW_ALIAS)
+
+        tagged = (
+            BKBaseQueryBuilder()
+            .from_(table)
+            .join(risk_window)
+            .on(
+                (table.strategy_id == risk_window.strategy_id)
+                & (table.raw_event_id == risk_window.raw_event_id)
+                & table.dtEventTimeStamp[
+                    risk_window.field(self.START_TIME_FIELD) : risk_window.field(self.END_TIME_FIELD)
+                ]
+            )
+            .select(risk_window.field(self.RISK_ID_FIELD), table.event_data, table.dtEventTimeStamp)
+            .where(Criterion.any(conditions))
+            .as_(self.TAGGED_ALIAS)
+        )
+        row_number = (
+            analytics.RowNumber()
+            .over(tagged.field(self.RISK_ID_FIELD))
+            .orderby(tagged.dtEventTimeStamp, order=PypikaOrder.desc)
+        )
+        ranked = (
+            BKBaseQueryBuilder()
+            .from_(tagged)
+            .select(
+                tagged.field(self.RISK_ID_FIELD),
+                tagged.event_data,
+                tagged.dtEventTimeStamp,
+                row_number.as_(self.ROW_NUMBER_FIELD),
+            )
+            .as_(self.RANKED_ALIAS)
+        )
+        query = (
+            BKBaseQueryBuilder()
+            .from_(ranked)
+            .select(ranked.field(self.RISK_ID_FIELD), ranked.event_data, ranked.dtEventTimeStamp)
+            .where(ranked.field(self.ROW_NUMBER_FIELD) <= self.limit_per_risk)
+            .orderby(ranked.dtEventTimeStamp, order=PypikaOrder.desc)
         )
+        return str(query)
@@ -21,12 +21,16 @@ import json
 import math
 import re
 import uuid
-from typing import List, Optional, Set, Tuple, Union
+import zlib
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from bk_resource import resource
 from blueapps.utils.logger import logger
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Q, QuerySet
 from django.utils import timezone
 from django.utils.translation import gettext
@@ -38,18 +42,26 @@ from apps.notice.constants import RelateType
 from apps.notice.handlers import ErrorMsgHandler
 from apps.notice.models import NoticeGroup
 from core.render import Jinja2Renderer, VariableUndefined
+from core.utils.data import data_chunks
+from core.utils.lock import wait_lock
 from services.web.risk.constants import (
     EVENT_DATA_SORT_FIELD,
     EVENT_TYPE_SPLIT_REGEX,
     RISK_EVENT_LATEST_TIME_KEY,
+    RISK_EVENTS_SYNC_TIME,
+    RISK_GENERATE_BULK_SIZE,
+    RISK_GENERATE_LOCK_PARTITIONS,
+    RISK_GENERATE_LOCK_TIMEOUT,
+    RISK_GENERATE_PARTITION_LOCK_KEY,
     RISK_RENDER_LOCK_KEY,
     RISK_SYNC_BATCH_SIZE,
+    RISK_SYNC_SLICE_FINISHED_KEY,
     RISK_SYNC_START_TIME_KEY,
     RiskDisplayStatus,
     RiskStatus,
 )
 from services.web.risk.handlers import EventHandler
-from services.web.risk.models import Risk
+from services.web.risk.models import Risk, generate_risk_id
 from services.web.risk.parser import RiskNoticeParser
 from services.web.risk.serializers import CreateRiskSerializer
 from services.web.strategy_v2.constants import StrategyStatusChoices
@@ -104,23 +116,294 @@ class RiskHandler:
                 raise err
 
     def generate_risk_from_event(
-        self, start_time: datetime.datetime, end_time: datetime.datetime, extra_filter: Optional[Q] = None
+        self,
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        extra_filter: Optional[Q] = None,
+        checkpoint: bool = True,
+        partition_lock: bool = False,
     ) -> None:
         """
         从事件生成风险
+        按页消费事件，时间片全部处理完成后才记录同步进度
+        :param checkpoint: 是否记录全局同步进度，并行时间片由调度方统一推进
+        :param partition_lock: 是否按 (strategy_id, raw_event_id) 分区加锁，并行时间片需要开启
         """
         eligible_strategy_ids = self.fetch_eligible_strategy_ids(extra_filter=extra_filter)
-        events = self.load_events(start_time, end_time)
+        total = 0
+        for events in self.iter_events(start_time, end_time):
+            total += len(events)
+            if settings.ENABLE_BULK_GENERATE_RISK:
+                self.bulk_generate_risk(events, eligible_strategy_ids, partition_lock=partition_lock)
+                continue
+            for event in events:
+                partitions = (
+                    {self.get_partition(event.get("strategy_id"), event.get("raw_event_id"))}
+                    if partition_lock
+                    else set()
+                )
+                with self.partition_lock(partitions):
+                    self.generate_risk(event, eligible_strategy_ids)
+        logger.info("[LoadEventSuccess] Total %d", total)
+
+        # 存储同步进度
+        if checkpoint:
+            GlobalMetaConfig.set(config_key=RISK_SYNC_START_TIME_KEY, config_value=math.floor(end_time.timestamp()))
+
+    def bulk_generate_risk(
+        self, events: List[dict], eligible_strategy_ids: Set[str], partition_lock: bool = False
+    ) -> List[str]:
+        """
+        批量生成风险
+        1. 校验事件并按 (strategy_id, raw_event_id) 分组
+        2. 分块预加载候选风险与策略，在内存中合并同一风险的多次更新
+        3. 每块使用 bulk_create / bulk_update 落库，再逐个风险触发渲染、通知与单据处理
+        :param events: 事件
+        :param eligible_strategy_ids: 可用策略ID集合
+        :param partition_lock: 是否按分区加锁，开启后每块只包含同一分区的风险
+        :return: 涉及的风险ID
+        """
+
+        grouped_events = self.group_events(events, eligible_strategy_ids)
+        if not grouped_events:
+            return []
+
+        strategies = {
+            strategy.strategy_id: strategy
+            for strategy in Strategy.objects.filter(strategy_id__in={key[0] for key in grouped_events.keys()})
+        }
+
+        # 按分区聚合，未开启分区锁时全部视为同一分区
+        keys_by_partition = defaultdict(list)
+        for key in grouped_events.keys():
+            keys_by_partition[self.get_partition(*key) if partition_lock else None].append(key)
+
+        risk_ids = []
+        for partition, partition_keys in keys_by_partition.items():
+            for chunk_keys in data_chunks(partition_keys, RISK_GENERATE_BULK_SIZE):
+                chunk_events = {key: grouped_events[key] for key in chunk_keys}
+                with self.partition_lock({partition} if partition is not None else set()):
+                    try:
+                        created_risks, touched_risks = self._bulk_save_risks(chunk_events, strategies)
+                    except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+                        # 批量写入失败时回退到逐个事件处理，保证单个异常事件不影响整块
+                        logger.exception("[BulkCreateRiskFailed] Fallback to single mode; Error: %s", err)
+                        for key in chunk_keys:
+                            for event in chunk_events[key]:
+                                risk_id = self.generate_risk(event, eligible_strategy_ids)
+                                if risk_id:
+                                    risk_ids.append(risk_id)
+                        continue
+                self._dispatch_risk_side_effects(created_risks, touched_risks)
+                risk_ids.extend(risk.risk_id for risk in touched_risks)
+        return risk_ids
+
+    @classmethod
+    def get_partition(cls, strategy_id: int, raw_event_id: str) -> int:
+        """
+        计算 (strategy_id, raw_event_id) 所属分区，需跨进程稳定，不能使用 hash()
+        """
+
+        return zlib.crc32(f"{strategy_id}:{raw_event_id}".encode()) % RISK_GENERATE_LOCK_PARTITIONS
+
+    @classmethod
+    @contextmanager
+    def partition_lock(cls, partitions: Set[int]):
+        """
+        按分区顺序加锁，保证并行时间片不会同时处理同一风险
+        """
+
+        with ExitStack() as stack:
+            for partition in sorted(partitions):
+                stack.enter_context(
+                    wait_lock(
+                        RISK_GENERATE_PARTITION_LOCK_KEY.format(partition=partition),
+                        ttl=RISK_GENERATE_LOCK_TIMEOUT,
+                        wait_timeout=RISK_GENERATE_LOCK_TIMEOUT,
+                    )
+                )
+            yield
+
+    @classmethod
+    def mark_slice_finished(cls, start_time: datetime.datetime, end_time: datetime.datetime) -> None:
+        """
+        记录并行时间片已处理完成
+        """
+
+        cache.set(
+            RISK_SYNC_SLICE_FINISHED_KEY.format(start_time=math.floor(start_time.timestamp())),
+            math.floor(end_time.timestamp()),
+            timeout=RISK_EVENTS_SYNC_TIME * 24 * 60 * 60,
+        )
+
+    @classmethod
+    def advance_sync_start_time(cls, start_time: datetime.datetime) -> datetime.datetime:
+        """
+        沿已完成的连续时间片推进同步进度，返回推进后的起始时间
+        """
+
+        sync_start_time = math.floor(start_time.timestamp())
+        while True:
+            end_time = cache.get(RISK_SYNC_SLICE_FINISHED_KEY.format(start_time=sync_start_time))
+            if not end_time:
+                break
+            sync_start_time = end_time
+        if sync_start_time != math.floor(start_time.timestamp()):
+            GlobalMetaConfig.set(config_key=RISK_SYNC_START_TIME_KEY, config_value=sync_start_time)
+            return datetime.datetime.fromtimestamp(sync_start_time)
+        return start_time
+
+    @classmethod
+    def is_slice_finished(cls, start_time: datetime.datetime) -> bool:
+        """
+        时间片是否已处理完成
+        """
+
+        return bool(cache.get(RISK_SYNC_SLICE_FINISHED_KEY.format(start_time=math.floor(start_time.timestamp()))))
+
+    def group_events(self, events: List[dict], eligible_strategy_ids: Set[str]) -> Dict[Tuple[int, str], List[dict]]:
+        """
+        校验事件，并按 (strategy_id, raw_event_id) 分组，组内保持原有顺序
+        """
+
+        grouped_events = defaultdict(list)
         for event in events:
-            self.generate_risk(event, eligible_strategy_ids)
+            serializer = CreateRiskSerializer(data=event)
+            if not serializer.is_valid():
+                logger.error("[CreateRiskFailed] Event Invalid: %s", json.dumps(event))
+                continue
+            validated_event = serializer.validated_data
+            if validated_event["strategy_id"] not in eligible_strategy_ids:
+                logger.info(
+                    "[SkipCreateRisk] Strategy not found. strategy_id=%s, raw_event_id=%s",
+                    validated_event["strategy_id"],
+                    validated_event.get("raw_event_id"),
+                )
+                continue
+            grouped_events[(validated_event["strategy_id"], validated_event["raw_event_id"])].append(validated_event)
+        return grouped_events
+
+    def load_candidate_risks(self, event_keys: List[Tuple[int, str]], min_event_time: float) -> Dict[tuple, List[Risk]]:
+        """
+        一次性加载可能被事件命中的风险: 未关单，或事件结束时间不早于最早事件时间
+        """
+
+        raw_event_ids_by_strategy = defaultdict(set)
+        for strategy_id, raw_event_id in event_keys:
+            raw_event_ids_by_strategy[strategy_id].add(raw_event_id)
+        key_filter = Q()
+        for strategy_id, raw_event_ids in raw_event_ids_by_strategy.items():
+            key_filter |= Q(strategy_id=strategy_id, raw_event_id__in=raw_event_ids)
+        risks = Risk.objects.filter(key_filter).filter(
+            ~Q(status=RiskStatus.CLOSED)
+            | Q(event_end_time__gte=datetime.datetime.fromtimestamp(min_event_time, tz=timezone.get_default_timezone()))
+        )
+        candidate_risks = defaultdict(list)
+        for risk in risks:
+            candidate_risks[(risk.strategy_id, risk.raw_event_id)].append(risk)
+        return candidate_risks
+
+    @classmethod
+    def match_candidate_risk(cls, candidate_risks: List[Risk], event_time: float) -> Optional[Risk]:
+        """
+        在候选风险中选出事件应当收敛的风险，与 create_risk 的查询条件保持一致
+        """
+
+        matched_risks = [
+            risk
+            for risk in candidate_risks
+            if risk.status != RiskStatus.CLOSED
+            or (risk.event_end_time and risk.event_end_time.timestamp() >= event_time)
+        ]
+        if not matched_risks:
+            return None
+        return max(matched_risks, key=lambda risk: risk.event_time.timestamp())
+
+    @transaction.atomic()
+    def _bulk_save_risks(
+        self, grouped_events: Dict[Tuple[int, str], List[dict]], strategies: Dict[int, Strategy]
+    ) -> Tuple[List[Risk], List[Risk]]:
+        """
+        合并同一风险的所有更新后批量写入
+        :return: (新建的风险, 涉及的全部风险)
+        """
+
+        min_event_time = min(event["event_time"] for events in grouped_events.values() for event in events) / 1000
+        candidate_risks = self.load_candidate_risks(list(grouped_events.keys()), min_event_time)
+
+        created_risks: List[Risk] = []
+        touched_risks: Dict[str, Risk] = {}
+        update_fields_map: Dict[str, Set[str]] = defaultdict(set)
+        created_risk_ids = set()
+        for key, events in grouped_events.items():
+            candidates = candidate_risks[key]
+            for event in events:
+                risk = self.match_candidate_risk(candidates, event["event_time"] / 1000)
+                if risk:
+                    update_fields = self.merge_event_to_risk(risk, event)
+                    if risk.risk_id not in created_risk_ids:
+                        update_fields_map[risk.risk_id].update(update_fields)
+                    touched_risks[risk.risk_id] = risk
+                    continue
+                create_params = self.gen_risk_create_params(event, strategy=strategies.get(event["strategy_id"]))
+                risk = Risk(**create_params)
+                # 同一批次内生成的风险ID可能重复，需要重新生成
+                while risk.risk_id in created_risk_ids:
+                    risk.risk_id = generate_risk_id()
+                created_risk_ids.add(risk.risk_id)
+                candidates.append(risk)
+                created_risks.append(risk)
+                touched_risks[risk.risk_id] = risk
+
+        # 按更新字段分组批量更新，避免覆盖未变更的字段
+        risks_by_fields = defaultdict(list)
+        for risk_id, update_fields in update_fields_map.items():
+            if update_fields:
+                risks_by_fields[tuple(sorted(update_fields))].append(touched_risks[risk_id])
+        for update_fields, risks in risks_by_fields.items():
+            Risk.objects.bulk_update(risks, fields=list(update_fields), batch_size=RISK_GENERATE_BULK_SIZE)
+        if created_risks:
+            Risk.objects.bulk_create(created_risks, batch_size=RISK_GENERATE_BULK_SIZE)
+        logger.info(
+            "[BulkCreateRisk] Created %d risks; Updated %d risks",
+            len(created_risks),
+            sum(len(risks) for risks in risks_by_fields.values()),
+        )
+
+        # 复用预加载的策略，避免后续逐个查询
+        for risk in touched_risks.values():
+            if risk.strategy_id in strategies:
+                risk.strategy = strategies[risk.strategy_id]
+        return created_risks, list(touched_risks.values())
+
+    def _dispatch_risk_side_effects(self, created_risks: List[Risk], touched_risks: List[Risk]) -> None:
+        """
+        逐个风险触发渲染、通知与单据处理，单个风险失败不影响其他风险
+        """
+
+        from services.web.risk.tasks import process_risk_ticket
 
-    def load_events(self, start_time: datetime.datetime, end_time: datetime.datetime) -> List[dict]:
+        created_risk_ids = {risk.risk_id for risk in created_risks}
+        for risk in touched_risks:
+            try:
+                self.trigger_render_task(risk)
+                if risk.risk_id not in created_risk_ids:
+                    continue
+                self.send_risk_notice(risk, strategy=risk.strategy)
+                process_risk_ticket(risk_id=risk.risk_id)
+            except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+                logger.exception("[DispatchRiskFailed] RiskID: %s; Error: %s", risk.risk_id, err)
+                ErrorMsgHandler(
+                    title=gettext("Create Risk Failed"),
+                    content=gettext("Strategy ID: %s; Raw Event ID:\t%s") % (risk.strategy_id, risk.raw_event_id),
+                ).send()
+
+    def iter_events(self, start_time: datetime.datetime, end_time: datetime.datetime) -> Iterator[List[dict]]:
         """
-        加载事件
+        按页加载事件
         """
 
-        # 加载数据
-        data = EventHandler.search_all_event(
+        return EventHandler.iter_all_event(
             namespace=settings.DEFAULT_NAMESPACE,
             start_time=start_time.strftime(api_settings.DATETIME_FORMAT),
             end_time=end_time.strftime(api_settings.DATETIME_FORMAT),
@@ -129,21 +412,28 @@ class RiskHandler:
             sort_list=EVENT_DATA_SORT_FIELD,
             include_end_time=False,
         )
-        logger.info("[LoadEventSuccess] Total %d", len(data))
 
-        # 存储起始时间
-        GlobalMetaConfig.set(config_key=RISK_SYNC_START_TIME_KEY, config_value=math.floor(end_time.timestamp()))
+    @classmethod
+    def get_sync_start_time(cls) -> Optional[datetime.datetime]:
+        """
+        获取上次完整处理的时间片结束时间
+        """
 
-        return data
+        timestamp = GlobalMetaConfig.get(config_key=RISK_SYNC_START_TIME_KEY, default=None)
+        if not timestamp:
+            return None
+        return datetime.datetime.fromtimestamp(timestamp)
 
     @classmethod
-    def render_risk_title(cls, create_params: dict) -> Optional[str]:
+    def render_risk_title(cls, create_params: dict, strategy: Optional[Strategy] = None) -> Optional[str]:
         """
         生成风险标题
         自动处理变量中的 list 类型，渲染为逗号拼接的字符串
+        :param strategy: 已加载的策略，未传入时按 strategy_id 查询
         """
         create_params = create_params.copy()
-        strategy: Strategy = Strategy.objects.filter(strategy_id=create_params["strategy_id"]).first()
+        if strategy is None:
+            strategy = Strategy.objects.filter(strategy_id=create_params["strategy_id"]).first()
         if not strategy or not strategy.risk_title:
             return None
 
@@ -171,7 +461,7 @@ class RiskHandler:
             )
             return strategy.risk_title
 
-    def gen_risk_create_params(self, event: dict) -> dict:
+    def gen_risk_create_params(self, event: dict, strategy: Optional[Strategy] = None) -> dict:
         create_params = {
             "event_content": event.get("event_content"),
             "raw_event_id": event["raw_event_id"],
@@ -184,7 +474,7 @@ class RiskHandler:
             "event_source": event.get("event_source"),
             "operator": self.parse_operator(event.get("operator")),
         }
-        create_params["title"] = self.render_risk_title(create_params)
+        create_params["title"] = self.render_risk_title(create_params, strategy=strategy)
         return create_params
 
     def create_risk(
@@ -235,22 +525,9 @@ class RiskHandler:
 
         # 存在则更新结束时间, 风险事件描述
         if risk:
-            last_end_time = event["event_time"] / 1000
-            logger.info("[UpdateRisk] Risk exists. risk_id=%s; last_end_time=%s", risk.risk_id, last_end_time)
-            # 只在事件的时间更新的时候存储
-            if risk.event_end_time.timestamp() < last_end_time:
-                risk.event_end_time = datetime.datetime.fromtimestamp(last_end_time)
-                risk.event_data = event.get("event_data")
-                risk.save(update_fields=["event_end_time", "event_data"])
-            if event.get("event_content") and risk.event_content != event["event_content"]:
-                risk.event_content = event["event_content"]
-                risk.save(update_fields=["event_content"])
-            if event.get("event_type") and risk.event_type != event["event_type"]:
-                risk.event_type = self.parse_event_type(event.get("event_type"))
-                risk.save(update_fields=["event_type"])
-            if event.get("operator") and risk.operator != event["operator"]:
-                risk.operator = self.parse_operator(event.get("operator"))
-                risk.save(update_fields=["operator"])
+            update_fields = self.merge_event_to_risk(risk, event)
+            if update_fields:
+                risk.save(update_fields=update_fields)
             return False, risk
 
         # 不存在则创建
@@ -262,6 +539,34 @@ class RiskHandler:
         logger.info("[CreateRisk] Risk created. risk_id=%s", risk.risk_id)
         return True, risk
 
+    def merge_event_to_risk(self, risk: Risk, event: dict) -> List[str]:
+        """
+        将事件合并到已存在的风险，返回需要更新的字段(仅修改内存对象，不落库)
+        """
+
+        update_fields = []
+        last_end_time = event["event_time"] / 1000
+        logger.info("[UpdateRisk] Risk exists. risk_id=%s; last_end_time=%s", risk.risk_id, last_end_time)
+        # 只在事件的时间更新的时候存储
+        if risk.event_end_time.timestamp() < last_end_time:
+            risk.event_end_time = datetime.datetime.fromtimestamp(last_end_time)
+            risk.event_data = event.get("event_data")
+            update_fields.extend(["event_end_time", "event_data"])
+        if event.get("event_content") and risk.event_content != event["event_content"]:
+            risk.event_content = event["event_content"]
+            update_fields.append("event_content")
+        if event.get("event_type"):
+            event_type = self.parse_event_type(event["event_type"])
+            if risk.event_type != event_type:
+                risk.event_type = event_type
+                update_fields.append("event_type")
+        if event.get("operator"):
+            operator = self.parse_operator(event["operator"])
+            if risk.operator != operator:
+                risk.operator = operator
+                update_fields.append("operator")
+        return update_fields
+
     def trigger_render_task(self, risk: Risk):
         """
         触发渲染任务
@@ -310,13 +615,15 @@ class RiskHandler:
         event_types = [t for t in re.split(EVENT_TYPE_SPLIT_REGEX, (event_type or "")) if t]
         return event_types
 
-    def send_risk_notice(self, risk: Risk) -> None:
+    def send_risk_notice(self, risk: Risk, strategy: Optional[Strategy] = None) -> None:
         """
         发送通知
+        :param strategy: 已加载的策略，未传入时按 strategy_id 查询
         """
 
         # 获取策略
-        strategy = Strategy.objects.filter(strategy_id=risk.strategy_id).first()
+        if strategy is None:
+            strategy = Strategy.objects.filter(strategy_id=risk.strategy_id).first()
         if not strategy:
             return
 
@@ -15,7 +15,7 @@ specific language governing permissions and limitations under the License.
 We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from core.exporter.constants import ExportField
 from core.exporter.export import BaseXlsxFileExporter
@@ -34,6 +34,60 @@ class MultiSheetRiskExporterXlsx(BaseXlsxFileExporter):
         super().__init__(*args, **kwargs)
         self.header_fmt = self.workbook.add_format(self.header_format)
         self.text_fmt = self.workbook.add_format({'num_format': '@'})
+        # sheet_name -> (worksheet, 表头原始字段名, 下一行行号)
+        self._sheets: Dict[str, list] = {}
+
+    @staticmethod
+    def build_safe_sheet_name(sheet_name: str) -> str:
+        """Excel 的 sheet 名称有长度限制 (31个字符)，并且不能包含某些特殊字符"""
+
+        safe_sheet_name = (
+            sheet_name.replace('[', '')
+            .replace(']', '')
+            .replace('*', '')
+            .replace(':', '')
+            .replace('?', '')
+            .replace('/', '\\')
+        )
+        return safe_sheet_name[:31]
+
+    def add_sheet(self, sheet_name: str, headers: List[ExportField]) -> None:
+        """
+        新增 Sheet 并写入表头
+        :param sheet_name: sheet 名称
+        :param headers: 表头
+        """
+
+        worksheet = self.workbook.add_worksheet(self.build_safe_sheet_name(sheet_name))
+
+        # 写入表头
+        display_headers = [field.display_name for field in headers]
+        worksheet.write_row(0, 0, display_headers, self.header_fmt)
+
+        # 设置列宽
+        worksheet.set_column(0, len(display_headers) - 1, 20)
+
+        self._sheets[sheet_name] = [worksheet, [field.raw_name for field in headers], 1]
+
+    def write_rows(self, sheet_name: str, data_rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        向已创建的 Sheet 追加数据行
+        constant_memory 模式下同一 Sheet 的行需按顺序写入，调用方需保证各 Sheet 的行连续追加
+        :param sheet_name: sheet 名称
+        :param data_rows: 数据行
+        :return: 本次写入的行数
+        """
+
+        sheet = self._sheets[sheet_name]
+        worksheet, raw_field_names, start_row = sheet
+        row_num = start_row
+        for row_data in data_rows:
+            # 按表头顺序提取数据
+            row_values = [str(row_data.get(raw_name, "")) for raw_name in raw_field_names]
+            worksheet.write_row(row_num, 0, row_values, self.text_fmt)
+            row_num += 1
+        sheet[2] = row_num
+        return row_num - start_row
 
     def write(self, sheets_data: Dict[str, List[Dict[str, Any]]], sheets_headers: Dict[str, List[ExportField]]):
         """
@@ -42,38 +96,6 @@ class MultiSheetRiskExporterXlsx(BaseXlsxFileExporter):
         :param sheets_headers: 每个 sheet 的表头. 格式: {"sheet_name": [ExportField_1, ExportField_2]}
         """
 
-        sheet_names = sorted(sheets_headers.keys())
-
-        for sheet_name in sheet_names:
-            headers = sheets_headers[sheet_name]
-            data_rows = sheets_data.get(sheet_name, [])
-
-            # Excel 的 sheet 名称有长度限制 (31个字符)，并且不能包含某些特殊字符
-            safe_sheet_name = (
-                sheet_name.replace('[', '')
-                .replace(']', '')
-                .replace('*', '')
-                .replace(':', '')
-                .replace('?', '')
-                .replace('/', '\\')
-            )
-            safe_sheet_name = safe_sheet_name[:31]
-
-            worksheet = self.workbook.add_worksheet(safe_sheet_name)
-
-            # 写入表头
-            display_headers = [field.display_name for field in headers]
-            worksheet.write_row(0, 0, display_headers, self.header_fmt)
-
-            # 设置列宽
-            worksheet.set_column(0, len(display_headers) - 1, 20)
-
-            # 写入数据
-            if not data_rows:
-                continue
-
-            raw_field_names = [field.raw_name for field in headers]
-            for row_num, row_data in enumerate(data_rows, start=1):
-                # 按表头顺序提取数据
-                row_values = [str(row_data.get(raw_name, "")) for raw_name in raw_field_names]
-                worksheet.write_row(row_num, 0, row_values, self.text_fmt)
+        for sheet_name in sorted(sheets_headers.keys()):
+            self.add_sheet(sheet_name, sheets_headers[sheet_name])
+            self.write_rows(sheet_name, sheets_data.get(sheet_name, []))
@@ -5,13 +5,14 @@
 """
 
 import base64
+import json
 import logging
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
-from typing import BinaryIO, Dict, List
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
 
-from bk_resource import resource
+from bk_resource import api, resource
 from django.conf import settings
 from rest_framework.settings import api_settings
 
@@ -27,6 +28,10 @@ from services.web.risk.constants import (
     RiskExportField,
     RiskViewType,
 )
+from services.web.risk.handlers.event_provider_sql import (
+    RiskEventAggregateSqlBuilder,
+    RiskEventWindowSqlBuilder,
+)
 from services.web.risk.handlers.risk_export import MultiSheetRiskExporterXlsx
 from services.web.risk.models import Risk
 from services.web.strategy_v2.constants import RiskLevel
@@ -70,7 +75,8 @@ class RiskExportService:
     def build_export_file(self) -> RiskExportFile:
         """生成风险导出 XLSX 文件。
 
-        XLSX 写入使用临时文件和 xlsxwriter constant_memory，但风险与事件行当前会先组装到内存中。
+        XLSX 写入使用 xlsxwriter constant_memory；风险按 Sheet 顺序分批拉取事件并逐批写入，
+        事件行不会整体驻留内存。
         """
 
         logger.info(
@@ -82,9 +88,12 @@ class RiskExportService:
         risks = self._load_risks()
         logger.info("[RiskExportService] risks loaded username=%s loaded=%s", self.username, len(risks))
         strategy_export_fields = self._build_strategy_export_fields(risks)
-        formatted_risks_by_strategy = self._build_rows(risks)
         exporter = MultiSheetRiskExporterXlsx()
-        exporter.write(sheets_data=formatted_risks_by_strategy, sheets_headers=strategy_export_fields)
+        for sheet_name in sorted(strategy_export_fields.keys()):
+            exporter.add_sheet(sheet_name, strategy_export_fields[sheet_name])
+        row_count = 0
+        for sheet_name, rows in self._iter_rows(self._sort_risks_by_sheet(risks)):
+            row_count += exporter.write_rows(sheet_name, rows)
         export_file = RiskExportFile(
             file=exporter.save(),
             filename=self.build_filename(self.risk_view_type),
@@ -92,10 +101,11 @@ class RiskExportService:
             view_label=str(RiskViewType.get_label(self.risk_view_type)),
         )
         logger.info(
-            "[RiskExportService] build export file finished username=%s total=%s sheets=%s filename=%s",
+            "[RiskExportService] build export file finished username=%s total=%s sheets=%s rows=%s filename=%s",
             self.username,
             export_file.total,
-            len(formatted_risks_by_strategy),
+            len(strategy_export_fields),
+            row_count,
             export_file.filename,
         )
         return export_file
@@ -126,53 +136,60 @@ class RiskExportService:
             strategy_export_fields[strategy.build_sheet_name()] = risk_basic_fields + event_fields
         return strategy_export_fields
 
-    def _build_rows(self, risks: List[Risk]) -> Dict[str, List[dict]]:
-        """组装导出行数据；一个风险最多展开最近 N 条事件。"""
-
-        logger.info("[RiskExportService] build rows start username=%s total=%s", self.username, len(risks))
-        bulk_resp = self._fetch_events(risks)
-        formatted_risks_by_strategy = defaultdict(list)
-        for risk, resp in zip(risks, bulk_resp):
-            risk_basic_data = self._build_risk_basic_data(risk)
-            events = resp["results"]
-            if not events:
-                formatted_risks_by_strategy[risk.strategy.build_sheet_name()].append(risk_basic_data)
-                continue
-            for event in events:
-                event_data = {
-                    field["field_name"]: event.get("event_data", {}).get(field["field_name"], "")
-                    for field in risk.strategy.event_data_field_configs
-                }
-                formatted_risk = {
+    @staticmethod
+    def _sort_risks_by_sheet(risks: List[Risk]) -> List[Risk]:
+        """按 Sheet 名称排序（Sheet 内保持请求顺序），保证每个 Sheet 的行连续写入。"""
+
+        return sorted(risks, key=lambda risk: risk.strategy.build_sheet_name())
+
+    def _iter_rows(self, risks: List[Risk]) -> Iterator[Tuple[str, List[dict]]]:
+        """逐个风险产出导出行；一个风险最多展开最近 N 条事件。"""
+
+        for risk_batch, events_map in self._fetch_events(risks):
+            for risk in risk_batch:
+                yield risk.strategy.build_sheet_name(), self._build_risk_rows(risk, events_map.get(risk.risk_id, []))
+
+    def _build_risk_rows(self, risk: Risk, events: List[dict]) -> List[dict]:
+        """组装单个风险的导出行，无事件时仅导出风险基础字段。"""
+
+        risk_basic_data = self._build_risk_basic_data(risk)
+        if not events:
+            return [risk_basic_data]
+        rows = []
+        for event in events:
+            event_data = {
+                field["field_name"]: event.get("event_data", {}).get(field["field_name"], "")
+                for field in risk.strategy.event_data_field_configs
+            }
+            rows.append(
+                {
                     **risk_basic_data,
                     **{f"{EVENT_EXPORT_FIELD_PREFIX}{key}": value for key, value in event_data.items()},
                 }
-                formatted_risks_by_strategy[risk.strategy.build_sheet_name()].append(formatted_risk)
-        logger.info(
-            "[RiskExportService] build rows finished username=%s total=%s sheets=%s rows=%s",
-            self.username,
-            len(risks),
-            len(formatted_risks_by_strategy),
-            sum(len(rows) for rows in formatted_risks_by_strategy.values()),
-        )
-        return formatted_risks_by_strategy
+            )
+        return rows
+
+    def _fetch_events(self, risks: List[Risk]) -> Iterator[Tuple[List[Risk], Dict[str, List[dict]]]]:
+        """分批拉取每个风险最近的事件数据，逐批产出 (风险批次, {risk_id: 事件列表})。
 
-    def _fetch_events(self, risks: List[Risk]) -> list:
-        """复用现有 bulk_request 拉取每个风险最近的事件数据。"""
+        配置了 Doris 事件结果表时，每批使用一条窗口函数 SQL 查询；否则复用 list_event 的 bulk_request。
+        """
 
         total = len(risks)
         batch_size = max(settings.RISK_EXPORT_EVENT_FETCH_BATCH_SIZE, 1)
         batch_count = (total + batch_size - 1) // batch_size
+        rt_id = RiskEventAggregateSqlBuilder.get_rt_id()
         logger.info(
-            "[RiskExportService] fetch events start username=%s total=%s event_limit=%s batch_size=%s",
+            "[RiskExportService] fetch events start username=%s total=%s event_limit=%s batch_size=%s rt_id=%s",
             self.username,
             total,
             settings.RISK_EXPORT_EVENT_LIMIT_PER_RISK,
             batch_size,
+            rt_id,
         )
-        bulk_resp = []
+        fetched = 0
         for batch_index, risk_batch in enumerate(data_chunks(risks, batch_size), start=1):
-            start_position = len(bulk_resp) + 1
+            start_position = fetched + 1
             end_position = start_position + len(risk_batch) - 1
             logger.info(
                 "[RiskExportService] fetch events batch start username=%s batch=%s/%s range=%s-%s total=%s",
@@ -183,21 +200,55 @@ class RiskExportService:
                 end_position,
                 total,
             )
-            bulk_events_params = [self._build_event_query_params(risk) for risk in risk_batch]
-            batch_resp = resource.risk.list_event.bulk_request(bulk_events_params)
-            bulk_resp.extend(batch_resp)
+            events_map = self._fetch_events_by_window(rt_id, risk_batch) if rt_id else None
+            if events_map is None:
+                events_map = self._fetch_events_by_request(risk_batch)
+            fetched += len(risk_batch)
             logger.info(
                 "[RiskExportService] fetch events batch finished "
                 "username=%s batch=%s/%s current=%s total=%s fetched=%s",
                 self.username,
                 batch_index,
                 batch_count,
-                len(bulk_resp),
+                fetched,
                 total,
-                len(batch_resp),
+                sum(len(events) for events in events_map.values()),
             )
-        logger.info("[RiskExportService] fetch events finished username=%s total=%s", self.username, len(bulk_resp))
-        return bulk_resp
+            yield risk_batch, events_map
+        logger.info("[RiskExportService] fetch events finished username=%s total=%s", self.username, fetched)
+
+    def _fetch_events_by_window(self, rt_id: str, risks: List[Risk]) -> Optional[Dict[str, List[dict]]]:
+        """使用一条 ROW_NUMBER 窗口 SQL 拉取一批风险的最近事件，失败时返回 None 由调用方回退。"""
+
+        sql = RiskEventWindowSqlBuilder(
+            table_name=rt_id, limit_per_risk=settings.RISK_EXPORT_EVENT_LIMIT_PER_RISK
+        ).build_sql(risks)
+        try:
+            resp = api.bk_base.query_sync(sql=sql) or {}
+        except Exception as err:  # NOCC:broad-except(回退到逐风险查询)
+            logger.warning(
+                "[RiskExportService] fetch events by window failed, fallback to list_event username=%s error=%s",
+                self.username,
+                err,
+            )
+            return None
+        events_map: Dict[str, List[dict]] = defaultdict(list)
+        for row in resp.get("list") or []:
+            event_data = row.get("event_data") or {}
+            if isinstance(event_data, str):
+                try:
+                    event_data = json.loads(event_data)
+                except ValueError:
+                    event_data = {}
+            events_map[row.get("risk_id")].append({"event_data": event_data})
+        return events_map
+
+    def _fetch_events_by_request(self, risks: List[Risk]) -> Dict[str, List[dict]]:
+        """复用现有 bulk_request 逐风险拉取最近的事件数据。"""
+
+        bulk_events_params = [self._build_event_query_params(risk) for risk in risks]
+        batch_resp = resource.risk.list_event.bulk_request(bulk_events_params)
+        return {risk.risk_id: resp["results"] for risk, resp in zip(risks, batch_resp)}
 
     def _build_event_query_params(self, risk: Risk) -> dict:
         """构造单个风险查询最近事件的请求参数。"""
@@ -18,8 +18,9 @@ to the current version of the project delivered to anyone in the future.
 
 import abc
 import datetime
+import hashlib
 import json
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from bk_resource import api, resource
 from bk_resource.settings import bk_resource_settings
@@ -59,6 +60,82 @@ from services.web.risk.parser import RiskNoticeParser
 from services.web.strategy_v2.models import Strategy
 
 
+class RiskFlowContext:
+    """
+    风险流转上下文
+    批量流转时预加载一批风险的策略、规则与处理套餐，未命中时逐个查询并缓存
+    风险本身及其流转节点需在加锁后实时读取，不在此预加载
+    """
+
+    def __init__(self, risk_ids: List[str] = None):
+        self.strategies: Dict[int, Optional[Strategy]] = {}
+        self.rules: Dict[Tuple[int, int], Optional[RiskRule]] = {}
+        self.process_applications: Dict[str, Optional[ProcessApplication]] = {}
+        if risk_ids:
+            self.preload(risk_ids)
+
+    def preload(self, risk_ids: List[str]) -> None:
+        risk_keys = list(
+            Risk.objects.filter(risk_id__in=risk_ids).values_list("strategy_id", "rule_id", "rule_version")
+        )
+        # 策略
+        strategy_ids = {strategy_id for strategy_id, _, _ in risk_keys}
+        self.strategies.update({strategy_id: None for strategy_id in strategy_ids})
+        self.strategies.update(
+            {strategy.strategy_id: strategy for strategy in Strategy.objects.filter(strategy_id__in=strategy_ids)}
+        )
+        # 规则
+        rule_keys = {(rule_id, rule_version) for _, rule_id, rule_version in risk_keys if rule_id}
+        self.rules.update({rule_key: None for rule_key in rule_keys})
+        for rule in RiskRule.objects.filter(
+            rule_id__in={rule_id for rule_id, _ in rule_keys}, version__in={version for _, version in rule_keys}
+        ):
+            if (rule.rule_id, rule.version) in rule_keys:
+                self.rules[(rule.rule_id, rule.version)] = rule
+        # 处理套餐
+        pa_ids = {str(rule.pa_id) for rule in self.rules.values() if rule and rule.pa_id}
+        self.process_applications.update({pa_id: None for pa_id in pa_ids})
+        self.process_applications.update({str(pa.id): pa for pa in ProcessApplication.objects.filter(id__in=pa_ids)})
+
+    def get_strategy(self, strategy_id: int) -> Optional[Strategy]:
+        if strategy_id not in self.strategies:
+            self.strategies[strategy_id] = Strategy.objects.filter(strategy_id=strategy_id).first()
+        return self.strategies[strategy_id]
+
+    def get_rule(self, rule_id: int, version: int) -> Optional[RiskRule]:
+        if (rule_id, version) not in self.rules:
+            self.rules[(rule_id, version)] = RiskRule.objects.filter(rule_id=rule_id, version=version).first()
+        return self.rules[(rule_id, version)]
+
+    def get_process_application(self, pa_id) -> Optional[ProcessApplication]:
+        if str(pa_id) not in self.process_applications:
+            self.process_applications[str(pa_id)] = ProcessApplication.objects.filter(id=pa_id).first()
+        return self.process_applications[str(pa_id)]
+
+    @classmethod
+    def build_status_version(cls, risk: Risk) -> str:
+        """
+        风险流转状态版本
+        状态、处理人、规则或最近流转节点变化时版本随之变化
+        """
+
+        last_history: TicketNode = risk.last_history
+        content = json.dumps(
+            [
+                risk.status,
+                risk.risk_label,
+                risk.current_operator,
+                risk.rule_id,
+                risk.rule_version,
+                "" if last_history._state.adding else last_history.pk,
+                last_history.process_result,
+            ],
+            default=str,
+            sort_keys=True,
+        )
+        return hashlib.md5(content.encode()).hexdigest()
+
+
 class RiskFlowBaseHandler:
     """
     用于流转风险单状态
@@ -78,28 +155,27 @@ class RiskFlowBaseHandler:
         RiskStatus.AWAIT_PROCESS: RiskDisplayStatus.PROCESSING,  # 默认"处理中"
     }
 
-    def __init__(self, risk_id: str, operator: str):
+    def __init__(self, risk_id: str, operator: str, context: RiskFlowContext = None):
         self.risk: Risk = Risk.objects.get(risk_id=risk_id)
+        self.context = context or RiskFlowContext()
         self.operator = operator
         self.rule: RiskRule = None
         self.process_application: ProcessApplication = None
         self.init_rule()
         self.init_process_application()
-        self.strategy: Strategy = Strategy.objects.filter(strategy_id=self.risk.strategy_id).first()
+        self.strategy: Strategy = self.context.get_strategy(self.risk.strategy_id)
 
     def init_rule(self) -> None:
         if self.risk.rule_id:
-            self.rule: RiskRule = RiskRule.objects.filter(
-                rule_id=self.risk.rule_id, version=self.risk.rule_version
-            ).first()
+            self.rule: RiskRule = self.context.get_rule(self.risk.rule_id, self.risk.rule_version)
         else:
             self.rule: RiskRule = None
 
     def init_process_application(self, pa_id: str = None) -> None:
         if pa_id:
-            self.process_application: ProcessApplication = ProcessApplication.objects.filter(id=pa_id).first()
+            self.process_application: ProcessApplication = self.context.get_process_application(pa_id)
         elif self.rule and self.rule.pa_id:
-            self.process_application: ProcessApplication = ProcessApplication.objects.filter(id=self.rule.pa_id).first()
+            self.process_application: ProcessApplication = self.context.get_process_application(self.rule.pa_id)
         else:
             self.process_application: ProcessApplication = None
 
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from django.core.management.base import BaseCommand
+
+from services.web.risk.models import Risk, RiskParticipant
+
+
+class Command(BaseCommand):
+    help = "按风险当前的处理人/关注人回填参与人索引"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="每批处理的风险数")
+        parser.add_argument("--start-risk-id", default="", help="从该风险ID之后开始回填，用于中断后续跑")
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+        last_risk_id = kwargs["start_risk_id"]
+        total = 0
+        queryset = Risk.objects.only(
+            "risk_id", "current_operator", "notice_users", "event_time", "display_status"
+        ).order_by("risk_id")
+        while True:
+            risks = list(queryset.filter(risk_id__gt=last_risk_id)[:batch_size])
+            if not risks:
+                break
+            RiskParticipant.sync(risks)
+            total += len(risks)
+            last_risk_id = risks[-1].risk_id
+            self.stdout.write(f"[backfill_risk_participants] synced => {total}; last_risk_id => {last_risk_id}")
+        self.stdout.write(self.style.SUCCESS(f"[backfill_risk_participants] finished, total => {total}"))
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.26 on 2026-10-18 05:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('risk', '0058_risk_idx_strategy_isdel_time'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiskParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('risk_id', models.CharField(max_length=255, verbose_name='Risk ID')),
+                ('username', models.CharField(max_length=255, verbose_name='User')),
+                (
+                    'role',
+                    models.CharField(
+                        choices=[('operator', 'Operator'), ('notice_user', 'Notice User')],
+                        max_length=32,
+                        verbose_name='Role',
+                    ),
+                ),
+                ('event_time', models.DateTimeField(verbose_name='事件发生时间')),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('stand_by', '录入中'),
+                            ('new', '新'),
+                            ('await_deal', '待处理'),
+                            ('processing', '处理中'),
+                            ('for_approve', '自动处理审批中'),
+                            ('auto_process', '套餐处理中'),
+                            ('closed', '已关单'),
+                        ],
+                        default='new',
+                        max_length=32,
+                        verbose_name='Display Status',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Risk Participant',
+                'verbose_name_plural': 'Risk Participant',
+                'ordering': ['-id'],
+                'indexes': [
+                    models.Index(
+                        fields=['username', 'role', 'event_time', 'risk_id'], name='risk_rp_user_role_time_idx'
+                    ),
+                    models.Index(
+                        fields=['username', 'role', 'status', 'event_time', 'risk_id'],
+                        name='risk_rp_user_role_stat_idx',
+                    ),
+                ],
+                'unique_together': {('risk_id', 'role', 'username')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+ROLE_OPERATOR = "operator"
+ROLE_NOTICE_USER = "notice_user"
+
+
+def backfill_risk_participants(apps, schema_editor):
+    """按风险当前的处理人/关注人回填参与人索引，逻辑与 backfill_risk_participants 命令一致"""
+
+    risk_model = apps.get_model("risk", "Risk")
+    risk_participant_model = apps.get_model("risk", "RiskParticipant")
+    queryset = (
+        risk_model.objects.filter(is_deleted=False)
+        .only("risk_id", "current_operator", "notice_users", "event_time", "display_status")
+        .order_by("risk_id")
+    )
+    last_risk_id = ""
+    while True:
+        risks = list(queryset.filter(risk_id__gt=last_risk_id)[:BATCH_SIZE])
+        if not risks:
+            break
+        participants = {}
+        for risk in risks:
+            for role, users in [(ROLE_OPERATOR, risk.current_operator), (ROLE_NOTICE_USER, risk.notice_users)]:
+                if not isinstance(users, list):
+                    continue
+                for username in users:
+                    if username:
+                        participants[(risk.risk_id, role, username)] = risk_participant_model(
+                            risk_id=risk.risk_id,
+                            username=username,
+                            role=role,
+                            event_time=risk.event_time,
+                            status=risk.display_status,
+                        )
+        risk_participant_model.objects.bulk_create(
+            list(participants.values()), batch_size=BATCH_SIZE, ignore_conflicts=True
+        )
+        last_risk_id = risks[-1].risk_id
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("risk", "0059_riskparticipant"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_risk_participants, migrations.RunPython.noop),
+    ]
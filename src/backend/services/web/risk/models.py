@@ -27,11 +27,12 @@ from blueapps.utils.logger import logger
 from blueapps.utils.request_provider import get_request_username
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Exists, Field, Max, OuterRef, Q, QuerySet
 from django.db.models.functions import Substr
-from django.db.models.signals import post_save  # noqa: E402
+from django.db.models.signals import post_delete, post_save  # noqa: E402
 from django.dispatch import receiver  # noqa: E402
+from django.utils import timezone
 from django.utils.translation import gettext_lazy
 from pydantic import BaseModel
 from pydantic import Field as PydanticField
@@ -317,6 +318,14 @@ class Risk(StrategyTagMixin, SoftDeleteModel):
                 return node
         return TicketNode()
 
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        """
+        保存风险，post_save 中同步的参与人索引与风险保存处于同一事务
+        """
+
+        return super().save(*args, **kwargs)
+
     def auth_users(self, action: str, users: List[str], user_type: str = UserType.OPERATOR) -> None:
         """
         授权相关用户查询权限
@@ -594,6 +603,117 @@ class TicketPermission(models.Model):
         ]
 
 
+class RiskParticipant(models.Model):
+    """
+    风险参与人: 当前处理人/关注人的规范化索引，用于个人视图筛选，避免在风险表上做 JSON 包含查询
+    随风险保存同步维护，见 sync_risk_participants
+    """
+
+    # 风险上会影响参与人索引的字段
+    RISK_TRIGGER_FIELDS = {"current_operator", "notice_users", "display_status", "event_time"}
+
+    risk_id = models.CharField(gettext_lazy("Risk ID"), max_length=255)
+    username = models.CharField(gettext_lazy("User"), max_length=255)
+    role = models.CharField(gettext_lazy("Role"), choices=UserType.choices, max_length=32)
+    event_time = models.DateTimeField(EventMappingFields.EVENT_TIME.description)
+    status = models.CharField(
+        gettext_lazy("Display Status"), choices=RiskDisplayStatus.choices, max_length=32, default=RiskDisplayStatus.NEW
+    )
+
+    class Meta:
+        verbose_name = gettext_lazy("Risk Participant")
+        verbose_name_plural = verbose_name
+        ordering = ["-id"]
+        unique_together = [["risk_id", "role", "username"]]
+        indexes = [
+            models.Index(fields=["username", "role", "event_time", "risk_id"], name="risk_rp_user_role_time_idx"),
+            models.Index(
+                fields=["username", "role", "status", "event_time", "risk_id"], name="risk_rp_user_role_stat_idx"
+            ),
+        ]
+
+    @classmethod
+    def build_participants(cls, risk: "Risk") -> List["RiskParticipant"]:
+        # 与数据库读出的时间保持可比较
+        event_time = risk.event_time
+        if isinstance(event_time, datetime.datetime) and timezone.is_naive(event_time):
+            event_time = timezone.make_aware(event_time)
+        participants = {}
+        for role, users in [(UserType.OPERATOR, risk.current_operator), (UserType.NOTICE_USER, risk.notice_users)]:
+            if not isinstance(users, list):
+                continue
+            for username in users:
+                if username:
+                    participants[(role.value, username)] = cls(
+                        risk_id=risk.risk_id,
+                        username=username,
+                        role=role.value,
+                        event_time=event_time,
+                        status=risk.display_status,
+                    )
+        return list(participants.values())
+
+    @classmethod
+    @transaction.atomic()
+    def sync(cls, risks: List["Risk"]) -> None:
+        """
+        按风险当前的处理人/关注人同步参与人索引，仅写入有变化的记录
+        """
+
+        if not risks:
+            return
+        existing = {
+            (participant.risk_id, participant.role, participant.username): participant
+            for participant in cls.objects.filter(risk_id__in=[risk.risk_id for risk in risks])
+        }
+        to_create, to_update = [], []
+        for risk in risks:
+            for participant in cls.build_participants(risk):
+                current = existing.pop((participant.risk_id, participant.role, participant.username), None)
+                if current is None:
+                    to_create.append(participant)
+                elif current.event_time != participant.event_time or current.status != participant.status:
+                    current.event_time, current.status = participant.event_time, participant.status
+                    to_update.append(current)
+        if existing:
+            cls.objects.filter(pk__in=[participant.pk for participant in existing.values()]).delete()
+        if to_create:
+            cls.objects.bulk_create(to_create, ignore_conflicts=True)
+        if to_update:
+            cls.objects.bulk_update(to_update, fields=["event_time", "status"])
+
+    @classmethod
+    def risk_filter(cls, role: str, username: str, event_time_start=None, event_time_end=None, status=None) -> Q:
+        """
+        指定用户以某角色参与的风险
+        """
+
+        participant_filters = {"username": username, "role": role}
+        if event_time_start:
+            participant_filters["event_time__gte"] = event_time_start
+        if event_time_end:
+            participant_filters["event_time__lt"] = event_time_end
+        if status:
+            participant_filters["status__in"] = status
+        return Q(risk_id__in=cls.objects.filter(**participant_filters).values("risk_id"))
+
+
+@receiver(post_save, sender=Risk)
+def sync_risk_participants(sender, instance: Risk, update_fields=None, **kwargs):
+    """
+    风险的处理人、关注人、展示状态或事件时间变更时同步参与人索引，与风险保存处于同一事务
+    """
+
+    if update_fields is not None and not RiskParticipant.RISK_TRIGGER_FIELDS.intersection(update_fields):
+        return
+    RiskParticipant.sync([instance])
+
+
+@receiver(post_delete, sender=Risk)
+def delete_risk_participants(sender, instance: Risk, **kwargs):
+    RiskParticipant.objects.filter(risk_id=instance.risk_id).delete()
+
+
 class RiskEventSubscription(SoftDeleteModel):
     """
     风险事件订阅配置。
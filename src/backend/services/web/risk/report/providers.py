@@ -21,7 +21,7 @@ from __future__ import annotations
 import abc
 from dataclasses import dataclass, field
 from functools import cached_property
-from typing import Any, Callable, Dict, Optional, Type
+from typing import Any, Callable, Dict, Hashable, List, Optional, Type
 
 from bk_resource import api
 from bk_resource.utils.cache import CacheTypeItem, using_cache
@@ -96,6 +96,33 @@ class Provider(abc.ABC):
         """
         raise NotImplementedError
 
+    def batch_key(self, **kwargs) -> Optional[Hashable]:
+        """返回调用的合并查询分组 key
+
+        渲染器会将同一Provider下 batch_key 相同的调用合并为一次 get_batch 调用；
+        返回 None 表示该调用不参与合并，单独执行 get。
+
+        Args:
+            **kwargs: 与 get 相同的调用参数
+
+        Returns:
+            分组 key，或 None
+        """
+        return None
+
+    def get_batch(self, call_args_list: List[Dict[str, Any]]) -> List[Any]:
+        """批量获取数据，返回结果与 call_args_list 一一对应
+
+        默认逐个调用 get，子类可覆盖实现合并查询。
+
+        Args:
+            call_args_list: 调用参数列表
+
+        Returns:
+            结果列表
+        """
+        return [self.get(**call_args) for call_args in call_args_list]
+
 
 class AIProvider(Provider):
     """AI变量Provider
@@ -336,6 +363,7 @@ class EventProvider(Provider):
     架构：
     1. match() 解析 Jinja2 AST，识别 count(event.field) 等语法
     2. get() 构造 SQL 查询 BKBase Doris 表并返回聚合数据
+    3. get_batch() 将同一查询形态（聚合 / FIRST / LATEST）的多个调用合并为一条多列 SQL
 
     初始化：只接受 risk_id，内部惰性加载 Risk 对象。
     """
@@ -343,6 +371,9 @@ class EventProvider(Provider):
     # Provider的唯一标识key
     key: str = "event"
 
+    # 非 FIRST/LATEST 聚合函数共用的合并查询分组 key
+    AGGREGATE_BATCH_KEY: str = "aggregate"
+
     def __init__(self, risk_id: str, **kwargs):
         """初始化事件Provider
 
@@ -408,21 +439,25 @@ class EventProvider(Provider):
         logger.debug("No field type found for field: %s", field_name)
         return DEFAULT_FIELD_TYPE_BY_AGGREGATE.get(aggregate, FieldType.STRING)
 
+    def _build_field_config(self, field_name: str, aggregate: str, display_name: str) -> EventFieldConfig:
+        """构建单个聚合字段配置"""
+        sql_aggregate = AGGREGATION_FUNCTION_TO_SQL_TYPE.get(aggregate) if aggregate else None
+        return EventFieldConfig.event_data(
+            field_name=field_name,
+            display_name=display_name,
+            field_type=self._get_field_type(field_name, aggregate),
+            aggregate=sql_aggregate,
+        )
+
     def _build_sql(self, key: str, spec: Dict[str, Any]) -> Optional[str]:
         """构建查询 SQL"""
         aggregate = spec.get("aggregate", "")
         field_name = spec.get("field", key)
-        field_type = self._get_field_type(field_name, aggregate)
 
         builder = RiskEventAggregateSqlBuilder(self.risk)
 
         sql_aggregate = AGGREGATION_FUNCTION_TO_SQL_TYPE.get(aggregate) if aggregate else None
-        field_config = EventFieldConfig.event_data(
-            field_name=field_name,
-            display_name=key,
-            field_type=field_type,
-            aggregate=sql_aggregate,
-        )
+        field_config = self._build_field_config(field_name, aggregate, display_name=key)
 
         if aggregate == AggregationFunction.FIRST:
             sql = builder.build_first_sql([field_config])
@@ -551,3 +586,83 @@ class EventProvider(Provider):
                 e,
             )
             return EVENT_QUERY_FAILED
+
+    def batch_key(self, function: str = None, field_name: str = None, **extra) -> Optional[str]:
+        """按查询形态分组：FIRST、LATEST 各自一条排序查询，其余聚合函数共用一条聚合查询"""
+        if not function or not field_name or function not in AggregationFunction.values:
+            return None
+        if function in (AggregationFunction.FIRST, AggregationFunction.LATEST):
+            return function
+        if function in AGGREGATION_FUNCTION_TO_SQL_TYPE:
+            return self.AGGREGATE_BATCH_KEY
+        return None
+
+    @staticmethod
+    def _batch_alias(function: str, field_name: str) -> str:
+        """合并查询中的列别名，同一字段的不同聚合函数需要区分"""
+        return f"{function}__{field_name}"
+
+    def _build_batch_sql(self, shape: str, call_args_list: List[Dict[str, Any]]) -> Optional[str]:
+        """将同一查询形态的多个调用编译为一条多列 SQL"""
+        fields = [
+            self._build_field_config(
+                call_args["field_name"],
+                call_args["function"],
+                display_name=self._batch_alias(call_args["function"], call_args["field_name"]),
+            )
+            for call_args in call_args_list
+        ]
+        builder = RiskEventAggregateSqlBuilder(self.risk)
+        if shape == AggregationFunction.FIRST:
+            return builder.build_first_sql(fields)
+        if shape == AggregationFunction.LATEST:
+            return builder.build_latest_sql(fields)
+        return builder.build_aggregate_sql(fields)
+
+    def get_batch(self, call_args_list: List[Dict[str, Any]]) -> List[Any]:
+        """合并查询同一形态的多个事件聚合
+
+        调用方需保证 call_args_list 中各调用的 batch_key 相同；单个调用时退化为 get，
+        保持原有 SQL 不变。任意一列查询失败时，该批次所有表达式均返回占位符。
+
+        Args:
+            call_args_list: 调用参数列表
+
+        Returns:
+            与 call_args_list 一一对应的查询结果
+        """
+        if len(call_args_list) <= 1:
+            return super().get_batch(call_args_list)
+
+        shape = self.batch_key(**call_args_list[0])
+        if not shape:
+            return super().get_batch(call_args_list)
+
+        try:
+            sql = self._build_batch_sql(shape, call_args_list)
+            logger.info(
+                "[EventProvider] Build batch SQL. risk_id=%s, shape=%s, size=%d, sql=%s",
+                self.risk_id,
+                shape,
+                len(call_args_list),
+                sql,
+            )
+            if not sql:
+                return [EVENT_QUERY_FAILED] * len(call_args_list)
+
+            result = api.bk_base.query_sync(sql=sql)
+            return [
+                self._parse_result(
+                    result, self._batch_alias(call_args["function"], call_args["field_name"]), call_args["function"]
+                )
+                for call_args in call_args_list
+            ]
+        except Exception as e:  # NOCC:broad-except(需要处理所有错误)
+            logger.exception(
+                "[EventProvider] Batch query failed. risk_id=%s, shape=%s, size=%d, error=%s",
+                self.risk_id,
+                shape,
+                len(call_args_list),
+                e,
+            )
+            return [EVENT_QUERY_FAILED] * len(call_args_list)
@@ -181,6 +181,46 @@ def _execute_provider_call(call: ProviderCall) -> tuple[ProviderCall, Any]:
         return call, f"[Error: {e}]"
 
 
+def _execute_provider_batch(calls: list[ProviderCall]) -> list[tuple[ProviderCall, Any]]:
+    """合并执行同一Provider、同一batch_key的多个调用
+
+    Args:
+        calls: Provider调用列表（provider和batch_key均相同）
+
+    Returns:
+        [(调用信息, 结果)] 列表
+    """
+    if len(calls) == 1:
+        return [_execute_provider_call(calls[0])]
+    try:
+        results = calls[0].provider.get_batch([call.call_args for call in calls])
+        return list(zip(calls, results))
+    except Exception as e:
+        logger_celery.exception(
+            "[RenderTemplate] Provider batch call failed: %s - %s", [call.original_expr for call in calls], e
+        )
+        return [(call, f"[Error: {e}]") for call in calls]
+
+
+def _group_provider_calls(provider_calls: list[ProviderCall]) -> list[list[ProviderCall]]:
+    """按 (Provider实例, batch_key) 对调用分组，batch_key 为空的调用单独成组
+
+    渲染耗时由此取决于不同查询形态的数量，而非模板中表达式的数量
+
+    Args:
+        provider_calls: Provider调用列表
+
+    Returns:
+        分组后的调用列表，保持首次出现的顺序
+    """
+    groups: dict[Any, list[ProviderCall]] = {}
+    for index, call in enumerate(provider_calls):
+        batch_key = call.provider.batch_key(**call.call_args)
+        group_key = (id(call.provider), batch_key) if batch_key is not None else index
+        groups.setdefault(group_key, []).append(call)
+    return list(groups.values())
+
+
 def _compute_args_hash(args: list, kwargs: dict) -> str:
     """计算args和kwargs的哈希值
 
@@ -292,7 +332,7 @@ def _render_template(template: str, providers: list[Provider], variables: dict[s
 
     该函数会：
     1. 使用Jinja2 AST解析模板，通过Provider.match()识别Provider变量/函数调用
-    2. 使用线程池并发调用Provider.get获取数据
+    2. 按 (Provider, batch_key) 合并调用后，使用线程池并发调用Provider.get/get_batch获取数据
     3. 构建渲染上下文，将结果注入为函数和变量
     4. 使用Jinja2渲染最终结果
 
@@ -318,27 +358,28 @@ def _render_template(template: str, providers: list[Provider], variables: dict[s
             logger_celery.exception("[RenderTemplate] Jinja2 render failed: %s", e)
             return f"[Render Error: {e}]"
 
-    # 2. 使用线程池并发执行Provider调用
+    # 2. 按查询形态合并后，使用线程池并发执行Provider调用
     results: dict[str, Any] = {}  # original_expr -> result
+    call_groups = _group_provider_calls(provider_calls)
 
-    with ThreadPoolExecutor(max_workers=min(max_workers, len(provider_calls))) as executor:
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(call_groups))) as executor:
         # 提交所有任务，直接使用call中的provider实例
-        future_to_call: dict[Future, ProviderCall] = {
-            submit_with_observation_context(executor, _execute_provider_call, call): call for call in provider_calls
+        future_to_calls: dict[Future, list[ProviderCall]] = {
+            submit_with_observation_context(executor, _execute_provider_batch, calls): calls for calls in call_groups
         }
 
         # 收集结果
-        for future in as_completed(future_to_call):
+        for future in as_completed(future_to_calls):
             try:
-                call, result = future.result()
-                # 将列表结果转换为字符串
-                if isinstance(result, list):
-                    result = ", ".join(str(v) for v in result)
-                results[call.original_expr] = result
+                for call, result in future.result():
+                    # 将列表结果转换为字符串
+                    if isinstance(result, list):
+                        result = ", ".join(str(v) for v in result)
+                    results[call.original_expr] = result
             except Exception as e:
-                call = future_to_call[future]
-                logger_celery.exception("[RenderTemplate] Future failed for %s: %s", call.original_expr, e)
-                results[call.original_expr] = f"[Error: {e}]"
+                for call in future_to_calls[future]:
+                    logger_celery.exception("[RenderTemplate] Future failed for %s: %s", call.original_expr, e)
+                    results[call.original_expr] = f"[Error: {e}]"
 
     # 3. 构建渲染上下文
     context = _build_render_context(provider_calls, results, variables)
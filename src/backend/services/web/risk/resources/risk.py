@@ -108,10 +108,12 @@ from services.web.risk.converter.bkbase import (
     BkBasePaginationPlanner,
     BkBaseQueryComponentsBuilder,
     BkBaseQueryExpressionBuilder,
+    BkBaseQueryPlanner,
     BkBaseResponseAssembler,
     BkBaseSQLRunner,
     FinalSelectAssembler,
     ManualUnsyncedRiskPrepender,
+    list_risk_count_cache,
 )
 from services.web.risk.exceptions import (
     ExportRiskNoPermission,
@@ -141,6 +143,7 @@ from services.web.risk.models import (
     Risk,
     RiskAuditInstance,
     RiskExperience,
+    RiskParticipant,
     TicketNode,
     TicketPermission,
     UserType,
@@ -570,8 +573,8 @@ class ListRisk(RiskMeta):
             table_map=table_map,
             storage_suffix=self.STORAGE_SUFFIX,
         )
-        base_sql = expression_builder.compile_queryset_sql(values_queryset.order_by())
-        if base_sql is None:
+        base_expression = expression_builder.compile_queryset_expression(values_queryset.order_by())
+        if base_expression is None:
             page = pagination_class()
             page.paginate_queryset(range(manual_unsynced_count), request)
             manual_ids = []
@@ -585,7 +588,6 @@ class ListRisk(RiskMeta):
                 page.page.object_list = list(manual_ids)
             return paged_risks, page, []
 
-        base_expression = expression_builder.convert_to_expression(base_sql)
         components_builder = BkBaseQueryComponentsBuilder(
             resolver=resolver,
             duplicate_field_map=self._duplicate_event_field_map,
@@ -600,32 +602,23 @@ class ListRisk(RiskMeta):
             components_builder=components_builder,
             count_query_builder=count_query_builder,
             sql_runner=sql_runner,
+            count_cache=list_risk_count_cache,
         )
         data_executor = BkBaseDataExecutor(
             components_builder=components_builder,
             data_query_builder=data_query_builder,
             sql_runner=sql_runner,
         )
-        pagination_planner = BkBasePaginationPlanner(pagination_class)
-
-        bkbase_total, components = count_executor.execute(base_expression)
-        total = bkbase_total + manual_unsynced_count
-        page, limit, offset = pagination_planner.paginate(total, request)
-
-        manual_ids = manual_helper.slice_ids(offset, limit)
-        manual_filled = len(manual_ids)
-        bkbase_limit = max(limit - manual_filled, 0)
-        bkbase_offset = max(offset - manual_unsynced_count, 0)
-
-        risk_rows: List[Dict[str, Any]] = []
-        if bkbase_limit and bkbase_total:
-            risk_rows = data_executor.execute(
-                base_expression,
-                order_fields=order_fields,
-                limit=bkbase_limit,
-                offset=bkbase_offset,
-                components=components,
-            )
+        planner = BkBaseQueryPlanner(
+            queryset_expression=base_expression,
+            count_executor=count_executor,
+            data_executor=data_executor,
+            pagination_planner=BkBasePaginationPlanner(pagination_class),
+            sql_runner=sql_runner,
+            manual_helper=manual_helper,
+        )
+        query_plan = planner.plan(request, order_fields=order_fields)
+        page, manual_ids, risk_rows = query_plan.page, query_plan.manual_ids, query_plan.risk_rows
 
         risk_ids = manual_ids + [row["risk_id"] for row in risk_rows]
         paged_queryset = self._build_risk_queryset(risk_ids)
@@ -859,7 +852,23 @@ class ListRiskAPIGW(ListRisk):
         return Risk.objects.filter(q).distinct()
 
 
-class ListMineRisk(ListRisk):
+class ListParticipantRiskMixin:
+    @classmethod
+    def participant_filter(cls, validated_request_data: dict, role: str, username: str) -> Q:
+        """
+        通过参与人索引筛选，事件时间与展示状态条件同时下推到索引范围扫描
+        """
+
+        return RiskParticipant.risk_filter(
+            role=role,
+            username=username,
+            event_time_start=next(iter(validated_request_data.get("event_time__gte") or []), None),
+            event_time_end=next(iter(validated_request_data.get("event_time__lt") or []), None),
+            status=validated_request_data.get("display_status"),
+        )
+
+
+class ListMineRisk(ListParticipantRiskMixin, ListRisk):
     name = gettext_lazy("获取待我处理的风险列表")
 
     def load_risks(self, validated_request_data, username: str = None):
@@ -874,11 +883,11 @@ class ListMineRisk(ListRisk):
                 username=username,
                 authorized_at_start=event_time_start,
             ),
-            current_operator__contains=username,
+            self.participant_filter(validated_request_data, role=UserType.OPERATOR, username=username),
         ).distinct()
 
 
-class ListNoticingRisk(ListRisk):
+class ListNoticingRisk(ListParticipantRiskMixin, ListRisk):
     name = gettext_lazy("获取我关注的风险列表")
 
     def load_risks(self, validated_request_data, username: str = None):
@@ -893,7 +902,7 @@ class ListNoticingRisk(ListRisk):
                 username=username,
                 authorized_at_start=event_time_start,
             ),
-            notice_users__contains=username,
+            self.participant_filter(validated_request_data, role=UserType.NOTICE_USER, username=username),
         ).distinct()
 
 
@@ -911,7 +920,9 @@ class ListProcessedRisk(ListRisk):
         processed_risk_ids = TicketNode.objects.filter(
             operator=username,
         ).values("risk_id")
-        return Risk.objects.filter(q, risk_id__in=processed_risk_ids).exclude(current_operator__contains=username)
+        return Risk.objects.filter(q, risk_id__in=processed_risk_ids).exclude(
+            RiskParticipant.risk_filter(role=UserType.OPERATOR, username=username)
+        )
 
 
 class ListRiskFields(RiskMeta):
@@ -20,13 +20,14 @@ import datetime
 import json
 import os
 import time
-from typing import Any
+from typing import Any, List
 
 from bk_resource import api
 from bk_resource.settings import bk_resource_settings
 from blueapps.contrib.celery_tools.periodic import periodic_task
 from blueapps.core.celery import celery_app
 from blueapps.utils.logger import logger_celery
+from celery import group
 from celery.exceptions import MaxRetriesExceededError
 from celery.schedules import crontab
 from django.conf import settings
@@ -45,7 +46,7 @@ from apps.meta.constants import ConfigLevelChoices
 from apps.meta.models import GlobalMetaConfig
 from apps.notice.handlers import ErrorMsgHandler
 from apps.sops.constants import SOPSTaskStatus
-from core.lock import lock
+from core.lock import CacheLock, lock
 from core.observability import (
     OBSERVATION_METRIC_STATUS_ERROR,
     OBSERVATION_METRIC_STATUS_SUCCESS,
@@ -61,6 +62,7 @@ from services.web.common.monitor import (
 from services.web.databus.constants import ASSET_RISK_BKBASE_RT_ID_KEY
 from services.web.risk.constants import (
     BULK_ADD_EVENT_SIZE,
+    PROCESS_RISK_STATUS_VERSION_KEY,
     RISK_ESQUERY_DELAY_TIME,
     RISK_ESQUERY_SLICE_DURATION,
     RISK_EVENTS_SYNC_TIME,
@@ -79,6 +81,7 @@ from services.web.risk.handlers.ticket import (
     AutoProcess,
     ForApprove,
     NewRisk,
+    RiskFlowContext,
     TransOperator,
 )
 from services.web.risk.models import (
@@ -472,23 +475,33 @@ def sync_manual_risk_status():
     _sync_manual_risk_status()
 
 
+GENERATE_RISK_FROM_EVENT_TIMEOUT = int(
+    os.getenv("BKAPP_GENERATE_RISK_FROM_EVENT_TIMEOUT", settings.DEFAULT_CACHE_LOCK_TIMEOUT)
+)
+
+
 @periodic_task(
     run_every=crontab(minute="0", hour=os.getenv("BKAPP_GENERATE_RISK_FROM_EVENT_SCHEDULE", "*")),
     queue="risk",
-    time_limit=int(os.getenv("BKAPP_GENERATE_RISK_FROM_EVENT_TIMEOUT", settings.DEFAULT_CACHE_LOCK_TIMEOUT)),
-)
-@lock(
-    lock_name="celery:generate_risk_from_event",
-    timeout=int(os.getenv("BKAPP_GENERATE_RISK_FROM_EVENT_TIMEOUT", settings.DEFAULT_CACHE_LOCK_TIMEOUT)),
+    time_limit=GENERATE_RISK_FROM_EVENT_TIMEOUT,
 )
+@lock(lock_name="celery:generate_risk_from_event", timeout=GENERATE_RISK_FROM_EVENT_TIMEOUT)
 def generate_risk_from_event():
     """从审计事件创建风险"""
 
-    # 初始化时间
+    # 初始化时间，存在同步进度时从上次完整处理的时间片继续
     start_time = datetime.datetime.now() - datetime.timedelta(days=RISK_EVENTS_SYNC_TIME)
-    end_time = start_time + datetime.timedelta(seconds=RISK_ESQUERY_SLICE_DURATION)
+    sync_start_time = RiskHandler.get_sync_start_time()
+    if sync_start_time and sync_start_time > start_time:
+        start_time = sync_start_time
     task_end_time = datetime.datetime.now() - datetime.timedelta(seconds=RISK_ESQUERY_DELAY_TIME)
 
+    # 并行模式：拆分时间片后分发子任务
+    if settings.ENABLE_PARALLEL_GENERATE_RISK:
+        dispatch_generate_risk_slices(start_time=start_time, task_end_time=task_end_time)
+        return
+
+    end_time = start_time + datetime.timedelta(seconds=RISK_ESQUERY_SLICE_DURATION)
     try:
         while end_time <= task_end_time:
             # 生成风险
@@ -507,6 +520,57 @@ def generate_risk_from_event():
         ErrorMsgHandler(gettext("Generate Risk Failed"), str(err)).send()
 
 
+def dispatch_generate_risk_slices(start_time: datetime.datetime, task_end_time: datetime.datetime) -> int:
+    """
+    拆分追赶区间为独立时间片，以 group 形式分发到 risk 队列
+    已完成的连续时间片会先推进同步进度，已完成的非连续时间片不再重复分发
+    """
+
+    # 对齐到时间片边界，保证多次调度间时间片划分一致
+    start_time = datetime.datetime.fromtimestamp(
+        start_time.timestamp() // RISK_ESQUERY_SLICE_DURATION * RISK_ESQUERY_SLICE_DURATION
+    )
+    start_time = RiskHandler.advance_sync_start_time(start_time)
+    end_time = start_time + datetime.timedelta(seconds=RISK_ESQUERY_SLICE_DURATION)
+    signatures = []
+    while end_time <= task_end_time:
+        if not RiskHandler.is_slice_finished(start_time):
+            signatures.append(
+                generate_risk_from_event_slice.s(start_time=start_time.timestamp(), end_time=end_time.timestamp())
+            )
+        start_time = end_time
+        end_time = start_time + datetime.timedelta(seconds=RISK_ESQUERY_SLICE_DURATION)
+    if signatures:
+        group(signatures).apply_async()
+    logger_celery.info("[DispatchGenerateRiskSlices] Total %d", len(signatures))
+    return len(signatures)
+
+
+@celery_app.task(queue="risk", time_limit=GENERATE_RISK_FROM_EVENT_TIMEOUT)
+@lock(
+    load_lock_name=lambda **kwargs: f"celery:generate_risk_from_event_slice:{int(kwargs['start_time'])}",
+    timeout=GENERATE_RISK_FROM_EVENT_TIMEOUT,
+)
+def generate_risk_from_event_slice(*, start_time: float, end_time: float):
+    """从审计事件创建风险(单个时间片)"""
+
+    start_time = datetime.datetime.fromtimestamp(start_time)
+    end_time = datetime.datetime.fromtimestamp(end_time)
+    try:
+        RiskHandler().generate_risk_from_event(
+            start_time=start_time,
+            end_time=end_time,
+            extra_filter=Q(strategy_type=StrategyType.MODEL.value),
+            checkpoint=False,
+            partition_lock=True,
+        )
+        RiskHandler.mark_slice_finished(start_time, end_time)
+        logger_celery.info("[GenerateRiskFinished] %s ~ %s", start_time, end_time)
+    except Exception as err:  # NOCC:broad-except(需要处理所有错误)
+        logger_celery.exception("[GenerateRiskFailed] %s ~ %s; %s", start_time, end_time, err)
+        ErrorMsgHandler(gettext("Generate Risk Failed"), str(err)).send()
+
+
 @periodic_task(
     run_every=crontab(minute=settings.PROCESS_ONE_RISK_PERIODIC_TASK_MINUTE),
     queue="risk",
@@ -533,6 +597,14 @@ def process_risk_ticket(*, risk_id: str = None, manual: bool = False):
     # 仅处理正式发单的策略对应的风险
     risks = risks.filter(strategy__is_formal=True)
 
+    # 分片投递，每个任务批量预加载并处理一组风险
+    if settings.ENABLE_MULTI_PROCESS_RISK and not manual and settings.PROCESS_RISK_CHUNK_SIZE > 1:
+        risk_ids = list(risks.values_list("risk_id", flat=True))
+        for chunk in data_chunks(risk_ids, settings.PROCESS_RISK_CHUNK_SIZE):
+            process_risk_chunk.delay(risk_ids=chunk)
+        logger_celery.info("[ProcessRiskTicket] Scheduled %d Risks In Chunks", len(risk_ids))
+        return
+
     # 逐个处理
     for risk in risks:
         if settings.ENABLE_MULTI_PROCESS_RISK and not manual:
@@ -543,6 +615,48 @@ def process_risk_ticket(*, risk_id: str = None, manual: bool = False):
             process_one_risk(risk_id=risk.risk_id)
 
 
+@celery_app.task(queue="risk", time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
+def process_risk_chunk(*, risk_ids: List[str]):
+    """
+    批量处理一组风险
+    预加载策略、规则与处理套餐，跳过上次处理后流转状态未变化的风险
+    """
+
+    context = RiskFlowContext(risk_ids=risk_ids)
+    processed, skipped = 0, 0
+    for risk_id in risk_ids:
+        # 与 process_one_risk 共用锁，避免同一风险被并发处理
+        _lock = CacheLock(lock_name=f"celery:process_one_risk:{risk_id}", timeout=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
+        if _lock.locked:
+            logger_celery.warning("[ProcessRiskChunk] Locked %s", risk_id)
+            continue
+        try:
+            # 加锁后读取风险，避免基于加锁前的快照流转
+            risk = Risk.objects.filter(pk=risk_id).first()
+            if risk is None:
+                continue
+            version_key = PROCESS_RISK_STATUS_VERSION_KEY.format(risk_id=risk_id)
+            status_version = RiskFlowContext.build_status_version(risk)
+            if settings.PROCESS_RISK_UNCHANGED_SKIP_TIMEOUT > 0 and cache.get(key=version_key) == status_version:
+                skipped += 1
+                continue
+            succeed = _process_risk(risk_id=risk_id, context=context)
+            processed += 1
+            # 处理成功但未改变流转状态(如审批/套餐仍在进行中)，短期内跳过
+            refreshed_risk = Risk.objects.filter(pk=risk_id).first() if succeed else None
+            if (
+                settings.PROCESS_RISK_UNCHANGED_SKIP_TIMEOUT > 0
+                and refreshed_risk
+                and RiskFlowContext.build_status_version(refreshed_risk) == status_version
+            ):
+                cache.set(key=version_key, value=status_version, timeout=settings.PROCESS_RISK_UNCHANGED_SKIP_TIMEOUT)
+            else:
+                cache.delete(key=version_key)
+        finally:
+            _lock.release()
+    logger_celery.info("[ProcessRiskChunk] Total %d; Processed %d; Skipped %d", len(risk_ids), processed, skipped)
+
+
 @celery_app.task(queue="risk", time_limit=settings.DEFAULT_CACHE_LOCK_TIMEOUT)
 @lock(
     lock_name="celery:process_one_risk",
@@ -553,6 +667,15 @@ def process_one_risk(*, risk_id: str):
     处理单个风险
     """
 
+    _process_risk(risk_id=risk_id)
+
+
+def _process_risk(*, risk_id: str, context: RiskFlowContext = None) -> bool:
+    """
+    按风险状态流转风险，失败达到最大次数后转人工
+    返回是否处理成功
+    """
+
     # 获取风险
     risk = Risk.objects.get(risk_id=risk_id)
 
@@ -567,14 +690,17 @@ def process_one_risk(*, risk_id: str):
         case RiskStatus.AUTO_PROCESS:
             process_class = AutoProcess
         case _:
-            return
+            return False
     # 处理
     try:
         logger_celery.info("[ProcessRiskTicket] %s Start %s", process_class.__name__, risk.risk_id)
         # 处理
-        process_class(risk_id=risk.risk_id, operator=bk_resource_settings.PLATFORM_AUTH_ACCESS_USERNAME).run()
+        process_class(
+            risk_id=risk.risk_id, operator=bk_resource_settings.PLATFORM_AUTH_ACCESS_USERNAME, context=context
+        ).run()
         # 成功后移除缓存
         cache.delete(key=cache_key)
+        return True
     except Exception as err:  # NOCC:broad-except(需要处理所有错误)
         # 获取失败次数
         retry_times = cache.get(key=cache_key, default=1)
@@ -602,6 +728,7 @@ def process_one_risk(*, risk_id: str):
                 value=retry_times + 1,
                 timeout=(settings.PROCESS_RISK_MAX_RETRY + 1) * settings.DEFAULT_CACHE_LOCK_TIMEOUT,
             )
+        return False
     except BaseException as err:
         logger_celery.exception("[ProcessRiskTicket] %s Error %s %s", process_class.__name__, risk.risk_id, err)
         raise err
@@ -27,6 +27,7 @@ from apps.meta.handlers.iam_group import IAMGroupManager
 from apps.permission.handlers.resource_types import ResourceEnum
 from apps.permission.handlers.service import PermissionService
 from services.web.common.monitor import ScenePermissionGrantFailedEvent
+from services.web.common.scope_permission import authorized_scope_cache
 from services.web.scene.constants import (
     SCENE_PERMISSION_GRANT_MAX_RETRY,
     SCENE_ROLE_TO_IAM_V4_ROLE,
@@ -41,7 +42,7 @@ from services.web.scene.models import Scene, ScenePermissionApplication
 
 def grant_scene_role(scene: Scene, role: str, username: str, operator: Optional[str] = None) -> dict:
     """授予场景角色（V3/V4 自适应）。仅授予单人，不影响其他成员。
-    授权成功后即时从 IAM 刷新当前 scene 的成员到本地，确保审批人列表与授权结果实时可见。
+    授权成功后即时从 IAM 刷新当前 scene 的成员到本地，并失效被授权人的授权集合缓存，确保审批人列表与授权结果实时可见。
     :param scene: Scene 实例
     :param role: SceneRole.MANAGER / SceneRole.USER
     :param username: 被授权人
@@ -51,6 +52,8 @@ def grant_scene_role(scene: Scene, role: str, username: str, operator: Optional[
     operator = operator or bk_resource_settings.PLATFORM_AUTH_ACCESS_USERNAME
     result = _grant_scene_role_to_iam(scene, role, username, operator)
     if result.get("success"):
+        # 被授权人的授权场景集合已变化
+        authorized_scope_cache.invalidate_user(username)
         try:
             IAMGroupManager.refresh_scene_members(scene, save=True)
         except Exception:  # NOCC:broad-except
@@ -35,7 +35,11 @@ from apps.permission.handlers.actions import ActionEnum
 from apps.permission.handlers.service import PermissionService
 from core.models import get_request_username
 from services.web.common.constants import ScopeType
-from services.web.common.scope_permission import ScopeContext, ScopePermission
+from services.web.common.scope_permission import (
+    ScopeContext,
+    ScopePermission,
+    authorized_scope_cache,
+)
 from services.web.risk.models import Risk
 from services.web.scene.binding_validation import assert_binding_relation_integrity
 from services.web.scene.constants import (
@@ -104,6 +108,12 @@ class SceneResource(AuditMixinResource, abc.ABC):
     def _sync_iam_group_members(cls, scene, validated_request_data):
         """当 managers 或 users 变更时，同步到 IAM 成员授权。"""
         IAMGroupManager.sync_scene_members(scene, validated_request_data, operator=get_request_username())
+        cls._invalidate_authorized_scope_cache()
+
+    @classmethod
+    def _invalidate_authorized_scope_cache(cls):
+        """场景成员、状态变更后失效用户授权集合缓存（事务提交后执行，避免其他请求回填旧值）"""
+        transaction.on_commit(authorized_scope_cache.invalidate_all)
 
 
 class SceneDetailResponseContextMixin:
@@ -342,6 +352,7 @@ class CreateScene(SceneResource):
         self._create_scene_manager_notice_group(scene)
         # 创建 IAM 成员授权；底层 V3 用户组/V4 Role 授权由 IAMGroupManager 屏蔽
         IAMGroupManager.create_scene_member_permissions(scene, operator=get_request_username())
+        self._invalidate_authorized_scope_cache()
         # 新场景补齐全可见平台报表的分组映射
         self._sync_all_visible_platform_panels(scene)
 
@@ -542,6 +553,7 @@ class DeleteScene(SceneResource):
             raise SceneStrategyNotDisabled(strategy_ids=active_strategy_ids)
 
         scene.delete()
+        self._invalidate_authorized_scope_cache()
         return {"message": "success"}
 
 
@@ -559,6 +571,7 @@ class DisableScene(SceneResource):
             raise SceneNotExist()
         scene.status = SceneStatus.DISABLED
         scene.save()
+        self._invalidate_authorized_scope_cache()
         return scene
 
 
@@ -576,6 +589,7 @@ class EnableScene(SceneResource):
             raise SceneNotExist()
         scene.status = SceneStatus.ENABLED
         scene.save()
+        self._invalidate_authorized_scope_cache()
         return scene
 
 
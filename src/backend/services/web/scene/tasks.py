@@ -12,6 +12,7 @@ from django.db import transaction
 from django.utils import timezone
 
 from core.lock import lock
+from services.web.common.scope_permission import authorized_scope_cache
 from services.web.scene.constants import (
     SCENE_PERMISSION_GRANT_MAX_RETRY,
     SYNC_SCENE_PERMISSION_PERIODIC_TASK_MINUTE,
@@ -55,6 +56,9 @@ def sync_scene_members_from_iam():
                 err,
             )
 
+    # 成员变更涉及的用户无法逐个确定，整体失效授权集合缓存
+    authorized_scope_cache.invalidate_all()
+
     logger.info(
         "[sync_scene_members_from_iam] finished, success_count=%s, fail_count=%s",
         success_count,
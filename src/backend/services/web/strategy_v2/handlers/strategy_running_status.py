@@ -74,7 +74,14 @@ class StrategyRunningStatusHandler(abc.ABC):
         return handler_cls(*args, **kwargs)
 
     def __init__(
-        self, strategy: Strategy, start_time: datetime.datetime, end_time: datetime.datetime, limit: int, offset: int
+        self,
+        strategy: Strategy,
+        start_time: datetime.datetime,
+        end_time: datetime.datetime,
+        limit: int,
+        offset: int,
+        flow_graph: Optional[dict] = None,
+        risk_count_map: Optional[Dict[int, int]] = None,
     ):
         """
         :param strategy: 策略
@@ -82,6 +89,8 @@ class StrategyRunningStatusHandler(abc.ABC):
         :param end_time: 结束时间
         :param limit: 分页大小
         :param offset: 分页偏移量
+        :param flow_graph: 预先获取的 Flow 图，为空时按需请求
+        :param risk_count_map: 预先统计的风险数量，为空时按需查询
         """
 
         self.strategy = strategy
@@ -89,6 +98,8 @@ class StrategyRunningStatusHandler(abc.ABC):
         self.end_time = end_time
         self.limit = limit
         self.offset = offset
+        self.flow_graph = flow_graph
+        self.risk_count_map = risk_count_map
 
     @abc.abstractmethod
     def get_strategy_running_status(self) -> List[RunningStatus]:
@@ -113,7 +124,8 @@ class RuleAuditBatchV2StrategyRunningStatusHandler(StrategyRunningStatusHandler)
 
         node = None
         flow_id = self.strategy.backend_data.get("flow_id")
-        bkbase_nodes = api.bk_base.get_flow_graph(flow_id=flow_id)["nodes"]
+        flow_graph = self.flow_graph if self.flow_graph is not None else api.bk_base.get_flow_graph(flow_id=flow_id)
+        bkbase_nodes = flow_graph["nodes"]
         for node in bkbase_nodes:
             if node["node_type"] == self.processing_node_type:
                 node = node
@@ -152,15 +164,32 @@ class RuleAuditBatchV2StrategyRunningStatusHandler(StrategyRunningStatusHandler)
         value: 风险数量
         """
 
-        risks = list(
-            Risk.objects.filter(
-                strategy_id=self.strategy.strategy_id, event_time__range=[self.start_time, self.end_time]
-            )
-            .values('event_time')
+        if self.risk_count_map is not None:
+            return self.risk_count_map
+        return self.bulk_get_risk_count_map([self.strategy.strategy_id], self.start_time, self.end_time).get(
+            self.strategy.strategy_id, {}
+        )
+
+    @classmethod
+    def bulk_get_risk_count_map(
+        cls, strategy_ids: List[int], start_time: datetime.datetime, end_time: datetime.datetime
+    ) -> Dict[int, Dict[int, int]]:
+        """
+        一次分组查询多个策略的风险数量
+        key: 策略ID
+        value: {数据时间: 风险数量}
+        """
+
+        risks = (
+            Risk.objects.filter(strategy_id__in=strategy_ids, event_time__range=[start_time, end_time])
+            .values('strategy_id', 'event_time')
             .annotate(risk_count=Count('risk_id'))
-            .order_by('-event_time')
+            .order_by()
         )
-        risk_count_map = {int(risk['event_time'].timestamp()) * 1000: risk['risk_count'] for risk in risks}
+        risk_count_map: Dict[int, Dict[int, int]] = {}
+        for risk in risks:
+            data_time = int(risk['event_time'].timestamp()) * 1000
+            risk_count_map.setdefault(risk['strategy_id'], {})[data_time] = risk['risk_count']
         return risk_count_map
 
     def format_running_status(self, status: dict, risk_count_map: Dict[int, int]) -> RunningStatus:
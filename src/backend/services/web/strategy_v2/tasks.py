@@ -16,8 +16,10 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import math
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
 
 from bk_resource import api
 from blueapps.contrib.celery_tools.periodic import periodic_task
@@ -26,6 +28,7 @@ from celery.schedules import crontab
 from django.conf import settings
 
 from core.lock import lock
+from core.observability import submit_with_observation_context
 from services.web.analyze.constants import FlowNodeStatusChoices
 from services.web.strategy_v2.constants import (
     RuleAuditSourceType,
@@ -33,6 +36,7 @@ from services.web.strategy_v2.constants import (
     StrategyStatusChoices,
 )
 from services.web.strategy_v2.handlers.strategy_running_status import (
+    RuleAuditBatchV2StrategyRunningStatusHandler,
     StrategyRunningStatusHandler,
 )
 from services.web.strategy_v2.models import Strategy
@@ -55,6 +59,42 @@ EXPECTED_FLOW_STATUS = {
 class StrategyStatusChecker:
     """策略状态检查器"""
 
+    def __init__(self, concurrency: Optional[int] = None, call_timeout: Optional[float] = None):
+        """
+        :param concurrency: 并发请求 BKBase 的线程数
+        :param call_timeout: 单次请求的超时时间(秒)
+        """
+
+        self.concurrency = max(concurrency or settings.STRATEGY_STATUS_CHECK_CONCURRENCY, 1)
+        self.call_timeout = call_timeout or settings.STRATEGY_STATUS_CHECK_CALL_TIMEOUT
+
+    def run_concurrently(self, func: Callable[[Hashable], Any], keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """
+        在有界线程池中并发执行 func(key)，返回 {key: 结果}
+        调用异常或超时的 key 对应的结果为异常对象；
+        每批最多 concurrency 个调用、每个调用 call_timeout 秒，超出总时长仍未完成的调用不再等待
+        """
+
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        max_workers = min(self.concurrency, len(keys))
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="strategy_status_check")
+        futures = {submit_with_observation_context(executor, func, key): key for key in keys}
+        done, _ = wait(futures, timeout=self.call_timeout * math.ceil(len(keys) / max_workers))
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        results = {}
+        for future, key in futures.items():
+            if future not in done:
+                results[key] = TimeoutError(f"timeout after {self.call_timeout}s")
+                continue
+            try:
+                results[key] = future.result()
+            except Exception as error:  # pylint: disable=broad-except
+                results[key] = error
+        return results
+
     def fetch_flow_status(self, flow_id: Optional[int]) -> str:
         """
         获取Flow状态
@@ -69,6 +109,24 @@ class StrategyStatusChecker:
             return FlowNodeStatusChoices.NO_START.value
         return data.get("flow_status") or FlowNodeStatusChoices.NO_START.value
 
+    def fetch_flow_statuses(self, flow_ids: Iterable[Optional[int]]) -> Dict[int, str]:
+        """
+        并发获取多个Flow的状态，每个Flow只请求一次
+        """
+
+        results = self.run_concurrently(self.fetch_flow_status, [flow_id for flow_id in flow_ids if flow_id])
+        return {
+            flow_id: f"error:{result}" if isinstance(result, Exception) else result
+            for flow_id, result in results.items()
+        }
+
+    def fetch_flow_graphs(self, flow_ids: Iterable[int]) -> Dict[int, Any]:
+        """
+        并发获取多个Flow的图，每个Flow只请求一次；失败的Flow对应的结果为异常对象
+        """
+
+        return self.run_concurrently(lambda flow_id: api.bk_base.get_flow_graph(flow_id=flow_id), flow_ids)
+
     def judge(self, strategy: Strategy, flow_status: str) -> Optional[str]:
         if flow_status.startswith("error:"):
             return flow_status
@@ -98,14 +156,28 @@ class StrategyStatusChecker:
         source_type = strategy.configs.get("data_source", {}).get("source_type")
         return source_type == RuleAuditSourceType.REALTIME
 
-    def get_strategy_running_data(self, strategy: Strategy, days: int = 1, limit: int = 100) -> List[Dict]:
+    def get_strategy_running_data(
+        self,
+        strategy: Strategy,
+        days: int = 1,
+        limit: int = 100,
+        end_time: Optional[datetime] = None,
+        flow_graph: Optional[dict] = None,
+        risk_count_map: Optional[Dict[int, int]] = None,
+    ) -> List[Dict]:
         """获取策略运行数据"""
         try:
-            end_time = datetime.now()
+            end_time = end_time or datetime.now()
             start_time = end_time - timedelta(days=days)
 
             handler = StrategyRunningStatusHandler.get_typed_handler(
-                strategy=strategy, start_time=start_time, end_time=end_time, limit=limit, offset=0
+                strategy=strategy,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit,
+                offset=0,
+                flow_graph=flow_graph,
+                risk_count_map=risk_count_map,
             )
 
             if not handler:
@@ -132,6 +204,52 @@ class StrategyStatusChecker:
             logger_celery.error("[GetRunningDataError] strategy=%s error=%s", strategy.strategy_id, str(e))
             return []
 
+    def fetch_strategies_running_data(
+        self, strategies: List[Strategy], days: int = 1, limit: int = 100
+    ) -> Dict[int, Any]:
+        """
+        并发获取多个离线策略的运行数据
+        Flow图按Flow去重获取，风险数量一次分组查询；获取超时的策略对应的结果为异常对象
+        """
+
+        if not strategies:
+            return {}
+        end_time = datetime.now()
+        strategy_map = {strategy.strategy_id: strategy for strategy in strategies}
+        flow_graphs = self.fetch_flow_graphs(strategy.backend_data["flow_id"] for strategy in strategies)
+        risk_count_maps = RuleAuditBatchV2StrategyRunningStatusHandler.bulk_get_risk_count_map(
+            list(strategy_map.keys()), end_time - timedelta(days=days), end_time
+        )
+
+        def fetch(strategy_id: int) -> List[Dict]:
+            strategy = strategy_map[strategy_id]
+            flow_graph = flow_graphs.get(strategy.backend_data["flow_id"])
+            if isinstance(flow_graph, Exception):
+                logger_celery.error("[GetRunningDataError] strategy=%s error=%s", strategy_id, str(flow_graph))
+                return []
+            return self.get_strategy_running_data(
+                strategy,
+                days=days,
+                limit=limit,
+                end_time=end_time,
+                flow_graph=flow_graph,
+                risk_count_map=risk_count_maps.get(strategy_id, {}),
+            )
+
+        return self.run_concurrently(fetch, strategy_map.keys())
+
+    def need_check_schedule_records(self, strategy: Strategy, flow_status: str) -> bool:
+        """
+        离线策略与Flow均为运行中时才需要检查调度记录
+        """
+
+        return (
+            not self.is_realtime_strategy(strategy)
+            and bool((strategy.backend_data or {}).get("flow_id"))
+            and strategy.status == StrategyStatusChoices.RUNNING.value
+            and flow_status == FlowNodeStatusChoices.RUNNING.value
+        )
+
     def check_no_schedule_records(
         self, strategy: Strategy, flow_status: Optional[str], running_data: List[Dict] = None
     ) -> Optional[str]:
@@ -177,42 +295,54 @@ def check_strategy_status_anomalies():
     checker = StrategyStatusChecker()
 
     # 获取所有策略
-    strategies = Strategy.objects.all()
+    strategies = list(Strategy.objects.all())
 
-    # 收集所有状态不匹配的策略
-    mismatches = []
+    # 并发获取所有flow状态，每个flow只请求一次
+    flow_statuses = checker.fetch_flow_statuses((strategy.backend_data or {}).get("flow_id") for strategy in strategies)
 
+    # 状态一致性检查，收集需要进一步检查调度记录的离线策略
+    checked = []
+    schedule_check_strategies = []
     for strategy in strategies:
         try:
             # 获取策略对应的flow_id
             flow_id = (strategy.backend_data or {}).get("flow_id")
+            flow_status = flow_statuses.get(flow_id, FlowNodeStatusChoices.NO_START.value)
+
+            # 实时策略与离线策略均先检查状态一致性
+            anomaly_reason = checker.judge(strategy, flow_status)
+            checked.append({"strategy": strategy, "flow_status": flow_status, "reason": anomaly_reason})
 
-            # 获取flow状态
-            flow_status = checker.fetch_flow_status(flow_id)
-
-            # 获取策略运行数据（最近1天的数据）
-            running_data = checker.get_strategy_running_data(strategy, days=1, limit=100)
-
-            # 判断策略类型：离线策略还是实时策略
-            if checker.is_realtime_strategy(strategy):
-                # 实时策略：使用judge方法检查状态一致性
-                anomaly_reason = checker.judge(strategy, flow_status)
-            else:
-                # 离线策略：先进行状态一致性检查
-                anomaly_reason = checker.judge(strategy, flow_status)
-
-                # 如果状态一致性检查无异常且Flow状态为RUNNING，再检查调度记录
-                if not anomaly_reason and flow_status == FlowNodeStatusChoices.RUNNING.value:
-                    schedule_anomaly = checker.check_no_schedule_records(strategy, flow_status, running_data)
-                    if schedule_anomaly:
-                        anomaly_reason = schedule_anomaly
-
-            # 如果有异常，添加到不匹配列表
-            if anomaly_reason:
-                mismatches.append({"strategy": strategy, "flow_status": flow_status, "reason": anomaly_reason})
+            # 离线策略状态一致且Flow为RUNNING时，再检查调度记录
+            if not anomaly_reason and checker.need_check_schedule_records(strategy, flow_status):
+                schedule_check_strategies.append(strategy)
         except Exception as e:
             logger_celery.error("[StrategyStatusCheckError] strategy=%s error=%s", strategy.strategy_id, str(e))
 
+    # 并发获取离线策略运行数据（最近1天的数据）
+    running_data_map = {}
+    try:
+        running_data_map = checker.fetch_strategies_running_data(schedule_check_strategies, days=1, limit=100)
+    except Exception as e:
+        logger_celery.error("[StrategyStatusCheckError] fetch running data error=%s", str(e))
+
+    # 收集所有状态不匹配的策略
+    mismatches = []
+    for item in checked:
+        strategy = item["strategy"]
+        if not item["reason"] and strategy.strategy_id in running_data_map:
+            running_data = running_data_map[strategy.strategy_id]
+            if isinstance(running_data, Exception):
+                logger_celery.error(
+                    "[StrategyStatusCheckError] strategy=%s error=%s", strategy.strategy_id, str(running_data)
+                )
+                continue
+            item["reason"] = checker.check_no_schedule_records(strategy, item["flow_status"], running_data)
+
+        # 如果有异常，添加到不匹配列表
+        if item["reason"]:
+            mismatches.append(item)
+
     # 批量上报所有异常
     if mismatches:
         try:
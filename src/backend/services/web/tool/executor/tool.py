@@ -29,6 +29,7 @@ from pydantic import BaseModel
 from api.bk_base.constants import UserAuthActionEnum
 from core.models import get_request_username
 from core.sql.parser.praser import SqlQueryAnalysis
+from core.utils.http import http_session_pool
 from services.web.scene.constants import ResourceVisibilityType
 from services.web.scene.data_filter import SceneDataFilter
 from services.web.tool.constants import (
@@ -521,7 +522,7 @@ class ApiToolExecutor(BaseToolExecutor[ApiToolConfig, APIToolExecuteParams, ApiT
                 f"body={safe_body}, query_params={safe_query_params}"
             )
 
-            response = requests.request(
+            response = http_session_pool.request(
                 method=method,
                 url=url,
                 headers=headers,
@@ -27,6 +27,22 @@ from api.bk_paas.default import UniAppsQuery
 from tests.constants import MOCK_PROCESSING_ID, RISK_EVENT_TIMESTAMP
 
 
+@pytest.fixture(autouse=True)
+def clear_versioned_caches():
+    """
+    测试用例结束后数据库会回滚，但配置、count 等缓存不会，需要在每个用例前清理
+    """
+
+    from apps.meta.models import GlobalMetaConfig
+    from services.web.common.scope_permission import authorized_scope_cache
+    from services.web.risk.converter.bkbase import list_risk_count_cache
+
+    GlobalMetaConfig.clear_cache()
+    list_risk_count_cache.invalidate()
+    authorized_scope_cache.invalidate_all()
+    yield
+
+
 @pytest.hookimpl(trylast=True)
 def pytest_configure(config: pytest.Config) -> None:
     from django.conf import settings
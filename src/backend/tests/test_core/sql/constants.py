@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+# SQL 模板缓存测试与基准使用的模板语料
+# tests/test_tool 中工具配置使用的 SQL 模板
+TOOL_SQL_TEMPLATES = [
+    "SELECT * FROM table",
+    "SELECT * FROM table WHERE username = :username",
+    "SELECT 1",
+    "SELECT a FROM config_table",
+    "SELECT a FROM table",
+    "SELECT a FROM table WHERE a = :a",
+    "SELECT a FROM table WHERE a IN :a",
+    "SELECT a FROM table WHERE time_range(x, :a,)",
+    "SELECT id FROM users",
+    "select 1 v2",
+    "select f1 from test_table",
+    "select f2 from test_table_2",
+    "select f3 from test_table_3",
+]
+
+# 覆盖 TIME_RANGE / SKIP_NULL_CLAUSE / CTE 等自定义函数与复杂结构的模板
+EXTRA_SQL_TEMPLATES = [
+    "SELECT id, name, price FROM products WHERE category = :cat AND price > :min_price",
+    "SELECT id FROM sales WHERE TIME_RANGE(amount, :time_range) AND status = :s",
+    "SELECT id FROM events WHERE :ok = 100 OR SKIP_NULL_CLAUSE(status, 'eq', :st)",
+    "SELECT id FROM events WHERE SKIP_NULL_CLAUSE(type, 'in', :t) AND SKIP_NULL_CLAUSE(level, 'gt', :lv)",
+    "WITH s AS (SELECT user_id, SUM(amount) AS total FROM orders WHERE dt > :start GROUP BY user_id) "
+    "SELECT u.id, u.name, s.total FROM users u JOIN s ON u.id = s.user_id WHERE u.status IN :status",
+]
+
+SQL_TEMPLATES = TOOL_SQL_TEMPLATES + EXTRA_SQL_TEMPLATES
@@ -0,0 +1,123 @@
+import os
+import time
+import unittest
+from unittest import mock
+
+import sqlglot
+from django.test import SimpleTestCase
+from sqlglot import exp
+
+from core.sql.exceptions import SQLParseError
+from core.sql.parser.functions import TimeRange, get_skip_null_var_names
+from core.sql.parser.model import RangeVariableData
+from core.sql.parser.praser import (
+    ParsedSQLTemplate,
+    SqlQueryAnalysis,
+    sql_template_cache,
+)
+from tests.test_core.sql.constants import SQL_TEMPLATES
+
+# 设置该环境变量时才执行耗时基准测试
+SQL_TEMPLATE_BENCHMARK_ENV = "BKAPP_RUN_SQL_TEMPLATE_BENCHMARK"
+
+
+def build_params(sql: str) -> dict:
+    params = {}
+    for node in sqlglot.parse_one(sql, read="hive").find_all(exp.Var, exp.Placeholder):
+        if isinstance(node.parent, TimeRange):
+            params[node.name] = RangeVariableData(start=1700000000000, end=1700003600000)
+        elif node.name in ("status", "t"):
+            params[node.name] = ["a", "b"]
+        elif node.name != "st":
+            params[node.name] = "value"
+    return params
+
+
+def legacy_generate_sql(analyzer: SqlQueryAnalysis, sql: str, params: dict, limit: int, offset: int) -> dict:
+    """缓存前的实现: 每次解析模板并执行两次 transform(copy=True)"""
+
+    parsed_tree = sqlglot.parse_one(sql, read=analyzer.dialect)
+    skip_null_var_names = get_skip_null_var_names(parsed_tree)
+    tree = parsed_tree.transform(
+        analyzer._parameter_replacer_visitor, params, analyzer.dialect, skip_null_var_names, copy=True
+    )
+    tree = tree.transform(analyzer._custom_function_visitor, params, analyzer.dialect, copy=True)
+    count_sql = (
+        exp.select(exp.func("COUNT", exp.Star()).as_("count"))
+        .from_(tree.copy().subquery("_sub"))
+        .sql(dialect=analyzer.dialect)
+    )
+    tree = tree.limit(limit)
+    if offset:
+        tree = tree.offset(offset)
+    return {"data": tree.sql(dialect=analyzer.dialect), "count": count_sql}
+
+
+class TestSqlTemplateCache(SimpleTestCase):
+    def setUp(self):
+        self.templates = [(sql, build_params(sql)) for sql in SQL_TEMPLATES]
+
+    def test_render_matches_legacy(self):
+        for sql, params in self.templates:
+            with self.subTest(sql=sql):
+                analyzer = SqlQueryAnalysis(sql)
+                expected = legacy_generate_sql(analyzer, sql, params, limit=10, offset=20)
+                for _ in range(2):
+                    self.assertEqual(
+                        analyzer.generate_sql_with_values(params, limit=10, offset=20, with_count=True), expected
+                    )
+
+    def test_parse_once_per_template(self):
+        sql_template_cache.clear()
+        with mock.patch("core.sql.parser.praser.ParsedSQLTemplate", wraps=ParsedSQLTemplate) as parsed_template:
+            for _ in range(3):
+                for sql, params in self.templates:
+                    SqlQueryAnalysis(sql).generate_sql_with_values(params, limit=10, with_count=True)
+        self.assertEqual(parsed_template.call_count, len({sql for sql, _ in self.templates}))
+
+    def test_template_tree_not_mutated(self):
+        sql = "SELECT id FROM events WHERE SKIP_NULL_CLAUSE(status, 'eq', :st) AND id = :id"
+        analyzer = SqlQueryAnalysis(sql)
+        first = analyzer.generate_sql_with_values({"st": "open", "id": 1}, limit=5, with_count=True)
+        second = analyzer.generate_sql_with_values({"id": 2})
+        self.assertIn("status = 'open'", first["data"])
+        self.assertEqual(second["data"], "SELECT id FROM events WHERE TRUE AND id = 2")
+        analyzer.parse_sql()
+        self.assertEqual({v.raw_name: v.required for v in analyzer.sql_variables}, {"st": False, "id": True})
+
+    def test_missing_param_and_anonymous_variable(self):
+        with self.assertRaises(SQLParseError):
+            SqlQueryAnalysis("SELECT id FROM t WHERE id = :id").generate_sql_with_values({})
+        with self.assertRaises(SQLParseError):
+            SqlQueryAnalysis("SELECT id FROM t WHERE id = ?").generate_sql_with_values({})
+
+
+@unittest.skipUnless(os.getenv(SQL_TEMPLATE_BENCHMARK_ENV), f"设置 {SQL_TEMPLATE_BENCHMARK_ENV}=1 时执行")
+class TestSqlTemplateCacheBenchmark(SimpleTestCase):
+    """逐次解析 + 两次复制转换 与 命中模板缓存单次渲染 的耗时对比"""
+
+    rounds = 20
+
+    def test_benchmark_sql_templates(self):
+        analyzers = [(SqlQueryAnalysis(sql), sql, build_params(sql)) for sql in SQL_TEMPLATES]
+
+        legacy_started = time.perf_counter()
+        for _ in range(self.rounds):
+            for analyzer, sql, params in analyzers:
+                legacy_generate_sql(analyzer, sql, params, limit=10, offset=20)
+        legacy_cost = time.perf_counter() - legacy_started
+
+        sql_template_cache.clear()
+        cached_started = time.perf_counter()
+        for _ in range(self.rounds):
+            for analyzer, sql, params in analyzers:
+                analyzer.generate_sql_with_values(params, limit=10, offset=20, with_count=True)
+        cached_cost = time.perf_counter() - cached_started
+
+        total = self.rounds * len(analyzers)
+        print(
+            f"\nSQL template render over {len(analyzers)} templates x {self.rounds}: "
+            f"legacy {legacy_cost * 1000 / total:.2f}ms/op, cached {cached_cost * 1000 / total:.2f}ms/op, "
+            f"speedup {legacy_cost / cached_cost:.1f}x"
+        )
+        self.assertLess(cached_cost, legacy_cost)
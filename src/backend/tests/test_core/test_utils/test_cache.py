@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from core.utils.cache import LocalTTLCache, VersionedCache
+
+
+class TestLocalTTLCache(TestCase):
+    def test_lru_eviction(self):
+        local = LocalTTLCache(maxsize=2, ttl=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        self.assertEqual(local.get("a"), 1)
+        local.set("c", 3)
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("a"), 1)
+        self.assertEqual(local.get("c"), 3)
+
+    def test_expire(self):
+        local = LocalTTLCache(maxsize=2, ttl=10)
+        with mock.patch("core.utils.cache.time.monotonic", return_value=100):
+            local.set("a", 1)
+        with mock.patch("core.utils.cache.time.monotonic", return_value=105):
+            self.assertEqual(local.get("a"), 1)
+        with mock.patch("core.utils.cache.time.monotonic", return_value=111):
+            self.assertIsNone(local.get("a"))
+
+
+class TestVersionedCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cache = VersionedCache(namespace="test_versioned_cache")
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_get_or_load(self):
+        loader = mock.Mock(return_value={"value": 1})
+        self.assertEqual(self.cache.get_or_load("key", loader), {"value": 1})
+        self.assertEqual(self.cache.get_or_load("key", loader), {"value": 1})
+        loader.assert_called_once()
+        self.assertEqual(self.cache.stats["local_hits"], 1)
+
+    def test_shared_tier_between_processes(self):
+        loader = mock.Mock(return_value=None)
+        self.cache.get_or_load("key", loader)
+        other = VersionedCache(namespace="test_versioned_cache")
+        self.assertIsNone(other.get_or_load("key", loader))
+        loader.assert_called_once()
+        self.assertEqual(other.stats["shared_hits"], 1)
+
+    def test_return_copy(self):
+        value = self.cache.get_or_load("key", lambda: {"items": [1]})
+        value["items"].append(2)
+        self.assertEqual(self.cache.get_or_load("key", lambda: {}), {"items": [1]})
+
+    def test_invalidate(self):
+        self.cache.get_or_load("key", lambda: 1)
+        self.cache.invalidate()
+        self.assertEqual(self.cache.get_or_load("key", lambda: 2), 2)
+
+    def test_loader_exception_not_cached(self):
+        with self.assertRaises(KeyError):
+            self.cache.get_or_load("key", mock.Mock(side_effect=KeyError))
+        self.assertEqual(self.cache.get_or_load("key", lambda: 1), 1)
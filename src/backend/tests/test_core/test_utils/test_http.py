@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.test import SimpleTestCase
+
+from core.utils.http import HostSessionPool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        body = b'{"result": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "sessionid=abc; Path=/")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        return
+
+
+class TestHostSessionPool(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}/api/"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.pool = HostSessionPool(pool_maxsize=2, max_hosts=2, host_concurrency=1)
+
+    def tearDown(self):
+        self.pool.clear()
+
+    def test_reuse_connection(self):
+        for _ in range(5):
+            resp = self.pool.post(self.url, json={"page": 1}, timeout=5)
+            self.assertEqual(resp.json(), {"result": True})
+        stats = self.pool.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 4)
+        self.assertEqual(stats["connections"], 1)
+        self.assertEqual(stats["reused"], 4)
+
+    def test_cookie_not_kept(self):
+        self.pool.post(self.url, timeout=5)
+        self.assertEqual(len(self.pool.get_session(self.url).session.cookies), 0)
+
+    def test_evict_least_recently_used_host(self):
+        self.pool.get_session("http://a.example.com/x")
+        self.pool.get_session("http://b.example.com/x")
+        self.pool.get_session("http://A.example.com/y")
+        self.pool.get_session("http://c.example.com/x")
+        self.assertEqual(list(self.pool.stats()["hosts"]), ["http://a.example.com", "http://c.example.com"])
+
+    def test_wait_slot_timeout(self):
+        host_session = self.pool.get_session(self.url)
+        host_session.semaphore.acquire()
+        try:
+            with self.assertRaises(requests.Timeout):
+                self.pool.post(self.url, timeout=(0.01, 5))
+        finally:
+            host_session.semaphore.release()
+        self.assertEqual(self.pool.post(self.url, timeout=5).status_code, 200)
@@ -258,14 +258,14 @@ class CollectorTest(TestCase):
         result = self.resource.databus.collector.etl_preview(**ETL_PREVIEW_DATA)
         self.assertEqual(result, ETL_PREVIEW_RESULT)
 
-    @mock.patch("databus.collector.resources.requests.session", SessionMock())
+    @mock.patch("services.web.databus.collector.snapshot.join.http_pull.http_session_pool", SessionMock())
     def test_toggle_join_data(self):
         """ToggleJoinDataResource"""
         self.resource.databus.collector.toggle_join_data(**TOGGLE_JOIN_DATA)
         with self.assertRaises(SnapshotPreparingException):
             self.resource.databus.collector.toggle_join_data(**TOGGLE_JOIN_DATA)
 
-    @mock.patch("databus.collector.resources.requests.session", SessionMock())
+    @mock.patch("services.web.databus.collector.snapshot.join.http_pull.http_session_pool", SessionMock())
     @mock.patch("databus.collector.snapshot.join.base.api.bk_base.stop_collector", mock.Mock())
     def test_toggle_join_data_stop(self):
         """ToggleJoinDataResource"""
@@ -280,7 +280,7 @@ class CollectorTest(TestCase):
         with self.assertRaises(JoinDataPreCheckFailed):
             self.resource.databus.collector.toggle_join_data(**TOGGLE_JOIN_DATA)
 
-    @mock.patch("databus.collector.resources.requests.session", ErrorSessionMock())
+    @mock.patch("services.web.databus.collector.snapshot.join.http_pull.http_session_pool", ErrorSessionMock())
     def test_toggle_join_data_check_status_failed(self):
         """ToggleJoinDataResource"""
         with self.assertRaises(JoinDataPreCheckFailed):
@@ -322,11 +322,12 @@ class CollectorTest(TestCase):
         )
         self.assertEqual(result[self.system_id]["status"], SnapshotReportStatus.ABNORMAL.value)
 
-    @mock.patch("databus.collector.resources.requests.session", SessionMock())
+    @mock.patch("services.web.databus.collector.snapshot.join.http_pull.http_session_pool", SessionMock())
     @mock.patch(
         "databus.collector.snapshot.join.http_pull.api.bk_base.create_deploy_plan",
         Mock(return_value=CREATE_DEPLOY_PLAN_RESULT),
     )
+    @mock.patch("databus.collector.snapshot.join.http_pull.api.bk_base.update_deploy_plan", mock.Mock())
     @mock.patch(
         "databus.collector.etl.base.api.bk_base.databus_cleans_post",
         mock.Mock(return_value=CREATE_COLLECTOR_ETL_API_RESP),
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+import itertools
+import json
+from unittest import mock
+
+from bk_resource.exceptions import APIRequestError
+from django.utils import timezone
+
+from services.web.databus.collector.handlers import TailLogSyncer
+from services.web.databus.constants import SourcePlatformChoices
+from services.web.databus.models import CollectorConfig
+from tests.base import TestCase
+from tests.test_databus.collector.constants import COLLECTOR_DATA
+
+
+class TailLogSyncerTest(TestCase):
+    def setUp(self):
+        self.tail_log_time = timezone.now().replace(microsecond=0)
+        self.bklog = self.create_collector(1, tail_log_time=self.tail_log_time - datetime.timedelta(days=1))
+        self.bklog_failed = self.create_collector(2, tail_log_time=self.tail_log_time)
+        self.bkbase = self.create_collector(3, source_platform=SourcePlatformChoices.BKBASE.value, bk_data_id=3)
+        # 缺少 DataID 的计算平台采集项，已有的最近日志时间需置空
+        self.bkbase_no_data_id = self.create_collector(
+            4,
+            source_platform=SourcePlatformChoices.BKBASE.value,
+            tail_log_time=self.tail_log_time - datetime.timedelta(days=2),
+        )
+        self.create_collector(5, is_deleted=True)
+        # 采集项变更时间早于优先窗口
+        CollectorConfig.objects.all().update(updated_at=self.tail_log_time - datetime.timedelta(days=1))
+
+    def create_collector(self, collector_config_id: int, **kwargs) -> CollectorConfig:
+        return CollectorConfig.objects.create(
+            **{
+                **COLLECTOR_DATA,
+                "collector_config_id": collector_config_id,
+                "collector_config_name": f"collector_{collector_config_id}",
+                **kwargs,
+            }
+        )
+
+    def mock_api(self):
+        def get_collector_tail_log(collector_config_id):
+            if collector_config_id == self.bklog_failed.collector_config_id:
+                raise APIRequestError()
+            return [{"origin": {"datetime": timezone.localtime(self.tail_log_time).strftime("%Y-%m-%d %H:%M:%S")}}]
+
+        api = mock.MagicMock()
+        api.bk_log.get_collector_tail_log.side_effect = get_collector_tail_log
+        api.bk_base.get_rawdata_tail.return_value = [
+            {"value": json.dumps({"start_time": int(self.tail_log_time.timestamp() * 1000)})}
+        ]
+        return mock.patch("services.web.databus.collector.handlers.api", api)
+
+    def test_sync(self):
+        with self.mock_api() as api, mock.patch("services.web.databus.collector.handlers.Metric") as metric:
+            changed = TailLogSyncer(concurrency=2).sync()
+
+        self.assertEqual(
+            sorted(collector.collector_config_id for collector in changed),
+            sorted(
+                collector.collector_config_id
+                for collector in [self.bklog, self.bklog_failed, self.bkbase, self.bkbase_no_data_id]
+            ),
+        )
+        self.bklog.refresh_from_db()
+        self.assertIsNotNone(self.bklog.tail_log_time)
+        self.bkbase.refresh_from_db()
+        self.assertEqual(self.bkbase.tail_log_time, self.tail_log_time)
+        self.bklog_failed.refresh_from_db()
+        self.assertIsNone(self.bklog_failed.tail_log_time)
+        self.bkbase_no_data_id.refresh_from_db()
+        self.assertIsNone(self.bkbase_no_data_id.tail_log_time)
+        # 已删除、缺少 DataID 的采集项不请求
+        self.assertEqual(api.bk_log.get_collector_tail_log.call_count, 2)
+        self.assertEqual(api.bk_base.get_rawdata_tail.call_count, 1)
+
+        records = {
+            record["dimension"]["source_platform"]: record["metrics"] for record in metric.call_args[1]["records"]
+        }
+        self.assertEqual(records[SourcePlatformChoices.BKLOG.value]["sync_count"], 2)
+        self.assertEqual(records[SourcePlatformChoices.BKLOG.value]["failed_count"], 1)
+        self.assertEqual(records[SourcePlatformChoices.BKBASE.value]["failed_count"], 0)
+
+    def test_unchanged_not_written(self):
+        with self.mock_api(), mock.patch("services.web.databus.collector.handlers.Metric"):
+            TailLogSyncer().sync()
+            changed = TailLogSyncer().sync()
+        self.assertEqual([collector.collector_config_id for collector in changed], [])
+
+    def test_prioritize(self):
+        CollectorConfig.objects.filter(pk=self.bklog_failed.pk).update(updated_at=timezone.now())
+        collectors = TailLogSyncer().prioritize(TailLogSyncer().load_collectors())
+        self.assertEqual(
+            [collector.collector_config_id for collector in collectors],
+            [
+                self.bklog_failed.collector_config_id,
+                self.bkbase.collector_config_id,
+                self.bkbase_no_data_id.collector_config_id,
+                self.bklog.collector_config_id,
+            ],
+        )
+
+    def test_time_budget(self):
+        monotonic = mock.Mock(side_effect=itertools.chain([0], itertools.repeat(100)))
+        with (
+            self.mock_api() as api,
+            mock.patch("services.web.databus.collector.handlers.Metric") as metric,
+            mock.patch("services.web.databus.collector.handlers.time.monotonic", monotonic),
+        ):
+            changed = TailLogSyncer(time_budget=10).sync()
+        # 缺少 DataID 的采集项无需请求，不受时间预算限制
+        self.assertEqual([collector.collector_config_id for collector in changed], [4])
+        api.bk_log.get_collector_tail_log.assert_not_called()
+        records = {
+            record["dimension"]["source_platform"]: record["metrics"] for record in metric.call_args[1]["records"]
+        }
+        self.assertEqual(records[SourcePlatformChoices.BKLOG.value]["skipped_count"], 2)
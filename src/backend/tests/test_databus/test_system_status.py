@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+from unittest import mock
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.meta.constants import SystemAuditStatusEnum, SystemStageEnum, SystemStatusEnum
+from apps.meta.models import Action, System
+from services.web.databus.constants import (
+    LogReportStatus,
+    SnapshotReportStatus,
+    SnapshotRunningStatus,
+    SystemStatusDetailEnum,
+)
+from services.web.databus.handler.system_status import (
+    SystemStatusRecordHandler,
+    fetch_system_status,
+)
+from services.web.databus.models import CollectorConfig, Snapshot, SystemStatusRecord
+from services.web.databus.tasks import sync_tail_log_time
+from tests.base import TestCase
+from tests.test_databus.collector.constants import COLLECTOR_DATA
+
+
+class SystemStatusRecordTest(TestCase):
+    def setUp(self):
+        self.system_id = settings.BK_IAM_SYSTEM_ID
+        System.objects.create(
+            namespace=settings.DEFAULT_NAMESPACE,
+            system_id=self.system_id,
+            instance_id=self.system_id,
+            name=self.system_id,
+            audit_status=SystemAuditStatusEnum.ACCESSED.value,
+        )
+        Action.objects.create(system_id=self.system_id, action_id="view", unique_id=f"{self.system_id}:view")
+
+    def get_record(self) -> SystemStatusRecord:
+        return SystemStatusRecord.objects.get(system_id=self.system_id)
+
+    def test_lazy_refresh(self):
+        SystemStatusRecord.objects.all().delete()
+        status = fetch_system_status(settings.DEFAULT_NAMESPACE, [self.system_id, "not_exists"])
+        self.assertEqual(list(status), [self.system_id])
+        self.assertEqual(status[self.system_id]["system_status"], SystemStatusEnum.INCOMPLETE.value)
+        self.assertEqual(status[self.system_id]["system_stage"], SystemStageEnum.COLLECTOR.value)
+        self.assertEqual(status[self.system_id]["tail_log_item"]["status"], LogReportStatus.UNSET.value)
+        self.assertTrue(SystemStatusRecord.objects.filter(system_id=self.system_id).exists())
+        self.assertEqual(fetch_system_status("other", [self.system_id]), {})
+
+    def test_read_only_records(self):
+        fetch_system_status(settings.DEFAULT_NAMESPACE, [self.system_id])
+        with self.assertNumQueries(1):
+            fetch_system_status(settings.DEFAULT_NAMESPACE, [self.system_id])
+
+    def test_refresh_on_collector_and_snapshot_change(self):
+        CollectorConfig.objects.create(**COLLECTOR_DATA)
+        record = self.get_record()
+        self.assertEqual(record.collector_count, 1)
+        self.assertEqual(record.log_status, LogReportStatus.NODATA.value)
+        self.assertEqual(record.snapshot_status, SnapshotReportStatus.UNSET.value)
+        self.assertEqual(record.system_status_detail, SystemStatusDetailEnum.NO_ASSET_REPORT.value)
+
+        snapshot = Snapshot.objects.create(
+            system_id=self.system_id, resource_type_id="biz", status=SnapshotRunningStatus.RUNNING.value
+        )
+        self.assertEqual(self.get_record().system_status_detail, SystemStatusDetailEnum.LOG_NO_DATA.value)
+
+        snapshot.status = SnapshotRunningStatus.FAILED.value
+        snapshot.save(update_fields=["status"])
+        self.assertEqual(self.get_record().snapshot_status, SnapshotReportStatus.ABNORMAL.value)
+
+    def test_sync_tail_log_time(self):
+        CollectorConfig.objects.create(**COLLECTOR_DATA)
+        tail_log_time = timezone.now()
+
+        with mock.patch(
+            "services.web.databus.collector.handlers.TailLogHandler.fetch", mock.Mock(return_value=tail_log_time)
+        ):
+            sync_tail_log_time()
+        record = self.get_record()
+        self.assertEqual(record.log_status, LogReportStatus.NORMAL.value)
+        self.assertEqual(record.tail_log_time, tail_log_time)
+        status = fetch_system_status(settings.DEFAULT_NAMESPACE, [self.system_id])
+        self.assertTrue(status[self.system_id]["tail_log_item"]["last_time"])
+
+    def test_system_deleted(self):
+        fetch_system_status(settings.DEFAULT_NAMESPACE, [self.system_id])
+        System.objects.filter(system_id=self.system_id).delete()
+        SystemStatusRecordHandler.refresh(system_ids=[self.system_id])
+        self.assertFalse(SystemStatusRecord.objects.filter(system_id=self.system_id).exists())
@@ -16,17 +16,22 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
-from datetime import timedelta
+import threading
+import time
+from datetime import date, timedelta
 from typing import Dict
 from unittest import mock
 
 from bk_resource.exceptions import APIRequestError
 from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
 from django.utils import timezone
 
 from api.bk_base.constants import StorageType
 from apps.meta.models import ResourceType, System
 from apps.permission.handlers.resource_types import ResourceEnum
+from services.web.databus.collector.check.handlers import SnapshotCountChecker
 from services.web.databus.constants import (
     ASSET_RISK_BKBASE_RT_ID_KEY,
     ASSET_STRATEGY_BKBASE_RT_ID_KEY,
@@ -45,6 +50,7 @@ from services.web.databus.models import (
 )
 from services.web.databus.tasks import (
     change_storage_cluster,
+    check_join_data,
     create_api_push_etl,
     refresh_system_snapshots,
     report_asset_sync_count,
@@ -674,3 +680,163 @@ class ReportAssetSyncCountTests(TestCase):
 
         # basic 不应触发任何事件
         event_class_mock.assert_not_called()
+
+
+@override_settings(
+    JOIN_DATA_CHECK_INCREMENTAL_STORAGES=[StorageType.HDFS.value], JOIN_DATA_CHECK_RECENT_PARTITION_DAYS=2
+)
+@mock.patch("services.web.databus.collector.check.handlers.HttpPullHandler.request")
+@mock.patch("services.web.databus.collector.check.handlers.api.bk_base.query_sync")
+class CheckJoinDataTests(TestCase):
+    """关联数据一致性检查（check_join_data）测试。"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        self.today = date(2026, 10, 18)
+        self.snapshots = []
+        for system_id in ["system_a", "system_b"]:
+            System.objects.create(system_id=system_id, instance_id=system_id, namespace=self.namespace, name=system_id)
+            for resource_type_id in ["rt_1", "rt_2"]:
+                ResourceType.objects.create(
+                    system_id=system_id,
+                    resource_type_id=resource_type_id,
+                    unique_id=f"{system_id}:{resource_type_id}",
+                    name=resource_type_id,
+                )
+                self.snapshots.append(
+                    Snapshot.objects.create(
+                        system_id=system_id,
+                        resource_type_id=resource_type_id,
+                        bkbase_table_id=f"{system_id}_{resource_type_id}",
+                        status=SnapshotRunningStatus.RUNNING.value,
+                        join_data_type=JoinDataType.ASSET.value,
+                    )
+                )
+        # HDFS 各表的分区计数
+        self.partitions = {"20261015": 10, "20261016": 20, "20261017": 30, "20261018": 40}
+        self.sqls = []
+
+    def tearDown(self) -> None:
+        cache.clear()
+        super().tearDown()
+
+    def _mock_pull(self, request_mock, count=100):
+        resp = mock.Mock()
+        resp.json.return_value = {"result": True, "data": {"count": count}}
+        request_mock.return_value = resp
+
+    def _query(self, sql: str, prefer_storage: str):
+        self.sqls.append((sql, prefer_storage))
+        if "group by thedate" not in sql:
+            return {"list": [{"count": 100}]}
+        if "where thedate >=" in sql:
+            recent_start = sql.split("where thedate >= ")[1].split(" ")[0]
+            return {
+                "list": [
+                    {"thedate": thedate, "count": count}
+                    for thedate, count in self.partitions.items()
+                    if thedate >= recent_start
+                ]
+            }
+        return {"list": [{"thedate": thedate, "count": count} for thedate, count in self.partitions.items()]}
+
+    def test_check_join_data_records_counts_and_timings(self, query_mock, request_mock):
+        self._mock_pull(request_mock)
+        query_mock.side_effect = self._query
+
+        check_join_data()
+
+        self.assertEqual(SnapshotCheckStatistic.objects.count(), 4)
+        for stat in SnapshotCheckStatistic.objects.all():
+            self.assertEqual(stat.http_pull_count, 100)
+            self.assertEqual(stat.doris_storage_count, 100)
+            self.assertEqual(stat.hdfs_storage_count, 100)
+            self.assertTrue(stat.result)
+            self.assertIsNone(stat.error_type)
+            self.assertGreaterEqual(stat.check_duration, 0)
+            self.assertIsNotNone(stat.checked_at)
+        hdfs_sqls = [sql for sql, storage in self.sqls if storage == StorageType.HDFS.value]
+        self.assertTrue(all("group by thedate" in sql for sql in hdfs_sqls))
+
+    def test_incremental_count_only_recounts_recent_partitions(self, query_mock, request_mock):
+        self._mock_pull(request_mock)
+        query_mock.side_effect = self._query
+        checker = SnapshotCountChecker(today=self.today)
+        table_id = self.snapshots[0].bkbase_table_id
+
+        self.assertEqual(checker.count_incremental(table_id, StorageType.HDFS.value), 100)
+        self.assertNotIn("where", self.sqls[-1][0])
+
+        # 历史分区使用缓存，最近两天的分区重新计数
+        self.partitions.update({"20261015": 999, "20261018": 45})
+        self.assertEqual(checker.count_incremental(table_id, StorageType.HDFS.value), 10 + 20 + 30 + 45)
+        self.assertIn("where thedate >= 20261017", self.sqls[-1][0])
+
+    def test_incremental_count_fallback_without_partition(self, query_mock, request_mock):
+        def _query(sql: str, prefer_storage: str):
+            self.sqls.append((sql, prefer_storage))
+            if "group by thedate" in sql:
+                raise APIRequestError(module_name="bkbase", result="Unknown column 'thedate' in 'table list'")
+            return {"list": [{"count": 7}]}
+
+        query_mock.side_effect = _query
+        checker = SnapshotCountChecker(today=self.today)
+        table_id = self.snapshots[0].bkbase_table_id
+
+        self.assertEqual(checker.count_incremental(table_id, StorageType.HDFS.value), 7)
+        self.assertEqual(checker.count_incremental(table_id, StorageType.HDFS.value), 7)
+        self.assertEqual(len([sql for sql, _ in self.sqls if "group by thedate" in sql]), 1)
+
+    def test_incremental_count_fallback_once_on_transient_error(self, query_mock, request_mock):
+        errors = [APIRequestError(module_name="bkbase", result="query timeout")]
+
+        def _query(sql: str, prefer_storage: str):
+            self.sqls.append((sql, prefer_storage))
+            if "group by thedate" in sql and errors:
+                raise errors.pop()
+            return self._query(sql, prefer_storage)
+
+        query_mock.side_effect = _query
+        checker = SnapshotCountChecker(today=self.today)
+        table_id = self.snapshots[0].bkbase_table_id
+
+        # 临时异常本次回退为全表计数，不缓存无分区结果，下次仍按分区计数
+        self.assertEqual(checker.count_incremental(table_id, StorageType.HDFS.value), 100)
+        self.assertEqual(checker.count_incremental(table_id, StorageType.HDFS.value), 10 + 20 + 30 + 40)
+        self.assertEqual(len([sql for sql, _ in self.sqls if "group by thedate" in sql]), 3)
+
+    def test_storage_error_marks_failed(self, query_mock, request_mock):
+        self._mock_pull(request_mock)
+        query_mock.side_effect = APIRequestError("storage unavailable")
+
+        check_join_data()
+
+        stat = SnapshotCheckStatistic.objects.get(system_id="system_a", resource_type_id="rt_1")
+        self.assertFalse(stat.result)
+        self.assertEqual(stat.error_type, "storage")
+        self.assertEqual(stat.doris_storage_count, 0)
+        self.assertEqual(stat.hdfs_storage_count, 0)
+
+    def test_system_concurrency_limit(self, query_mock, request_mock):
+        self._mock_pull(request_mock)
+        lock = threading.Lock()
+        running: Dict[str, int] = {"system_a": 0, "system_b": 0}
+        peak: Dict[str, int] = {"system_a": 0, "system_b": 0}
+
+        def _query(sql: str, prefer_storage: str):
+            system_id = "system_a" if "system_a" in sql else "system_b"
+            with lock:
+                running[system_id] += 1
+                peak[system_id] = max(peak[system_id], running[system_id])
+            time.sleep(0.02)
+            with lock:
+                running[system_id] -= 1
+            return {"list": [{"count": 1}]}
+
+        query_mock.side_effect = _query
+        with override_settings(JOIN_DATA_CHECK_INCREMENTAL_STORAGES=[]):
+            results = SnapshotCountChecker(concurrency=4, system_concurrency=1).check(self.snapshots)
+
+        self.assertEqual(len(results), 4)
+        self.assertEqual(peak, {"system_a": 1, "system_b": 1})
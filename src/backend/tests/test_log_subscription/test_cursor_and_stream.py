@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import json
+from unittest import mock
+
+from bk_resource.exceptions import ValidateException
+from django.test import TestCase, override_settings
+
+from api.bk_base.constants import StorageType
+from services.web.log_subscription.constants import LOG_SUBSCRIPTION_STREAM_META_KEY
+from services.web.log_subscription.exceptions import (
+    CursorFieldNotFound,
+    LogSubscriptionNotFound,
+)
+from services.web.log_subscription.models import (
+    LogDataSource,
+    LogSubscription,
+    LogSubscriptionItem,
+)
+from services.web.log_subscription.resources.subscription import (
+    QueryLogSubscription,
+    StreamLogSubscription,
+)
+from services.web.log_subscription.serializers import encode_cursor
+from services.web.query.constants import TIMESTAMP_PARTITION_FIELD
+
+
+class TestCursorAndStream(TestCase):
+    """测试游标模式、流式查询与查询计划缓存"""
+
+    def setUp(self):
+        LogSubscription.clear_query_plan_cache()
+        self.data_source = LogDataSource.objects.create(
+            source_id="cursor_log",
+            name="游标日志",
+            bkbase_table_id="5000448_cursor_log",
+            storage_type=StorageType.DORIS.value,
+        )
+        self.subscription = LogSubscription.objects.create(name="游标订阅")
+        self.item = LogSubscriptionItem.objects.create(
+            subscription=self.subscription,
+            name="游标配置项",
+            condition={
+                "condition": {
+                    "field": {
+                        "table": "t",
+                        "raw_name": "system_id",
+                        "display_name": "system_id",
+                        "field_type": "string",
+                    },
+                    "operator": "eq",
+                    "filter": "bk_sops",
+                }
+            },
+        )
+        self.item.data_sources.add(self.data_source)
+        self.table_name = self.data_source.get_table_name()
+
+    def build_request(self, **kwargs) -> dict:
+        return {
+            "token": self.subscription.token,
+            "source_id": self.data_source.source_id,
+            "start_time": 1000,
+            "end_time": 9000,
+            **kwargs,
+        }
+
+    def query(self, resource_cls=QueryLogSubscription, **kwargs):
+        resource = resource_cls()
+        return resource.perform_request(resource.validate_request_data(self.build_request(**kwargs)))
+
+    def mock_api(self) -> mock.MagicMock:
+        api = mock.MagicMock()
+        patcher = mock.patch("services.web.log_subscription.resources.subscription.api", api)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return api
+
+    @staticmethod
+    def make_rows(*keys) -> list:
+        return [
+            {TIMESTAMP_PARTITION_FIELD: time_value, "event_id": event_id, "data": "x"} for time_value, event_id in keys
+        ]
+
+    def test_cursor_sql(self):
+        result = self.query(cursor="", page_size=10, raw=True)
+        query_sql = result["query_sql"]
+        self.assertIn(
+            f"ORDER BY `{self.table_name}`.`{TIMESTAMP_PARTITION_FIELD}` DESC,`{self.table_name}`.`event_id` DESC",
+            query_sql,
+        )
+        self.assertIn("LIMIT 11", query_sql)
+        self.assertNotIn("OFFSET", query_sql)
+        self.assertIsNone(result["total"])
+        self.assertIsNone(result["next_cursor"])
+
+        query_sql = self.query(cursor=encode_cursor(5000, "e1"), page=3, raw=True)["query_sql"]
+        self.assertIn(f"`{self.table_name}`.`{TIMESTAMP_PARTITION_FIELD}`<5000", query_sql)
+        self.assertIn(f"`{self.table_name}`.`event_id`<'e1'", query_sql)
+        self.assertIn(f"`{self.table_name}`.`system_id`='bk_sops'", query_sql)
+        self.assertNotIn("OFFSET", query_sql)
+
+    def test_invalid_cursor(self):
+        for cursor in ["invalid", encode_cursor(None, "e1")]:
+            with self.subTest(cursor=cursor), self.assertRaises(ValidateException):
+                self.query(cursor=cursor)
+
+    def test_cursor_pagination(self):
+        api = self.mock_api()
+        api.bk_base.query_sync.return_value = {"list": self.make_rows((3000, "e3"), (3000, "e2"), (2000, "e1"))}
+        result = self.query(cursor="", page_size=2, fields=["data"])
+        api.bk_base.query_sync.bulk_request.assert_not_called()
+        self.assertEqual(result["results"], [{"data": "x"}, {"data": "x"}])
+        self.assertEqual(result["next_cursor"], encode_cursor(3000, "e2"))
+
+        api.bk_base.query_sync.return_value = {"list": self.make_rows((2000, "e1"))}
+        result = self.query(cursor=result["next_cursor"], page_size=2)
+        self.assertEqual(len(result["results"]), 1)
+        self.assertIsNone(result["next_cursor"])
+
+        # 显式要求统计总数
+        api.bk_base.query_sync.bulk_request.return_value = [{"list": []}, {"list": [{"count": 3}]}]
+        self.assertEqual(self.query(cursor="", need_count=True)["total"], 3)
+
+    def test_cursor_pagination_float_time(self):
+        api = self.mock_api()
+        api.bk_base.query_sync.return_value = {"list": self.make_rows((3000.5, "e3"), (3000.5, "e2"), (2000.5, "e1"))}
+        next_cursor = self.query(cursor="", page_size=2)["next_cursor"]
+        self.assertEqual(next_cursor, encode_cursor(3000.5, "e2"))
+        query_sql = self.query(cursor=next_cursor, raw=True)["query_sql"]
+        self.assertIn(f"`{self.table_name}`.`{TIMESTAMP_PARTITION_FIELD}`<3000.5", query_sql)
+
+    def test_cursor_pagination_unsupported_value(self):
+        api = self.mock_api()
+        api.bk_base.query_sync.return_value = {"list": self.make_rows((3000, "e3"), ({"v": 1}, "e2"), (2000, "e1"))}
+        with self.assertRaises(CursorFieldNotFound):
+            self.query(cursor="", page_size=2)
+
+    def test_stream(self):
+        api = self.mock_api()
+        api.bk_base.query_sync.side_effect = [
+            {"list": self.make_rows((3000, "e3"), (3000, "e2"), (2000, "e1"))},
+            {"list": self.make_rows((2000, "e1"))},
+        ]
+        response = self.query(StreamLogSubscription, page_size=2)
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([line.get("event_id") for line in lines[:-1]], ["e3", "e2", "e1"])
+        self.assertEqual(lines[-1], {LOG_SUBSCRIPTION_STREAM_META_KEY: {"count": 3, "next_cursor": None}})
+        self.assertIn(f"`{self.table_name}`.`event_id`<'e2'", api.bk_base.query_sync.call_args[1]["sql"])
+
+    @override_settings(LOG_SUBSCRIPTION_STREAM_MAX_ROWS=2)
+    def test_stream_max_rows(self):
+        api = self.mock_api()
+        api.bk_base.query_sync.return_value = {"list": self.make_rows((3000, "e3"), (3000, "e2"), (2000, "e1"))}
+        response = self.query(StreamLogSubscription, page_size=10)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(
+            json.loads(lines[-1]),
+            {LOG_SUBSCRIPTION_STREAM_META_KEY: {"count": 2, "next_cursor": encode_cursor(3000, "e2")}},
+        )
+        self.assertEqual(api.bk_base.query_sync.call_count, 1)
+
+    def test_query_plan_cache(self):
+        expected = self.query(raw=True)["query_sql"]
+        with self.assertNumQueries(0):
+            self.assertEqual(self.query(raw=True)["query_sql"], expected)
+
+        self.item.condition["condition"]["filter"] = "bk_cmdb"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.save()
+        self.assertIn(f"`{self.table_name}`.`system_id`='bk_cmdb'", self.query(raw=True)["query_sql"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.subscription.is_enabled = False
+            self.subscription.save()
+        with self.assertRaises(LogSubscriptionNotFound):
+            self.query(raw=True)
+
+    def test_query_plan_cache_bulk_delete(self):
+        self.query(raw=True)
+        # 批量软删除仅执行 UPDATE，不触发模型信号
+        with self.captureOnCommitCallbacks(execute=True):
+            LogSubscription.objects.filter(pk=self.subscription.pk).delete()
+        with self.assertRaises(LogSubscriptionNotFound):
+            self.query(raw=True)
@@ -17,10 +17,13 @@ to the current version of the project delivered to anyone in the future.
 """
 
 import copy
+import datetime
 from unittest import mock
 
 from django.conf import settings
+from django.utils import timezone
 from django.utils.translation import gettext_lazy
+from rest_framework.settings import api_settings
 
 from apps.meta.constants import DEFAULT_DATA_DELIMITER as _DEFAULT_DATA_DELIMITER
 from apps.meta.constants import DEFAULT_DATA_ENCODING as _DEFAULT_DATA_ENCODING
@@ -47,6 +50,7 @@ from apps.permission.handlers.actions import ActionEnum
 from core.choices import TextChoices
 from core.utils.data import choices_to_dict, trans_object_local
 from services.web.databus.constants import JoinDataPullType, SystemStatusDetailEnum
+from tests.test_databus.collector.constants import COLLECTOR_DATA as _COLLECTOR_DATA
 from tests.test_databus.collector.constants import (
     COLLECTOR_STATUS_RESULT as _COLLECTOR_STATUS_RESULT,
 )
@@ -281,9 +285,12 @@ SYSTEM_LIST_OF_NOT_SORT_DATA = [
         "system_status_msg": str(SystemStatusDetailEnum.PENDING.label),
     },
 ]
-BULK_SYSTEM_COLLECTORS_STATUS_API_RESP = {
-    SYSTEM_DATA1["system_id"]: STATUS_ABNORMAL_COPY,
-    SYSTEM_DATA2["system_id"]: STATUS_NORMAL_COPY,
+# SYSTEM_DATA2 日志上报正常，SYSTEM_DATA1 未配置采集
+SYSTEM_LIST_COLLECTOR_DATA = {
+    **_COLLECTOR_DATA,
+    "tail_log_time": timezone.make_aware(
+        datetime.datetime.strptime(STATUS_NORMAL_COPY["last_time"], api_settings.DATETIME_FORMAT)
+    ),
 }
 SYSTEM_LIST_PARAMS = {
     "namespace": settings.DEFAULT_NAMESPACE,
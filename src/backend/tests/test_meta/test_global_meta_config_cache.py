@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.exceptions import MetaConfigNotExistException
+from apps.meta.models import GlobalMetaConfig
+
+
+class TestGlobalMetaConfigCache(TestCase):
+    def test_get_hits_cache(self):
+        GlobalMetaConfig.set(config_key="cache_key", config_value={"a": 1})
+        self.assertEqual(GlobalMetaConfig.get(config_key="cache_key"), {"a": 1})
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(10):
+                self.assertEqual(GlobalMetaConfig.get(config_key="cache_key"), {"a": 1})
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_set_invalidate_cache(self):
+        GlobalMetaConfig.set(config_key="cache_key", config_value=1)
+        self.assertEqual(GlobalMetaConfig.get(config_key="cache_key"), 1)
+        GlobalMetaConfig.set(config_key="cache_key", config_value=2)
+        self.assertEqual(GlobalMetaConfig.get(config_key="cache_key"), 2)
+
+    def test_delete_invalidate_cache(self):
+        GlobalMetaConfig.set(config_key="cache_key", config_value=1)
+        self.assertEqual(GlobalMetaConfig.get(config_key="cache_key"), 1)
+        GlobalMetaConfig.objects.filter(config_key="cache_key").delete()
+        self.assertIsNone(GlobalMetaConfig.get(config_key="cache_key", default=None))
+
+    def test_not_exist_not_cached(self):
+        with self.assertRaises(MetaConfigNotExistException):
+            GlobalMetaConfig.get(config_key="cache_key")
+        GlobalMetaConfig.objects.create(config_level="global", instance_key="global", config_key="cache_key")
+        self.assertIsNone(GlobalMetaConfig.get(config_key="cache_key"))
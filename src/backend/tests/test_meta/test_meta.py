@@ -37,12 +37,11 @@ from apps.meta.views.system_views import SystemsViewSet
 from core.testing import assert_dict_contains, assert_list_contains
 from core.utils.data import ordered_dict_to_json, trans_object_local
 from services.web.common.constants import ScopeType
-from services.web.databus.models import Snapshot
+from services.web.databus.models import CollectorConfig, Snapshot
 from tests.base import TestCase
 from tests.test_meta.constants import (
     BIZS_LIST_API_RESP,
     BKLOG_PERMISSION_VERSION_API_RESP,
-    BULK_SYSTEM_COLLECTORS_STATUS_API_RESP,
     CUSTOM_FIELD_DATA,
     FIELDS_DATA,
     GET_APP_INFO_DATA,
@@ -90,6 +89,7 @@ from tests.test_meta.constants import (
     SYSTEM_LIST_ALL_OF_ACTION_IDS_DATA,
     SYSTEM_LIST_ALL_OF_ACTION_IDS_PARAMS,
     SYSTEM_LIST_ALL_PARAMS,
+    SYSTEM_LIST_COLLECTOR_DATA,
     SYSTEM_LIST_DATA,
     SYSTEM_LIST_OF_NOT_SORT_DATA,
     SYSTEM_LIST_OF_NOT_SORT_PARAMS,
@@ -134,13 +134,10 @@ class MetaTest(TestCase):
         self.patcher_1.stop()
         self.patcher_2.stop()
 
-    @mock.patch(
-        "meta.resources.resource.databus.collector.bulk_system_collectors_status",
-        mock.Mock(return_value=BULK_SYSTEM_COLLECTORS_STATUS_API_RESP),
-    )
     @mock.patch("meta.resources.wrapper_permission_field", PermissionMock.wrapper_permission_field)
     def test_system_list(self):
         """SystemListResource"""
+        CollectorConfig.objects.create(**SYSTEM_LIST_COLLECTOR_DATA)
         result_of_ordered = self.resource.meta.system_list(**SYSTEM_LIST_PARAMS)
         result_of_json = ordered_dict_to_json(result_of_ordered)
         result = [item for item in result_of_json if item.pop("id", None)]
@@ -175,10 +172,6 @@ class MetaTest(TestCase):
         self.assertFalse(serializer.is_valid())
         self.assertIn("filter_actions", serializer.errors)
 
-    @mock.patch(
-        "meta.resources.resource.databus.collector.bulk_system_collectors_status",
-        mock.Mock(return_value=BULK_SYSTEM_COLLECTORS_STATUS_API_RESP),
-    )
     @mock.patch("meta.resources.wrapper_permission_field", mock_system_permissions)
     def test_system_list_filter_actions_by_view_system(self):
         """SystemListResource filter_actions"""
@@ -186,10 +179,6 @@ class MetaTest(TestCase):
 
         self.assertEqual([system["system_id"] for system in result], [f"{settings.BK_IAM_SYSTEM_ID}test"])
 
-    @mock.patch(
-        "meta.resources.resource.databus.collector.bulk_system_collectors_status",
-        mock.Mock(return_value=BULK_SYSTEM_COLLECTORS_STATUS_API_RESP),
-    )
     @mock.patch("meta.resources.wrapper_permission_field", mock_system_permissions)
     def test_system_list_filter_actions_uses_any_action(self):
         """SystemListResource filter_actions"""
@@ -202,10 +191,6 @@ class MetaTest(TestCase):
 
     @mock.patch("apps.permission.handlers.drf.IAMPermission.has_permission", mock.Mock(return_value=True))
     @mock.patch("meta.resources.get_request_username", mock.Mock(return_value="admin"))
-    @mock.patch(
-        "meta.resources.resource.databus.collector.bulk_system_collectors_status",
-        mock.Mock(return_value=BULK_SYSTEM_COLLECTORS_STATUS_API_RESP),
-    )
     @mock.patch("meta.resources.wrapper_permission_field", mock_system_permissions)
     def test_system_list_filter_actions_before_view_pagination(self):
         """SystemListResource filter_actions pagination"""
@@ -222,37 +207,28 @@ class MetaTest(TestCase):
         self.assertEqual(len(response.data["results"]), 1)
         self.assertEqual(response.data["results"][0]["system_id"], f"{settings.BK_IAM_SYSTEM_ID}test")
 
-    @mock.patch(
-        "meta.resources.resource.databus.collector.bulk_system_collectors_status",
-        mock.Mock(return_value=BULK_SYSTEM_COLLECTORS_STATUS_API_RESP),
-    )
     @mock.patch("meta.resources.wrapper_permission_field", PermissionMock.wrapper_permission_field)
     def test_system_list_of_not_sort(self):
         """SystemListResource"""
+        CollectorConfig.objects.create(**SYSTEM_LIST_COLLECTOR_DATA)
         result_of_ordered = self.resource.meta.system_list(**SYSTEM_LIST_OF_NOT_SORT_PARAMS)
         result_of_json = ordered_dict_to_json(result_of_ordered)
         result = [item for item in result_of_json if item.pop("id", None)]
         assert_list_contains(result, SYSTEM_LIST_OF_NOT_SORT_DATA)
 
-    @mock.patch(
-        "meta.resources.resource.databus.collector.bulk_system_collectors_status",
-        mock.Mock(return_value=BULK_SYSTEM_COLLECTORS_STATUS_API_RESP),
-    )
     @mock.patch("meta.resources.wrapper_permission_field", PermissionMock.wrapper_permission_field)
     def test_system_list_of_sort_eq(self):
         """SystemListResource"""
+        CollectorConfig.objects.create(**SYSTEM_LIST_COLLECTOR_DATA)
         result = self.resource.meta.system_list(**SYSTEM_LIST_OF_SORT_EQ_PARAMS)
         result_of_json = ordered_dict_to_json(result)
         result = [item for item in result_of_json if item.pop("id", None)]
         assert_list_contains(result, SYSTEM_LIST_OF_SORT_EQ_DATA)
 
-    @mock.patch(
-        "meta.resources.resource.databus.collector.bulk_system_collectors_status",
-        mock.Mock(return_value=BULK_SYSTEM_COLLECTORS_STATUS_API_RESP),
-    )
     @mock.patch("meta.resources.wrapper_permission_field", PermissionMock.wrapper_permission_field)
     def test_system_list_of_sort_gt(self):
         """SystemListResource"""
+        CollectorConfig.objects.create(**SYSTEM_LIST_COLLECTOR_DATA)
         result = self.resource.meta.system_list(**SYSTEM_LIST_OF_SORT_GT_PARAMS)
         result_of_json = ordered_dict_to_json(result)
         result = [item for item in result_of_json if item.pop("id", None)]
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+"""
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase
+
+from apps.meta.constants import IAM_MANAGER_ROLE
+from apps.meta.models import System, SystemRole
+from apps.meta.tasks import sync_iam_systems
+from apps.meta.utils.system import fetch_system_infos
+
+
+class TestSystemInfoCache(TestCase):
+    def setUp(self):
+        System.clear_info_cache()
+        for system_id in ["system_a", "system_b"]:
+            System.objects.create(
+                namespace=settings.DEFAULT_NAMESPACE,
+                system_id=system_id,
+                instance_id=system_id,
+                name=system_id,
+                auth_token="token",
+            )
+        SystemRole.objects.create(system_id="system_a", role=IAM_MANAGER_ROLE, username="admin")
+
+    def test_fetch_only_requested(self):
+        infos = fetch_system_infos(settings.DEFAULT_NAMESPACE, ["system_a", "system_a", "not_exists", None])
+        self.assertEqual(list(infos), ["system_a"])
+        self.assertEqual(infos["system_a"]["name"], "system_a")
+        self.assertEqual(infos["system_a"]["managers"], ["admin"])
+        self.assertNotIn("auth_token", infos["system_a"])
+        self.assertEqual(fetch_system_infos("other", ["system_a"]), {})
+
+    def test_cache_hit(self):
+        fetch_system_infos(settings.DEFAULT_NAMESPACE, ["system_a", "not_exists"])
+        with self.assertNumQueries(0):
+            infos = fetch_system_infos(settings.DEFAULT_NAMESPACE, ["system_a", "not_exists"])
+        self.assertEqual(list(infos), ["system_a"])
+        # 仅加载未命中的系统
+        with self.assertNumQueries(2):
+            infos = fetch_system_infos(settings.DEFAULT_NAMESPACE, ["system_a", "system_b"])
+        self.assertEqual(sorted(infos), ["system_a", "system_b"])
+
+    def test_invalidate_on_save(self):
+        fetch_system_infos(settings.DEFAULT_NAMESPACE, ["system_a"])
+        system = System.objects.get(system_id="system_a")
+        system.name = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            system.save()
+        self.assertEqual(fetch_system_infos(settings.DEFAULT_NAMESPACE, ["system_a"])["system_a"]["name"], "renamed")
+
+    def test_invalidate_on_sync(self):
+        fetch_system_infos(settings.DEFAULT_NAMESPACE, ["system_a"])
+        System.objects.filter(system_id="system_a").update(name="synced")
+        with mock.patch("apps.meta.tasks.IAMV3SystemSyncer"), mock.patch("apps.meta.tasks.IAMV4SystemSyncer"):
+            sync_iam_systems()
+        self.assertEqual(fetch_system_infos(settings.DEFAULT_NAMESPACE, ["system_a"])["system_a"]["name"], "synced")
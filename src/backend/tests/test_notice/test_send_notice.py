@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+from unittest import mock
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.notice.constants import RelateType
+from apps.notice.handlers import NoticeHandler
+from apps.notice.models import NoticeLogV2
+from apps.notice.tasks import send_notice_from_db
+from tests.base import TestCase
+
+
+class TestSendNoticeFromDB(TestCase):
+    def _create_log(self, relate_type: str, agg_key: str, **kwargs) -> NoticeLogV2:
+        return NoticeLogV2.objects.create(relate_type=relate_type, agg_key=agg_key, **kwargs)
+
+    def test_dispatch_only_pending_logs(self):
+        first = self._create_log(RelateType.RISK, "risk-1")
+        second = self._create_log(RelateType.RISK, "risk-1")
+        error = self._create_log(RelateType.ERROR, "error-1")
+        self._create_log(RelateType.RISK, "risk-2", schedule_at=timezone.now(), schedule_result=True)
+
+        dispatched = {}
+
+        def send(handler):
+            dispatched[(handler.relate_type, handler.agg_key)] = [log.id for log in handler.notice_logs]
+
+        with mock.patch.object(NoticeHandler, "send", autospec=True, side_effect=send):
+            send_notice_from_db()
+
+        self.assertEqual(
+            dispatched,
+            {(RelateType.RISK.value, "risk-1"): [first.id, second.id], (RelateType.ERROR.value, "error-1"): [error.id]},
+        )
+
+    @mock.patch("apps.notice.handlers.base.BUILDERS", {})
+    def test_bulk_update_schedule_result(self):
+        for _ in range(3):
+            self._create_log(RelateType.RISK, "risk-1", receivers=["admin"], msg_type=["mail"])
+        handler = NoticeHandler(
+            schedule_time=timezone.now().timestamp(),
+            relate_type=RelateType.RISK.value,
+            agg_key="risk-1",
+            notice_logs=list(NoticeLogV2.objects.filter(schedule_at__isnull=True)),
+        )
+
+        with mock.patch("apps.notice.handlers.base.NOTICE_LOG_UPDATE_BATCH_SIZE", 2):
+            with CaptureQueriesContext(connection) as ctx:
+                handler.send()
+
+        updates = [query["sql"] for query in ctx.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)
+        self.assertFalse(NoticeLogV2.objects.filter(schedule_at__isnull=True).exists())
+        self.assertFalse(NoticeLogV2.objects.filter(schedule_result=True).exists())
+
+    def test_flush_after_each_delivery(self):
+        for _ in range(3):
+            self._create_log(RelateType.RISK, "risk-1", receivers=["admin"], msg_type=["mail"])
+        handler = NoticeHandler(
+            schedule_time=timezone.now().timestamp(),
+            relate_type=RelateType.RISK.value,
+            agg_key="risk-1",
+            notice_logs=list(NoticeLogV2.objects.filter(schedule_at__isnull=True)),
+        )
+        # 每次发送时统计已回写的记录数
+        persisted = []
+
+        def send():
+            persisted.append(NoticeLogV2.objects.filter(schedule_at__isnull=False).count())
+            return {}
+
+        builder = mock.MagicMock()
+        builder.return_value.build_msg.return_value = ("title", "content", None, {})
+        sender = mock.MagicMock()
+        sender.return_value.send.side_effect = send
+        with (
+            mock.patch("apps.notice.handlers.base.BUILDERS", {RelateType.RISK.value.lower(): builder}),
+            mock.patch("apps.notice.handlers.base.SENDERS", {"mail": sender}),
+        ):
+            handler.send()
+
+        self.assertEqual(persisted, [0, 1, 2])
+        self.assertEqual(NoticeLogV2.objects.filter(schedule_result=True).count(), 3)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.meta.models import ResourceType
+from services.puller.puller.utils.fetch import ResourceTypeFetchHandler
+from tests.base import TestCase
+
+
+class ResourceTypeFetchHandlerTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        base_time = timezone.now().replace(microsecond=0)
+        # 三条数据共享同一更新时间，验证游标在相同 updated_at 下按 pk 推进
+        for index in range(7):
+            ResourceType.objects.create(
+                system_id="puller",
+                resource_type_id=f"rt_{index}",
+                unique_id=f"puller:rt_{index}",
+                name=f"rt_{index}",
+                updated_at=base_time + datetime.timedelta(seconds=index // 3),
+            )
+        ResourceType.objects.filter(resource_type_id="rt_6").update(updated_at=None)
+
+    def fetch_all(self, limit: int):
+        cursor, pages, ids = "", 0, []
+        while cursor is not None:
+            data = ResourceTypeFetchHandler(page={"cursor": cursor, "limit": limit}).fetch_instance_list()
+            ids.extend(item["id"] for item in data["results"])
+            cursor = data["next_cursor"]
+            pages += 1
+        return ids, pages
+
+    def test_cursor_pagination(self):
+        ids, pages = self.fetch_all(limit=2)
+        self.assertEqual(sorted(ids), [f"rt_{index}" for index in range(7)])
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(pages, 4)
+        # 空 updated_at 排在最前
+        self.assertEqual(ids[0], "rt_6")
+
+    def test_cursor_exact_page(self):
+        data = ResourceTypeFetchHandler(page={"cursor": "", "limit": 7}).fetch_instance_list()
+        self.assertEqual(len(data["results"]), 7)
+        self.assertIsNone(data["next_cursor"])
+
+    def test_count_cached_after_first_page(self):
+        first = ResourceTypeFetchHandler(page={"cursor": "", "limit": 2}).fetch_instance_list()
+        self.assertEqual(first["count"], 7)
+        ResourceType.objects.create(system_id="puller", resource_type_id="rt_7", unique_id="puller:rt_7", name="rt_7")
+        with self.assertNumQueries(1):
+            second = ResourceTypeFetchHandler(page={"cursor": first["next_cursor"], "limit": 2}).fetch_instance_list()
+        self.assertEqual(second["count"], 7)
+        refreshed = ResourceTypeFetchHandler(page={"cursor": "", "limit": 2}).fetch_instance_list()
+        self.assertEqual(refreshed["count"], 8)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(serializers.ValidationError):
+            ResourceTypeFetchHandler(page={"cursor": "invalid", "limit": 2}).fetch_instance_list()
+
+    def test_offset_pagination(self):
+        data = ResourceTypeFetchHandler(page={"offset": 0, "limit": 3}).fetch_instance_list()
+        self.assertEqual(data["count"], 7)
+        self.assertEqual(len(data["results"]), 3)
+        self.assertNotIn("next_cursor", data)
+
+    def test_offset_count_not_cached(self):
+        ResourceTypeFetchHandler(page={"offset": 0, "limit": 3}).fetch_instance_list()
+        ResourceType.objects.create(system_id="puller", resource_type_id="rt_7", unique_id="puller:rt_7", name="rt_7")
+        data = ResourceTypeFetchHandler(page={"offset": 3, "limit": 3}).fetch_instance_list()
+        self.assertEqual(data["count"], 8)
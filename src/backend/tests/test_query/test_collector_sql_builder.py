@@ -282,3 +282,72 @@ class TestDorisSQLBuilder(TestCase):
         }
         for key, expected_sql in expected_numeric_sql.items():
             self.assertEqual(stats_sql[key], expected_sql)
+
+
+class TestDorisKeysetSQLBuilder(TestCase):
+    """游标分页 SQL 单元测试"""
+
+    def setUp(self):
+        self.sort_list = [
+            {"order_field": "dtEventTimeStamp", "order_type": "desc"},
+            {"order_field": "gseIndex", "order_type": "asc"},
+        ]
+
+    def _get_builder(self, search_after=None, page_size=3):
+        return DorisQuerySQLBuilder(
+            table="test_rt.doris",
+            conditions=[],
+            sort_list=self.sort_list,
+            page=1,
+            page_size=page_size,
+            search_after=search_after,
+        )
+
+    def test_first_page(self):
+        data_sql = self._get_builder().build_keyset_data_sql()
+        self.assertEqual(
+            data_sql,
+            "SELECT * FROM test_rt.doris ORDER BY `dtEventTimeStamp` DESC,`gseIndex` ASC,`event_id` ASC LIMIT 3",
+        )
+
+    def test_offset_without_cursor(self):
+        """无游标时按页码使用 OFFSET，排序包含决胜字段"""
+        builder = self._get_builder()
+        builder.page = 3
+        self.assertEqual(
+            builder.build_keyset_data_sql(),
+            "SELECT * FROM test_rt.doris ORDER BY `dtEventTimeStamp` DESC,`gseIndex` ASC,`event_id` ASC "
+            "LIMIT 3 OFFSET 6",
+        )
+
+    def test_keyset_condition(self):
+        data_sql = self._get_builder(search_after={"values": [100, 5, "e1"]}).build_keyset_data_sql()
+        expect = (
+            "SELECT * FROM test_rt.doris WHERE `dtEventTimeStamp`<100 OR `dtEventTimeStamp` IS NULL "
+            "OR (`dtEventTimeStamp`=100 AND `gseIndex`>5) "
+            "OR (`dtEventTimeStamp`=100 AND `gseIndex`=5 AND `event_id`>'e1') "
+            "ORDER BY `dtEventTimeStamp` DESC,`gseIndex` ASC,`event_id` ASC LIMIT 3"
+        )
+        self.assertEqual(data_sql, expect)
+
+    def test_tiebreaker_not_duplicated(self):
+        self.sort_list.append({"order_field": "event_id", "order_type": "desc"})
+        self.assertEqual(
+            self._get_builder().build_keyset_data_sql(),
+            "SELECT * FROM test_rt.doris ORDER BY `dtEventTimeStamp` DESC,`gseIndex` ASC,`event_id` DESC LIMIT 3",
+        )
+
+    def test_next_search_after(self):
+        builder = self._get_builder()
+        rows = [
+            {"dtEventTimeStamp": 101, "gseIndex": 1, "event_id": "e0"},
+            {"dtEventTimeStamp": 100, "gseIndex": 5, "event_id": "e1"},
+            {"dtEventTimeStamp": 100, "gseIndex": 5, "event_id": "e2"},
+        ]
+        self.assertEqual(builder.build_next_search_after(rows), {"values": [100, 5, "e2"]})
+        self.assertIsNone(builder.build_next_search_after([]))
+
+    def test_next_search_after_with_null(self):
+        """末行排序值为空时无法生成游标"""
+        rows = [{"dtEventTimeStamp": None, "gseIndex": 5, "event_id": "e1"}]
+        self.assertIsNone(self._get_builder().build_next_search_after(rows))
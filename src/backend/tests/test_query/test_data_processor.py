@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+import json
+from unittest import mock
+
+from bk_resource.base import Empty
+from django.test import SimpleTestCase
+
+from core.utils.data import extract_nested_value
+from services.web.query.constants import LogExportFieldScope
+from services.web.query.export.data_processor import DataProcessor
+from services.web.query.export.model import ExportConfig
+
+
+def legacy_format_row(config: ExportConfig, data: dict) -> list:
+    """编译前的逐单元格格式化逻辑，用于对比结果"""
+
+    row = []
+    for field in config.export_fields:
+        value = extract_nested_value(data.get(field.raw_name), field.keys)
+        if isinstance(value, Empty):
+            row.append(config.empty_value)
+        elif isinstance(value, (dict, list)):
+            row.append(json.dumps(value, ensure_ascii=False))
+        else:
+            row.append(str(value))
+    return row
+
+
+class TestDataProcessor(SimpleTestCase):
+    def setUp(self):
+        fields = [{"raw_name": "action_id", "display_name": "操作", "keys": []}]
+        fields += [{"raw_name": f"column_{i}", "display_name": f"列{i}", "keys": []} for i in range(40)]
+        fields += [{"raw_name": "extend_data", "display_name": f"扩展{i}", "keys": [f"k{i}"]} for i in range(5)]
+        fields += [
+            {"raw_name": "instance_data", "display_name": "实例", "keys": []},
+            {"raw_name": "snapshot_user_info", "display_name": "用户", "keys": ["profile", "name"]},
+            {"raw_name": "event_content", "display_name": "内容", "keys": ["title"]},
+            {"raw_name": "missing_field", "display_name": "缺失", "keys": []},
+        ]
+        task = mock.Mock(export_config={"field_scope": LogExportFieldScope.SPECIFIED.value, "fields": fields})
+        self.config = ExportConfig(task=task, empty_value="--")
+        self.processor = DataProcessor(self.config)
+        self.logs = [
+            {
+                "action_id": f"view_{i}",
+                "extend_data": {"k0": i, "k1": [1, 2], "k2": {"a": "中文"}, "k3": None},
+                "instance_data": {"id": i},
+                "snapshot_user_info": json.dumps({"profile": {"name": f"user{i}"}}),
+                "event_content": "not json",
+                **{f"column_{j}": f"value_{i}_{j}" for j in range(40)},
+            }
+            for i in range(50)
+        ]
+
+    def test_rows_match_legacy_format(self):
+        rows = self.processor.batch_format_rows(self.logs)
+        self.assertEqual([list(row) for row in rows], [legacy_format_row(self.config, log) for log in self.logs])
+        first = dict(zip([field.full_key for field in self.config.export_fields], rows[0]))
+        self.assertEqual(first["action_id"], "view_0")
+        self.assertEqual(first["extend_data/k1"], "[1, 2]")
+        self.assertEqual(first["extend_data/k2"], '{"a": "中文"}')
+        self.assertEqual(first["snapshot_user_info/profile/name"], "user0")
+        self.assertEqual(first["event_content/title"], "--")
+        self.assertEqual(first["missing_field"], "None")
+
+    def test_format_data_by_full_key(self):
+        formatted = self.processor.batch_format_data(self.logs[:1])[0]
+        self.assertEqual(formatted["extend_data/k4"], "--")
+        self.assertEqual(formatted["snapshot_user_info/profile/name"], "user0")
@@ -18,8 +18,13 @@ to the current version of the project delivered to anyone in the future.
 from copy import deepcopy
 from unittest import mock
 
+from django.test import override_settings
+
 from core.exceptions import PermissionException, ValidationError
 from services.web.databus.models import CollectorPlugin
+from services.web.query.export.data_fetcher import DataFetcher
+from services.web.query.export.export import CollectorLogExporter
+from services.web.query.serializers import CollectorSearchAfterSerializer
 from tests.base import TestCase
 from tests.test_databus.collector_plugin.constants import PLUGIN_ID
 from tests.test_query.constants import (
@@ -147,3 +152,107 @@ class CollectorQueryTest(TestCase):
 
         with self.assertRaises(ValidationError):
             self.resource.query.collector_search(**invalid_params)
+
+    def test_collector_search_after_values(self):
+        """游标值仅允许数值或字符串，嵌套结构或空值不能拼入查询条件"""
+        self.assertTrue(CollectorSearchAfterSerializer(data={"values": [100, 1.5, "e1"]}).is_valid())
+        for value in [{"a": 1}, [1], None, True]:
+            self.assertFalse(CollectorSearchAfterSerializer(data={"values": [100, value]}).is_valid())
+
+
+class DataFetcherKeysetTest(TestCase):
+    def setUp(self) -> None:
+        self.task = mock.Mock(query_params={"namespace": "default"}, total=5)
+        self.fetcher = DataFetcher(config=mock.Mock(task=self.task), page_size=2)
+
+    @override_settings(ENABLE_LOG_EXPORT_KEYSET_PAGINATION=True)
+    def test_fetch_logs_by_keyset(self):
+        """游标分页按上一页游标继续检索，不再计算 OFFSET"""
+        pages = [
+            {"total": 5, "results": [{"id": 0}], "search_after": None},
+            {"results": [{"id": 1}, {"id": 2}], "search_after": {"values": [2, "e2"]}},
+            {"results": [{"id": 3}, {"id": 4}], "search_after": {"values": [4, "e4"]}},
+            {"results": [{"id": 5}], "search_after": {"values": [5, "e5"]}},
+        ]
+        with mock.patch(
+            "services.web.query.export.data_fetcher.resource.query.collector_search_all", side_effect=pages
+        ) as search:
+            logs = [log["id"] for page in self.fetcher.fetch_logs() for log in page]
+
+        self.assertEqual(logs, [1, 2, 3, 4, 5])
+        calls = [call.kwargs for call in search.call_args_list[1:]]
+        self.assertEqual([call["search_after"] for call in calls], [None, {"values": [2, "e2"]}, {"values": [4, "e4"]}])
+        self.assertTrue(all(call["keyset_pagination"] and call["page"] == 1 for call in calls))
+
+    @override_settings(ENABLE_LOG_EXPORT_KEYSET_PAGINATION=True)
+    def test_fetch_logs_fallback_to_offset(self):
+        """末行排序值为空无法生成游标时，按 OFFSET 继续检索而不是提前结束"""
+        pages = [
+            {"total": 5, "results": [{"id": 0}], "search_after": None},
+            {"results": [{"id": 1}, {"id": 2}], "search_after": None},
+            {"results": [{"id": 3}, {"id": 4}], "search_after": {"values": [4, "e4"]}},
+            {"results": [{"id": 5}], "search_after": None},
+        ]
+        with mock.patch(
+            "services.web.query.export.data_fetcher.resource.query.collector_search_all", side_effect=pages
+        ) as search:
+            logs = [log["id"] for page in self.fetcher.fetch_logs() for log in page]
+
+        self.assertEqual(logs, [1, 2, 3, 4, 5])
+        calls = [call.kwargs for call in search.call_args_list[1:]]
+        self.assertEqual(
+            [(call["search_after"], call["page"]) for call in calls],
+            [(None, 1), (None, 2), ({"values": [4, "e4"]}, 1)],
+        )
+
+    def test_prefetch_logs(self):
+        """预取线程按顺序返回分页日志"""
+        pages = [[{"id": 1}], [{"id": 2}], [{"id": 3}]]
+        with mock.patch.object(DataFetcher, "sync_total", return_value=3), mock.patch.object(
+            DataFetcher, "iter_logs", return_value=iter(pages)
+        ), mock.patch("services.web.query.export.data_fetcher.connections") as connections:
+            self.assertEqual(list(self.fetcher.prefetch_logs(max_pages=1)), pages)
+        # 检索线程结束时关闭自身的数据库连接
+        connections.close_all.assert_called_once_with()
+
+    def test_prefetch_logs_raise_fetch_error(self):
+        """检索线程的异常在消费方抛出"""
+
+        def iter_logs(total):
+            yield [{"id": 1}]
+            raise RuntimeError("fetch failed")
+
+        with mock.patch.object(DataFetcher, "sync_total", return_value=2), mock.patch.object(
+            DataFetcher, "iter_logs", side_effect=iter_logs
+        ):
+            pages = self.fetcher.prefetch_logs()
+            self.assertEqual(next(pages), [{"id": 1}])
+            with self.assertRaises(RuntimeError):
+                next(pages)
+
+
+class CollectorLogExporterTest(TestCase):
+    @override_settings(LOG_EXPORT_PROGRESS_UPDATE_INTERVAL=60)
+    def test_throttle_progress_update(self):
+        """进度按时间间隔更新，而非每页写库"""
+        task = mock.Mock(id=1)
+        data_fetcher = mock.Mock()
+        data_fetcher.prefetch_logs.return_value = iter([[{"id": 1}], [{"id": 2}], [{"id": 3}]])
+        data_processor = mock.Mock()
+        data_processor.batch_format_rows.side_effect = lambda logs: logs
+        exporter = CollectorLogExporter(
+            config=mock.Mock(task=task),
+            data_fetcher=data_fetcher,
+            data_processor=data_processor,
+            file_exporter=mock.Mock(),
+            file_uploader=mock.Mock(),
+        )
+
+        exporter.search_and_write_file()
+
+        self.assertEqual(exporter.current_records, 3)
+        self.assertEqual(exporter.file_exporter.write.call_count, 3)
+        task.update_current_records.assert_not_called()
+        with override_settings(LOG_EXPORT_PROGRESS_UPDATE_INTERVAL=0):
+            exporter.update_progress()
+        task.update_current_records.assert_called_once_with(current_records=3)
@@ -16,6 +16,7 @@ We undertake not to change the open source license (MIT license) applicable
 to the current version of the project delivered to anyone in the future.
 """
 
+import re
 from unittest import mock
 
 from jinja2 import nodes
@@ -25,6 +26,7 @@ from opentelemetry.sdk.trace.export import SimpleSpanProcessor
 from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
 
 from core.observability import start_observation_span
+from services.web.risk.constants import EVENT_QUERY_FAILED
 from services.web.risk.report.providers import (
     EventProvider,
     Provider,
@@ -91,6 +93,42 @@ def _create_mock_risk(risk_id: str):
     return mock_risk
 
 
+def _mock_column_value(expr: str, order: str, events: list[dict]):
+    """根据单列表达式计算模拟聚合结果"""
+    expr_lower = expr.lower()
+
+    # 解析字段名（从 JSON_EXTRACT_STRING 的 '$.field' 中提取）
+    field_name = None
+    for event_field in ["account", "username", "amount", "event_id"]:
+        if f"'$.{event_field}'" in expr_lower:
+            field_name = event_field
+            break
+
+    values = [e.get(field_name) for e in events if e.get(field_name) is not None]
+
+    if expr_lower.startswith("count(distinct"):
+        return len(set(values))
+    if expr_lower.startswith("count("):
+        return len(values)
+    if expr_lower.startswith("sum("):
+        return sum(float(v) for v in values)
+    if expr_lower.startswith("avg("):
+        return sum(float(v) for v in values) / len(values) if values else 0
+    if expr_lower.startswith("max("):
+        return max(float(v) for v in values)
+    if expr_lower.startswith("min("):
+        return min(float(v) for v in values)
+    if expr_lower.startswith("group_concat(distinct"):
+        return ", ".join(sorted({str(v) for v in values}))
+    if expr_lower.startswith("group_concat("):
+        return ", ".join(str(v) for v in values)
+    if order == "desc":
+        # latest - 最后一条
+        return values[-1] if values else None
+    # first - 第一条
+    return values[0] if values else None
+
+
 def mock_bkbase_query(events: list[dict]):
     """创建 mock bk_base.query_sync 响应的函数
 
@@ -98,61 +136,21 @@ def mock_bkbase_query(events: list[dict]):
         events: 模拟事件列表
 
     Returns:
-        mock 函数，根据 SQL 内容返回适当的聚合结果
-
-    注意：由于 SQL 中 COUNT DISTINCT 和 COUNT 的区别难以通过 SQL 文本准确判断，
-    测试时根据字段名来区分：
-    - username 字段使用 count_distinct 返回去重数量
-    - event_id 字段使用 count 返回总数量
+        mock 函数，按 SELECT 中的每一列分别计算聚合结果（支持合并后的多列 SQL）
     """
 
     def _mock_query(sql: str):
         """根据 SQL 解析聚合函数并返回模拟结果"""
-        sql_lower = sql.lower()
-
-        # 解析字段名（从 SELECT 和 AS 子句中提取）
-        field_name = None
-        for event_field in ["account", "username", "amount", "event_id"]:
-            if event_field in sql_lower:
-                field_name = event_field
-                break
-
-        if not field_name or not events:
+        if not events:
             return {"list": []}
 
-        values = [e.get(field_name) for e in events if e.get(field_name) is not None]
-
-        # 根据 SQL 中的聚合函数返回结果
-        if "count(" in sql_lower:
-            # 根据字段区分 count 和 count_distinct
-            # username 字段测试 count_distinct，其他字段测试 count
-            if field_name == "username":
-                return {"list": [{field_name: len(set(values))}]}
-            else:
-                return {"list": [{field_name: len(values)}]}
-        elif "sum(" in sql_lower:
-            return {"list": [{field_name: sum(float(v) for v in values)}]}
-        elif "avg(" in sql_lower:
-            return {"list": [{field_name: sum(float(v) for v in values) / len(values) if values else 0}]}
-        elif "max(" in sql_lower:
-            return {"list": [{field_name: max(float(v) for v in values)}]}
-        elif "min(" in sql_lower:
-            return {"list": [{field_name: min(float(v) for v in values)}]}
-        elif "order by" in sql_lower and "desc" in sql_lower:
-            # latest - 最后一条
-            return {"list": [{field_name: values[-1] if values else None}]}
-        elif "order by" in sql_lower and "asc" in sql_lower:
-            # first - 第一条
-            return {"list": [{field_name: values[0] if values else None}]}
-        elif "group_concat" in sql_lower and "distinct" in sql_lower:
-            # list_distinct
-            return {"list": [{field_name: ", ".join(sorted({str(v) for v in values}))}]}
-        elif "group_concat" in sql_lower:
-            # list
-            return {"list": [{field_name: ", ".join(str(v) for v in values)}]}
-        else:
-            # 默认返回第一个值
-            return {"list": [{field_name: values[0] if values else None}]}
+        select_part = sql[len("SELECT ") : sql.index(" FROM ")]
+        order = "desc" if " DESC " in sql else "asc"
+        row = {
+            alias: _mock_column_value(expr, order, events)
+            for expr, alias in re.findall(r"(.+?) `([^`]+)`(?:,|$)", select_part)
+        }
+        return {"list": [row]}
 
     return _mock_query
 
@@ -590,6 +588,63 @@ class TestRenderTemplate(TestCase):
         self.assertIn("500000", result)
         self.assertIn("3", result)
 
+    @mock.patch("services.web.risk.report.providers.api.bk_base.query_sync")
+    def test_fuse_event_aggregations_by_query_shape(self, mock_query):
+        """测试同一查询形态的事件聚合合并为一条 SQL"""
+        mock_query.side_effect = mock_bkbase_query(MOCK_EVENTS)
+
+        template = """
+        count: {{ count(event.event_id) }}
+        count_distinct: {{ count_distinct(event.username) }}
+        sum: {{ sum(event.amount) }}
+        max: {{ max(event.amount) }}
+        first_account: {{ first(event.account) }}
+        first_username: {{ first(event.username) }}
+        latest_username: {{ latest(event.username) }}
+        latest_amount: {{ latest(event.amount) }}
+        """
+
+        result = _render_template(template=template, providers=[create_event_provider_with_mock_api()], variables={})
+
+        # 聚合 / FIRST / LATEST 三种查询形态，各一条 SQL
+        self.assertEqual(mock_query.call_count, 3)
+        sqls = [call.kwargs["sql"] for call in mock_query.call_args_list]
+        self.assertEqual(len([sql for sql in sqls if "ORDER BY" not in sql]), 1)
+        self.assertEqual(len([sql for sql in sqls if " ASC " in sql]), 1)
+        self.assertEqual(len([sql for sql in sqls if " DESC " in sql]), 1)
+
+        # 合并查询的每一列按别名映射回各自的表达式
+        self.assertEqual(
+            [line.strip() for line in result.strip().splitlines()],
+            [
+                "count: 3",
+                "count_distinct: 2",
+                "sum: 500000.0",
+                "max: 250000.0",
+                "first_account: game_admin_001",
+                "first_username: zhangsan",
+                "latest_username: zhangsan",
+                "latest_amount: 250000",
+            ],
+        )
+
+    @mock.patch("services.web.risk.report.providers.api.bk_base.query_sync")
+    def test_fused_query_failure_only_affects_its_shape(self, mock_query):
+        """测试合并查询失败只影响同一批次的表达式"""
+        query = mock_bkbase_query(MOCK_EVENTS)
+
+        def _query(sql: str):
+            if "ORDER BY" not in sql:
+                raise Exception("query failed")
+            return query(sql)
+
+        mock_query.side_effect = _query
+
+        template = "{{ count(event.event_id) }}|{{ sum(event.amount) }}|{{ first(event.account) }}"
+        result = _render_template(template=template, providers=[create_event_provider_with_mock_api()], variables={})
+
+        self.assertEqual(result, f"{EVENT_QUERY_FAILED}|{EVENT_QUERY_FAILED}|game_admin_001")
+
     @mock.patch("services.web.risk.report.providers.api.bk_base.query_sync")
     def test_function_results_hash_lookup(self, mock_query):
         """测试function_results按照function_name和args_hash存储和获取结果"""
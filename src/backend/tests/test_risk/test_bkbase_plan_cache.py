@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import datetime
+from unittest import mock
+
+from django.db.models import Q
+from django.test import TestCase
+
+from services.web.risk.constants import RiskDisplayStatus, RiskStatus
+from services.web.risk.converter.bkbase import (
+    BkBaseQueryExpressionBuilder,
+    bkbase_plan_cache,
+)
+from services.web.risk.models import Risk
+
+VALUE_FIELDS = ["risk_id", "strategy_id", "raw_event_id", "event_time", "event_end_time"]
+
+# 与 test_retrieve_risk 中风险列表用例的筛选条件保持一致
+FIXTURE_FILTERS = [
+    Q(),
+    Q(title="bkbase-title"),
+    Q(title="bkbase-title", strategy_id__in=[1, 2, 3]),
+    Q(display_status__in=[RiskDisplayStatus.STAND_BY, RiskDisplayStatus.PROCESSING]),
+    Q(status=RiskStatus.NEW, strategy__risk_level__in=["HIGH", "MIDDLE"]),
+    Q(event_time__gte=datetime.datetime(2024, 1, 1, 8, 0, tzinfo=datetime.timezone.utc))
+    & Q(event_time__lt=datetime.datetime(2024, 1, 2, 8, 0, tzinfo=datetime.timezone.utc)),
+    Q(risk_id__in=["risk-001", "risk-002"]) | Q(raw_event_id="raw-001"),
+    Q(has_report=True, manual_synced=False),
+]
+
+TABLE_MAP = {
+    Risk._meta.db_table: "test.asset_risk.doris",
+    "risk_strategy": "test.asset_strategy.doris",
+    "risk_strategytag": "test.asset_strategy_tag.doris",
+}
+
+
+class TestBkBasePlanCache(TestCase):
+    def setUp(self):
+        bkbase_plan_cache.clear()
+        self.builder = BkBaseQueryExpressionBuilder(table_map=TABLE_MAP, storage_suffix="doris")
+
+    def tearDown(self):
+        bkbase_plan_cache.clear()
+
+    def _queryset(self, q: Q):
+        return Risk.objects.filter(q).values(*VALUE_FIELDS).distinct().order_by()
+
+    def _uncached_sql(self, q: Q) -> str:
+        sql = self.builder.compile_queryset_sql(self._queryset(q))
+        return self.builder.convert_to_expression(sql).sql(dialect="mysql")
+
+    def test_same_sql_as_uncached_path(self):
+        for q in FIXTURE_FILTERS:
+            with self.subTest(q=q):
+                expected = self._uncached_sql(q)
+                cold = self.builder.compile_queryset_expression(self._queryset(q))
+                warm = self.builder.compile_queryset_expression(self._queryset(q))
+                self.assertEqual(cold.sql(dialect="mysql"), expected)
+                self.assertEqual(warm.sql(dialect="mysql"), expected)
+
+    def test_reuse_template_with_different_params(self):
+        hits = bkbase_plan_cache.stats["hits"]
+        first = self.builder.compile_queryset_expression(self._queryset(Q(title="first")))
+        second = self.builder.compile_queryset_expression(self._queryset(Q(title="second")))
+
+        self.assertEqual(bkbase_plan_cache.stats["size"], 1)
+        self.assertEqual(bkbase_plan_cache.stats["hits"] - hits, 1)
+        self.assertIn("first", first.sql(dialect="mysql"))
+        self.assertIn("second", second.sql(dialect="mysql"))
+        self.assertEqual(second.sql(dialect="mysql"), self._uncached_sql(Q(title="second")))
+
+    def test_event_time_params_localized(self):
+        q = Q(event_time__gte=datetime.datetime(2024, 1, 1, 8, 0, tzinfo=datetime.timezone.utc))
+        self.builder.compile_queryset_expression(self._queryset(q))
+        q = Q(event_time__gte=datetime.datetime(2024, 3, 1, 8, 0, tzinfo=datetime.timezone.utc))
+        warm = self.builder.compile_queryset_expression(self._queryset(q))
+
+        self.assertEqual(warm.sql(dialect="mysql"), self._uncached_sql(q))
+
+    def test_bound_expression_does_not_modify_template(self):
+        expression = self.builder.compile_queryset_expression(self._queryset(Q(title="a")))
+        expression.set("where", None)
+
+        again = self.builder.compile_queryset_expression(self._queryset(Q(title="a")))
+        self.assertIsNotNone(again.args.get("where"))
+
+    def test_template_built_once_per_plan(self):
+        querysets = [self._queryset(q) for q in FIXTURE_FILTERS]
+        with mock.patch.object(
+            self.builder, "_build_expression_template", wraps=self.builder._build_expression_template
+        ) as build_template:
+            for _ in range(3):
+                for queryset in querysets:
+                    self.builder.compile_queryset_expression(queryset)
+
+        self.assertEqual(build_template.call_count, len(FIXTURE_FILTERS))
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+import sqlglot
+from blueapps.contrib.drf.utils.pagination import CustomPageNumberPagination
+from django.test import SimpleTestCase
+
+from services.web.risk.converter.bkbase import (
+    BkBaseCountExecutor,
+    BkBaseDataExecutor,
+    BkBasePaginationPlanner,
+    BkBaseQueryPlanner,
+    BkBaseSQLRunner,
+    list_risk_count_cache,
+)
+
+
+class FakeBkBase:
+    def __init__(self, total: int, barrier: threading.Barrier = None):
+        self.total = total
+        self.barrier = barrier
+        self.calls = []
+
+    def __call__(self, sql):
+        self.calls.append(sql)
+        if self.barrier:
+            # count 与 data 必须同时在途，否则等待超时
+            self.barrier.wait()
+        if "COUNT" in sql.upper():
+            return {"list": [{"count": self.total}]}
+        return {"list": [{"risk_id": f"risk-{index}"} for index in range(self.total)]}
+
+
+class TestBkBaseQueryPlanner(SimpleTestCase):
+    def setUp(self):
+        list_risk_count_cache.invalidate()
+
+    def tearDown(self):
+        list_risk_count_cache.invalidate()
+
+    def _planner(self, api_client, manual_count: int = 0, filter_value: str = "a") -> BkBaseQueryPlanner:
+        components_builder = mock.Mock()
+        count_query_builder = mock.Mock()
+        count_query_builder.build.return_value = sqlglot.parse_one(
+            f"SELECT COUNT(*) AS count FROM risk WHERE title = '{filter_value}'"
+        )
+        data_query_builder = mock.Mock()
+        data_query_builder.build.side_effect = lambda components, **kwargs: sqlglot.parse_one(
+            "SELECT risk_id FROM risk LIMIT {limit} OFFSET {offset}".format(**kwargs)
+        )
+        sql_runner = BkBaseSQLRunner(api_client)
+        manual_helper = None
+        if manual_count:
+            manual_helper = mock.Mock()
+            manual_helper.count.return_value = manual_count
+            manual_helper.slice_ids.side_effect = lambda offset, limit: [
+                f"manual-{index}" for index in range(offset, min(offset + limit, manual_count))
+            ]
+        return BkBaseQueryPlanner(
+            queryset_expression=sqlglot.parse_one("SELECT risk_id FROM risk"),
+            count_executor=BkBaseCountExecutor(
+                components_builder, count_query_builder, sql_runner, count_cache=list_risk_count_cache
+            ),
+            data_executor=BkBaseDataExecutor(components_builder, data_query_builder, sql_runner),
+            pagination_planner=BkBasePaginationPlanner(CustomPageNumberPagination),
+            sql_runner=sql_runner,
+            manual_helper=manual_helper,
+        )
+
+    def _request(self, page, page_size=2):
+        return SimpleNamespace(query_params={"page": str(page), "page_size": str(page_size)})
+
+    def test_count_and_data_run_concurrently(self):
+        api_client = FakeBkBase(total=5, barrier=threading.Barrier(2, timeout=5))
+        planner = self._planner(api_client)
+
+        result = planner.plan(self._request(page=2), order_fields=[])
+
+        self.assertEqual(result.page.page.paginator.count, 5)
+        self.assertEqual(len(api_client.calls), 2)
+        self.assertIn("COUNT", planner.sql_statements[0].upper())
+        self.assertIn("OFFSET 2", planner.sql_statements[1])
+
+    def test_count_cached_between_pages(self):
+        api_client = FakeBkBase(total=5)
+        self._planner(api_client).plan(self._request(page=1), order_fields=[])
+
+        api_client.calls.clear()
+        planner = self._planner(api_client)
+        result = planner.plan(self._request(page=3), order_fields=[])
+
+        self.assertEqual(result.page.page.paginator.count, 5)
+        self.assertEqual(len(api_client.calls), 1)
+        self.assertNotIn("COUNT", api_client.calls[0].upper())
+        self.assertIn("OFFSET 4", api_client.calls[0])
+
+        api_client.calls.clear()
+        self._planner(api_client, filter_value="b").plan(self._request(page=1), order_fields=[])
+        self.assertEqual(len(api_client.calls), 2)
+
+    def test_last_page_runs_serially(self):
+        api_client = FakeBkBase(total=5)
+        planner = self._planner(api_client)
+
+        result = planner.plan(self._request(page="last"), order_fields=[])
+
+        self.assertEqual(result.page.page.number, 3)
+        self.assertEqual(api_client.calls[0], planner.sql_statements[0])
+        self.assertIn("OFFSET 4", api_client.calls[1])
+
+    def test_manual_unsynced_prepended(self):
+        api_client = FakeBkBase(total=5)
+        planner = self._planner(api_client, manual_count=3)
+
+        result = planner.plan(self._request(page=2), order_fields=[])
+
+        self.assertEqual(result.page.page.paginator.count, 8)
+        self.assertEqual(result.manual_ids, ["manual-2"])
+        self.assertIn("LIMIT 1 OFFSET 0", api_client.calls[1])
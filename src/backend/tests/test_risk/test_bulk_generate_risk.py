@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.exceptions import LockError
+from core.utils.lock import wait_lock
+from services.web.risk.constants import (
+    RISK_ESQUERY_SLICE_DURATION,
+    RISK_GENERATE_PARTITION_LOCK_KEY,
+    RiskStatus,
+)
+from services.web.risk.handlers.risk import RiskHandler
+from services.web.risk.models import Risk
+from services.web.risk.tasks import (
+    dispatch_generate_risk_slices,
+    generate_risk_from_event_slice,
+)
+from services.web.strategy_v2.constants import StrategyStatusChoices
+from services.web.strategy_v2.models import Strategy
+
+
+@mock.patch("services.web.risk.tasks.process_risk_ticket")
+@mock.patch.object(RiskHandler, "send_risk_notice")
+@mock.patch.object(RiskHandler, "trigger_render_task")
+class TestBulkGenerateRisk(TestCase):
+    def setUp(self):
+        self.now_ms = int(datetime.datetime.now().timestamp() * 1000)
+        self.strategy = Strategy.objects.create(
+            strategy_id=201, status=StrategyStatusChoices.RUNNING.value, risk_title="{{ raw_event_id }}"
+        )
+        self.disabled_strategy = Strategy.objects.create(strategy_id=202, status=StrategyStatusChoices.DISABLED.value)
+
+    def _event(self, raw_event_id: str, offset_ms: int = 0, strategy_id: int = 201, **kwargs) -> dict:
+        return {
+            "strategy_id": strategy_id,
+            "raw_event_id": raw_event_id,
+            "event_time": self.now_ms + offset_ms,
+            "event_data": {"offset": offset_ms},
+            "event_evidence": "[]",
+            **kwargs,
+        }
+
+    def test_merge_events_into_one_created_risk(self, mock_render, mock_notice, mock_process):
+        events = [
+            self._event("raw-001"),
+            self._event("raw-001", 60_000, operator="admin;user"),
+            self._event("raw-002"),
+            self._event("raw-003", strategy_id=202),
+        ]
+
+        eligible = RiskHandler.fetch_eligible_strategy_ids()
+        risk_ids = RiskHandler().bulk_generate_risk(events, eligible)
+
+        self.assertEqual(len(risk_ids), 2)
+        self.assertEqual(Risk.objects.count(), 2)
+        risk = Risk.objects.get(strategy_id=201, raw_event_id="raw-001")
+        self.assertEqual(risk.title, "raw-001")
+        self.assertEqual(risk.operator, ["admin", "user"])
+        self.assertEqual(risk.event_data, {"offset": 60_000})
+        self.assertEqual(int(risk.event_end_time.timestamp()), int((self.now_ms + 60_000) / 1000))
+        self.assertEqual(mock_render.call_count, 2)
+        self.assertEqual(mock_notice.call_count, 2)
+        self.assertEqual(mock_process.call_count, 2)
+
+    def test_update_existing_risk_in_single_write(self, mock_render, mock_notice, mock_process):
+        existing = Risk.objects.create(
+            strategy=self.strategy,
+            raw_event_id="raw-004",
+            event_time=datetime.datetime.fromtimestamp(self.now_ms / 1000),
+            event_end_time=datetime.datetime.fromtimestamp(self.now_ms / 1000),
+            event_data={},
+            event_type=[],
+        )
+        events = [
+            self._event("raw-004", 30_000, event_content="first"),
+            self._event("raw-004", 60_000, event_content="second", event_type="a,b"),
+        ]
+
+        eligible = RiskHandler.fetch_eligible_strategy_ids()
+        with CaptureQueriesContext(connection) as ctx:
+            risk_ids = RiskHandler().bulk_generate_risk(events, eligible)
+
+        # 策略 + 候选风险 + 一次合并后的更新
+        statements = [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+        self.assertEqual(len(statements), 3)
+        self.assertEqual(len([sql for sql in statements if sql.startswith("UPDATE")]), 1)
+
+        self.assertEqual(risk_ids, [existing.risk_id])
+        existing.refresh_from_db()
+        self.assertEqual(existing.event_content, "second")
+        self.assertEqual(existing.event_type, ["a", "b"])
+        self.assertEqual(int(existing.event_end_time.timestamp()), int((self.now_ms + 60_000) / 1000))
+        self.assertEqual(Risk.objects.count(), 1)
+        mock_render.assert_called_once()
+        mock_notice.assert_not_called()
+        mock_process.assert_not_called()
+
+    def test_closed_risk_creates_new_risk(self, mock_render, mock_notice, mock_process):
+        closed = Risk.objects.create(
+            strategy=self.strategy,
+            raw_event_id="raw-005",
+            event_time=datetime.datetime.fromtimestamp(self.now_ms / 1000),
+            event_end_time=datetime.datetime.fromtimestamp(self.now_ms / 1000),
+            status=RiskStatus.CLOSED,
+        )
+        events = [self._event("raw-005", -10_000), self._event("raw-005", 60_000)]
+
+        eligible = RiskHandler.fetch_eligible_strategy_ids()
+        RiskHandler().bulk_generate_risk(events, eligible)
+
+        self.assertEqual(Risk.objects.filter(raw_event_id="raw-005").count(), 2)
+        self.assertTrue(Risk.objects.filter(raw_event_id="raw-005").exclude(risk_id=closed.risk_id).exists())
+        mock_process.assert_called_once()
+
+    def test_fallback_to_single_mode(self, mock_render, mock_notice, mock_process):
+        events = [self._event("raw-006"), self._event("raw-006", 60_000)]
+
+        eligible = RiskHandler.fetch_eligible_strategy_ids()
+        with mock.patch.object(RiskHandler, "_bulk_save_risks", side_effect=RuntimeError("bulk failed")):
+            RiskHandler().bulk_generate_risk(events, eligible)
+
+        self.assertEqual(Risk.objects.filter(raw_event_id="raw-006").count(), 1)
+        mock_process.assert_called_once()
+
+
+class TestGenerateRiskFromEventCheckpoint(TestCase):
+    def setUp(self):
+        self.start_time = datetime.datetime(2026, 6, 24, 0, 0, 0)
+        self.end_time = datetime.datetime(2026, 6, 24, 1, 0, 0)
+
+    def _iter_events(self, fail: bool):
+        yield []
+        if fail:
+            raise RuntimeError("scroll failed")
+
+    def test_checkpoint_after_slice_processed(self):
+        with mock.patch.object(RiskHandler, "iter_events", return_value=self._iter_events(fail=False)):
+            RiskHandler().generate_risk_from_event(self.start_time, self.end_time)
+
+        self.assertEqual(RiskHandler.get_sync_start_time(), self.end_time)
+
+    def test_no_checkpoint_when_slice_failed(self):
+        with mock.patch.object(RiskHandler, "iter_events", return_value=self._iter_events(fail=True)):
+            with self.assertRaises(RuntimeError):
+                RiskHandler().generate_risk_from_event(self.start_time, self.end_time)
+
+        self.assertIsNone(RiskHandler.get_sync_start_time())
+
+
+class TestGenerateRiskSlices(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.start_time = datetime.datetime.fromtimestamp(1782230400)
+        self.slice = datetime.timedelta(seconds=RISK_ESQUERY_SLICE_DURATION)
+
+    def tearDown(self):
+        cache.clear()
+
+    @mock.patch("services.web.risk.tasks.group")
+    def test_dispatch_skips_finished_slices_and_advances_checkpoint(self, mock_group):
+        RiskHandler.mark_slice_finished(self.start_time, self.start_time + self.slice)
+        RiskHandler.mark_slice_finished(self.start_time + self.slice * 2, self.start_time + self.slice * 3)
+
+        count = dispatch_generate_risk_slices(self.start_time, self.start_time + self.slice * 4)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(RiskHandler.get_sync_start_time(), self.start_time + self.slice)
+        signatures = mock_group.call_args.args[0]
+        self.assertEqual(
+            [signature.kwargs["start_time"] for signature in signatures],
+            [(self.start_time + self.slice).timestamp(), (self.start_time + self.slice * 3).timestamp()],
+        )
+        mock_group.return_value.apply_async.assert_called_once()
+
+    @mock.patch.object(RiskHandler, "generate_risk_from_event")
+    def test_slice_task_marks_finished_without_global_checkpoint(self, mock_generate):
+        generate_risk_from_event_slice(
+            start_time=self.start_time.timestamp(), end_time=(self.start_time + self.slice).timestamp()
+        )
+
+        self.assertFalse(mock_generate.call_args.kwargs["checkpoint"])
+        self.assertTrue(mock_generate.call_args.kwargs["partition_lock"])
+        self.assertTrue(RiskHandler.is_slice_finished(self.start_time))
+        self.assertIsNone(RiskHandler.get_sync_start_time())
+
+    def test_partition_lock_blocks_same_partition(self):
+        partition = RiskHandler.get_partition(1, "raw-001")
+        self.assertEqual(partition, RiskHandler.get_partition(1, "raw-001"))
+        with RiskHandler.partition_lock({partition}):
+            with self.assertRaises(LockError):
+                with wait_lock(RISK_GENERATE_PARTITION_LOCK_KEY.format(partition=partition), wait_timeout=0):
+                    pass
+        with wait_lock(RISK_GENERATE_PARTITION_LOCK_KEY.format(partition=partition), wait_timeout=0):
+            pass
+
+    def test_wait_lock_keeps_other_holder(self):
+        lock_name = RISK_GENERATE_PARTITION_LOCK_KEY.format(partition=0)
+        with wait_lock(lock_name, wait_timeout=0):
+            # 模拟持有超过 ttl 后锁被其他进程获取
+            cache.set(lock_name, "other-holder")
+        self.assertEqual(cache.get(lock_name), "other-holder")
+        cache.delete(lock_name)
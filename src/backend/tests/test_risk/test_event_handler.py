@@ -3,7 +3,7 @@ from unittest import mock
 
 from django.test import SimpleTestCase, override_settings
 
-from services.web.risk.handlers.event import EventHandler
+from services.web.risk.handlers.event import EventHandler, scroll_clients
 
 
 @override_settings(DEFAULT_MAX_RETRY=3, DEFAULT_RETRY_SLEEP_TIME=0, DEFAULT_MAX_RETRY_SLEEP_TIME=0)
@@ -47,3 +47,72 @@ class TestEventHandlerRetry(SimpleTestCase):
                 EventHandler.search_all_event(**self._search_event_params())
 
         self.assertEqual(mock_search.call_count, 1)
+
+
+class TestEventHandlerIterAllEvent(SimpleTestCase):
+    def _search_event_params(self):
+        return {
+            "namespace": "default",
+            "start_time": "2026-06-24 00:00:00",
+            "end_time": "2026-06-24 01:00:00",
+            "page": 1,
+            "page_size": 2,
+        }
+
+    def _scroll_resp(self, scroll_id, hits):
+        return {"_scroll_id": scroll_id, "hits": {"hits": [{"_source": hit} for hit in hits]}}
+
+    @mock.patch("services.web.risk.handlers.event.GlobalMetaConfig.get", return_value=1)
+    @mock.patch("services.web.risk.handlers.event.EventHandler.get_table_id", return_value="1_bklog.event")
+    @mock.patch("services.web.risk.handlers.event.EventHandler.clear_scroll")
+    @mock.patch("services.web.risk.handlers.event.api.bk_log.es_query_scroll")
+    def test_iter_all_event_yields_pages_and_clears_scroll(
+        self, mock_scroll, mock_clear_scroll, mock_get_table_id, mock_global_meta_get
+    ):
+        mock_scroll.side_effect = [
+            self._scroll_resp("scroll-2", [{"event_id": "event-003"}, {"event_id": "event-004"}]),
+            self._scroll_resp("scroll-3", []),
+        ]
+        first_page = {"results": [{"event_id": "event-001"}, {"event_id": "event-002"}], "total": 4}
+        with mock.patch.object(EventHandler, "search_event", return_value={**first_page, "scroll_id": "scroll-1"}):
+            pages = list(EventHandler.iter_all_event(**self._search_event_params()))
+
+        self.assertEqual([len(page) for page in pages], [2, 2])
+        self.assertEqual(mock_scroll.call_args_list[1].kwargs["scroll_id"], "scroll-2")
+        mock_clear_scroll.assert_called_once_with("scroll-2", 1)
+        mock_global_meta_get.assert_called_once()
+
+    @mock.patch("core.utils.retry.time.sleep", return_value=None)
+    @mock.patch("services.web.risk.handlers.event.GlobalMetaConfig.get", return_value=1)
+    @mock.patch("services.web.risk.handlers.event.EventHandler.get_table_id", return_value="1_bklog.event")
+    @mock.patch("services.web.risk.handlers.event.EventHandler.clear_scroll")
+    @mock.patch("services.web.risk.handlers.event.api.bk_log.es_query_scroll", side_effect=RuntimeError("failed"))
+    def test_iter_all_event_clears_scroll_on_failure(
+        self, mock_scroll, mock_clear_scroll, mock_get_table_id, mock_global_meta_get, mock_sleep
+    ):
+        first_page = {"results": [{"event_id": "event-001"}], "total": 4, "scroll_id": "scroll-1"}
+        with mock.patch.object(EventHandler, "search_event", return_value=first_page):
+            iterator = EventHandler.iter_all_event(**self._search_event_params())
+            self.assertEqual(len(next(iterator)), 1)
+            with self.assertRaises(RuntimeError):
+                next(iterator)
+
+        mock_clear_scroll.assert_called_once_with("scroll-1", 1)
+
+
+class TestEventHandlerClearScroll(SimpleTestCase):
+    def setUp(self):
+        scroll_clients.clear()
+
+    @mock.patch("services.web.risk.handlers.event.EventHandler.get_es_config", return_value={})
+    @mock.patch("services.web.risk.handlers.event.EventHandler.get_client")
+    def test_clear_scroll_reuses_client(self, mock_get_client, mock_get_es_config):
+        EventHandler.clear_scroll(None, 1)
+        EventHandler.clear_scroll("scroll-1", 1)
+        EventHandler.clear_scroll("scroll-2", 1)
+
+        mock_get_es_config.assert_called_once_with(1)
+        self.assertEqual(
+            mock_get_client.return_value.clear_scroll.call_args_list,
+            [mock.call(scroll_id="scroll-1"), mock.call(scroll_id="scroll-2")],
+        )
@@ -6,7 +6,7 @@ EventProvider 和 EventProviderSqlBuilder 测试
 1. EventProviderSqlBuilder：完整 SQL 验证，一个测试覆盖所有聚合函数
 2. EventProvider：精简但覆盖全面，验证类型匹配和参数传递
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from unittest import mock
 
 from bk_resource.exceptions import APIRequestError
@@ -495,6 +495,47 @@ class TestEventProviderGet(TestCase):
         result = self.provider.get(function="count", field_name="event_id")
         self.assertEqual(result, EVENT_QUERY_FAILED)
 
+    def test_batch_key_by_query_shape(self, mock_query_sync, mock_global_config):
+        """测试按查询形态分组"""
+        self.assertEqual(self.provider.batch_key(function="first", field_name="a"), "first")
+        self.assertEqual(self.provider.batch_key(function="latest", field_name="a"), "latest")
+        self.assertEqual(
+            self.provider.batch_key(function="count", field_name="a"),
+            self.provider.batch_key(function="list_distinct", field_name="b"),
+        )
+        self.assertIsNone(self.provider.batch_key(function="unsupported", field_name="a"))
+        self.assertIsNone(self.provider.batch_key(function="count"))
+
+    def test_get_batch_single_multi_column_sql(self, mock_query_sync, mock_global_config):
+        """测试同一形态的多个聚合合并为一条多列 SQL，并按别名映射回各表达式"""
+        mock_global_config.return_value = "591_test_table"
+        mock_query_sync.return_value = {"list": [{"sum__amount": 999, "avg__amount": 85.5, "count__event_id": 3}]}
+
+        result = self.provider.get_batch(
+            [
+                {"function": "sum", "field_name": "amount"},
+                {"function": "avg", "field_name": "amount"},
+                {"function": "count", "field_name": "event_id"},
+            ]
+        )
+
+        self.assertEqual(result, [999, 85.5, 3])
+        mock_query_sync.assert_called_once()
+        sql = mock_query_sync.call_args.kwargs["sql"]
+        self.assertIn("`sum__amount`", sql)
+        self.assertIn("`avg__amount`", sql)
+        self.assertIn("`count__event_id`", sql)
+
+    def test_get_batch_error_returns_placeholder(self, mock_query_sync, mock_global_config):
+        """测试合并查询异常时整批返回占位符"""
+        mock_global_config.return_value = "591_test_table"
+        mock_query_sync.side_effect = APIRequestError()
+
+        result = self.provider.get_batch(
+            [{"function": "first", "field_name": "a"}, {"function": "first", "field_name": "b"}]
+        )
+        self.assertEqual(result, [EVENT_QUERY_FAILED, EVENT_QUERY_FAILED])
+
 
 class TestEventProviderFieldType(TestCase):
     """EventProvider 字段类型推断测试"""
@@ -703,3 +744,62 @@ class TestRiskEventAggregateSqlBuilder(TestCase):
             f"LIMIT 1"
         )
         self.assertEqual(sql, expected)
+
+
+class TestRiskEventWindowSqlBuilder(TestCase):
+    """RiskEventWindowSqlBuilder 批量查询 SQL 测试"""
+
+    TABLE_NAME = "591_test_table.doris"
+
+    @staticmethod
+    def _mock_risk(risk_id: str, start: int, end: int):
+        return mock.Mock(
+            risk_id=risk_id,
+            strategy_id=1001,
+            raw_event_id="raw_event_abc",
+            event_time=datetime.fromtimestamp(start, tz=timezone.utc),
+            event_end_time=datetime.fromtimestamp(end, tz=timezone.utc),
+        )
+
+    def test_build_sql_overlapping_risks(self):
+        """测试时间范围重叠的风险通过派生表关联，同一事件为每个风险各产出一行"""
+        from services.web.risk.handlers.event_provider_sql import (
+            RiskEventWindowSqlBuilder,
+        )
+
+        risks = [self._mock_risk("risk_a", 100, 200), self._mock_risk("risk_b", 150, 300)]
+        sql = RiskEventWindowSqlBuilder(table_name=self.TABLE_NAME, limit_per_risk=10).build_sql(risks)
+
+        expected = (
+            "SELECT `ranked`.`risk_id`,`ranked`.`event_data`,`ranked`.`dtEventTimeStamp` FROM ("
+            "SELECT `tagged`.`risk_id`,`tagged`.`event_data`,`tagged`.`dtEventTimeStamp`,"
+            "ROW_NUMBER() OVER(PARTITION BY `tagged`.`risk_id` ORDER BY `tagged`.`dtEventTimeStamp` DESC) "
+            "`_row_number` FROM ("
+            "SELECT `risk_window`.`risk_id`,`t`.`event_data`,`t`.`dtEventTimeStamp` FROM 591_test_table.doris `t` "
+            "JOIN ("
+            "(SELECT 'risk_a' `risk_id`,1001 `strategy_id`,'raw_event_abc' `raw_event_id`,"
+            "100000 `start_time`,200000 `end_time`) UNION ALL "
+            "(SELECT 'risk_b' `risk_id`,1001 `strategy_id`,'raw_event_abc' `raw_event_id`,"
+            "150000 `start_time`,300000 `end_time`)"
+            ") `risk_window` "
+            "ON `t`.`strategy_id`=`risk_window`.`strategy_id` "
+            "AND `t`.`raw_event_id`=`risk_window`.`raw_event_id` "
+            "AND `t`.`dtEventTimeStamp` BETWEEN `risk_window`.`start_time` AND `risk_window`.`end_time` "
+            "WHERE (`t`.`strategy_id`=1001 AND `t`.`raw_event_id`='raw_event_abc' "
+            "AND `t`.`dtEventTimeStamp` BETWEEN 100000 AND 200000) "
+            "OR (`t`.`strategy_id`=1001 AND `t`.`raw_event_id`='raw_event_abc' "
+            "AND `t`.`dtEventTimeStamp` BETWEEN 150000 AND 300000)"
+            ") `tagged`"
+            ") `ranked` "
+            "WHERE `ranked`.`_row_number`<=10 "
+            "ORDER BY `ranked`.`dtEventTimeStamp` DESC"
+        )
+        self.assertEqual(sql, expected)
+
+    def test_build_sql_empty_risks(self):
+        """测试风险为空时不生成 SQL"""
+        from services.web.risk.handlers.event_provider_sql import (
+            RiskEventWindowSqlBuilder,
+        )
+
+        self.assertIsNone(RiskEventWindowSqlBuilder(table_name=self.TABLE_NAME, limit_per_risk=10).build_sql([]))
@@ -18,6 +18,7 @@ to the current version of the project delivered to anyone in the future.
 import base64
 import datetime
 import io
+import json
 from unittest import mock
 from urllib.parse import unquote
 
@@ -561,6 +562,77 @@ class TestRiskExport(TestCase):
         self.assertIn("batch=1/2", logs)
         self.assertIn("batch=2/2", logs)
 
+    @mock.patch.object(ListEvent, "bulk_request")
+    @mock.patch("services.web.risk.handlers.risk_export_service.api.bk_base.query_sync")
+    @mock.patch(
+        "services.web.risk.handlers.risk_export_service.RiskEventAggregateSqlBuilder.get_rt_id",
+        return_value="591_risk_event.doris",
+    )
+    def test_risk_export_service_fetches_events_by_window_sql(self, _, mock_query_sync, mock_get_event_list):
+        mock_query_sync.return_value = {
+            "list": [
+                {"risk_id": "risk003", "event_data": json.dumps({"ip": "127.0.0.1"})},
+                {"risk_id": "risk001", "event_data": json.dumps({"user": "alice", "action": "login_success"})},
+                {"risk_id": "risk002", "event_data": {"user": "bob", "action": "delete_file"}},
+                {"risk_id": "risk001", "event_data": json.dumps({"user": "alice", "action": "login_fail"})},
+            ]
+        }
+
+        export_file = RiskExportService(
+            username="admin",
+            risk_ids=[self.risk_3.risk_id, self.risk_1.risk_id, self.risk_4.risk_id, self.risk_2.risk_id],
+            risk_view_type=RiskViewType.ALL.value,
+        ).build_export_file()
+
+        mock_get_event_list.assert_not_called()
+        mock_query_sync.assert_called_once()
+        sql = mock_query_sync.call_args.kwargs["sql"]
+        self.assertIn("ROW_NUMBER() OVER(PARTITION BY `tagged`.`risk_id`", sql)
+        self.assertIn(f"<={settings.RISK_EXPORT_EVENT_LIMIT_PER_RISK}", sql)
+        self.assertIn("591_risk_event.doris", sql)
+
+        workbook = openpyxl.load_workbook(io.BytesIO(export_file.file.read()))
+        sheet1 = workbook[self.strategy_1.build_sheet_name()]
+        header_map1 = {cell.value: index for index, cell in enumerate(sheet1[1], 1)}
+        risk_id_column = header_map1[str(RiskExportField.RISK_ID.label)]
+        self.assertEqual(
+            [
+                (row[risk_id_column - 1], row[header_map1["Action"] - 1])
+                for row in sheet1.iter_rows(2, values_only=True)
+            ],
+            [("risk001", "login_success"), ("risk001", "login_fail"), ("risk002", "delete_file")],
+        )
+        sheet2 = workbook[self.strategy_2.build_sheet_name()]
+        header_map2 = {cell.value: index for index, cell in enumerate(sheet2[1], 1)}
+        self.assertEqual(
+            [
+                (row[risk_id_column - 1], row[header_map2["Source IP"] - 1])
+                for row in sheet2.iter_rows(2, values_only=True)
+            ],
+            [("risk003", "127.0.0.1"), ("risk004", None)],
+        )
+
+    @mock.patch.object(ListEvent, "bulk_request")
+    @mock.patch("services.web.risk.handlers.risk_export_service.api.bk_base.query_sync")
+    @mock.patch(
+        "services.web.risk.handlers.risk_export_service.RiskEventAggregateSqlBuilder.get_rt_id",
+        return_value="591_risk_event.doris",
+    )
+    def test_risk_export_service_window_sql_failure_fallback(self, _, mock_query_sync, mock_get_event_list):
+        mock_query_sync.side_effect = Exception("query failed")
+        mock_get_event_list.return_value = [{"results": [{"event_data": {"user": "alice"}}]}]
+
+        export_file = RiskExportService(
+            username="admin",
+            risk_ids=[self.risk_1.risk_id],
+            risk_view_type=RiskViewType.ALL.value,
+        ).build_export_file()
+
+        mock_get_event_list.assert_called_once()
+        sheet = openpyxl.load_workbook(io.BytesIO(export_file.file.read()))[self.strategy_1.build_sheet_name()]
+        header_map = {cell.value: index for index, cell in enumerate(sheet[1], 1)}
+        self.assertEqual(sheet.cell(row=2, column=header_map["Username"]).value, "alice")
+
     @mock.patch.object(ListEvent, "bulk_request")
     @mock.patch("services.web.risk.handlers.risk_export_service.MailSender")
     def test_risk_export_service_send_mail_with_attachment(self, mock_mail_sender, mock_get_event_list):
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for chunked risk ticket processing.
+"""
+
+import datetime
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+
+from services.web.risk.constants import RiskStatus
+from services.web.risk.handlers.ticket import NewRisk, RiskFlowContext
+from services.web.risk.models import Risk, RiskRule
+from services.web.risk.tasks import process_risk_chunk, process_risk_ticket
+from services.web.strategy_v2.models import Strategy
+from tests.base import TestCase
+
+
+class FakeProcess:
+    calls = []
+
+    def __init__(self, risk_id: str, operator: str, context: RiskFlowContext = None):
+        self.risk_id = risk_id
+        self.context = context
+
+    def run(self):
+        FakeProcess.calls.append(self.risk_id)
+
+
+class TestProcessRiskChunk(TestCase):
+    def setUp(self):
+        cache.clear()
+        FakeProcess.calls = []
+        self.strategy = Strategy.objects.create(
+            namespace=settings.DEFAULT_NAMESPACE, strategy_name="formal", is_formal=True
+        )
+        self.risks = [
+            Risk.objects.create(
+                strategy=self.strategy,
+                raw_event_id=f"raw-{index}",
+                event_time=datetime.datetime.now(),
+                event_data={},
+                event_type=[],
+                status=RiskStatus.FOR_APPROVE,
+            )
+            for index in range(3)
+        ]
+        self.risk_ids = [risk.risk_id for risk in self.risks]
+
+    def test_dispatch_in_chunks(self):
+        with (
+            mock.patch("services.web.risk.tasks.settings.ENABLE_MULTI_PROCESS_RISK", True),
+            mock.patch("services.web.risk.tasks.settings.PROCESS_RISK_CHUNK_SIZE", 2),
+            mock.patch("services.web.risk.tasks.process_risk_chunk") as mocked_chunk,
+            mock.patch("services.web.risk.tasks.process_one_risk") as mocked_one,
+        ):
+            process_risk_ticket()
+        self.assertEqual(mocked_chunk.delay.call_count, 2)
+        self.assertEqual(
+            sorted(sum([call.kwargs["risk_ids"] for call in mocked_chunk.delay.call_args_list], [])),
+            sorted(self.risk_ids),
+        )
+        mocked_one.delay.assert_not_called()
+
+    def test_skip_unchanged_risks(self):
+        with (
+            mock.patch("services.web.risk.tasks.ForApprove", FakeProcess),
+            mock.patch("services.web.risk.tasks.settings.PROCESS_RISK_UNCHANGED_SKIP_TIMEOUT", 60),
+        ):
+            process_risk_chunk(risk_ids=self.risk_ids)
+            process_risk_chunk(risk_ids=self.risk_ids)
+        self.assertEqual(sorted(FakeProcess.calls), sorted(self.risk_ids))
+
+    def test_reprocess_changed_risks(self):
+        with (
+            mock.patch("services.web.risk.tasks.ForApprove", FakeProcess),
+            mock.patch("services.web.risk.tasks.settings.PROCESS_RISK_UNCHANGED_SKIP_TIMEOUT", 60),
+        ):
+            process_risk_chunk(risk_ids=self.risk_ids)
+            Risk.objects.filter(risk_id=self.risk_ids[0]).update(current_operator=["admin"])
+            process_risk_chunk(risk_ids=self.risk_ids)
+        self.assertEqual(FakeProcess.calls.count(self.risk_ids[0]), 2)
+        self.assertEqual(len(FakeProcess.calls), 4)
+
+    def test_skip_disabled_by_default(self):
+        with mock.patch("services.web.risk.tasks.ForApprove", FakeProcess):
+            process_risk_chunk(risk_ids=self.risk_ids)
+            process_risk_chunk(risk_ids=self.risk_ids)
+        self.assertEqual(len(FakeProcess.calls), 6)
+
+    def test_read_risk_after_lock(self):
+        preload = RiskFlowContext.preload
+
+        def preload_then_change(context, risk_ids):
+            preload(context, risk_ids)
+            # 预加载后、加锁前风险状态发生变化
+            Risk.objects.filter(risk_id=self.risk_ids[0]).update(status=RiskStatus.NEW)
+
+        with (
+            mock.patch.object(RiskFlowContext, "preload", preload_then_change),
+            mock.patch("services.web.risk.tasks.ForApprove", FakeProcess),
+            mock.patch("services.web.risk.tasks.NewRisk", mock.MagicMock(__name__="NewRisk")) as new_risk,
+        ):
+            process_risk_chunk(risk_ids=self.risk_ids)
+        self.assertEqual(sorted(FakeProcess.calls), sorted(self.risk_ids[1:]))
+        self.assertEqual(new_risk.call_args.kwargs["risk_id"], self.risk_ids[0])
+
+    def test_context_preload(self):
+        rule = RiskRule.objects.create(rule_id=1, version=1, name="rule", scope=[], pa_id=None, priority_index=1)
+        Risk.objects.filter(risk_id=self.risk_ids[0]).update(rule_id=rule.rule_id, rule_version=rule.version)
+        context = RiskFlowContext(risk_ids=self.risk_ids)
+        # 仅实时读取风险本身，策略与规则来自预加载
+        with self.assertNumQueries(1):
+            handler = NewRisk(risk_id=self.risk_ids[0], operator="admin", context=context)
+            self.assertEqual(handler.strategy, self.strategy)
+            self.assertEqual(handler.rule, rule)
+            self.assertIsNone(handler.process_application)
@@ -374,15 +374,15 @@ class TestListRiskResource(TestCase):
         self.assertEqual(len(sql_log), 2)  # count + data
 
         risk_table = f"{self.bkbase_table_config[ASSET_RISK_BKBASE_RT_ID_KEY]}.doris"
-        self.assertIn(risk_table, sql_log[0])
-        self.assertIn(risk_table, sql_log[1])
+        self.assertIn(risk_table, data["sql"][0])
+        self.assertIn(risk_table, data["sql"][1])
         # 所有风险为 IAM 仅用，不 join ticket_permission 表
         ticket_table = f"{self.bkbase_table_config[ASSET_TICKET_PERMISSION_BKBASE_RT_ID_KEY]}.doris"
         self.assertFalse(any(ticket_table in sql for sql in sql_log))
         self.assertFalse(any("scene_resourcebinding" in sql for sql in sql_log))
         event_table = f"{self.bkbase_table_config[DORIS_EVENT_BKBASE_RT_ID_KEY]}.doris"
         self.assertTrue(any(event_table in sql for sql in sql_log))
-        self.assertEqual(data["sql"], sql_log)
+        self.assertCountEqual(data["sql"], sql_log)
         assert_hive_sql(self, sql_log)
 
     def test_list_risk_via_bkbase_with_event_filters(self):
@@ -428,7 +428,7 @@ class TestListRiskResource(TestCase):
             "`", ""
         )
         self.assertTrue(any(event_table in sql for sql in normalized_sql))
-        self.assertEqual(data["sql"], sql_log)
+        self.assertCountEqual(data["sql"], sql_log)
         assert_hive_sql(self, sql_log)
 
     def test_list_risk_via_bkbase_returns_filtered_event_data(self):
@@ -557,7 +557,7 @@ class TestListRiskResource(TestCase):
         self.assertIn("CAST(JSON_EXTRACT_STRING", combined_sql)
         self.assertIn("> 1.5", combined_sql)
         self.assertNotIn("> '1.5'", combined_sql)
-        self.assertEqual(data["sql"], sql_log)
+        self.assertCountEqual(data["sql"], sql_log)
         assert_hive_sql(self, sql_log)
 
     def test_list_risk_via_bkbase_with_duplicate_field(self):
@@ -664,7 +664,7 @@ class TestListRiskResource(TestCase):
         normalized_sql = combined_sql.replace("`", "")
         self.assertIn("matched_event_src_base.thedate >=", normalized_sql)
         self.assertIn("matched_event_src_base.thedate <=", normalized_sql)
-        self.assertEqual(data["sql"], sql_log)
+        self.assertCountEqual(data["sql"], sql_log)
         assert_hive_sql(self, sql_log)
 
     def test_list_risk_via_bkbase_without_duplicate_fields(self):
@@ -712,7 +712,7 @@ class TestListRiskResource(TestCase):
         normalized_sql = combined_sql.replace("`", "")
         self.assertIn("matched_event_src_base.thedate >=", normalized_sql)
         self.assertIn("matched_event_src_base.thedate <=", normalized_sql)
-        self.assertEqual(data["sql"], sql_log)
+        self.assertCountEqual(data["sql"], sql_log)
         assert_hive_sql(self, sql_log)
 
     def test_list_risk_via_bkbase_with_risk_level(self):
@@ -741,11 +741,11 @@ class TestListRiskResource(TestCase):
 
         strategy_table = f"{self.bkbase_table_config[ASSET_STRATEGY_BKBASE_RT_ID_KEY]}.doris"
         self.assertTrue(any(strategy_table in sql for sql in sql_log))
-        data_sql = sql_log[1]
+        data_sql = data["sql"][1]
         data_sql_normalized = data_sql.replace("`", "")
         self.assertIn("CASE WHEN base_query.risk_level", data_sql_normalized)
         self.assertIn("ELSE -1 END DESC", data_sql_normalized)
-        self.assertEqual(data["sql"], sql_log)
+        self.assertCountEqual(data["sql"], sql_log)
         assert_hive_sql(self, sql_log)
 
     def test_list_risk_event_filters_without_matching_strategy_field(self):
@@ -823,7 +823,7 @@ class TestListRiskResource(TestCase):
         self.assertIn("2025-10-20", combined_sql)
         event_table = f"{self.bkbase_table_config[DORIS_EVENT_BKBASE_RT_ID_KEY]}.doris"
         self.assertTrue(any(event_table in sql for sql in sql_log))
-        self.assertEqual(data["sql"], sql_log)
+        self.assertCountEqual(data["sql"], sql_log)
         assert_hive_sql(self, sql_log)
 
     def test_list_risk_via_bkbase_with_display_status_filter(self):
@@ -868,7 +868,7 @@ class TestListRiskResource(TestCase):
         combined_sql = " ".join(sql_log).replace("`", "")
         self.assertIn("display_status", combined_sql)
         self.assertIn(RiskDisplayStatus.CLOSED, combined_sql)
-        self.assertEqual(data["sql"], sql_log)
+        self.assertCountEqual(data["sql"], sql_log)
         assert_hive_sql(self, sql_log)
 
     def test_list_risk_via_db_with_display_status_filter(self):
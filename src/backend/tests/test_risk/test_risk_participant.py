@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+TencentBlueKing is pleased to support the open source community by making
+蓝鲸智云 - 审计中心 (BlueKing - Audit Center) available.
+Copyright (C) 2023 THL A29 Limited,
+a Tencent company. All rights reserved.
+Licensed under the MIT License (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at http://opensource.org/licenses/MIT
+Unless required by applicable law or agreed to in writing,
+software distributed under the License is distributed on
+an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
+either express or implied. See the License for the
+specific language governing permissions and limitations under the License.
+We undertake not to change the open source license (MIT license) applicable
+to the current version of the project delivered to anyone in the future.
+"""
+
+import datetime
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.permission.handlers.actions import ActionEnum
+from services.web.risk.constants import RiskDisplayStatus, RiskStatus
+from services.web.risk.models import Risk, RiskParticipant, TicketNode, UserType
+from services.web.risk.resources.risk import (
+    ListMineRisk,
+    ListNoticingRisk,
+    ListProcessedRisk,
+)
+from services.web.strategy_v2.models import Strategy
+from tests.base import TestCase
+
+
+class RiskParticipantTest(TestCase):
+    def setUp(self):
+        self.strategy = Strategy.objects.create(namespace=settings.DEFAULT_NAMESPACE, strategy_name="participant")
+        self.event_time = datetime.datetime(2024, 1, 5, tzinfo=datetime.timezone.utc)
+        self.risk = self.create_risk("risk-participant", current_operator=["admin"], notice_users=["watcher"])
+
+    def create_risk(self, risk_id: str, **kwargs) -> Risk:
+        risk = Risk.objects.create(
+            risk_id=risk_id,
+            raw_event_id=risk_id,
+            strategy=self.strategy,
+            event_time=self.event_time,
+            status=RiskStatus.AWAIT_PROCESS,
+            display_status=RiskDisplayStatus.AWAIT_PROCESS,
+            **kwargs,
+        )
+        for user_type, users in [(UserType.OPERATOR, risk.current_operator), (UserType.NOTICE_USER, risk.notice_users)]:
+            risk.auth_users(action=ActionEnum.LIST_RISK.id, users=users, user_type=user_type)
+        return risk
+
+    def participants(self, risk_id: str = "risk-participant") -> set:
+        return set(RiskParticipant.objects.filter(risk_id=risk_id).values_list("role", "username", "status"))
+
+    def test_sync_on_create(self):
+        self.assertEqual(
+            self.participants(),
+            {
+                (UserType.OPERATOR.value, "admin", RiskDisplayStatus.AWAIT_PROCESS.value),
+                (UserType.NOTICE_USER.value, "watcher", RiskDisplayStatus.AWAIT_PROCESS.value),
+            },
+        )
+
+    def test_sync_on_operator_change(self):
+        self.risk.current_operator = ["other"]
+        self.risk.save(update_fields=["current_operator"])
+        self.risk.display_status = RiskDisplayStatus.PROCESSING
+        self.risk.save(update_fields=["display_status"])
+        self.assertEqual(
+            self.participants(),
+            {
+                (UserType.OPERATOR.value, "other", RiskDisplayStatus.PROCESSING.value),
+                (UserType.NOTICE_USER.value, "watcher", RiskDisplayStatus.PROCESSING.value),
+            },
+        )
+
+    def test_skip_unrelated_save(self):
+        with CaptureQueriesContext(connection) as context:
+            self.risk.save(update_fields=["last_operate_time"])
+        self.assertFalse(
+            [query for query in context.captured_queries if RiskParticipant._meta.db_table in query["sql"]]
+        )
+
+    def test_sync_in_save_transaction(self):
+        # 参与人同步失败时风险保存一并回滚
+        self.risk.current_operator = ["other"]
+        with mock.patch.object(RiskParticipant, "sync", side_effect=RuntimeError("sync failed")):
+            with self.assertRaises(RuntimeError):
+                self.risk.save(update_fields=["current_operator"])
+        self.assertEqual(Risk.objects.get(risk_id=self.risk.risk_id).current_operator, ["admin"])
+
+    def test_delete(self):
+        Risk._objects.filter(risk_id=self.risk.risk_id).delete()
+        self.assertEqual(self.participants(), set())
+
+    def test_list_views(self):
+        self.create_risk("risk-other", current_operator=["other"], notice_users=["admin"])
+        payload = {"event_time__gte": [self.event_time]}
+        self.assertEqual(
+            list(ListMineRisk().load_risks(dict(payload), username="admin").values_list("risk_id", flat=True)),
+            [self.risk.risk_id],
+        )
+        self.assertEqual(
+            list(ListNoticingRisk().load_risks(dict(payload), username="admin").values_list("risk_id", flat=True)),
+            ["risk-other"],
+        )
+        self.assertFalse(
+            ListMineRisk().load_risks({"display_status": [RiskDisplayStatus.CLOSED.value]}, username="admin").exists()
+        )
+
+    def test_list_processed(self):
+        TicketNode.objects.create(risk_id=self.risk.risk_id, operator="admin", action="TransOperator", timestamp=0)
+        self.assertFalse(ListProcessedRisk().load_risks({}, username="admin").exists())
+        self.risk.current_operator = ["other"]
+        self.risk.save(update_fields=["current_operator"])
+        self.assertEqual(
+            list(ListProcessedRisk().load_risks({}, username="admin").values_list("risk_id", flat=True)),
+            [self.risk.risk_id],
+        )
+
+    def test_backfill(self):
+        Risk.objects.filter(risk_id=self.risk.risk_id).update(current_operator=["backfill"])
+        self.create_risk("risk-other", current_operator=["other"])
+        call_command("backfill_risk_participants", batch_size=1, stdout=StringIO())
+        self.assertIn((UserType.OPERATOR.value, "backfill", RiskDisplayStatus.AWAIT_PROCESS.value), self.participants())
+        self.assertNotIn((UserType.OPERATOR.value, "admin", RiskDisplayStatus.AWAIT_PROCESS.value), self.participants())
+
+    def test_backfill_migration(self):
+        RiskParticipant.objects.all().delete()
+        self.create_risk("risk-other", current_operator=["other"])
+        RiskParticipant.objects.all().delete()
+        migration = import_module("services.web.risk.migrations.0060_backfill_riskparticipant")
+        migration.backfill_risk_participants(apps, None)
+        self.assertEqual(
+            self.participants(),
+            {
+                (UserType.OPERATOR.value, "admin", RiskDisplayStatus.AWAIT_PROCESS.value),
+                (UserType.NOTICE_USER.value, "watcher", RiskDisplayStatus.AWAIT_PROCESS.value),
+            },
+        )
+        self.assertEqual(
+            self.participants("risk-other"), {(UserType.OPERATOR.value, "other", RiskDisplayStatus.AWAIT_PROCESS.value)}
+        )
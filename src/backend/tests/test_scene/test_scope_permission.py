@@ -8,13 +8,16 @@ ScopePermission 权限组件单元测试
 - ScopePermission action 方向校验（基于 related_resource_types）
 - ScopePermission.check_scope_entry 四种 scope_type 路由
 - ScopePermission.get_scene_ids / get_system_ids 请求级缓存
+- AuthorizedScopeCache 跨请求缓存、失效与 stale-while-revalidate
 - ScopePermission.get_scene_ids / get_system_ids 方向不匹配返回空列表
 - ScopeInstancePermission 列表接口直接通过
 - ScopePermission.check_resource_permission（不传 scope）
+- ScopePermission.check_resources_visibility 批量校验
 - ScopePermission 的 binding_type 过滤与校验
 - System.get_managed_system_ids / System.is_manager 便捷方法
 """
 
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -29,6 +32,7 @@ from services.web.common.constants import (
     ScopeType,
 )
 from services.web.common.scope_permission import (
+    AuthorizedScopeCache,
     ScopeContext,
     ScopeInstancePermission,
     ScopePermission,
@@ -642,6 +646,107 @@ class TestScopePermissionCache(TestCase):
         assert len(sp._scene_ids_cache) == 0
 
 
+# ==================== Cross-request Cache Tests ====================
+
+
+@pytest.mark.django_db
+class TestAuthorizedScopeCache(TestCase):
+    """测试跨请求的授权集合缓存"""
+
+    def setUp(self):
+        self.cache = AuthorizedScopeCache(namespace="test_authorized_scope", ttl=60)
+        self.cache.invalidate_all()
+        patcher = patch("services.web.common.scope_permission.authorized_scope_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("services.web.common.scope_permission.Permission")
+    def test_scene_ids_cached_between_requests(self, mock_perm_cls):
+        """不同请求的 ScopePermission 复用 IAM 授权集合"""
+        scene = Scene.objects.create(name="跨请求缓存", status=SceneStatus.ENABLED)
+        mock_instance = MagicMock()
+        mock_instance.get_authorized_resource_ids.return_value = [str(scene.scene_id)]
+        mock_perm_cls.return_value = mock_instance
+
+        for _ in range(3):
+            result = ScopePermission("admin").get_scene_ids(ScopeContext(ScopeType.CROSS_SCENE), ActionEnum.VIEW_SCENE)
+            assert result == [scene.scene_id]
+
+        assert mock_instance.get_authorized_resource_ids.call_count == 1
+        assert self.cache.stats["hits"] == 2
+        assert self.cache.stats["misses"] == 1
+
+    @patch("services.web.common.scope_permission.System.get_managed_system_ids")
+    @patch("services.web.common.scope_permission.Permission")
+    def test_local_managers_not_cached(self, mock_perm_cls, mock_managed):
+        """系统本地 managers 通道每次实时查询"""
+        mock_instance = MagicMock()
+        mock_instance.get_authorized_resource_ids.return_value = []
+        mock_perm_cls.return_value = mock_instance
+        scope = ScopeContext(ScopeType.CROSS_SYSTEM)
+
+        mock_managed.return_value = []
+        assert ScopePermission("admin").get_system_ids(scope, ActionEnum.VIEW_SYSTEM) == []
+        mock_managed.return_value = ["bk_monitor"]
+        assert ScopePermission("admin").get_system_ids(scope, ActionEnum.VIEW_SYSTEM) == ["bk_monitor"]
+        assert mock_instance.get_authorized_resource_ids.call_count == 1
+
+    def test_invalidate_user(self):
+        loader = MagicMock(return_value=[1])
+        self.cache.get_or_load("admin", "scene", "view_scene", loader)
+        self.cache.get_or_load("other", "scene", "view_scene", loader)
+        self.cache.invalidate_user("admin")
+        self.cache.get_or_load("admin", "scene", "view_scene", loader)
+        self.cache.get_or_load("other", "scene", "view_scene", loader)
+        assert loader.call_count == 3
+
+    def test_invalidate_all(self):
+        loader = MagicMock(return_value=[1])
+        self.cache.get_or_load("admin", "scene", "view_scene", loader)
+        self.cache.invalidate_all()
+        self.cache.get_or_load("admin", "scene", "view_scene", loader)
+        assert loader.call_count == 2
+
+    def test_loader_exception_not_cached(self):
+        with self.assertRaises(KeyError):
+            self.cache.get_or_load("admin", "scene", "view_scene", MagicMock(side_effect=KeyError))
+        assert self.cache.get_or_load("admin", "scene", "view_scene", lambda: [1]) == [1]
+
+    def test_stale_while_revalidate(self):
+        """过期后先返回旧值，后台刷新后返回新值"""
+        self.cache.stale_while_revalidate = True
+        self.cache.stale_ttl = 60
+        self.cache.get_or_load("admin", "scene", "view_scene", lambda: [1])
+
+        expired_at = time.time() + 61
+        with patch("services.web.common.scope_permission.time.time", return_value=expired_at):
+            with patch("services.web.common.scope_permission.submit_with_observation_context") as mock_submit:
+                assert self.cache.get_or_load("admin", "scene", "view_scene", lambda: [2]) == [1]
+                # 刷新进行中时不重复提交
+                assert self.cache.get_or_load("admin", "scene", "view_scene", lambda: [3]) == [1]
+            mock_submit.assert_called_once()
+            _, refresh, *args = mock_submit.call_args.args
+            with patch("services.web.common.scope_permission.connections"):
+                refresh(*args)
+
+        assert self.cache.get_or_load("admin", "scene", "view_scene", lambda: [4]) == [2]
+        assert self.cache.stats["stale_hits"] == 2
+
+    @patch("services.web.scene.permission._grant_scene_role_to_iam", return_value={"success": True})
+    @patch("services.web.scene.permission.IAMGroupManager.refresh_scene_members")
+    def test_grant_scene_role_invalidate_user(self, mock_refresh, mock_grant):
+        from services.web.scene.constants import SceneRole
+        from services.web.scene.permission import grant_scene_role
+
+        scene = Scene.objects.create(name="授权失效", status=SceneStatus.ENABLED)
+        loader = MagicMock(return_value=[])
+        self.cache.get_or_load("new_user", "scene", "view_scene", loader)
+        with patch("services.web.scene.permission.authorized_scope_cache", self.cache):
+            grant_scene_role(scene, SceneRole.USER, "new_user", operator="admin")
+        self.cache.get_or_load("new_user", "scene", "view_scene", loader)
+        assert loader.call_count == 2
+
+
 # ==================== ScopeInstancePermission Tests ====================
 
 
@@ -894,6 +999,62 @@ class TestCheckResourcePermission(TestCase):
             )
 
 
+# ==================== check_resources_visibility Tests ====================
+
+
+@pytest.mark.django_db
+class TestCheckResourcesVisibility(TestCase):
+    """测试批量资源可见性校验"""
+
+    def setUp(self):
+        self.scene = Scene.objects.create(name="批量可见场景", status=SceneStatus.ENABLED)
+        self.other_scene = Scene.objects.create(name="其他场景", status=SceneStatus.ENABLED)
+        self.expected = {}
+        for index in range(10):
+            specific_scene = ResourceBinding.objects.create(
+                resource_type=BindingResourceType.PANEL,
+                resource_id=f"batch_scene_{index}",
+                binding_type=BindingType.PLATFORM_BINDING,
+                visibility_type=VisibilityScope.SPECIFIC_SCENES,
+            )
+            visible_scene = self.scene if index % 2 == 0 else self.other_scene
+            ResourceBindingScene.objects.create(binding=specific_scene, scene=visible_scene)
+            self.expected[(BindingResourceType.PANEL.value, specific_scene.resource_id)] = index % 2 == 0
+
+            specific_system = ResourceBinding.objects.create(
+                resource_type=BindingResourceType.TOOL,
+                resource_id=f"batch_system_{index}",
+                binding_type=BindingType.PLATFORM_BINDING,
+                visibility_type=VisibilityScope.SPECIFIC_SYSTEMS,
+            )
+            system_id = "bk_monitor" if index % 3 == 0 else "bk_log"
+            ResourceBindingSystem.objects.create(binding=specific_system, system_id=system_id)
+            self.expected[(BindingResourceType.TOOL.value, specific_system.resource_id)] = index % 3 == 0
+        self.expected[(BindingResourceType.TOOL.value, "not_bound")] = False
+
+    def _scope_permission(self):
+        sp = ScopePermission("admin")
+        sp._get_all_scene_ids = MagicMock(return_value=[self.scene.scene_id])
+        sp._get_all_system_ids = MagicMock(return_value=["bk_monitor"])
+        return sp
+
+    @patch("services.web.common.scope_permission.Permission")
+    def test_batch_matches_single_check(self, mock_perm_cls):
+        sp = self._scope_permission()
+        # 绑定 + 绑定场景 + 绑定系统
+        with self.assertNumQueries(3):
+            result = sp.check_resources_visibility(self.expected.keys())
+        assert result == self.expected
+        for (resource_type, resource_id), visible in self.expected.items():
+            assert sp.check_resource_permission(resource_type, resource_id, raise_exception=False) is visible
+
+    @patch("services.web.common.scope_permission.Permission")
+    def test_empty_resources(self, mock_perm_cls):
+        sp = self._scope_permission()
+        with self.assertNumQueries(0):
+            assert sp.check_resources_visibility([]) == {}
+
+
 # ==================== SCENES_AND_SYSTEMS Binding Tests ====================
 
 
@@ -1,4 +1,6 @@
 # -*- coding: utf-8 -*-
+import threading
+import time
 from unittest import mock
 
 from api.bk_base.default import GetFlowDeployData
@@ -546,3 +548,76 @@ class TestCheckStrategyStatusAnomaliesTask(TestCase):
         call_args = self.mock_bk_monitor_report_event.call_args
         event_data = call_args[1]  # kwargs
         assert len(event_data["data"]) == 2
+
+
+class TestCheckStrategyStatusConcurrentFetch(TestCase):
+    """测试策略状态巡检的并发获取"""
+
+    def setUp(self):
+        self.mock_strategy_objects = mock.patch("services.web.strategy_v2.tasks.Strategy.objects.all").start()
+        # 两个离线策略共用一个 Flow
+        self.strategies = [
+            Strategy(
+                strategy_id=i,
+                strategy_name=f"离线策略{i}",
+                strategy_type=StrategyType.RULE,
+                status=StrategyStatusChoices.RUNNING.value,
+                configs={"data_source": {"source_type": RuleAuditSourceType.BATCH}},
+                backend_data={"flow_id": 20000 + i // 2},
+            )
+            for i in range(4)
+        ]
+        self.mock_strategy_objects.return_value = self.strategies
+        self.mock_get_flow_deploy_data = mock.patch.object(
+            GetFlowDeployData, "perform_request", mock.Mock(return_value={"flow_status": "running"})
+        ).start()
+        self.mock_get_flow_graph = mock.patch(
+            "services.web.strategy_v2.tasks.api.bk_base.get_flow_graph",
+            return_value={"nodes": [{"node_type": "batchv2", "result_table_ids": ["rt_batch"]}]},
+        ).start()
+        self.mock_batch_status_list = mock.patch(
+            "services.web.strategy_v2.handlers.strategy_running_status.api.bk_base.dataflow_batch_status_list",
+            return_value=[],
+        ).start()
+        self.mock_report_event = mock.patch("services.web.strategy_v2.tasks.api.bk_monitor.report_event").start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+
+    def test_fetch_once_per_flow(self):
+        with self.assertNumQueries(1):
+            check_strategy_status_anomalies()
+
+        # 每个 Flow 只请求一次状态与 Flow 图，每个策略各请求一次调度记录
+        assert self.mock_get_flow_deploy_data.call_count == 2
+        assert self.mock_get_flow_graph.call_count == 2
+        assert self.mock_batch_status_list.call_count == 4
+        event_data = self.mock_report_event.call_args.kwargs
+        assert [event["target"] for event in event_data["data"]] == [0, 1, 2, 3]
+
+    def test_realtime_strategy_skip_running_data(self):
+        for strategy in self.strategies:
+            strategy.configs = {"data_source": {"source_type": RuleAuditSourceType.REALTIME}}
+
+        with self.assertNumQueries(0):
+            check_strategy_status_anomalies()
+
+        self.mock_get_flow_graph.assert_not_called()
+        self.mock_report_event.assert_not_called()
+
+    def test_call_timeout(self):
+        release = threading.Event()
+        checker = StrategyStatusChecker(concurrency=2, call_timeout=0.1)
+
+        def fetch(key):
+            if key == "slow":
+                release.wait(5)
+            return key
+
+        start = time.monotonic()
+        results = checker.run_concurrently(fetch, ["fast", "slow", "fast"])
+        release.set()
+
+        assert time.monotonic() - start < 1
+        assert results["fast"] == "fast"
+        assert isinstance(results["slow"], TimeoutError)
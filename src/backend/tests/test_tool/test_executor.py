@@ -1088,7 +1088,7 @@ class ApiToolExecutorTestCase(DjangoTestCase):
 
         self.executor = ApiToolExecutor(self.tool)
 
-    @patch('requests.request')
+    @patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_success(self, mock_requests_request):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -1147,7 +1147,7 @@ class ApiToolExecutorTestCase(DjangoTestCase):
             json={"body_param": {"key": "value"}},
         )
 
-    @patch('requests.request')
+    @patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_failed(self, mock_requests_request):
         mock_response = MagicMock()
         mock_response.status_code = 404
@@ -1176,7 +1176,7 @@ class ApiToolExecutorTestCase(DjangoTestCase):
         self.assertEqual(result.err_type, ApiToolErrorType.NONE)
         self.assertEqual(result.message, "")
 
-    @patch('requests.request')
+    @patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_non_json_response(self, mock_requests_request):
         mock_response = MagicMock()
         mock_response.status_code = 502
@@ -1202,7 +1202,7 @@ class ApiToolExecutorTestCase(DjangoTestCase):
         self.assertEqual(result.err_type, ApiToolErrorType.NON_JSON_RESPONSE)
         self.assertEqual(result.message, "Bad Gateway")
 
-    @patch('requests.request')
+    @patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_request_exception(self, mock_requests_request):
         mock_requests_request.side_effect = requests.RequestException("boom")
 
@@ -1386,7 +1386,7 @@ class ApiToolExecutorTestCase(DjangoTestCase):
         # 验证单个值被转换为字符串
         self.assertEqual(person_select_param.value, "user1")
 
-    @patch('requests.request')
+    @patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_person_select(self, mock_requests_request):
         """测试 API 工具执行时人员选择器参数传递"""
         mock_response = MagicMock()
@@ -1564,7 +1564,7 @@ class TestApiToolExecutor(TestCase):
             ),
         )
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_no_auth(self, mock_request):
         """测试无认证方式执行API工具"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -1590,7 +1590,7 @@ class TestApiToolExecutor(TestCase):
         # 无认证不应添加 Authorization 头
         self.assertNotIn("Authorization", call_kwargs[1]["headers"])
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_bk_app_auth(self, mock_request):
         """测试蓝鲸应用认证方式执行API工具"""
         import json
@@ -1619,7 +1619,7 @@ class TestApiToolExecutor(TestCase):
         self.assertEqual(auth_data["bk_app_code"], "test_app")
         self.assertEqual(auth_data["bk_app_secret"], "test_secret_12345")
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_ieop_auth(self, mock_request):
         """测试IEOP认证方式执行API工具"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -1657,7 +1657,7 @@ class TestApiToolExecutor(TestCase):
         self.assertEqual(body.get("app_secret"), "test_app_secret")
         self.assertEqual(body.get("operator"), "test_operator")
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_ieop_auth_without_operator(self, mock_request):
         """测试IEOP认证方式执行API工具（不带operator）"""
         from services.web.tool.constants import (
@@ -1731,7 +1731,7 @@ class TestApiToolExecutor(TestCase):
         self.assertIn("Date", headers)
 
     @mock.patch('services.web.tool.executor.tool.logger.info')
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_ieop_auth_masks_app_secret_in_body_log(self, mock_request, mock_logger_info):
         """测试IEOP认证日志中body的app_secret会脱敏"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -1750,7 +1750,7 @@ class TestApiToolExecutor(TestCase):
         self.assertNotIn("test_app_secret", log_message)
 
     @mock.patch('services.web.tool.executor.tool.logger.info')
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_ieop_auth_masks_app_secret_in_query_log(self, mock_request, mock_logger_info):
         """测试IEOP认证日志中query参数的app_secret会脱敏"""
         from services.web.tool.constants import (
@@ -1789,7 +1789,7 @@ class TestApiToolExecutor(TestCase):
         self.assertIn("'app_secret': '***'", log_message)
         self.assertNotIn("test_app_secret", log_message)
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_path_params(self, mock_request):
         """测试带路径参数的API工具执行"""
         from services.web.tool.constants import (
@@ -1841,7 +1841,7 @@ class TestApiToolExecutor(TestCase):
         call_kwargs = mock_request.call_args
         self.assertEqual(call_kwargs[1]["url"], "https://api.example.com/v1/users/12345/profile")
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_body_params(self, mock_request):
         """测试带请求体参数的API工具执行"""
         from services.web.tool.constants import (
@@ -1908,7 +1908,7 @@ class TestApiToolExecutor(TestCase):
         call_kwargs = mock_request.call_args
         self.assertEqual(call_kwargs[1]["json"], {"username": "test_user", "age": 25})
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_query_params(self, mock_request):
         """测试带查询参数的API工具执行"""
         from services.web.tool.constants import (
@@ -1975,7 +1975,7 @@ class TestApiToolExecutor(TestCase):
         call_kwargs = mock_request.call_args
         self.assertEqual(call_kwargs[1]["params"], {"page": 1, "page_size": 10})
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_pagination_params_from_tool_variables(self, mock_request):
         """测试分页参数从 tool_variables 渲染到查询参数"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -1999,7 +1999,7 @@ class TestApiToolExecutor(TestCase):
         self.assertEqual(result.status_code, 200)
         self.assertEqual(mock_request.call_args[1]["params"], {"pageNum": 2, "pageSize": 20})
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_pagination_defaults_when_tool_variables_missing(self, mock_request):
         """测试分页参数未传时使用配置默认值"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -2015,7 +2015,7 @@ class TestApiToolExecutor(TestCase):
 
         self.assertEqual(mock_request.call_args[1]["params"], {"pageNum": 1, "pageSize": 10})
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_invalid_pagination_value(self, mock_request):
         """测试分页参数值格式错误时抛出异常"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -2035,7 +2035,7 @@ class TestApiToolExecutor(TestCase):
 
         mock_request.assert_not_called()
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_multiple_pagination_configs(self, mock_request):
         """测试多组分页配置同时渲染"""
         from services.web.tool.constants import (
@@ -2085,7 +2085,7 @@ class TestApiToolExecutor(TestCase):
         self.assertEqual(mock_request.call_args[1]["params"], {"pageNum": 2, "pageSize": 10})
         self.assertEqual(mock_request.call_args[1]["json"], {"pageNum": 3, "pageSize": 50})
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_pagination_params_in_body(self, mock_request):
         """测试分页参数按配置渲染到请求体"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -2108,7 +2108,7 @@ class TestApiToolExecutor(TestCase):
 
         self.assertEqual(mock_request.call_args[1]["json"], {"pageNum": 3, "pageSize": 50})
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_pagination_params_in_path(self, mock_request):
         """测试分页参数按配置渲染到路径参数"""
         from services.web.tool.constants import (
@@ -2148,7 +2148,7 @@ class TestApiToolExecutor(TestCase):
 
         self.assertEqual(mock_request.call_args[1]["url"], "https://api.example.com/v1/users/page/4/size/100")
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_ignores_pagination_config_when_disabled(self, mock_request):
         """测试关闭分页时不注入分页参数"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -2164,7 +2164,7 @@ class TestApiToolExecutor(TestCase):
 
         self.assertNotIn("params", mock_request.call_args[1])
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_pagination_defaults_do_not_skip_required_input_validation(self, mock_request):
         """测试分页默认值不绕过普通输入变量必填校验"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -2181,7 +2181,7 @@ class TestApiToolExecutor(TestCase):
 
         mock_request.assert_not_called()
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_missing_required_variable(self, mock_request):
         """测试缺少必填变量时抛出异常"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -2193,7 +2193,7 @@ class TestApiToolExecutor(TestCase):
             executor.execute(params)
         self.assertIn("用户ID", cm.exception.message)
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_non_json_response(self, mock_request):
         """测试响应非JSON时的处理"""
         from services.web.tool.constants import ApiToolErrorType
@@ -2214,7 +2214,7 @@ class TestApiToolExecutor(TestCase):
         self.assertEqual(result.message, "Plain text response")
         self.assertIsNone(result.result)
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_request_error(self, mock_request):
         """测试请求异常时的处理"""
         import requests as req
@@ -2232,7 +2232,7 @@ class TestApiToolExecutor(TestCase):
         self.assertEqual(result.err_type, ApiToolErrorType.REQUEST_ERROR)
         self.assertIn("Connection timeout", result.message)
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_ieop_auth_url_parsing(self, mock_request):
         """测试IEOP认证自动从URL解析host和path"""
         from services.web.tool.constants import (
@@ -2369,7 +2369,7 @@ class TestApiToolExecutorWithTool(DjangoTestCase):
     def tearDown(self):
         mock.patch.stopall()
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_create_executor_from_tool(self, mock_request):
         """测试通过Tool对象创建执行器并执行"""
         from services.web.tool.executor.tool import ApiToolExecutor
@@ -2399,7 +2399,7 @@ class TestApiToolExecutorWithTool(DjangoTestCase):
         self.assertEqual(body.get("operator"), "tool_operator")
         self.assertEqual(headers["X-Custom-Header"], "custom_value")
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_create_executor_from_factory(self, mock_request):
         """测试通过工厂创建API执行器"""
         mock_response = mock.Mock()
@@ -2424,7 +2424,7 @@ class TestApiToolExecutorWithTool(DjangoTestCase):
 class TestApiToolExecutorTimeRange(TestCase):
     """测试时间范围变量的API工具执行"""
 
-    @mock.patch('services.web.tool.executor.tool.requests.request')
+    @mock.patch('services.web.tool.executor.tool.http_session_pool.request')
     def test_execute_with_time_range_variable(self, mock_request):
         """测试时间范围变量拆分为开始和结束时间"""
         from services.web.tool.constants import (
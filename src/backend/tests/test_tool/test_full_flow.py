@@ -227,7 +227,7 @@ class TestToolFullFlow(TestCase):
         mock_response.json.return_value = {"result": True, "data": {"pageIndex": 2, "pageSize": 30}}
 
         with (
-            mock.patch("requests.request", return_value=mock_response),
+            mock.patch("services.web.tool.executor.tool.http_session_pool.request", return_value=mock_response),
             mock.patch.object(
                 self.resource.tool.execute_tool.__class__, "_get_user_allowed_scopes", return_value=([], [])
             ),